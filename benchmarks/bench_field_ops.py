@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+
+"""\
+Benchmarks for the routines in :mod:`stk.api.mesh.field_ops`
+"""
+
+import numpy as np
+import pytest
+from stk import StkSelector, StkState
+from stk.api.mesh import field_ops
+
+def field_bytes(mesh, *names):
+    """Bytes of field data on the locally stored nodes"""
+    sel = StkSelector.from_part(mesh.meta.universal_part)
+    return sum(mesh.meta.get_field(name).gather(sel).nbytes for name in names)
+
+@pytest.fixture
+def fields(mesh):
+    meta = mesh.meta
+    return meta.get_field("pressure"), meta.get_field("velocity")
+
+def bench_axpy(benchmark, mesh, fields):
+    _, velocity = fields
+    vel_old = velocity.field_state(StkState.StateN)
+    benchmark(field_ops.axpy, 0.5, vel_old, velocity,
+              nbytes=3 * field_bytes(mesh, "velocity"))
+
+def bench_fill(benchmark, mesh, fields):
+    _, velocity = fields
+    benchmark(field_ops.fill, 1.0, velocity,
+              nbytes=field_bytes(mesh, "velocity"))
+
+def bench_fill_component(benchmark, mesh, fields):
+    _, velocity = fields
+    benchmark(field_ops.fill_component, np.array([1.0, 0.5, 0.0]), velocity,
+              nbytes=field_bytes(mesh, "velocity"))
+
+def bench_copy(benchmark, mesh, fields):
+    _, velocity = fields
+    vel_old = velocity.field_state(StkState.StateN)
+    benchmark(field_ops.copy, velocity, vel_old,
+              nbytes=2 * field_bytes(mesh, "velocity"))
+
+def bench_swap(benchmark, mesh, fields):
+    _, velocity = fields
+    vel_old = velocity.field_state(StkState.StateN)
+    benchmark(field_ops.swap, velocity, vel_old,
+              nbytes=4 * field_bytes(mesh, "velocity"))
+
+@pytest.mark.parametrize("op", ["dot", "nrm2", "asum", "amax",
+                                "field_min", "field_max", "field_sum"])
+def bench_reduction(benchmark, mesh, fields, op):
+    _, velocity = fields
+    func = getattr(field_ops, op)
+    sel = StkSelector.from_part(mesh.meta.locally_owned_part)
+    if op == "dot":
+        benchmark(func, velocity, velocity, sel)
+    else:
+        benchmark(func, velocity, sel)
+
+def bench_reduce_many(benchmark, mesh, fields):
+    pressure, velocity = fields
+    benchmark(field_ops.reduce_many, [
+        ("nrm2", velocity), ("max", pressure), ("sum", velocity)])
+
+def bench_evaluate(benchmark, mesh, fields):
+    pressure, velocity = fields
+    benchmark(field_ops.evaluate, "u = a*u + b*p",
+              dict(u=velocity, p=pressure), dict(a=0.5, b=2.0),
+              nbytes=field_bytes(mesh, "pressure") +
+              2 * field_bytes(mesh, "velocity"))
+
+def bench_gather_scatter_fields(benchmark, mesh, fields):
+    flist = list(fields)
+    buf = field_ops.gather_fields(flist)
+
+    def run():
+        field_ops.gather_fields(flist, out=buf)
+        field_ops.scatter_fields(flist, buf)
+
+    benchmark(run, nbytes=2 * buf.nbytes)
+
+@pytest.mark.parametrize("op", ["parallel_sum", "parallel_max", "parallel_min",
+                                "copy_owned_to_shared"])
+def bench_parallel_comm(benchmark, mesh, fields, op):
+    func = getattr(field_ops, op)
+    benchmark(func, mesh.bulk, list(fields))
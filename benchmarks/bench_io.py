@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+
+"""\
+Benchmarks for mesh creation and Exodus I/O
+"""
+
+import itertools
+import os
+import pytest
+from stk import StkMesh
+from conftest import mesh_spec
+
+@pytest.mark.parametrize("create_edges", [False, True], ids=["nodes", "edges"])
+def bench_populate_bulk_data(benchmark, parallel, mesh_size, create_edges):
+    """Read the generated mesh metadata and populate the bulk data"""
+    def setup():
+        mesh = StkMesh(parallel)
+        mesh.read_mesh_meta_data(mesh_spec(mesh_size))
+        return (mesh,)
+
+    benchmark(lambda mesh: mesh.populate_bulk_data(create_edges=create_edges),
+              setup=setup, repeat=3)
+
+@pytest.fixture
+def output_dir(request):
+    """Output directory under the working directory, common to all MPI ranks"""
+    path = os.path.join(request.config.getoption("bench_workdir"), "bench_io")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+def write_exodus(mesh, fname):
+    """Write the mesh with pressure and velocity for a single time step"""
+    stkio = mesh.stkio
+    fidx = stkio.create_output_mesh(fname)
+    stkio.add_field(fidx, mesh.meta.get_field("pressure"))
+    stkio.add_field(fidx, mesh.meta.get_field("velocity"))
+    stkio.process_output_request(fidx, 0.0)
+    stkio.flush_output()
+
+def read_exodus(parallel, fname):
+    """Read a mesh with all fields at the last time step
+
+    The files were written with one file per rank, so the existing
+    decomposition is used instead of decomposing the mesh again.
+    """
+    mesh = StkMesh(parallel)
+    mesh.read_mesh_meta_data(fname, auto_decomp=False)
+    mesh.populate_bulk_data(auto_load_fields=True)
+    return mesh
+
+def bench_exodus_write(benchmark, mesh, mesh_size, output_dir):
+    """Write the mesh and fields to a new Exodus database"""
+    fnames = iter(os.path.join(output_dir, "write_n%d_%d.exo"%(mesh_size, i))
+                  for i in itertools.count())
+    benchmark(write_exodus, setup=lambda: (mesh, next(fnames)), repeat=3)
+
+def bench_exodus_read(benchmark, parallel, mesh, mesh_size, output_dir):
+    """Read the mesh and fields from an Exodus database"""
+    fname = os.path.join(output_dir, "read_n%d.exo"%mesh_size)
+    write_exodus(mesh, fname)
+    benchmark(read_exodus, parallel, fname, repeat=3)
+
+def bench_exodus_round_trip(benchmark, parallel, mesh, mesh_size, output_dir):
+    """Write the mesh and fields to Exodus and read them back"""
+    fnames = iter(os.path.join(output_dir, "rt_n%d_%d.exo"%(mesh_size, i))
+                  for i in itertools.count())
+
+    def run(fname):
+        write_exodus(mesh, fname)
+        return read_exodus(parallel, fname)
+
+    benchmark(run, setup=lambda: (next(fnames),), repeat=3)
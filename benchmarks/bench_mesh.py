@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+
+"""\
+Benchmarks for mesh traversal and field access
+"""
+
+import numpy as np
+import pytest
+from stk import StkSelector, StkRank
+from conftest import create_mesh
+
+def bench_iter_entities_get(benchmark, mesh):
+    """Per-entity access with ``iter_entities`` and ``StkFieldBase.get``"""
+    pressure = mesh.meta.get_field("pressure")
+    sel = StkSelector.from_part(mesh.meta.universal_part)
+
+    def run():
+        total = 0.0
+        for ent in mesh.iter_entities(sel, StkRank.NODE_RANK):
+            total += pressure.get(ent)[0]
+        return total
+
+    benchmark(run)
+
+def bench_bkt_view(benchmark, mesh):
+    """Vectorized update using ``iter_buckets`` and ``bkt_view``"""
+    pressure = mesh.meta.get_field("pressure")
+    velocity = mesh.meta.get_field("velocity")
+    sel = StkSelector.from_part(mesh.meta.universal_part)
+
+    def run():
+        for bkt in mesh.iter_buckets(sel, StkRank.NODE_RANK):
+            pres = pressure.bkt_view(bkt)
+            vel = velocity.bkt_view(bkt)
+            vel *= 0.5
+            vel += 2.0 * pres[:, np.newaxis]
+
+    benchmark(run)
+
+@pytest.mark.parametrize("name", ["pressure", "velocity"])
+def bench_gather_scatter(benchmark, mesh, name):
+    """Round trip of ``gather`` and ``scatter`` for one field"""
+    field = mesh.meta.get_field(name)
+    sel = StkSelector.from_part(mesh.meta.universal_part)
+    buf = field.gather(sel)
+
+    def run():
+        field.gather(sel, out=buf)
+        field.scatter(buf, sel)
+
+    benchmark(run, nbytes=2 * buf.nbytes)
+
+def bench_entity_ids(benchmark, mesh):
+    """Bulk query of node identifiers"""
+    sel = StkSelector.from_part(mesh.meta.universal_part)
+    benchmark(mesh.bulk.entity_ids, sel, StkRank.NODE_RANK)
+
+def bench_connectivity(benchmark, mesh):
+    """Element to node connectivity table"""
+    sel = StkSelector.from_part(mesh.meta.locally_owned_part)
+    benchmark(mesh.bulk.connectivity, sel, StkRank.ELEM_RANK, StkRank.NODE_RANK)
+
+@pytest.mark.parametrize("method", ["original", "hilbert", "morton", "rcm"])
+def bench_gather_through_connectivity(benchmark, parallel, mesh_size, method):
+    """Element centroid kernel reading node data through the connectivity
+
+    Compares the original node ordering with the orderings from
+    ``reorder_entities``. Generated meshes are already ordered by a
+    structured numbering, so the differences are larger for unstructured
+    meshes read from files.
+    """
+    mesh = create_mesh(parallel, mesh_size)
+    bulk = mesh.bulk
+    if method != "original":
+        bulk.reorder_entities(method, StkRank.NODE_RANK)
+        bulk.reorder_entities(method, StkRank.ELEM_RANK)
+    sel = StkSelector.from_part(mesh.meta.universal_part)
+    xyz = mesh.meta.coordinate_field.gather(sel)
+    nodes = bulk.local_offsets(sel, StkRank.NODE_RANK)
+    lookup = np.zeros((nodes.max() + 1,), dtype=np.int64)
+    lookup[nodes] = np.arange(nodes.shape[0])
+    offsets, conn = bulk.connectivity_csr(sel, StkRank.ELEM_RANK, StkRank.NODE_RANK)
+    positions = lookup[conn]
+
+    def run():
+        return np.add.reduceat(xyz[positions], offsets[:-1])
+
+    benchmark(run, nbytes=xyz.itemsize * 3 * positions.shape[0])
+
+@pytest.mark.parametrize("schedule", ["python", "static", "balanced"])
+@pytest.mark.parametrize("nthreads", [1, 4])
+def bench_parallel_for_buckets(benchmark, mesh, nthreads, schedule):
+    """Threaded bucket loop running a compiled kernel
+
+    The ``python`` schedule times the same update with a Python loop over
+    ``iter_buckets`` and ``bkt_view`` as the baseline.
+    """
+    pressure = mesh.meta.get_field("pressure")
+    velocity = mesh.meta.get_field("velocity")
+    sel = StkSelector.from_part(mesh.meta.universal_part)
+    if schedule == "python":
+        if nthreads != 1:
+            pytest.skip("Python loop is serial")
+
+        def python_loop():
+            for bkt in mesh.iter_buckets(sel, StkRank.NODE_RANK):
+                pres = pressure.bkt_view(bkt)
+                vel = velocity.bkt_view(bkt)
+                vel *= 0.5
+                vel += 2.0 * pres[:, np.newaxis]
+
+        benchmark(python_loop)
+        return
+
+    numba = pytest.importorskip("numba")
+    types = numba.types
+    sig = types.void(types.uintp, types.CPointer(types.CPointer(types.double)),
+                     types.CPointer(types.intc), types.voidptr)
+
+    @numba.cfunc(sig, nopython=True)
+    def axpby_kernel(num_entities, data, ncomp, user_data):
+        """velocity = 0.5 * velocity + 2.0 * pressure"""
+        pres = numba.carray(data[0], (num_entities,))
+        vel = numba.carray(data[1], (num_entities, ncomp[1]))
+        for i in range(num_entities):
+            for j in range(ncomp[1]):
+                vel[i, j] = 0.5 * vel[i, j] + 2.0 * pres[i]
+
+    fields = [pressure, velocity]
+    # Run once so that the thread pool is created before timing
+    mesh.bulk.parallel_for_buckets(sel, StkRank.NODE_RANK, axpby_kernel, fields,
+                                   nthreads=nthreads)
+    benchmark(lambda: mesh.bulk.parallel_for_buckets(
+        sel, StkRank.NODE_RANK, axpby_kernel, fields,
+        nthreads=nthreads, schedule=schedule))
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+
+"""\
+Benchmark for partial mesh loading
+==================================
+
+Measures the load time and peak resident memory of
+:meth:`~stk.stk.stk_mesh.StkMesh.read_mesh_meta_data` followed by
+``populate_bulk_data`` for a generated multi-block mesh, loading either the
+full mesh or only the hex block and a subset of the sidesets. Each case runs in
+a separate process so that the peak memory is not polluted by earlier cases.
+
+Usage::
+
+    python benchmarks/bench_partial_load.py --size 100
+"""
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import time
+
+CASES = {
+    "full": dict(),
+    "block_1": dict(include_parts=["block_1"]),
+    "block_1+surfaces": dict(include_parts=["block_1", "surface_1", "surface_2"]),
+    "exclude_shells": dict(exclude_parts=["block_2", "block_3"]),
+}
+
+def mesh_spec(size):
+    """Generated mesh with a hex block, two shell blocks and six sidesets"""
+    return "generated:%dx%dx%d|shell:xX|sideset:xXyYzZ"%(size, size, size)
+
+def run_case(name, size):
+    """Load the mesh for one case and return the timings"""
+    from stk import StkMesh, Parallel
+    par = Parallel.initialize()
+    mesh = StkMesh(par)
+    tstart = time.perf_counter()
+    mesh.read_mesh_meta_data(mesh_spec(size), **CASES[name])
+    tmeta = time.perf_counter()
+    mesh.populate_bulk_data()
+    tend = time.perf_counter()
+    # ru_maxrss is in kilobytes on Linux
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+    return dict(case=name, meta=tmeta - tstart, populate=tend - tmeta,
+                total=tend - tstart, maxrss_mb=maxrss)
+
+def main():
+    """Run all cases in subprocesses and print a summary table"""
+    parser = argparse.ArgumentParser(description="Partial mesh loading benchmark")
+    parser.add_argument("--size", type=int, default=50,
+                        help="Number of elements in each direction")
+    parser.add_argument("--case", choices=sorted(CASES),
+                        help="Run a single case in this process (internal)")
+    args = parser.parse_args()
+
+    if args.case is not None:
+        print(json.dumps(run_case(args.case, args.size)))
+        return
+
+    print("Mesh: %s"%mesh_spec(args.size))
+    print("%-20s %10s %10s %10s %12s"%(
+        "case", "meta (s)", "pop. (s)", "total (s)", "max RSS (MB)"))
+    for name in CASES:
+        out = subprocess.check_output(
+            [sys.executable, __file__, "--size", str(args.size), "--case", name])
+        res = json.loads(out.decode().strip().splitlines()[-1])
+        print("%-20s %10.3f %10.3f %10.3f %12.1f"%(
+            name, res["meta"], res["populate"], res["total"], res["maxrss_mb"]))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+
+"""\
+Fixtures for the pySTK benchmark suite
+
+The benchmarks are regular pytest functions named ``bench_*`` in files named
+``bench_*.py``. They are not collected by the default test run, use
+``run_benchmarks.py`` or::
+
+    python -m pytest benchmarks -o python_files="bench_*.py" \\
+        -o python_functions="bench_*" --mesh-sizes 10,20 --bench-output out.json
+
+The ``benchmark`` fixture times a callable over several repetitions. Under MPI,
+all ranks synchronize before every repetition and the slowest rank determines
+the recorded time. The ratio of the slowest to the fastest rank is recorded as
+the load imbalance.
+"""
+
+import json
+import platform
+import socket
+import statistics
+import time
+import numpy as np
+import pytest
+from stk import Parallel, StkMesh
+
+def pytest_addoption(parser):
+    group = parser.getgroup("stk-benchmarks")
+    group.addoption("--mesh-sizes", default="10,20",
+                    help="Comma-separated list of N for generated:NxNxN meshes")
+    group.addoption("--bench-repeat", type=int, default=5,
+                    help="Number of timed repetitions per benchmark")
+    group.addoption("--bench-output", default=None,
+                    help="JSON file for the benchmark results")
+    group.addoption("--bench-workdir", default=".",
+                    help="Directory for files written by the I/O benchmarks")
+
+def pytest_configure(config):
+    config._stk_bench_results = []
+    config._stk_bench_rank = 0
+
+def pytest_generate_tests(metafunc):
+    if "mesh_size" in metafunc.fixturenames:
+        sizes = [int(n) for n in metafunc.config.getoption("mesh_sizes").split(",")]
+        metafunc.parametrize("mesh_size", sizes, ids=["n%d"%n for n in sizes])
+
+@pytest.fixture(scope="session")
+def parallel(request):
+    par = Parallel.initialize(["stk_bench"])
+    request.config._stk_bench_rank = par.rank
+    yield par
+    par.finalize()
+
+def mesh_spec(size):
+    """Generated mesh with sidesets on all boundaries"""
+    return "generated:%dx%dx%d|sideset:xXyYzZ"%(size, size, size)
+
+def create_mesh(parallel, size, create_edges=False):
+    """Generated mesh with a scalar ``pressure`` and vector ``velocity`` field"""
+    mesh = StkMesh(parallel)
+    mesh.read_mesh_meta_data(mesh_spec(size))
+    meta = mesh.meta
+    pressure = meta.declare_scalar_field("pressure")
+    velocity = meta.declare_vector_field("velocity", number_of_states=2)
+    pressure.add_to_part(meta.universal_part, init_value=np.array([1.0]))
+    velocity.add_to_part(meta.universal_part, meta.spatial_dimension,
+                         init_value=np.array([1.0, 0.5, 0.0]))
+    mesh.populate_bulk_data(create_edges=create_edges)
+    return mesh
+
+_mesh_cache = {}
+
+@pytest.fixture
+def mesh(parallel, mesh_size):
+    """Populated mesh, shared by all benchmarks with the same size"""
+    if mesh_size not in _mesh_cache:
+        _mesh_cache.clear()
+        _mesh_cache[mesh_size] = create_mesh(parallel, mesh_size)
+    return _mesh_cache[mesh_size]
+
+def barrier(parallel):
+    """Synchronize all ranks"""
+    parallel.parallel_reduce_sum(np.zeros((1,), dtype=np.float64))
+
+class Benchmark:
+    """Time a callable and record the results"""
+
+    def __init__(self, request, parallel):
+        self.request = request
+        self.parallel = parallel
+        self.repeat = request.config.getoption("bench_repeat")
+
+    def __call__(self, func, *args, setup=None, repeat=None, nbytes=0, **info):
+        """Run ``func(*args)`` repeatedly and record the timings
+
+        Args:
+            func: Callable to benchmark
+            setup: Optional callable run before every repetition (not timed)
+                whose return value (a tuple) replaces ``args``
+            repeat (int): Number of repetitions (default: ``--bench-repeat``)
+            nbytes (int): Bytes moved per call, used to report bandwidth
+            info: Additional metadata stored with the results
+
+        Return:
+            The return value of the last call
+        """
+        repeat = repeat or self.repeat
+        times = np.empty((repeat,), dtype=np.float64)
+        result = None
+        for i in range(repeat):
+            if setup is not None:
+                args = setup()
+            barrier(self.parallel)
+            tstart = time.perf_counter()
+            result = func(*args)
+            times[i] = time.perf_counter() - tstart
+        tfast = self.parallel.parallel_reduce_min(times)
+        times = self.parallel.parallel_reduce_max(times)
+
+        params = getattr(self.request.node, "callspec", None)
+        rec = dict(
+            name=self.request.node.originalname or self.request.node.name,
+            id=self.request.node.nodeid,
+            params={k: v for k, v in (params.params.items() if params else ())
+                    if isinstance(v, (int, float, str))},
+            nranks=self.parallel.size,
+            repeat=repeat,
+            min=float(times.min()),
+            median=float(statistics.median(times)),
+            mean=float(times.mean()),
+            max=float(times.max()),
+            imbalance=float(np.median(times) / max(np.median(tfast), 1.0e-300)),
+            nbytes=nbytes,
+            **info)
+        if nbytes:
+            rec["bandwidth_gbs"] = nbytes / rec["min"] / 1.0e9
+        self.request.config._stk_bench_results.append(rec)
+        return result
+
+@pytest.fixture
+def benchmark(request, parallel):
+    return Benchmark(request, parallel)
+
+def pytest_sessionfinish(session, exitstatus):
+    config = session.config
+    fname = config.getoption("bench_output")
+    if fname is None or not config._stk_bench_results:
+        return
+    if config._stk_bench_rank != 0:
+        return
+    import stk
+    out = dict(
+        timestamp=time.strftime("%Y-%m-%dT%H:%M:%S"),
+        host=socket.gethostname(),
+        python=platform.python_version(),
+        numpy=np.__version__,
+        stk_version=getattr(stk, "__version__", None),
+        results=config._stk_bench_results)
+    with open(fname, "w") as fh:
+        json.dump(out, fh, indent=2)
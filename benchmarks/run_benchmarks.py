@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+
+"""\
+Run the pySTK benchmark suite for several MPI rank counts
+=========================================================
+
+Runs the ``bench_*`` functions in this directory under ``mpirun -np N`` for
+every requested rank count and merges the results into a single JSON file.
+Each record contains the benchmark name and parameters, the number of MPI
+ranks, and the min/median/mean/max wall time (slowest rank) in seconds.
+
+Usage::
+
+    python benchmarks/run_benchmarks.py --np 1 2 4 --mesh-sizes 10,20,40 \\
+        --output results.json
+
+Additional arguments after ``--`` are passed to pytest, e.g., ``-- -k
+field_ops`` to run only a subset of the benchmarks.
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def pytest_command(args, output):
+    """Pytest command line for one run of the suite"""
+    return [
+        sys.executable, "-m", "pytest", BENCH_DIR, "-q", "-p", "no:cacheprovider",
+        "-o", "python_files=bench_*.py",
+        "-o", "python_functions=bench_*",
+        "--mesh-sizes", args.mesh_sizes,
+        "--bench-repeat", str(args.repeat),
+        "--bench-output", output,
+        "--bench-workdir", args.workdir,
+    ] + args.pytest_args
+
+def run_suite(args, nranks, workdir):
+    """Run the suite on ``nranks`` MPI ranks and return the parsed results"""
+    output = os.path.join(workdir, "np%d.json"%nranks)
+    cmd = pytest_command(args, output)
+    if nranks > 1 or args.always_mpirun:
+        cmd = [args.mpirun, "-np", str(nranks)] + args.mpirun_args + cmd
+    print("Running: %s"%" ".join(cmd), flush=True)
+    ret = subprocess.call(cmd)
+    if ret != 0:
+        print("WARNING: benchmark run with %d ranks returned %d"%(nranks, ret))
+    if not os.path.exists(output):
+        return None
+    with open(output) as fh:
+        return json.load(fh)
+
+def summarize(results):
+    """Print a table of the median times grouped by benchmark"""
+    print("%-60s %6s %12s %12s"%("benchmark", "ranks", "median (s)", "imbalance"))
+    for rec in sorted(results, key=lambda r: (r["id"], r["nranks"])):
+        print("%-60s %6d %12.5f %12.2f"%(
+            rec["id"].split("::")[-1][:60], rec["nranks"],
+            rec["median"], rec["imbalance"]))
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Run the pySTK benchmark suite for several MPI rank counts")
+    parser.add_argument("--np", type=int, nargs="+", default=[1, 2, 4],
+                        help="Number of MPI ranks for each run")
+    parser.add_argument("--mesh-sizes", default="10,20",
+                        help="Comma-separated list of N for generated:NxNxN meshes")
+    parser.add_argument("--repeat", type=int, default=5,
+                        help="Number of timed repetitions per benchmark")
+    parser.add_argument("--output", default="stk_benchmarks.json",
+                        help="Merged JSON output file")
+    parser.add_argument("--mpirun", default="mpirun",
+                        help="MPI launcher executable")
+    parser.add_argument("--mpirun-args", nargs="*", default=[],
+                        help="Additional arguments for the MPI launcher")
+    parser.add_argument("--always-mpirun", action="store_true",
+                        help="Use the MPI launcher for serial runs as well")
+    parser.add_argument("pytest_args", nargs="*",
+                        help="Additional arguments passed to pytest")
+    args = parser.parse_args()
+
+    merged = None
+    workdir = tempfile.mkdtemp(prefix="stk_bench_")
+    args.workdir = workdir
+    try:
+        for nranks in args.np:
+            out = run_suite(args, nranks, workdir)
+            if out is None:
+                continue
+            if merged is None:
+                merged = out
+            else:
+                merged["results"].extend(out["results"])
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    if merged is None:
+        print("ERROR: no benchmark results were recorded")
+        sys.exit(1)
+    merged["mesh_sizes"] = [int(n) for n in args.mesh_sizes.split(",")]
+    merged["nranks"] = args.np
+    with open(args.output, "w") as fh:
+        json.dump(merged, fh, indent=2)
+    summarize(merged["results"])
+    print("Results written to %s"%args.output)
+
+if __name__ == "__main__":
+    main()
@@ -8,8 +8,14 @@ This module provides a high-level interface to STK library
 """
 
 from .api.util.parallel import Parallel
+from .api.util import profiling
 from .api.topology.topology import rank_t as StkRank
 from .api.mesh.field import FieldState as StkState
 from .api.mesh.selector import StkSelector
 from .api.io.io import DatabasePurpose, TimeMatchOption
 from .stk.stk_mesh import StkMesh
+from .stk import search
+from .stk import assembly
+from .stk import balance
+from .stk import geometry
+from .stk import ensemble
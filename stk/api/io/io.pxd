@@ -5,6 +5,7 @@
 from libcpp cimport bool
 from libcpp.string cimport string
 from libcpp.vector cimport vector
+from libcpp.memory cimport shared_ptr
 from ..util.parallel cimport ParallelMachine
 from ..mesh.bulk cimport BulkData
 from ..mesh.field cimport FieldBase
@@ -15,6 +16,36 @@ cdef extern from "Ioss_Property.h" namespace "Ioss":
         Property(string name, int value)
         Property(string name, double value)
 
+cdef extern from "Ioss_VariableType.h" namespace "Ioss" nogil:
+    cdef cppclass VariableType:
+        int component_count() const
+
+cdef extern from "Ioss_Field.h" namespace "Ioss" nogil:
+    cdef cppclass IossField "Ioss::Field":
+        const VariableType* raw_storage() const
+
+cdef extern from "Ioss_GroupingEntity.h" namespace "Ioss" nogil:
+    cdef cppclass GroupingEntity:
+        const string& name() const
+        void property_add(const Property& prop)
+        bool field_exists(const string& name) const
+        IossField get_field(const string& name) const
+
+cdef extern from "Ioss_Region.h" namespace "Ioss" nogil:
+    cdef cppclass NodeBlock(GroupingEntity):
+        pass
+
+    cdef cppclass ElementBlock(GroupingEntity):
+        pass
+
+    cdef cppclass SideSet(GroupingEntity):
+        pass
+
+    cdef cppclass Region:
+        const vector[NodeBlock*]& get_node_blocks() const
+        const vector[ElementBlock*]& get_element_blocks() const
+        const vector[SideSet*]& get_sidesets() const
+
 cdef extern from "stk_io/DatabasePurpose.hpp" namespace "stk::io":
     cpdef enum DatabasePurpose:
         PURPOSE_UNKNOWN
@@ -59,7 +90,7 @@ cdef extern from "stk_io/InputFile.hpp" namespace "stk::io":
         InputFile& set_periodic_time(double period_len)
 
 
-cdef extern from "stk_io/StkMeshIoBroker.hpp" namespace "stk::io":
+cdef extern from "stk_io/StkMeshIoBroker.hpp" namespace "stk::io" nogil:
     cdef cppclass StkMeshIoBroker:
         StkMeshIoBroker()
         StkMeshIoBroker(ParallelMachine comm)
@@ -75,6 +106,7 @@ cdef extern from "stk_io/StkMeshIoBroker.hpp" namespace "stk::io":
 
 
         InputFile& get_mesh_database(size_t input_file_index)
+        shared_ptr[Region] get_input_io_region()
         void remove_mesh_database(size_t input_file_index) except +
         size_t set_active_mesh(size_t input_file_index)
         size_t get_active_mesh() const
@@ -94,6 +126,7 @@ cdef extern from "stk_io/StkMeshIoBroker.hpp" namespace "stk::io":
         double read_defined_input_fields(double time,
                                        vector[MeshField]* missing)
 
+        double read_input_field(MeshField& mesh_field) except +
         void add_input_field(const MeshField& mesh_field)
         void add_input_field(size_t mesh_index, const MeshField& mesh_field)
 
@@ -123,5 +156,7 @@ cdef class StkIoBroker:
     cdef StkMeshIoBroker* stkio
     cdef bint stkio_owner
 
+    cdef Region* input_region(self) except NULL
+
     @staticmethod
     cdef wrap_instance(StkMeshIoBroker* stkio, bint owner=*)
@@ -7,9 +7,19 @@ from cython.operator cimport dereference as deref
 from libcpp.string cimport string
 from libcpp.vector cimport vector
 from libcpp.memory cimport unique_ptr
-from ..util.parallel cimport Parallel
+from ..util.parallel cimport Parallel, mpi_thread_level, MPI_THREAD_MULTIPLE
 from ..mesh.bulk cimport StkBulkData
+from ..mesh.meta cimport StkMetaData
 from ..mesh.field cimport StkFieldBase
+from ..mesh.selector cimport StkSelector
+from ..topology.topology cimport rank_t
+from ..util.profiling cimport Profiler, get_profiler
+
+import queue
+import threading
+import numpy as np
+
+cdef Profiler _prof = get_profiler()
 
 cdef class StkIoBroker:
     def __cinit__(self):
@@ -34,7 +44,8 @@ cdef class StkIoBroker:
         """Create a StkIoBroker instance
 
         Args:
-            comm (Parallel): Communicator instance
+            comm (Parallel): Communicator instance, may be a
+                sub-communicator from :meth:`Parallel.split`
 
         Return:
             StkIoBroker: Newly created instance
@@ -108,25 +119,123 @@ cdef class StkIoBroker:
 
         This method does not commit metadata.
         """
+        cdef double t0 = _prof.tic() if _prof.enabled else -1.0
         deref(self.stkio).create_input_mesh()
+        if t0 >= 0.0:
+            _prof.toc("io.create_input_mesh", t0)
+
+    cdef Region* input_region(self) except NULL:
+        cdef Region* region = deref(self.stkio).get_input_io_region().get()
+        if region == NULL:
+            raise RuntimeError("Input mesh has not been created")
+        return region
+
+    def omit_input_parts(self, include_parts=None, exclude_parts=None):
+        """Omit element blocks and sidesets of the input mesh from loading
+
+        An element block or sideset is loaded only if it appears in
+        ``include_parts`` (when provided) and does not appear in
+        ``exclude_parts``. The omitted parts are still declared in MetaData,
+        but no entities are created for them. This method must be called after
+        :meth:`create_input_mesh` and before :meth:`populate_bulk_data`.
+
+        Args:
+            include_parts (list): Names of blocks and sidesets to load
+            exclude_parts (list): Names of blocks and sidesets to skip
+
+        Return:
+            list: Names of the omitted parts
+        """
+        cdef Region* region = self.input_region()
+        cdef const vector[ElementBlock*]* blocks = &deref(region).get_element_blocks()
+        cdef const vector[SideSet*]* ssets = &deref(region).get_sidesets()
+        cdef vector[GroupingEntity*] entities
+        cdef size_t i
+        for i in range(deref(blocks).size()):
+            entities.push_back(deref(blocks)[i])
+        for i in range(deref(ssets).size()):
+            entities.push_back(deref(ssets)[i])
+
+        included = (None if include_parts is None
+                    else set(p.lower() for p in include_parts))
+        excluded = set(p.lower() for p in (exclude_parts or ()))
+        names = set()
+        omitted = []
+        cdef string oname = b"omitted"
+        for i in range(entities.size()):
+            name = deref(entities[i]).name().decode('UTF-8')
+            names.add(name.lower())
+            if ((included is not None and name.lower() not in included)
+                or name.lower() in excluded):
+                deref(entities[i]).property_add(Property(oname, 1))
+                omitted.append(name)
+        unknown = ((included or set()) | excluded) - names
+        if unknown:
+            raise ValueError("Unknown parts in input mesh: %s"%(
+                ", ".join(sorted(unknown))))
+        return omitted
+
+    def input_field_info(self, str name):
+        """Return the location and size of a field in the input mesh
+
+        Node fields are searched first, followed by element block fields.
+
+        Args:
+            name (str): Name of the field in the input database
+
+        Return:
+            (rank_t, int, list): Entity rank, number of components, and the
+            names of the element blocks (empty for node fields)
+        """
+        cdef Region* region = self.input_region()
+        cdef const vector[NodeBlock*]* nblocks = &deref(region).get_node_blocks()
+        cdef const vector[ElementBlock*]* blocks = &deref(region).get_element_blocks()
+        cdef string fname = name.encode('UTF-8')
+        cdef GroupingEntity* ent
+        cdef size_t i
+        cdef int ncomp = 0
+        for i in range(deref(nblocks).size()):
+            ent = deref(nblocks)[i]
+            if deref(ent).field_exists(fname):
+                ncomp = deref(ent).get_field(fname).raw_storage().component_count()
+                return (rank_t.NODE_RANK, ncomp, [])
+
+        parts = []
+        for i in range(deref(blocks).size()):
+            ent = deref(blocks)[i]
+            if deref(ent).field_exists(fname):
+                ncomp = deref(ent).get_field(fname).raw_storage().component_count()
+                parts.append(deref(ent).name().decode('UTF-8'))
+        if not parts:
+            raise ValueError("Field %s not found in input mesh"%name)
+        return (rank_t.ELEM_RANK, ncomp, parts)
 
     def populate_bulk_data(self):
         """Populate the bulk data for this mesh.
 
         This call is equivalent to calling `populate_mesh` followed by `populate_field_data`
         """
+        cdef double t0 = _prof.tic() if _prof.enabled else -1.0
         deref(self.stkio).populate_bulk_data()
+        if t0 >= 0.0:
+            _prof.toc("io.populate_bulk_data", t0)
 
     def populate_mesh(self):
         """Populate the mesh data but not fields"""
+        cdef double t0 = _prof.tic() if _prof.enabled else -1.0
         deref(self.stkio).populate_mesh()
+        if t0 >= 0.0:
+            _prof.toc("io.populate_mesh", t0)
 
     def populate_field_data(self):
         """Populate field data
 
         This method must be called after ``populate_mesh``
         """
+        cdef double t0 = _prof.tic() if _prof.enabled else -1.0
         deref(self.stkio).populate_field_data()
+        if t0 >= 0.0:
+            _prof.toc("io.populate_field_data", t0)
 
     def add_all_mesh_fields_as_input_fields(self, TimeMatchOption tmo=TimeMatchOption.CLOSEST):
         """Load all existing fields in mesh database as input fields
@@ -152,9 +261,12 @@ cdef class StkIoBroker:
         Return:
             (double, list): Time read from database, list of missing fields
         """
+        cdef double t0 = _prof.tic() if _prof.enabled else -1.0
         cdef vector[MeshField] missing
         cdef double time = deref(self.stkio).read_defined_input_fields_at_step(
             step, &missing)
+        if t0 >= 0.0:
+            _prof.toc("io.read_defined_input_fields", t0)
         cdef size_t num_missing = missing.size()
         cdef list fnames = []
         for i in range(num_missing):
@@ -169,15 +281,132 @@ cdef class StkIoBroker:
         Return:
             (double, list): The actual time for fields, list of missing fields
         """
+        cdef double t0 = _prof.tic() if _prof.enabled else -1.0
         cdef vector[MeshField] missing
         cdef double time1 = deref(self.stkio).read_defined_input_fields(
             time, &missing)
+        if t0 >= 0.0:
+            _prof.toc("io.read_defined_input_fields", t0)
         cdef size_t num_missing = missing.size()
         cdef list fnames = []
         for i in range(num_missing):
             fnames.append(missing[i].field().name())
         return (time1, fnames)
 
+    def _resolve_steps(self, steps):
+        """Convert ``steps`` argument to a list of 1-based database steps"""
+        nsteps = self.num_time_steps
+        all_steps = range(1, nsteps + 1)
+        if steps is None:
+            return list(all_steps)
+        if isinstance(steps, slice):
+            return list(all_steps[steps])
+        steps = [int(s) for s in steps]
+        for s in steps:
+            if s < 1 or s > nsteps:
+                raise ValueError("Invalid step %d; database has %d steps"%(s, nsteps))
+        return steps
+
+    def _read_step(self, int step, list fields):
+        """Read only the given fields at a step of the database"""
+        cdef vector[double] tsteps = deref(self.stkio).get_time_steps()
+        cdef double time = tsteps[step - 1]
+        cdef unique_ptr[MeshField] mfld
+        cdef StkFieldBase fld
+        for fld in fields:
+            mfld.reset(new MeshField(fld.fld))
+            deref(mfld).set_read_time(time)
+            try:
+                with nogil:
+                    deref(self.stkio).read_input_field(deref(mfld))
+            except RuntimeError as err:
+                raise RuntimeError(
+                    "Field %s not found in database at step %d"%(fld.name, step)) from err
+        return time
+
+    def iter_field_steps(self, list fields, steps=None, StkSelector sel=None):
+        """Iterate over the timesteps in the database and yield field data
+
+        For every step, only the requested fields are read from the database
+        and copied into NumPy arrays (see
+        :meth:`~stk.api.mesh.field.StkFieldBase.gather`); the other input
+        fields are left untouched. The same arrays are reused for every step,
+        copy them if the data must be retained. The steps are located by
+        their time, databases with repeated times are not supported.
+
+        .. code-block:: python
+
+           for time, data in stkio.iter_field_steps([pressure], steps=slice(0, None, 10)):
+               pmax = data["pressure"].max()
+
+        Args:
+            fields (list): List of StkFieldBase instances
+            steps: None (all steps), a slice, or a list of 1-based step numbers
+            sel (StkSelector): Selector (default: entities where each field is defined)
+
+        Yields:
+            (double, dict): Time and a dictionary of arrays keyed by field name
+        """
+        cdef StkFieldBase fld
+        cdef list step_list = self._resolve_steps(steps)
+        cdef dict bufs = None
+        for step in step_list:
+            time = self._read_step(step, fields)
+            if bufs is None:
+                bufs = {fld.name: fld.gather(sel) for fld in fields}
+            else:
+                for fld in fields:
+                    fld.gather(sel, out=bufs[fld.name])
+            yield (time, bufs)
+
+    def read_field_history(self, StkFieldBase field, StkSelector sel=None,
+                           steps=None, out=None, str filename=None):
+        """Read the history of a field over several timesteps into one array
+
+        The result has shape ``(nsteps, n_entities, ncomp)``, or ``(nsteps,
+        n_entities)`` for scalar fields, with the entities ordered as in
+        :meth:`~stk.api.mesh.field.StkFieldBase.gather`. If ``filename`` is
+        provided, the array is a memory-mapped ``.npy`` file so that histories
+        larger than the available memory can be extracted.
+
+        Only ``field`` is read from the database at every step, the other
+        input fields are not modified.
+
+        Args:
+            field (StkFieldBase): Field to read
+            sel (StkSelector): Selector (default: entities where the field is defined)
+            steps: None (all steps), a slice, or a list of 1-based step numbers
+            out (np.ndarray): Optional C-contiguous array of the field dtype to fill
+            filename (str): Optional path of a ``.npy`` file to back the array
+
+        Return:
+            (np.ndarray, np.ndarray): Array of times and the field history
+        """
+        cdef list step_list = self._resolve_steps(steps)
+        cdef size_t nsteps = len(step_list)
+        cdef size_t i
+        times = np.empty((nsteps,), dtype=np.float64)
+        shape = None
+        for i in range(nsteps):
+            times[i] = self._read_step(step_list[i], [field])
+            if i == 0:
+                buf = field.gather(sel)
+                shape = (nsteps,) + buf.shape
+                if out is None and filename is not None:
+                    out = np.lib.format.open_memmap(
+                        filename, mode="w+", dtype=field.dtype, shape=shape)
+                elif out is None:
+                    out = np.empty(shape, dtype=field.dtype)
+                assert out.shape == shape, "Size mismatch in output array"
+                out[0] = buf
+            else:
+                field.gather(sel, out=out[i])
+        if out is None:
+            out = np.empty((0,), dtype=field.dtype)
+        elif isinstance(out, np.memmap):
+            out.flush()
+        return (times, out)
+
     def create_output_mesh(self, str filename,
                            DatabasePurpose purpose=DatabasePurpose.WRITE_RESULTS):
         """Create an Exodus database for writing results
@@ -198,7 +427,10 @@ cdef class StkIoBroker:
         Args:
             fidx (size_t): File handle to output
         """
+        cdef double t0 = _prof.tic() if _prof.enabled else -1.0
         deref(self.stkio).write_output_mesh(fidx)
+        if t0 >= 0.0:
+            _prof.toc("io.write_output_mesh", t0)
 
     def add_field(self, size_t fidx, StkFieldBase field, str db_field_name=None):
         """Register a field for output to a given database.
@@ -249,7 +481,11 @@ cdef class StkIoBroker:
             int: Current output time step
 
         """
-        return deref(self.stkio).write_defined_output_fields(fidx)
+        cdef double t0 = _prof.tic() if _prof.enabled else -1.0
+        cdef int step = deref(self.stkio).write_defined_output_fields(fidx)
+        if t0 >= 0.0:
+            _prof.toc("io.write_defined_output_fields", t0)
+        return step
 
     def write_global(self, size_t file_index, str name, cython.numeric data):
         """Write a global parameter
@@ -291,7 +527,10 @@ cdef class StkIoBroker:
 
     def flush_output(self):
         """Flush output to disk"""
+        cdef double t0 = _prof.tic() if _prof.enabled else -1.0
         deref(self.stkio).flush_output()
+        if t0 >= 0.0:
+            _prof.toc("io.flush_output", t0)
 
     def process_output_request(self, size_t file_index, double time):
         """Process output request to the database
@@ -306,4 +545,227 @@ cdef class StkIoBroker:
             file_index (size_t): Open file handle
             time (double): Time to write
         """
-        deref(self.stkio).process_output_request(file_index, time)
+        cdef double t0 = _prof.tic() if _prof.enabled else -1.0
+        with nogil:
+            deref(self.stkio).process_output_request(file_index, time)
+        if t0 >= 0.0:
+            _prof.toc("io.process_output_request", t0)
+
+
+cdef class AsyncOutputWriter:
+    """Write results to an Exodus database on a background thread
+
+    Writing the output fields directly blocks the simulation until the
+    database has been written to disk. This class instead copies the output
+    fields into host buffers on :meth:`submit` and writes them from a
+    background thread with the GIL released. The writer thread writes from
+    *shadow* fields that are declared on the same entities as the output
+    fields, so that the simulation can continue modifying the original fields
+    while the output is in progress.
+
+    Since the shadow fields must be declared before the MetaData is committed,
+    the writer is created before ``populate_bulk_data`` and opened after it.
+
+    .. code-block:: python
+
+       writer = AsyncOutputWriter(mesh.stkio, mesh.meta, [pressure, velocity])
+       mesh.populate_bulk_data()
+       writer.open("results.exo")
+       for step in range(nsteps):
+           ...
+           writer.submit(time)
+       writer.close()
+
+    At most ``queue_depth`` snapshots are pending at any time; :meth:`submit`
+    blocks until a buffer is available. The mesh must not be modified while
+    writes are pending, call :meth:`wait_all` first. If the MPI library does
+    not provide ``MPI_THREAD_MULTIPLE``, the output is written synchronously
+    within :meth:`submit`, also in serial runs, since Ioss issues MPI calls.
+    Unlike the ``begin_*`` communication in :mod:`~stk.api.mesh.field_ops`,
+    ``MPI_THREAD_SERIALIZED`` is not sufficient: the simulation keeps making
+    MPI calls on the main thread while the writer thread is active.
+    """
+
+    cdef readonly StkIoBroker stkio
+    cdef readonly list fields
+    cdef readonly list shadow_fields
+    cdef readonly int queue_depth
+    cdef readonly object file_index
+    cdef readonly bint is_async
+    cdef list selectors
+    cdef object free_bufs
+    cdef object pending
+    cdef object thread
+    cdef object error
+
+    def __init__(self, StkIoBroker stkio, StkMetaData meta, list fields,
+                 int queue_depth=2, str suffix="_async_out"):
+        """
+        Args:
+            stkio (StkIoBroker): I/O broker used to write the database
+            meta (StkMetaData): MetaData instance (must not be committed)
+            fields (list): List of StkFieldBase instances to output
+            queue_depth (int): Maximum number of pending output steps
+            suffix (str): Suffix used to name the shadow fields
+        """
+        cdef StkFieldBase fld
+        assert not meta.is_committed, \
+            "AsyncOutputWriter must be created before MetaData is committed"
+        assert queue_depth > 0, "Queue depth must be positive"
+        self.stkio = stkio
+        self.fields = list(fields)
+        self.queue_depth = queue_depth
+        self.file_index = None
+        self.is_async = False
+        self.shadow_fields = []
+        self.selectors = []
+        for fld in self.fields:
+            sel = StkSelector.select_field(fld)
+            ncomp = fld.max_size
+            name = fld.name + suffix
+            if fld.field_array_rank == 0:
+                shadow = meta.declare_scalar_field(
+                    name, fld.entity_rank, dtype=fld.dtype)
+            else:
+                shadow = meta.declare_vector_field(
+                    name, fld.entity_rank, dtype=fld.dtype)
+            shadow.add_to_selected(sel, ncomp)
+            self.shadow_fields.append(shadow)
+            self.selectors.append(sel)
+
+    def open(self, str filename,
+             DatabasePurpose purpose=DatabasePurpose.WRITE_RESULTS):
+        """Create the output database and start the writer thread
+
+        The shadow fields are registered using the names of the original
+        fields, so the database is identical to one written directly.
+
+        Args:
+            filename (str): Name of the Exodus-II output database
+            purpose (DatabasePurpose): ``WRITE_RESULTS``, ``WRITE_RESTART``
+
+        Return:
+            size_t: File handle for the newly created output database
+        """
+        cdef StkFieldBase fld
+        assert self.file_index is None, "Output database is already open"
+        fidx = self.stkio.create_output_mesh(filename, purpose)
+        for fld, shadow in zip(self.fields, self.shadow_fields):
+            self.stkio.add_field(fidx, shadow, fld.name)
+        self.stkio.write_output_mesh(fidx)
+        self.file_index = fidx
+
+        self.is_async = mpi_thread_level() >= MPI_THREAD_MULTIPLE
+        self.free_bufs = queue.Queue()
+        for i in range(self.queue_depth):
+            self.free_bufs.put(None)
+        self.error = None
+        if self.is_async:
+            self.pending = queue.Queue()
+            self.thread = threading.Thread(
+                target=self._writer_loop, name="stk-async-output", daemon=True)
+            self.thread.start()
+        return fidx
+
+    def _snapshot(self, bufs):
+        """Copy the output fields into host buffers"""
+        cdef StkFieldBase fld
+        if bufs is None:
+            return [fld.gather(sel)
+                    for fld, sel in zip(self.fields, self.selectors)]
+        for fld, sel, buf in zip(self.fields, self.selectors, bufs):
+            fld.gather(sel, out=buf)
+        return bufs
+
+    def _write(self, double time, list bufs):
+        """Copy the buffers into shadow fields and write the output step"""
+        cdef StkFieldBase shadow
+        cdef size_t fidx = self.file_index
+        cdef double t0 = _prof.tic() if _prof.enabled else -1.0
+        for shadow, sel, buf in zip(self.shadow_fields, self.selectors, bufs):
+            shadow.scatter(buf, sel)
+        with nogil:
+            deref(self.stkio.stkio).process_output_request(fidx, time)
+        if t0 >= 0.0:
+            _prof.toc("io.async_write", t0)
+
+    def _writer_loop(self):
+        while True:
+            item = self.pending.get()
+            if item is None:
+                self.pending.task_done()
+                break
+            time, bufs = item
+            try:
+                if self.error is None:
+                    self._write(time, bufs)
+            except BaseException as err:
+                self.error = err
+            finally:
+                self.free_bufs.put(bufs)
+                self.pending.task_done()
+
+    def _check_error(self):
+        if self.error is not None:
+            err = self.error
+            self.error = None
+            raise RuntimeError("Asynchronous output failed") from err
+
+    def submit(self, double time):
+        """Snapshot the output fields and queue them for writing
+
+        Blocks if ``queue_depth`` output steps are already pending.
+
+        Args:
+            time (double): Time for this output step
+        """
+        assert self.file_index is not None, "Output database has not been opened"
+        self._check_error()
+        bufs = self._snapshot(self.free_bufs.get())
+        if self.is_async:
+            self.pending.put((time, bufs))
+        else:
+            try:
+                self._write(time, bufs)
+            finally:
+                self.free_bufs.put(bufs)
+
+    @property
+    def num_pending(self):
+        """Number of output steps that have not been written yet"""
+        if self.file_index is None or not self.is_async:
+            return 0
+        return self.pending.unfinished_tasks
+
+    def wait_all(self):
+        """Block until all pending output steps have been written"""
+        if self.file_index is not None and self.is_async:
+            self.pending.join()
+        self._check_error()
+
+    def flush(self):
+        """Write all pending output steps and flush the database to disk"""
+        self.wait_all()
+        if self.file_index is not None:
+            with nogil:
+                deref(self.stkio.stkio).flush_output()
+
+    def close(self):
+        """Write all pending output steps and stop the writer thread"""
+        if self.file_index is None:
+            return
+        try:
+            self.flush()
+        finally:
+            # Stop the writer thread even if a pending step failed
+            if self.is_async:
+                self.pending.put(None)
+                self.thread.join()
+                self.thread = None
+            self.file_index = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -8,6 +8,7 @@ stk_mesh python bindings
 from .bucket import StkBucket
 from .bulk import StkBulkData
 from .entity import StkEntity
+from .ghosting import StkGhosting
 from .meta import StkMetaData
 from .part import StkPart
 from .selector import StkSelector
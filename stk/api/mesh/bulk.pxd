@@ -4,9 +4,17 @@
 
 from libcpp cimport bool
 from libcpp.string cimport string
+from libcpp.vector cimport vector
+cimport numpy as np
 from ..util.parallel cimport ParallelMachine
 from .stk_mesh_fwd cimport *
 from .bucket cimport Bucket
+from .selector cimport Selector
+from .meta cimport StkMetaData
+
+cdef extern from "stk_mesh/base/EntitySorterBase.hpp" namespace "stk::mesh" nogil:
+    cdef cppclass EntitySorterBase:
+        pass
 
 cdef extern from "stk_mesh/base/BulkData.hpp" namespace "stk::mesh" nogil:
     cdef cppclass BulkData:
@@ -25,8 +33,8 @@ cdef extern from "stk_mesh/base/BulkData.hpp" namespace "stk::mesh" nogil:
 
         bool modification_begin()
         bool modification_end()
-        # void sort_entities(const stk::mesh::EntitySorterBase&)
-        # void change_entity_owner(const EntityProcVec&)
+        void sort_entities(const EntitySorterBase& sorter) except +
+        void change_entity_owner(const EntityProcVec& procs) except +
         void update_field_data_states()
         void update_field_data_states(FieldBase* field)
 
@@ -37,7 +45,16 @@ cdef extern from "stk_mesh/base/BulkData.hpp" namespace "stk::mesh" nogil:
         Entity get_entity(EntityRank rank, EntityId entity_id) const
         Entity get_entity(const EntityKey key) const
 
+        Entity declare_node(EntityId id) except +
+        Entity declare_node(EntityId id, const PartVector& parts) except +
+        Entity declare_element(EntityId id, const PartVector& parts) except +
+        Entity declare_element_side(Entity elem, unsigned side_ordinal,
+                                    const PartVector& parts) except +
+        void declare_relation(Entity e_from, Entity e_to, unsigned local_id) except +
+        void change_entity_parts(Entity entity, const PartVector& add_parts) except +
+
         void add_node_sharing(Entity node, int sharing_proc)
+        void comm_shared_procs(Entity entity, vector[int]& procs) const
 
         const MeshIndex& mesh_index(Entity entity) const
         EntityId identifier(Entity entity) const
@@ -54,12 +71,14 @@ cdef extern from "stk_mesh/base/BulkData.hpp" namespace "stk::mesh" nogil:
         const Entity* begin_edges(Entity entity) const
         const Entity* begin_faces(Entity entity) const
         const Entity* begin_elements(Entity entity) const
+        const ConnectivityOrdinal* begin_ordinals(Entity entity, EntityRank rank) const
 
         unsigned num_nodes(Entity entity) const
         unsigned num_edges(Entity entity) const
         unsigned num_faces(Entity entity) const
         unsigned num_elements(Entity entity) const
         unsigned num_sides(Entity entity) const
+        unsigned num_connectivity(Entity entity, EntityRank rank) const
 
         size_t get_size_of_entity_index_space() const
 
@@ -67,17 +86,39 @@ cdef extern from "stk_mesh/base/BulkData.hpp" namespace "stk::mesh" nogil:
         Ghosting& aura_ghosting() const
         Ghosting& shared_ghosting() const
         Ghosting& create_ghosting(const string& name)
-        void change_ghosting(Ghosting& ghosts, const EntityProcVec& add_send)
+        void change_ghosting(Ghosting& ghosts, const EntityProcVec& add_send) except +
         void change_ghosting(
             Ghosting& ghosts, const EntityProcVec& add_send,
-            vector[EntityKey]& remove_receive)
-        void destroy_ghosting(Ghosting& ghost_layer)
+            vector[EntityKey]& remove_receive) except +
+        void destroy_ghosting(Ghosting& ghost_layer) except +
         void destroy_all_ghosting()
         const vector[Ghosting*]& ghostings() const
 
+cdef size_t count_entities(const BucketVector& bkts) nogil
+cdef np.ndarray curve_keys(points, bint hilbert, lo=*, hi=*)
+
+cdef class MeshCache:
+    cdef BulkData* bulk
+    cdef readonly size_t hits
+    cdef readonly size_t misses
+    cdef readonly size_t evictions
+    cdef public bint enabled
+    cdef public size_t max_bucket_lists
+    cdef public size_t max_views
+    cdef object epoch
+    cdef list bucket_lists
+    cdef object views
+
+    cdef bint validate(self) except -1
+    cdef object bucket_list(self, const Selector& sel, EntityRank rank)
+    cdef object field_view(self, FieldBase* fld, Bucket* bkt)
+
+cdef MeshCache mesh_cache(BulkData* bulk)
+
 cdef class StkBulkData:
     cdef BulkData* bulk
     cdef bint bulk_owner
+    cdef StkMetaData owner_meta
 
     @staticmethod
     cdef wrap_instance(BulkData* in_bulk, bint owner=*)
@@ -3,14 +3,607 @@
 # cython: embedsignature = True
 
 from cython.operator cimport dereference as deref
+from libc.stdint cimport int64_t, uint64_t
 from libcpp cimport bool
-from ..util.parallel cimport Parallel
-from ..topology.topology cimport rank_t
-from .entity cimport StkEntity
-from .selector cimport StkSelector
+from libcpp.string cimport string
+from libcpp.vector cimport vector
+from libcpp.pair cimport pair
+from libcpp.algorithm cimport sort
+from ..util.parallel cimport Parallel, all_reduce_max
+from ..topology.topology cimport rank_t, topology_t, topology as topo_cls
+from .entity cimport StkEntity, Entity as EntityT
+from .selector cimport StkSelector, Selector
 from .bucket cimport StkBucket
 from .part cimport StkPart
+from .ghosting cimport StkGhosting, Ghosting as GhostingT
 from .meta cimport StkMetaData
+from .field cimport StkFieldBase, FieldBase, field_data, field_scalars_per_entity
+from .field cimport field_array, field_type_num, StateNP1
+from ..util.profiling cimport Profiler, get_profiler
+from . cimport stk_mesh_fwd as fwd
+
+cimport numpy as np
+import numpy as np
+import os
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+np.import_array()
+
+cdef Profiler _prof = get_profiler()
+
+cdef extern from "entity_sorter.hpp" namespace "pystk" nogil:
+    cdef cppclass EntityKeySorter(EntitySorterBase):
+        EntityKeySorter(const int64_t* keys)
+
+ctypedef void (*bucket_kernel_t)(size_t num_entities, double** field_data,
+                                 const int* num_components, void* user_data) nogil
+
+cdef dict _thread_pools = {}
+
+# Number of field state rotations for every BulkData instance (by address)
+cdef dict _state_epochs = {}
+
+# Bucket list and field view caches for every BulkData instance (by address)
+cdef dict _mesh_caches = {}
+
+cdef object thread_pool(int nthreads):
+    """Return a cached thread pool with the requested number of threads"""
+    pool = _thread_pools.get(nthreads, None)
+    if pool is None:
+        pool = ThreadPoolExecutor(max_workers=nthreads)
+        _thread_pools[nthreads] = pool
+    return pool
+
+cdef size_t kernel_address(kernel) except 0:
+    """Address of a compiled kernel
+
+    Accepts an integer address, an object with an ``address`` attribute (e.g.,
+    a Numba ``cfunc``), or a ctypes function pointer.
+    """
+    cdef size_t addr = 0
+    if isinstance(kernel, int):
+        addr = kernel
+    elif hasattr(kernel, "address"):
+        addr = kernel.address
+    else:
+        import ctypes
+        addr = ctypes.cast(kernel, ctypes.c_void_p).value or 0
+    if addr == 0:
+        raise ValueError("Invalid kernel: %s"%kernel)
+    return addr
+
+def _run_bucket_kernel(size_t kaddr, size_t[:, ::1] ptrs, int[:, ::1] comps,
+                       size_t[::1] sizes, Py_ssize_t[::1] bkt_ids, size_t user_data):
+    """Execute a compiled kernel on a subset of buckets without the GIL"""
+    cdef bucket_kernel_t kernel = <bucket_kernel_t>kaddr
+    cdef size_t i, ib
+    with nogil:
+        for i in range(bkt_ids.shape[0]):
+            ib = bkt_ids[i]
+            kernel(sizes[ib], <double**>&ptrs[ib, 0], &comps[ib, 0],
+                   <void*>user_data)
+
+cdef inline void copy_relations(const BulkData* bulk, Entity ent, EntityRank rank,
+                                unsigned nconn, bint use_ids, int64_t* out) nogil:
+    """Copy the connected entities (local offsets or identifiers) to output"""
+    cdef const Entity* conn = deref(bulk).begin(ent, rank)
+    cdef unsigned k
+    if use_ids:
+        for k in range(nconn):
+            out[k] = deref(bulk).identifier(conn[k])
+    else:
+        for k in range(nconn):
+            out[k] = (<const EntityT*>conn)[k].local_offset()
+
+cdef size_t fill_connectivity(const BulkData* bulk, const BucketVector& bkts,
+                              int topo, EntityRank rank, unsigned nconn,
+                              bint use_ids, int64_t* out) nogil:
+    """Fill dense connectivity for all buckets of a given topology
+
+    Returns the number of entities processed or ``-1`` if an entity does not
+    have exactly ``nconn`` connected entities of the requested rank.
+    """
+    cdef size_t nbkts = bkts.size()
+    cdef size_t count = 0
+    cdef size_t i, j, bsize
+    cdef Bucket* bkt
+    cdef Entity ent
+    for i in range(nbkts):
+        bkt = <Bucket*>bkts[i]
+        if deref(bkt).topology().value() != topo:
+            continue
+        bsize = deref(bkt).size()
+        for j in range(bsize):
+            ent = deref(bkt)[j]
+            if deref(bulk).num_connectivity(ent, rank) != nconn:
+                return <size_t>-1
+            copy_relations(bulk, ent, rank, nconn, use_ids, out + count * nconn)
+            count += 1
+    return count
+
+cdef struct EntityRecord:
+    int64_t identifier
+    int64_t local_offset
+    int owner_rank
+    unsigned bucket_id
+    unsigned bucket_ordinal
+
+#: NumPy dtype matching the records returned by :meth:`StkBulkData.entity_table`
+entity_record_dtype = np.dtype([
+    ("identifier", np.int64),
+    ("local_offset", np.int64),
+    ("owner_rank", np.intc),
+    ("bucket_id", np.uintc),
+    ("bucket_ordinal", np.uintc)], align=True)
+
+cdef size_t count_entities(const BucketVector& bkts) nogil:
+    """Total number of entities in a list of buckets"""
+    cdef size_t nbkts = bkts.size()
+    cdef size_t count = 0
+    cdef size_t i
+    for i in range(nbkts):
+        count += deref(<Bucket*>bkts[i]).size()
+    return count
+
+cdef void fill_entity_records(const BulkData* bulk, const BucketVector& bkts,
+                              EntityRecord* out) nogil:
+    """Fill entity attributes for all entities in the buckets"""
+    cdef size_t nbkts = bkts.size()
+    cdef size_t count = 0
+    cdef size_t i, j, bsize
+    cdef Bucket* bkt
+    cdef Entity ent
+    for i in range(nbkts):
+        bkt = <Bucket*>bkts[i]
+        bsize = deref(bkt).size()
+        for j in range(bsize):
+            ent = deref(bkt)[j]
+            out[count].identifier = deref(bulk).identifier(ent)
+            out[count].local_offset = (<EntityT*>&ent).local_offset()
+            out[count].owner_rank = deref(bulk).parallel_owner_rank(ent)
+            out[count].bucket_id = deref(bkt).bucket_id()
+            out[count].bucket_ordinal = j
+            count += 1
+
+cdef void parts_to_vector(parts, PartVector& pvec) except *:
+    """Convert None, a StkPart, or a list of StkPart instances to a PartVector"""
+    cdef StkPart part
+    if parts is None:
+        return
+    if isinstance(parts, StkPart):
+        parts = [parts]
+    for part in parts:
+        pvec.push_back(<Part*>part.part)
+
+cdef inline bint is_valid_entity(Entity ent) nogil:
+    """Check if the entity handle refers to an entity on this rank"""
+    return (<EntityT*>&ent).local_offset() != 0
+
+cdef void selection_map(const BulkData* bulk, const BucketVector& bkts,
+                        int64_t* colmap) nogil:
+    """Map the local offsets of the entities in the buckets to their positions"""
+    cdef size_t count = 0
+    cdef size_t i, j, bsize
+    cdef Bucket* bkt
+    cdef Entity ent
+    for i in range(bkts.size()):
+        bkt = <Bucket*>bkts[i]
+        bsize = deref(bkt).size()
+        for j in range(bsize):
+            ent = deref(bkt)[j]
+            colmap[(<EntityT*>&ent).local_offset()] = count
+            count += 1
+
+cdef void build_adjacency(const BulkData* bulk, const BucketVector& bkts,
+                          EntityRank via_rank, EntityRank to_rank, bint direct,
+                          int min_shared, const int64_t* colmap, bint compact,
+                          int64_t* stamp, int* counts,
+                          vector[int64_t]& offsets, vector[int64_t]& indices) nogil:
+    """Adjacency of the entities in the buckets through ``via_rank`` entities
+
+    If ``direct`` is True, the ``via_rank`` entities are the adjacent entities
+    (e.g., node to element). Otherwise, the adjacent entities are the
+    ``to_rank`` entities connected to the ``via_rank`` entities (e.g., nodes
+    of the edges of a node) and must be reached at least ``min_shared`` times.
+    Only entities with ``colmap >= 0`` are included.
+    """
+    cdef vector[int64_t] touched
+    cdef const Entity* vias
+    cdef const Entity* targets
+    cdef Bucket* bkt
+    cdef Entity ent
+    cdef Entity tgt
+    cdef int64_t row = 0
+    cdef int64_t off, self_off
+    cdef size_t i, j, bsize, start, t
+    cdef unsigned nvia, ntgt, v, k
+    offsets.push_back(0)
+    for i in range(bkts.size()):
+        bkt = <Bucket*>bkts[i]
+        bsize = deref(bkt).size()
+        for j in range(bsize):
+            ent = deref(bkt)[j]
+            self_off = (<EntityT*>&ent).local_offset()
+            touched.clear()
+            nvia = deref(bulk).num_connectivity(ent, via_rank)
+            vias = deref(bulk).begin(ent, via_rank)
+            for v in range(nvia):
+                if direct:
+                    ntgt = 1
+                    targets = &vias[v]
+                else:
+                    ntgt = deref(bulk).num_connectivity(vias[v], to_rank)
+                    targets = deref(bulk).begin(vias[v], to_rank)
+                for k in range(ntgt):
+                    tgt = targets[k]
+                    off = (<EntityT*>&tgt).local_offset()
+                    if off == self_off or colmap[off] < 0:
+                        continue
+                    if stamp[off] != row:
+                        stamp[off] = row
+                        counts[off] = 0
+                        touched.push_back(off)
+                    counts[off] += 1
+            start = indices.size()
+            for t in range(touched.size()):
+                off = touched[t]
+                if counts[off] >= min_shared:
+                    indices.push_back(colmap[off] if compact else off)
+            if indices.size() > start:
+                sort(indices.data() + start, indices.data() + indices.size())
+            offsets.push_back(indices.size())
+            row += 1
+
+cdef inline uint64_t interleave_bits(const uint64_t* x, int ndim, int bits) nogil:
+    """Interleave the lowest ``bits`` bits of the coordinates, most significant first"""
+    cdef uint64_t key = 0
+    cdef int b, i
+    for b in range(bits - 1, -1, -1):
+        for i in range(ndim):
+            key = (key << 1) | ((x[i] >> b) & 1)
+    return key
+
+cdef uint64_t hilbert_key(uint64_t* x, int ndim, int bits) nogil:
+    """Distance along the Hilbert curve of a point with integer coordinates
+
+    Uses the transpose algorithm of Skilling (AIP Conf. Proc. 707, 2004). The
+    coordinates in ``x`` are overwritten.
+    """
+    cdef uint64_t M = (<uint64_t>1) << (bits - 1)
+    cdef uint64_t P, Q, t
+    cdef int i
+    Q = M
+    while Q > 1:
+        P = Q - 1
+        for i in range(ndim):
+            if x[i] & Q:
+                x[0] ^= P
+            else:
+                t = (x[0] ^ x[i]) & P
+                x[0] ^= t
+                x[i] ^= t
+        Q >>= 1
+    for i in range(1, ndim):
+        x[i] ^= x[i - 1]
+    t = 0
+    Q = M
+    while Q > 1:
+        if x[ndim - 1] & Q:
+            t ^= Q - 1
+        Q >>= 1
+    for i in range(ndim):
+        x[i] ^= t
+    return interleave_bits(x, ndim, bits)
+
+cdef np.ndarray curve_keys(points, bint hilbert, lo=None, hi=None):
+    """Hilbert or Morton keys of points scaled to a bounding box
+
+    The bounding box defaults to the bounding box of the points.
+    """
+    cdef np.ndarray pts = np.ascontiguousarray(points, dtype=np.float64)
+    cdef int64_t npts = pts.shape[0]
+    cdef int ndim = pts.shape[1]
+    cdef int bits = 63 // ndim
+    keys = np.empty((npts,), dtype=np.int64)
+    if npts == 0:
+        return keys
+    lo = pts.min(axis=0) if lo is None else np.asarray(lo, dtype=np.float64)
+    hi = pts.max(axis=0) if hi is None else np.asarray(hi, dtype=np.float64)
+    cdef uint64_t gmax = (<uint64_t>1 << bits) - 1
+    scale = <double>gmax / np.maximum(hi - lo, 1.0e-300)
+    cdef np.ndarray grid = np.clip((pts - lo) * scale, 0.0, <double>gmax).astype(np.uint64)
+    # Rounding of gmax to double may exceed the number of bits
+    np.minimum(grid, np.uint64(gmax), out=grid)
+    cdef uint64_t* gptr = <uint64_t*>np.PyArray_DATA(grid)
+    cdef int64_t* kptr = <int64_t*>np.PyArray_DATA(keys)
+    cdef int64_t i
+    with nogil:
+        for i in range(npts):
+            if hilbert:
+                kptr[i] = <int64_t>hilbert_key(gptr + i * ndim, ndim, bits)
+            else:
+                kptr[i] = <int64_t>interleave_bits(gptr + i * ndim, ndim, bits)
+    return keys
+
+cdef int64_t bfs_levels(int64_t start, const int64_t* indptr, const int64_t* indices,
+                        int64_t* mark, int64_t stamp, vector[int64_t]& queue,
+                        int64_t* last) nogil:
+    """Breadth-first search returning the number of levels from ``start``
+
+    A node of minimum degree in the last level is returned in ``last``.
+    """
+    cdef size_t head = 0
+    cdef size_t level_end
+    cdef int64_t nlevels = 0
+    cdef int64_t v, w, k, best
+    queue.clear()
+    queue.push_back(start)
+    mark[start] = stamp
+    while head < queue.size():
+        level_end = queue.size()
+        best = -1
+        while head < level_end:
+            v = queue[head]
+            head += 1
+            if best < 0 or (indptr[v + 1] - indptr[v]) < (indptr[best + 1] - indptr[best]):
+                best = v
+            for k in range(indptr[v], indptr[v + 1]):
+                w = indices[k]
+                if mark[w] != stamp:
+                    mark[w] = stamp
+                    queue.push_back(w)
+        nlevels += 1
+        last[0] = best
+    return nlevels
+
+cdef void rcm_order(int64_t n, const int64_t* indptr, const int64_t* indices,
+                    const int64_t* by_degree, int64_t* order) nogil:
+    """Reverse Cuthill-McKee ordering of a symmetric graph
+
+    Every connected component starts from a pseudo-peripheral node found with
+    the George-Liu heuristic.
+    """
+    cdef vector[int64_t] mark = vector[int64_t](n, -1)
+    cdef vector[char] visited = vector[char](n, 0)
+    cdef vector[int64_t] queue
+    cdef vector[pair[int64_t, int64_t]] nbrs
+    cdef int64_t count = 0
+    cdef int64_t stamp = 0
+    cdef int64_t s, root, cand, nxt, ecc, necc, head, v, w, k, tmp
+    cdef size_t p
+    cdef int it
+    for s in range(n):
+        root = by_degree[s]
+        if visited[root]:
+            continue
+        ecc = bfs_levels(root, indptr, indices, mark.data(), stamp, queue, &cand)
+        stamp += 1
+        for it in range(16):
+            necc = bfs_levels(cand, indptr, indices, mark.data(), stamp, queue, &nxt)
+            stamp += 1
+            if necc <= ecc:
+                break
+            root = cand
+            ecc = necc
+            cand = nxt
+
+        head = count
+        order[count] = root
+        visited[root] = 1
+        count += 1
+        while head < count:
+            v = order[head]
+            head += 1
+            nbrs.clear()
+            for k in range(indptr[v], indptr[v + 1]):
+                w = indices[k]
+                if not visited[w]:
+                    visited[w] = 1
+                    nbrs.push_back(pair[int64_t, int64_t](indptr[w + 1] - indptr[w], w))
+            sort(nbrs.begin(), nbrs.end())
+            for p in range(nbrs.size()):
+                order[count] = nbrs[p].second
+                count += 1
+
+    for s in range(n // 2):
+        tmp = order[s]
+        order[s] = order[n - 1 - s]
+        order[n - 1 - s] = tmp
+
+cdef class BucketList:
+    """Buckets of a selector and entity rank, cached by :class:`MeshCache`
+
+    ``offsets[i]`` is the position of the first entity of ``buckets[i]`` in
+    :meth:`StkBulkData.iter_entities` order, and ``sizes[i]`` its number of
+    entities.
+    """
+
+    cdef Selector sel
+    cdef EntityRank rank
+    cdef readonly tuple buckets
+    cdef readonly np.ndarray offsets
+    cdef readonly np.ndarray sizes
+
+    @property
+    def num_entities(self):
+        """Total number of entities in the buckets"""
+        return int(self.offsets[-1] + self.sizes[-1]) if len(self.buckets) else 0
+
+cdef class MeshCache:
+    """Cache of bucket lists and field data views of a mesh
+
+    Bucket lists are cached per (selector, rank) and NumPy views of the field
+    data per (field, bucket). Both are discarded when the mesh changes, i.e.,
+    when :attr:`StkBulkData.field_data_epoch` changes after a modification
+    cycle, a field state rotation, or reordering the entities. Nothing is
+    cached while the mesh is in a modification cycle. The least recently used
+    entries are evicted beyond ``max_bucket_lists`` bucket lists or
+    ``max_views`` views.
+
+    .. code-block:: python
+
+       cache = bulk.cache
+       for bkt in bulk.iter_buckets(sel, StkRank.NODE_RANK):
+           vel = velocity.bkt_view(bkt)
+       print(cache.hits, cache.misses)
+    """
+
+    def __cinit__(self):
+        self.bulk = NULL
+        self.enabled = True
+        self.max_bucket_lists = 64
+        self.max_views = 65536
+        self.epoch = None
+        self.bucket_lists = []
+        self.views = OrderedDict()
+
+    cdef bint validate(self) except -1:
+        """Discard stale entries and check if the cache can be used"""
+        if not self.enabled or deref(self.bulk).in_modifiable_state():
+            return False
+        epoch = (deref(self.bulk).synchronized_count(),
+                 _state_epochs.get(<size_t>self.bulk, 0))
+        if epoch != self.epoch:
+            self.bucket_lists = []
+            self.views.clear()
+            self.epoch = epoch
+        return True
+
+    cdef object bucket_list(self, const Selector& sel, EntityRank rank):
+        """Cached bucket list for a selector and entity rank"""
+        cdef bint use_cache = self.validate()
+        cdef BucketList entry
+        cdef Py_ssize_t i, nlists = len(self.bucket_lists)
+        if use_cache:
+            for i in range(nlists - 1, -1, -1):
+                entry = self.bucket_lists[i]
+                if entry.rank == rank and entry.sel == sel:
+                    self.hits += 1
+                    if i != nlists - 1:
+                        del self.bucket_lists[i]
+                        self.bucket_lists.append(entry)
+                    return entry
+            self.misses += 1
+
+        cdef const BucketVector* bkts = &deref(self.bulk).get_buckets(rank, sel)
+        cdef size_t nbkts = deref(bkts).size()
+        cdef size_t j
+        cdef int64_t count = 0
+        entry = BucketList.__new__(BucketList)
+        entry.sel = sel
+        entry.rank = rank
+        entry.offsets = np.empty((nbkts,), dtype=np.int64)
+        entry.sizes = np.empty((nbkts,), dtype=np.int64)
+        cdef int64_t[::1] optr = entry.offsets
+        cdef int64_t[::1] sptr = entry.sizes
+        buckets = []
+        for j in range(nbkts):
+            buckets.append(StkBucket.wrap_instance(<Bucket*>deref(bkts)[j]))
+            optr[j] = count
+            sptr[j] = deref(<Bucket*>deref(bkts)[j]).size()
+            count += sptr[j]
+        entry.buckets = tuple(buckets)
+
+        if use_cache:
+            self.bucket_lists.append(entry)
+            while len(self.bucket_lists) > self.max_bucket_lists:
+                del self.bucket_lists[0]
+                self.evictions += 1
+        return entry
+
+    cdef object field_view(self, FieldBase* fld, Bucket* bkt):
+        """Cached NumPy view of the field data of a bucket"""
+        cdef bint use_cache = self.validate()
+        key = (deref(fld).mesh_meta_data_ordinal(), deref(bkt).entity_rank(),
+               deref(bkt).bucket_id())
+        if use_cache:
+            view = self.views.get(key, None)
+            if view is not None:
+                self.hits += 1
+                self.views.move_to_end(key)
+                return view
+            self.misses += 1
+
+        cdef void* ptr = field_data(deref(fld), deref(<fwd.Bucket*>bkt))
+        cdef unsigned ncomp = field_scalars_per_entity(deref(fld), deref(<fwd.Bucket*>bkt))
+        view = field_array(deref(fld), ptr, deref(bkt).size(), ncomp, True)
+
+        if use_cache:
+            self.views[key] = view
+            while len(self.views) > self.max_views:
+                self.views.popitem(last=False)
+                self.evictions += 1
+        return view
+
+    @property
+    def num_bucket_lists(self):
+        """Number of cached bucket lists"""
+        return len(self.bucket_lists)
+
+    @property
+    def num_views(self):
+        """Number of cached field views"""
+        return len(self.views)
+
+    def clear(self):
+        """Discard all cached entries"""
+        self.bucket_lists = []
+        self.views.clear()
+        self.epoch = None
+
+    def reset_stats(self):
+        """Reset the hit, miss and eviction counters"""
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __repr__(self):
+        return "<%s: hits=%d, misses=%d, evictions=%d>"%(
+            self.__class__.__name__, self.hits, self.misses, self.evictions)
+
+cdef MeshCache mesh_cache(BulkData* bulk):
+    """Cache associated with a BulkData instance"""
+    cdef MeshCache cache = _mesh_caches.get(<size_t>bulk, None)
+    if cache is None:
+        cache = MeshCache.__new__(MeshCache)
+        cache.bulk = bulk
+        _mesh_caches[<size_t>bulk] = cache
+    return cache
+
+cdef void raise_collective(BulkData* bulk, error) except *:
+    """Raise ``error`` on every rank if the check failed on any rank
+
+    Argument errors of collective operations must be raised on all ranks
+    together, otherwise the other ranks wait in the collective call.
+    """
+    cdef int local = 0 if error is None else 1
+    cdef int failed = 0
+    all_reduce_max(deref(bulk).parallel(), &local, &failed, 1)
+    if local:
+        raise error
+    if failed:
+        raise ValueError("Invalid arguments on another MPI rank")
+
+class ModificationCycle:
+    """Context manager for a BulkData modification cycle
+
+    Calls ``modification_begin`` on entry and ``modification_end`` on exit. If
+    an exception is raised within the block, ``modification_end`` is not
+    called because it is a collective operation that the other MPI ranks may
+    not reach.
+    """
+
+    def __init__(self, bulk):
+        self.bulk = bulk
+
+    def __enter__(self):
+        self.bulk.modification_begin()
+        return self.bulk
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.bulk.modification_end()
 
 cdef class StkBulkData:
     """stk::mesh::BulkData"""
@@ -21,6 +614,8 @@ cdef class StkBulkData:
 
     def __dealloc__(self):
         if self.bulk is not NULL and self.bulk_owner is True:
+            _state_epochs.pop(<size_t>self.bulk, None)
+            _mesh_caches.pop(<size_t>self.bulk, None)
             del self.bulk
 
     def __eq__(self, StkBulkData other):
@@ -39,13 +634,19 @@ cdef class StkBulkData:
 
         Args:
             smeta (StkMetaData): MetaData instance to create Bulkdata
-            par (Parallel): Parallel communicator object
+            par (Parallel): Parallel communicator object, may be a
+                sub-communicator from :meth:`Parallel.split`
+
+        The BulkData is destroyed with the returned instance, and the
+        MetaData is kept alive until then.
 
         Return:
             StkBulkData: Newly created BulkData
         """
         cdef BulkData* bulk = new BulkData(deref(smeta.meta), par.comm)
-        return StkBulkData.wrap_instance(bulk)
+        cdef StkBulkData sbulk = StkBulkData.wrap_instance(bulk, owner=True)
+        sbulk.owner_meta = smeta
+        return sbulk
 
     @property
     def meta(self):
@@ -57,11 +658,7 @@ cdef class StkBulkData:
     def parallel(self):
         """Parallel communicator associated with this instance"""
         assert(self.bulk != NULL)
-        cdef Parallel par = Parallel()
-        par.comm = deref(self.bulk).parallel()
-        par.size = deref(self.bulk).parallel_size()
-        par.rank = deref(self.bulk).parallel_rank()
-        return par
+        return Parallel.wrap_comm(deref(self.bulk).parallel())
 
     @property
     def parallel_size(self):
@@ -93,6 +690,54 @@ cdef class StkBulkData:
         """Synchronization counter"""
         return deref(self.bulk).synchronized_count()
 
+    @property
+    def cache(self):
+        """Cache of bucket lists and field views for this mesh
+
+        Return:
+            MeshCache: Cache instance with hit and miss counters
+        """
+        return mesh_cache(self.bulk)
+
+    def bucket_list(self, StkSelector sel, rank_t rank=rank_t.NODE_RANK):
+        """Buckets of a selector with their entity offsets and sizes
+
+        The result is cached until the mesh changes (see :attr:`cache`).
+
+        Args:
+            sel (StkSelector): Selector for fetching the desired entities
+            rank (rank_t): Entity rank
+
+        Return:
+            BucketList: Buckets, offsets and sizes
+        """
+        return mesh_cache(self.bulk).bucket_list(sel.sel, rank)
+
+    @property
+    def state_epoch(self):
+        """Counter of field data moves outside of modification cycles
+
+        Incremented by :meth:`update_field_data_states` and
+        :meth:`reorder_entities`.
+        """
+        return _state_epochs.get(<size_t>self.bulk, 0)
+
+    @property
+    def field_data_epoch(self):
+        """Counter identifying the current layout of the field data
+
+        NumPy views of field data (e.g., from
+        :meth:`~stk.api.mesh.field.StkFieldBase.bkt_view`) point to the
+        memory of a field state at the time they were created. They must be
+        fetched again when this value changes, i.e., after a modification
+        cycle, a field state rotation, or reordering the entities.
+
+        Return:
+            tuple: ``(synchronized_count, state_epoch)``
+        """
+        return (deref(self.bulk).synchronized_count(),
+                _state_epochs.get(<size_t>self.bulk, 0))
+
     @property
     def get_max_allowed_id(self):
         """Maximum allowed entity ID"""
@@ -134,26 +779,1026 @@ cdef class StkBulkData:
         """Return a unique identifier for the given entity"""
         return deref(self.bulk).identifier(entity.entity)
 
-    def iter_buckets(self, StkSelector sel, rank_t rank=rank_t.NODE_RANK):
-        """Iterator for looping over STK buckets
+    def entity_ids(self, StkSelector sel, rank_t rank=rank_t.NODE_RANK):
+        """Identifiers of all entities of a selector
+
+        Entities are in the same order as :meth:`iter_entities`.
 
         Args:
             sel (StkSelector): Selector for fetching the desired entities
             rank (rank_t): Entity rank
 
-        Yield:
-            StkBucket: Bucket instances
+        Return:
+            np.ndarray: int64 array of entity identifiers
+        """
+        cdef const BucketVector* bkts = &(deref(self.bulk).get_buckets(rank, sel.sel))
+        cdef size_t nbkts = deref(bkts).size()
+        ids = np.empty((count_entities(deref(bkts)),), dtype=np.int64)
+        cdef int64_t* out = <int64_t*>np.PyArray_DATA(ids)
+        cdef Bucket* bkt
+        cdef size_t i, j, bsize
+        cdef size_t count = 0
+        with nogil:
+            for i in range(nbkts):
+                bkt = <Bucket*>deref(bkts)[i]
+                bsize = deref(bkt).size()
+                for j in range(bsize):
+                    out[count] = deref(self.bulk).identifier(deref(bkt)[j])
+                    count += 1
+        return ids
+
+    def owner_ranks(self, StkSelector sel, rank_t rank=rank_t.NODE_RANK):
+        """Owning MPI ranks of all entities of a selector
+
+        Entities are in the same order as :meth:`iter_entities`.
+
+        Args:
+            sel (StkSelector): Selector for fetching the desired entities
+            rank (rank_t): Entity rank
+
+        Return:
+            np.ndarray: Integer array of owning MPI ranks
+        """
+        cdef const BucketVector* bkts = &(deref(self.bulk).get_buckets(rank, sel.sel))
+        cdef size_t nbkts = deref(bkts).size()
+        owners = np.empty((count_entities(deref(bkts)),), dtype=np.intc)
+        cdef int* out = <int*>np.PyArray_DATA(owners)
+        cdef Bucket* bkt
+        cdef size_t i, j, bsize
+        cdef size_t count = 0
+        with nogil:
+            for i in range(nbkts):
+                bkt = <Bucket*>deref(bkts)[i]
+                bsize = deref(bkt).size()
+                for j in range(bsize):
+                    out[count] = deref(self.bulk).parallel_owner_rank(deref(bkt)[j])
+                    count += 1
+        return owners
+
+    def local_offsets(self, StkSelector sel, rank_t rank=rank_t.NODE_RANK):
+        """Local offsets of all entities of a selector
+
+        Entities are in the same order as :meth:`iter_entities`. The local
+        offsets are the same values returned by :meth:`connectivity`.
+
+        Args:
+            sel (StkSelector): Selector for fetching the desired entities
+            rank (rank_t): Entity rank
+
+        Return:
+            np.ndarray: int64 array of local offsets
         """
-        cdef StkBucket sbkt = StkBucket()
-        cdef Selector ssel = sel.sel
-        cdef BulkData* sbulk = self.bulk
         cdef const BucketVector* bkts = &(deref(self.bulk).get_buckets(rank, sel.sel))
+        cdef size_t nbkts = deref(bkts).size()
+        offsets = np.empty((count_entities(deref(bkts)),), dtype=np.int64)
+        cdef int64_t* out = <int64_t*>np.PyArray_DATA(offsets)
+        cdef Bucket* bkt
+        cdef Entity ent
+        cdef size_t i, j, bsize
+        cdef size_t count = 0
+        with nogil:
+            for i in range(nbkts):
+                bkt = <Bucket*>deref(bkts)[i]
+                bsize = deref(bkt).size()
+                for j in range(bsize):
+                    ent = deref(bkt)[j]
+                    out[count] = (<EntityT*>&ent).local_offset()
+                    count += 1
+        return offsets
+
+    def entity_table(self, StkSelector sel, rank_t rank=rank_t.NODE_RANK):
+        """Table of entity attributes for all entities of a selector
+
+        Returns a structured array (see ``entity_record_dtype``) with the
+        fields ``identifier``, ``local_offset``, ``owner_rank``, ``bucket_id``,
+        and ``bucket_ordinal``. Entities are in the same order as
+        :meth:`iter_entities`.
+
+        .. code-block:: python
+
+           table = bulk.entity_table(sel, rank_t.NODE_RANK)
+           owned = table[table["owner_rank"] == bulk.parallel_rank]
+           owned_ids = owned["identifier"]
+
+        Args:
+            sel (StkSelector): Selector for fetching the desired entities
+            rank (rank_t): Entity rank
+
+        Return:
+            np.ndarray: Structured array with one record per entity
+        """
+        cdef const BucketVector* bkts = &(deref(self.bulk).get_buckets(rank, sel.sel))
+        table = np.empty((count_entities(deref(bkts)),), dtype=entity_record_dtype)
+        cdef EntityRecord* out = <EntityRecord*>np.PyArray_DATA(table)
+        with nogil:
+            fill_entity_records(self.bulk, deref(bkts), out)
+        return table
+
+    def get_entities(self, rank_t rank, ids):
+        """Look up entities from their identifiers
+
+        This is the inverse of :meth:`entity_ids`. Identifiers that do not
+        exist on this MPI rank have a local offset of 0 (invalid entity).
+
+        Args:
+            rank (rank_t): Entity rank
+            ids (np.ndarray): Array of entity identifiers
+
+        Return:
+            np.ndarray: int64 array of local offsets for the requested entities
+        """
+        cdef np.ndarray eids = np.ascontiguousarray(ids, dtype=np.uint64)
+        cdef size_t nids = eids.size
+        offsets = np.empty((nids,), dtype=np.int64)
+        cdef uint64_t* iptr = <uint64_t*>np.PyArray_DATA(eids)
+        cdef int64_t* out = <int64_t*>np.PyArray_DATA(offsets)
+        cdef Entity ent
+        cdef size_t i
+        with nogil:
+            for i in range(nids):
+                ent = deref(self.bulk).get_entity(rank, iptr[i])
+                out[i] = (<EntityT*>&ent).local_offset()
+        return offsets
+
+    def modification_begin(self):
+        """Begin a modification cycle
+
+        Return:
+            bool: True if a new modification cycle was started
+        """
+        return deref(self.bulk).modification_begin()
+
+    def modification_end(self):
+        """End the modification cycle and resolve parallel ownership and sharing
+
+        This is a collective operation that must be called on all MPI ranks.
+
+        Return:
+            bool: True if the modification cycle was ended successfully
+        """
+        return deref(self.bulk).modification_end()
+
+    def update_field_data_states(self, fields=None):
+        """Rotate the states of multi-state fields without copying data
+
+        The data of every state is moved to the next older state (e.g.,
+        ``StateNP1 -> StateN -> StateNM1``), and the oldest state becomes the
+        new state ``StateNP1``. Only the pointers to the field data are
+        swapped, so the cost is independent of the mesh size. The new state
+        holds the data of the previous oldest state.
+
+        Existing NumPy views of the field data keep pointing to the same
+        memory, which now belongs to a different state. This increments
+        :attr:`state_epoch`; views must be fetched again after this call.
+
+        Every field is rotated once, even if several of its states are
+        passed.
+
+        Args:
+            fields (list): Fields (any state) to rotate (default: all fields)
+        """
+        cdef vector[FieldBase*] cfields
+        cdef StkFieldBase pyfield
+        cdef FieldBase* fld
+        cdef bint all_fields = fields is None
+        cdef size_t i
+        seen = set()
+        if not all_fields:
+            for pyfield in fields:
+                # STK expects the new state and rotates the following ordinals
+                fld = deref(pyfield.fld).field_state(StateNP1)
+                if (deref(fld).number_of_states() > 1 and
+                        deref(fld).mesh_meta_data_ordinal() not in seen):
+                    seen.add(deref(fld).mesh_meta_data_ordinal())
+                    cfields.push_back(fld)
+
+        cdef double t0 = _prof.tic() if _prof.enabled else -1.0
+        with nogil:
+            if all_fields:
+                deref(self.bulk).update_field_data_states()
+            else:
+                for i in range(cfields.size()):
+                    deref(self.bulk).update_field_data_states(cfields[i])
+        _state_epochs[<size_t>self.bulk] = _state_epochs.get(<size_t>self.bulk, 0) + 1
+        if t0 >= 0.0:
+            _prof.toc("bulk.update_field_data_states", t0)
 
+    def modification(self):
+        """Context manager for a modification cycle
+
+        .. code-block:: python
+
+           with bulk.modification():
+               bulk.declare_elements(block, elem_ids, conn)
+               bulk.add_node_sharing(shared_ids, shared_procs)
+           bulk.set_coordinates(node_ids, coords)
+
+        Return:
+            ModificationCycle: Context manager instance
+        """
+        return ModificationCycle(self)
+
+    def declare_nodes(self, ids, parts=None):
+        """Declare nodes from an array of identifiers
+
+        Nodes that already exist are added to the parts.
+
+        Args:
+            ids (np.ndarray): Array of node identifiers
+            parts: StkPart or list of StkPart instances for the nodes
+        """
+        assert deref(self.bulk).in_modifiable_state(), \
+            "BulkData must be in a modification cycle"
+        cdef np.ndarray nids = np.ascontiguousarray(ids, dtype=np.uint64)
+        cdef const EntityId* iptr = <const EntityId*>np.PyArray_DATA(nids)
+        cdef size_t nnodes = nids.size
+        cdef PartVector pvec
+        cdef size_t i
+        parts_to_vector(parts, pvec)
+        for i in range(nnodes):
+            deref(self.bulk).declare_node(iptr[i], pvec)
+
+    def declare_elements(self, StkPart part, ids, connectivity):
+        """Declare elements of a part and connect them to their nodes
+
+        The connectivity contains the node identifiers of every element in
+        the node ordering of the part topology. Nodes that do not exist are
+        declared.
+
+        Args:
+            part (StkPart): Element block with a valid element topology
+            ids (np.ndarray): Array of element identifiers
+            connectivity (np.ndarray): Array of shape ``(n_elements, n_nodes)``
+        """
+        assert deref(self.bulk).in_modifiable_state(), \
+            "BulkData must be in a modification cycle"
+        cdef topo_cls topo = deref(part.part).topology()
+        if not topo.is_valid() or topo.rank() != rank_t.ELEM_RANK:
+            raise ValueError("Part %s does not have an element topology"%part.name)
+        cdef np.ndarray eids = np.ascontiguousarray(ids, dtype=np.uint64)
+        cdef np.ndarray conn = np.ascontiguousarray(connectivity, dtype=np.uint64)
+        cdef size_t nelem = eids.size
+        cdef unsigned nconn = topo.num_nodes()
+        if conn.ndim != 2 or conn.shape[0] != nelem or conn.shape[1] != nconn:
+            raise ValueError("Expected connectivity of shape (%d, %d) for %s"%(
+                nelem, nconn, topo.name().decode('UTF-8')))
+
+        cdef const EntityId* iptr = <const EntityId*>np.PyArray_DATA(eids)
+        cdef const EntityId* cptr = <const EntityId*>np.PyArray_DATA(conn)
+        cdef PartVector pvec
+        cdef PartVector empty
+        cdef Entity elem
+        cdef Entity node
+        cdef size_t i
+        cdef unsigned j
+        pvec.push_back(<Part*>part.part)
+        for i in range(nelem):
+            elem = deref(self.bulk).declare_element(iptr[i], pvec)
+            for j in range(nconn):
+                node = deref(self.bulk).get_entity(rank_t.NODE_RANK, cptr[i * nconn + j])
+                if not is_valid_entity(node):
+                    node = deref(self.bulk).declare_node(cptr[i * nconn + j], empty)
+                deref(self.bulk).declare_relation(elem, node, j)
+
+    def declare_element_sides(self, StkPart part, elem_ids, ordinals):
+        """Declare sides of existing elements on a part
+
+        Args:
+            part (StkPart): Part for the sides, e.g., a sideset
+            elem_ids (np.ndarray): Identifiers of the elements
+            ordinals (np.ndarray): Side ordinal for each element
+        """
+        assert deref(self.bulk).in_modifiable_state(), \
+            "BulkData must be in a modification cycle"
+        cdef np.ndarray eids = np.ascontiguousarray(elem_ids, dtype=np.uint64)
+        cdef np.ndarray ords = np.ascontiguousarray(ordinals, dtype=np.uintc)
+        if eids.size != ords.size:
+            raise ValueError("Mismatch in number of elements and side ordinals")
+        cdef const EntityId* iptr = <const EntityId*>np.PyArray_DATA(eids)
+        cdef const unsigned* optr = <const unsigned*>np.PyArray_DATA(ords)
+        cdef PartVector pvec
+        cdef Entity elem
+        cdef size_t i
+        pvec.push_back(<Part*>part.part)
+        for i in range(<size_t>eids.size):
+            elem = deref(self.bulk).get_entity(rank_t.ELEM_RANK, iptr[i])
+            if not is_valid_entity(elem):
+                raise ValueError("Element %d does not exist on this rank"%iptr[i])
+            deref(self.bulk).declare_element_side(elem, optr[i], pvec)
+
+    def add_node_sharing(self, ids, procs):
+        """Register the MPI ranks that share nodes with this rank
+
+        A node shared by several ranks appears once for every sharing rank.
+
+        Args:
+            ids (np.ndarray): Array of node identifiers
+            procs (np.ndarray): Sharing MPI rank for every node identifier
+        """
+        assert deref(self.bulk).in_modifiable_state(), \
+            "BulkData must be in a modification cycle"
+        cdef np.ndarray nids = np.ascontiguousarray(ids, dtype=np.uint64)
+        cdef np.ndarray nprocs = np.ascontiguousarray(procs, dtype=np.intc)
+        if nids.size != nprocs.size:
+            raise ValueError("Mismatch in number of nodes and sharing ranks")
+        cdef const EntityId* iptr = <const EntityId*>np.PyArray_DATA(nids)
+        cdef const int* pptr = <const int*>np.PyArray_DATA(nprocs)
+        cdef Entity node
+        cdef size_t i
+        for i in range(<size_t>nids.size):
+            node = deref(self.bulk).get_entity(rank_t.NODE_RANK, iptr[i])
+            if not is_valid_entity(node):
+                raise ValueError("Node %d does not exist on this rank"%iptr[i])
+            deref(self.bulk).add_node_sharing(node, pptr[i])
+
+    def set_coordinates(self, ids, coords, StkFieldBase field=None):
+        """Assign nodal coordinates from an array
+
+        Args:
+            ids (np.ndarray): Array of node identifiers
+            coords (np.ndarray): Array of shape ``(n_nodes, ndim)``
+            field (StkFieldBase): Field to assign (default: coordinate field)
+        """
+        if field is None:
+            field = self.meta.coordinate_field
+        assert not field.is_null, "Coordinate field has not been registered"
+        if field_type_num(deref(field.fld)) != np.NPY_DOUBLE:
+            raise TypeError("Field %s must be float64"%field.name)
+        cdef np.ndarray nids = np.ascontiguousarray(ids, dtype=np.uint64)
+        cdef size_t nnodes = nids.size
+        cdef np.ndarray xyz = np.ascontiguousarray(coords, dtype=np.float64)
+        if xyz.ndim == 1:
+            xyz = xyz.reshape((nnodes, -1))
+        if xyz.ndim != 2 or <size_t>xyz.shape[0] != nnodes:
+            raise ValueError("Expected coordinates of shape (%d, ndim)"%nnodes)
+        cdef unsigned ndim = xyz.shape[1]
+        cdef const EntityId* iptr = <const EntityId*>np.PyArray_DATA(nids)
+        cdef const double* xptr = <const double*>np.PyArray_DATA(xyz)
+        cdef const FieldBase* fld = field.fld
+        cdef Entity node
+        cdef double* data
+        cdef size_t i, bad = nnodes
+        cdef unsigned j
+        with nogil:
+            for i in range(nnodes):
+                node = deref(self.bulk).get_entity(rank_t.NODE_RANK, iptr[i])
+                if (not is_valid_entity(node) or
+                        field_scalars_per_entity(deref(fld), node) != ndim):
+                    bad = i
+                    break
+                data = <double*>field_data(deref(fld), node)
+                for j in range(ndim):
+                    data[j] = xptr[i * ndim + j]
+        if bad < nnodes:
+            raise ValueError("Node %d does not exist or %s does not have %d "
+                             "components"%(iptr[bad], field.name, ndim))
+
+    @property
+    def aura_ghosting(self):
+        """Ghosting for the automatically generated aura"""
+        return StkGhosting.wrap_reference(deref(self.bulk).aura_ghosting())
+
+    @property
+    def shared_ghosting(self):
+        """Ghosting for the entities shared between MPI ranks"""
+        return StkGhosting.wrap_reference(deref(self.bulk).shared_ghosting())
+
+    @property
+    def ghostings(self):
+        """List of all ghostings, including the shared and aura ghostings"""
+        cdef const vector[Ghosting*]* ghosts = &deref(self.bulk).ghostings()
+        cdef size_t i
+        return [StkGhosting.wrap_instance(<GhostingT*>deref(ghosts)[i])
+                for i in range(deref(ghosts).size())]
+
+    def ghosting_part(self, StkGhosting ghosting):
+        """Part containing the entities received through a ghosting
+
+        Args:
+            ghosting (StkGhosting): Ghosting instance
+
+        Return:
+            StkPart: Part of the ghosted entities on this MPI rank
+        """
+        return StkPart.wrap_reference(
+            deref(self.bulk).ghosting_part(deref(<Ghosting*>ghosting.ghosting)))
+
+    def create_ghosting(self, str name):
+        """Create a custom ghosting
+
+        A modification cycle is started (and ended) if BulkData is not already
+        in a modifiable state. This is a collective operation.
+
+        Args:
+            name (str): Unique name of the ghosting
+
+        Return:
+            StkGhosting: The new ghosting instance
+        """
+        cdef string gname = name.encode('UTF-8')
+        cdef bint own_cycle = not deref(self.bulk).in_modifiable_state()
+        if own_cycle:
+            deref(self.bulk).modification_begin()
+        try:
+            ghosting = StkGhosting.wrap_reference(deref(self.bulk).create_ghosting(gname))
+        finally:
+            if own_cycle:
+                deref(self.bulk).modification_end()
+        return ghosting
+
+    def change_ghosting(self, StkGhosting ghosting, entity_ids, ranks,
+                        remove_ids=None, rank_t rank=rank_t.ELEM_RANK):
+        """Add and remove entities from a custom ghosting
+
+        Every locally owned entity in ``entity_ids`` is sent to the
+        corresponding MPI rank in ``ranks``; the same entity can appear
+        several times with different destination ranks. ``remove_ids`` are the
+        identifiers of entities previously received through this ghosting that
+        are no longer needed on this rank. The entities required by the ghosted
+        entities (e.g., the nodes of elements) are ghosted automatically.
+
+        All entities are processed in a single modification cycle, which is
+        started (and ended) if BulkData is not already in a modifiable state.
+        This is a collective operation.
+
+        .. code-block:: python
+
+           ghosting = bulk.create_ghosting("overset")
+           bulk.change_ghosting(ghosting, elem_ids, dest_ranks)
+           field_ops.communicate_field_data(ghosting, [pressure, velocity])
+
+        Args:
+            ghosting (StkGhosting): Custom ghosting instance
+            entity_ids (np.ndarray): Identifiers of the locally owned entities to send
+            ranks (np.ndarray): Destination MPI rank for every entity
+            remove_ids (np.ndarray): Identifiers of received entities to remove
+            rank (rank_t): Entity rank of the identifiers (default: ELEM_RANK)
+        """
+        cdef np.ndarray eids = np.ascontiguousarray(entity_ids, dtype=np.uint64)
+        cdef np.ndarray procs = np.ascontiguousarray(ranks, dtype=np.intc)
+        cdef np.ndarray rids = np.ascontiguousarray(
+            remove_ids if remove_ids is not None else (), dtype=np.uint64)
+        cdef const EntityId* iptr = <const EntityId*>np.PyArray_DATA(eids)
+        cdef const int* pptr = <const int*>np.PyArray_DATA(procs)
+        cdef const EntityId* rptr = <const EntityId*>np.PyArray_DATA(rids)
+        cdef int myrank = deref(self.bulk).parallel_rank()
+        cdef int nranks = deref(self.bulk).parallel_size()
+        cdef EntityProcVec add_send
+        cdef vector[EntityKey] remove_receive
+        cdef Entity ent
+        cdef size_t i
+        error = None
+        if eids.size != procs.size:
+            error = ValueError("Mismatch in number of entities and destination ranks")
+        else:
+            add_send.reserve(eids.size)
+            for i in range(<size_t>eids.size):
+                ent = deref(self.bulk).get_entity(rank, iptr[i])
+                if (not is_valid_entity(ent) or
+                        deref(self.bulk).parallel_owner_rank(ent) != myrank):
+                    error = ValueError("Entity %d is not owned by this rank"%iptr[i])
+                    break
+                if pptr[i] < 0 or pptr[i] >= nranks:
+                    error = ValueError("Invalid destination rank: %d"%pptr[i])
+                    break
+                add_send.push_back(EntityProc(ent, pptr[i]))
+        raise_collective(self.bulk, error)
+        for i in range(<size_t>rids.size):
+            ent = deref(self.bulk).get_entity(rank, rptr[i])
+            if is_valid_entity(ent):
+                remove_receive.push_back(deref(self.bulk).entity_key(ent))
+
+        cdef bint own_cycle = not deref(self.bulk).in_modifiable_state()
+        if own_cycle:
+            deref(self.bulk).modification_begin()
+        try:
+            deref(self.bulk).change_ghosting(
+                deref(ghosting.ghosting), add_send, remove_receive)
+        finally:
+            if own_cycle:
+                deref(self.bulk).modification_end()
+
+    def change_entity_owner(self, entity_ids, ranks, rank_t rank=rank_t.ELEM_RANK):
+        """Move the ownership of entities to other MPI ranks
+
+        Every locally owned entity in ``entity_ids`` is migrated to the
+        corresponding MPI rank in ``ranks``, together with its field data and
+        the entities in its downward closure (e.g., the nodes of elements).
+        Sharing and aura ghosting are updated in a single modification cycle.
+        This is a collective operation that must be called outside of a
+        modification cycle; ranks with no entities to move pass empty arrays.
+
+        Args:
+            entity_ids (np.ndarray): Identifiers of the locally owned entities to move
+            ranks (np.ndarray): New owner MPI rank for every entity
+            rank (rank_t): Entity rank of the identifiers (default: ELEM_RANK)
+        """
+        if deref(self.bulk).in_modifiable_state():
+            raise RuntimeError("Cannot change entity owners during a modification cycle")
+        cdef np.ndarray eids = np.ascontiguousarray(entity_ids, dtype=np.uint64)
+        cdef np.ndarray procs = np.ascontiguousarray(ranks, dtype=np.intc)
+        cdef const EntityId* iptr = <const EntityId*>np.PyArray_DATA(eids)
+        cdef const int* pptr = <const int*>np.PyArray_DATA(procs)
+        cdef int myrank = deref(self.bulk).parallel_rank()
+        cdef int nranks = deref(self.bulk).parallel_size()
+        cdef EntityProcVec moves
+        cdef Entity ent
+        cdef size_t i
+        error = None
+        if eids.size != procs.size:
+            error = ValueError("Mismatch in number of entities and destination ranks")
+        else:
+            moves.reserve(eids.size)
+            for i in range(<size_t>eids.size):
+                ent = deref(self.bulk).get_entity(rank, iptr[i])
+                if (not is_valid_entity(ent) or
+                        deref(self.bulk).parallel_owner_rank(ent) != myrank):
+                    error = ValueError("Entity %d is not owned by this rank"%iptr[i])
+                    break
+                if pptr[i] < 0 or pptr[i] >= nranks:
+                    error = ValueError("Invalid destination rank: %d"%pptr[i])
+                    break
+                if pptr[i] != myrank:
+                    moves.push_back(EntityProc(ent, pptr[i]))
+        raise_collective(self.bulk, error)
+
+        cdef double t0 = _prof.tic() if _prof.enabled else -1.0
+        deref(self.bulk).change_entity_owner(moves)
+        if t0 >= 0.0:
+            _prof.toc("bulk.change_entity_owner", t0)
+
+    def destroy_ghosting(self, StkGhosting ghosting):
+        """Remove all entities from a custom ghosting
+
+        A modification cycle is started (and ended) if BulkData is not already
+        in a modifiable state. This is a collective operation.
+
+        Args:
+            ghosting (StkGhosting): Custom ghosting instance
+        """
+        cdef bint own_cycle = not deref(self.bulk).in_modifiable_state()
+        if own_cycle:
+            deref(self.bulk).modification_begin()
+        try:
+            deref(self.bulk).destroy_ghosting(deref(ghosting.ghosting))
+        finally:
+            if own_cycle:
+                deref(self.bulk).modification_end()
+
+    def connectivity(self, StkSelector sel,
+                     rank_t from_rank=rank_t.ELEM_RANK,
+                     rank_t to_rank=rank_t.NODE_RANK,
+                     bint use_ids=False):
+        """Connectivity arrays grouped by topology
+
+        For every topology present in the selected buckets of ``from_rank``,
+        returns a dense array of shape ``(n_entities, n_connected)``. The
+        entities are in the same order as :meth:`iter_entities`. By default
+        the connected entities are represented by their local offsets, set
+        ``use_ids=True`` to get the global identifiers instead.
+
+        .. code-block:: python
+
+           conn = bulk.connectivity(sel)
+           # Local offsets of the nodes of all hex elements, shape (nelems, 8)
+           hex_nodes = conn[topology_t.HEX_8]
+           # Node IDs instead of local offsets
+           hex_node_ids = bulk.connectivity(sel, use_ids=True)[topology_t.HEX_8]
+
+        Args:
+            sel (StkSelector): Selector for the ``from_rank`` entities
+            from_rank (rank_t): Rank of the entities (default: ELEM_RANK)
+            to_rank (rank_t): Rank of the connected entities (default: NODE_RANK)
+            use_ids (bool): If True, return identifiers instead of local offsets
+
+        Return:
+            dict: Mapping of ``topology_t`` values to int64 arrays
+        """
+        cdef const BucketVector* bkts = &(deref(self.bulk).get_buckets(from_rank, sel.sel))
         cdef size_t num_bkts = deref(bkts).size()
+        cdef Bucket* bkt
         cdef size_t i
+        cdef dict counts = {}
+        cdef dict nconns = {}
         for i in range(num_bkts):
-            sbkt.bkt = <Bucket*>deref(bkts)[i]
-            yield sbkt
+            bkt = <Bucket*>deref(bkts)[i]
+            if deref(bkt).size() == 0:
+                continue
+            topo = deref(bkt).topology().value()
+            if topo not in counts:
+                counts[topo] = 0
+                nconns[topo] = deref(self.bulk).num_connectivity(deref(bkt)[0], to_rank)
+            counts[topo] += deref(bkt).size()
+
+        cdef dict conn = {}
+        cdef int ctopo
+        cdef unsigned nconn
+        cdef size_t nfilled
+        cdef np.ndarray arr
+        cdef int64_t* buf
+        for topo, nent in counts.items():
+            ctopo = topo
+            nconn = nconns[topo]
+            arr = np.empty((nent, nconn), dtype=np.int64)
+            buf = <int64_t*>np.PyArray_DATA(arr)
+            with nogil:
+                nfilled = fill_connectivity(
+                    self.bulk, deref(bkts), ctopo, to_rank, nconn, use_ids, buf)
+            if nfilled != nent:
+                raise RuntimeError(
+                    "Non-uniform connectivity for topology %s, "
+                    "use connectivity_csr instead"%(
+                        topo_cls(<topology_t>ctopo).name().decode('UTF-8')))
+            conn[topo] = arr
+        return conn
+
+    def connectivity_csr(self, StkSelector sel,
+                         rank_t from_rank=rank_t.ELEM_RANK,
+                         rank_t to_rank=rank_t.NODE_RANK,
+                         bint use_ids=False):
+        """Connectivity in compressed sparse row (CSR) format
+
+        Unlike :meth:`connectivity`, this method handles mixed topologies and
+        entities with varying number of connected entities (e.g., node to
+        element connectivity). The connected entities for the ``i``-th entity
+        (in :meth:`iter_entities` order) are
+        ``indices[offsets[i]:offsets[i+1]]``.
+
+        Args:
+            sel (StkSelector): Selector for the ``from_rank`` entities
+            from_rank (rank_t): Rank of the entities (default: ELEM_RANK)
+            to_rank (rank_t): Rank of the connected entities (default: NODE_RANK)
+            use_ids (bool): If True, return identifiers instead of local offsets
+
+        Return:
+            (np.ndarray, np.ndarray): Offsets and indices as int64 arrays
+        """
+        cdef const BucketVector* bkts = &(deref(self.bulk).get_buckets(from_rank, sel.sel))
+        cdef size_t num_bkts = deref(bkts).size()
+        cdef size_t nent = count_entities(deref(bkts))
+        cdef Bucket* bkt
+        cdef size_t i, j, bsize
+
+        offsets = np.empty((nent + 1,), dtype=np.int64)
+        cdef int64_t* optr = <int64_t*>np.PyArray_DATA(offsets)
+        cdef size_t count = 0
+        optr[0] = 0
+        with nogil:
+            for i in range(num_bkts):
+                bkt = <Bucket*>deref(bkts)[i]
+                bsize = deref(bkt).size()
+                for j in range(bsize):
+                    optr[count + 1] = optr[count] + deref(self.bulk).num_connectivity(
+                        deref(bkt)[j], to_rank)
+                    count += 1
+
+        indices = np.empty((optr[nent],), dtype=np.int64)
+        cdef int64_t* iptr = <int64_t*>np.PyArray_DATA(indices)
+        cdef Entity ent
+        count = 0
+        with nogil:
+            for i in range(num_bkts):
+                bkt = <Bucket*>deref(bkts)[i]
+                bsize = deref(bkt).size()
+                for j in range(bsize):
+                    ent = deref(bkt)[j]
+                    copy_relations(self.bulk, ent, to_rank,
+                                   optr[count + 1] - optr[count], use_ids,
+                                   iptr + optr[count])
+                    count += 1
+        return offsets, indices
+
+    def adjacency(self, StkSelector sel, str kind="node-node", bint compact=False,
+                  rank_t through=rank_t.INVALID_RANK, int min_shared_nodes=0):
+        """Adjacency graph of the selected entities in CSR format
+
+        The supported kinds are
+
+        - ``"node-node"``: nodes sharing an edge (``through=EDGE_RANK``) or an
+          element (``through=ELEM_RANK``). By default, edges are used if the
+          selected part of the mesh has edges.
+        - ``"node-elem"``: elements connected to each node (the inverse of the
+          element to node connectivity).
+        - ``"elem-elem"``: elements sharing at least ``min_shared_nodes`` nodes
+          (default: the spatial dimension, i.e., a face for linear elements).
+
+        Only the entities belonging to the selector are included. The rows
+        are in :meth:`iter_entities` order and the neighbors of row ``i`` are
+        ``indices[indptr[i]:indptr[i+1]]``, sorted in increasing order. The
+        indices are local offsets (see :meth:`local_offsets`), or positions
+        in the selected entities of the column rank if ``compact=True``.
+
+        Args:
+            sel (StkSelector): Selector for the entities
+            kind (str): One of ``"node-node"``, ``"node-elem"``, ``"elem-elem"``
+            compact (bool): Return positions instead of local offsets
+            through (rank_t): Rank of the entities defining node-node adjacency
+            min_shared_nodes (int): Number of shared nodes for elem-elem adjacency
+
+        Return:
+            (np.ndarray, np.ndarray): ``indptr`` and ``indices`` as int64 arrays
+        """
+        cdef EntityRank row_rank, via_rank, to_rank
+        cdef bint direct = False
+        cdef int min_shared = 1
+        if kind == "node-node":
+            row_rank = rank_t.NODE_RANK
+            to_rank = rank_t.NODE_RANK
+            if through == rank_t.INVALID_RANK:
+                nedges = count_entities(
+                    deref(self.bulk).get_buckets(rank_t.EDGE_RANK, sel.sel))
+                through = rank_t.EDGE_RANK if nedges > 0 else rank_t.ELEM_RANK
+            via_rank = through
+        elif kind == "node-elem":
+            row_rank = rank_t.NODE_RANK
+            via_rank = rank_t.ELEM_RANK
+            to_rank = rank_t.ELEM_RANK
+            direct = True
+        elif kind == "elem-elem":
+            row_rank = rank_t.ELEM_RANK
+            via_rank = rank_t.NODE_RANK
+            to_rank = rank_t.ELEM_RANK
+            min_shared = (min_shared_nodes if min_shared_nodes > 0
+                          else self.meta.spatial_dimension)
+        else:
+            raise ValueError("Invalid adjacency kind: %s"%kind)
+
+        cdef double t0 = _prof.tic() if _prof.enabled else -1.0
+        cdef size_t nspace = deref(self.bulk).get_size_of_entity_index_space()
+        cdef np.ndarray colmap = np.full((nspace,), -1, dtype=np.int64)
+        cdef np.ndarray stamp = np.full((nspace,), -1, dtype=np.int64)
+        cdef np.ndarray counts = np.zeros((nspace,), dtype=np.intc)
+        cdef int64_t* cptr = <int64_t*>np.PyArray_DATA(colmap)
+        cdef int64_t* sptr = <int64_t*>np.PyArray_DATA(stamp)
+        cdef int* nptr = <int*>np.PyArray_DATA(counts)
+        cdef const BucketVector* rows = &deref(self.bulk).get_buckets(row_rank, sel.sel)
+        cdef const BucketVector* cols = &deref(self.bulk).get_buckets(to_rank, sel.sel)
+        cdef vector[int64_t] offsets
+        cdef vector[int64_t] indices
+        with nogil:
+            selection_map(self.bulk, deref(cols), cptr)
+            build_adjacency(self.bulk, deref(rows), via_rank, to_rank, direct,
+                            min_shared, cptr, compact, sptr, nptr, offsets, indices)
+
+        indptr = np.empty((offsets.size(),), dtype=np.int64)
+        indptr[:] = <int64_t[:offsets.size()]>offsets.data()
+        out = np.empty((indices.size(),), dtype=np.int64)
+        if indices.size() > 0:
+            out[:] = <int64_t[:indices.size()]>indices.data()
+        if t0 >= 0.0:
+            _prof.toc("bulk.adjacency", t0)
+        return indptr, out
+
+    def entity_centroids(self, StkSelector sel, rank_t rank=rank_t.ELEM_RANK,
+                         StkFieldBase coords=None):
+        """Coordinates of nodes or centroids of the nodes of other entities
+
+        Args:
+            sel (StkSelector): Selector for the entities
+            rank (rank_t): Entity rank
+            coords (StkFieldBase): Coordinate field (default: mesh coordinates)
+
+        Return:
+            np.ndarray: Array of shape ``(n_entities, spatial_dimension)``
+        """
+        meta = self.meta
+        if coords is None:
+            coords = meta.coordinate_field
+        ndim = meta.spatial_dimension
+        if rank == rank_t.NODE_RANK:
+            return coords.gather(sel).reshape((-1, ndim))
+
+        # Nodes of the selected entities may not belong to the selector
+        offsets, conn = self.connectivity_csr(sel, rank, rank_t.NODE_RANK)
+        all_nodes = StkSelector.from_part(meta.universal_part)
+        nodes = self.local_offsets(all_nodes, rank_t.NODE_RANK)
+        xyz = coords.gather(all_nodes).reshape((-1, ndim))
+        out = np.zeros((offsets.shape[0] - 1, ndim), dtype=np.float64)
+        if conn.shape[0] == 0:
+            return out
+        lookup = np.zeros((nodes.max() + 1,), dtype=np.int64)
+        lookup[nodes] = np.arange(nodes.shape[0])
+        counts = np.diff(offsets)
+        has_nodes = counts > 0
+        out[has_nodes] = np.add.reduceat(xyz[lookup[conn]], offsets[:-1][has_nodes])
+        out[has_nodes] /= counts[has_nodes, np.newaxis]
+        return out
+
+    def reorder_entities(self, str method="hilbert", rank_t rank=rank_t.NODE_RANK,
+                         StkFieldBase coords=None):
+        """Reorder the entities within their buckets to improve memory locality
+
+        The supported methods are
+
+        - ``"hilbert"``: Hilbert space-filling curve over the coordinates
+          (nodes) or the centroids (other ranks)
+        - ``"morton"``: Morton (Z-order) curve, cheaper but with larger jumps
+          than the Hilbert curve
+        - ``"rcm"``: reverse Cuthill-McKee ordering of the node-node graph
+          (``NODE_RANK``) or the element graph (``ELEM_RANK``)
+
+        Entities are only moved between buckets with the same parts, the
+        ordering of the other ranks is preserved. This must be called outside
+        of a modification cycle, and later modification cycles may restore
+        the default ordering by identifier. Existing field data views must be
+        fetched again (see :attr:`field_data_epoch`).
+
+        Args:
+            method (str): Ordering method
+            rank (rank_t): Rank of the entities to reorder
+            coords (StkFieldBase): Coordinate field (default: mesh coordinates)
+
+        Return:
+            np.ndarray: int64 array with the previous :meth:`iter_entities`
+            position of every entity in the new order
+        """
+        if method not in ("hilbert", "morton", "rcm"):
+            raise ValueError("Invalid reordering method: %s"%method)
+        if method == "rcm" and rank not in (rank_t.NODE_RANK, rank_t.ELEM_RANK):
+            raise ValueError("RCM ordering is only available for nodes and elements")
+        if deref(self.bulk).in_modifiable_state():
+            raise RuntimeError("Cannot reorder entities during a modification cycle")
+
+        cdef double t0 = _prof.tic() if _prof.enabled else -1.0
+        sel = StkSelector.from_part(self.meta.universal_part)
+        entities = self.local_offsets(sel, rank)
+        cdef int64_t n = entities.shape[0]
+        cdef np.ndarray order = np.empty((n,), dtype=np.int64)
+        cdef np.ndarray indptr, indices, by_degree
+        if method == "rcm":
+            kind = "node-node" if rank == rank_t.NODE_RANK else "elem-elem"
+            indptr, indices = self.adjacency(sel, kind, compact=True)
+            by_degree = np.argsort(np.diff(indptr), kind="stable").astype(np.int64)
+            with nogil:
+                rcm_order(n, <int64_t*>np.PyArray_DATA(indptr),
+                          <int64_t*>np.PyArray_DATA(indices),
+                          <int64_t*>np.PyArray_DATA(by_degree),
+                          <int64_t*>np.PyArray_DATA(order))
+        else:
+            keys = curve_keys(self.entity_centroids(sel, rank, coords),
+                              method == "hilbert")
+            order[:] = np.argsort(keys, kind="stable")
+
+        # Keys by local offset: current position for the other ranks
+        cdef np.ndarray sort_keys = np.zeros(
+            (deref(self.bulk).get_size_of_entity_index_space(),), dtype=np.int64)
+        for erank in (rank_t.NODE_RANK, rank_t.EDGE_RANK,
+                      rank_t.FACE_RANK, rank_t.ELEM_RANK):
+            if erank != rank:
+                offsets = self.local_offsets(sel, erank)
+                sort_keys[offsets] = np.arange(offsets.shape[0])
+        sort_keys[entities[order]] = np.arange(n)
+
+        cdef EntityKeySorter* sorter = new EntityKeySorter(
+            <int64_t*>np.PyArray_DATA(sort_keys))
+        try:
+            deref(self.bulk).sort_entities(deref(sorter))
+        finally:
+            del sorter
+        _state_epochs[<size_t>self.bulk] = _state_epochs.get(<size_t>self.bulk, 0) + 1
+
+        # Entities are sorted within each bucket partition
+        sort_keys[entities] = np.arange(n)
+        previous = sort_keys[self.local_offsets(sel, rank)]
+        if t0 >= 0.0:
+            _prof.toc("bulk.reorder_entities", t0)
+        return previous
+
+    def parallel_for_buckets(self, StkSelector sel, rank_t rank, kernel,
+                             list fields, int nthreads=0, str schedule="static",
+                             size_t user_data=0):
+        """Execute a compiled kernel on buckets using a pool of threads
+
+        The kernel must be a compiled function that does not require the GIL
+        with the following C signature
+
+        .. code-block:: c
+
+           void kernel(size_t num_entities, double** field_data,
+                       const int* num_components, void* user_data)
+
+        where ``field_data[i]`` points to the bucket data for ``fields[i]``
+        and ``num_components[i]`` is the number of components of that field.
+        The kernel can be a Numba ``cfunc``, a ctypes function pointer, or the
+        integer address of a ``nogil`` Cython function. Buckets are processed
+        concurrently and the GIL is released while the kernels are running.
+        Only the selected buckets where all fields are defined are passed to
+        the kernel.
+
+        .. code-block:: python
+
+           from numba import cfunc, types, carray
+
+           sig = types.void(types.uintp, types.CPointer(types.CPointer(types.double)),
+                            types.CPointer(types.intc), types.voidptr)
+
+           @cfunc(sig, nopython=True)
+           def scale(n, data, ncomp, user):
+               pres = carray(data[0], (n,))
+               vel = carray(data[1], (n * ncomp[1],))
+               for i in range(n):
+                   pres[i] *= 2.0
+
+           bulk.parallel_for_buckets(sel, rank_t.NODE_RANK, scale,
+                                     [pressure, velocity], nthreads=8)
+
+        Args:
+            sel (StkSelector): Selector for the buckets
+            rank (rank_t): Entity rank
+            kernel: Compiled kernel (see above)
+            fields (list): List of float64 StkFieldBase instances passed to the kernel
+            nthreads (int): Number of threads (default: number of CPUs)
+            schedule (str): ``static`` assigns contiguous blocks of buckets to
+                threads, ``balanced`` distributes buckets based on their size
+            user_data (int): Address of user data passed to the kernel
+        """
+        cdef size_t kaddr = kernel_address(kernel)
+        if nthreads < 1:
+            nthreads = os.cpu_count() or 1
+        if schedule not in ("static", "balanced"):
+            raise ValueError("Invalid schedule: %s"%schedule)
+
+        # Only the buckets where every field is defined are processed
+        cdef Selector fsel = sel.sel
+        cdef vector[FieldBase*] cfields
+        cdef StkFieldBase pyfield
+        for pyfield in fields:
+            if field_type_num(deref(pyfield.fld)) != np.NPY_DOUBLE:
+                raise TypeError("Field %s must be float64"%pyfield.name)
+            if deref(pyfield.fld).entity_rank() != rank:
+                raise ValueError("Field %s is not defined on rank %s"%(
+                    pyfield.name, rank))
+            fsel = fsel & Selector(deref(pyfield.fld))
+            cfields.push_back(pyfield.fld)
+
+        cdef const BucketVector* bkts = &(deref(self.bulk).get_buckets(rank, fsel))
+        cdef size_t nbkts = deref(bkts).size()
+        cdef size_t nfields = len(fields)
+        if nbkts == 0:
+            return
+
+        ptrs = np.zeros((nbkts, max(nfields, 1)), dtype=np.uintp)
+        comps = np.zeros((nbkts, max(nfields, 1)), dtype=np.intc)
+        sizes = np.empty((nbkts,), dtype=np.uintp)
+        cdef size_t[:, ::1] pview = ptrs
+        cdef int[:, ::1] cview = comps
+        cdef size_t[::1] sview = sizes
+        cdef size_t i, k
+        cdef Bucket* bkt
+        with nogil:
+            for i in range(nbkts):
+                bkt = <Bucket*>deref(bkts)[i]
+                sview[i] = deref(bkt).size()
+                for k in range(nfields):
+                    pview[i, k] = <size_t>field_data(
+                        deref(cfields[k]), deref(deref(bkts)[i]))
+                    cview[i, k] = field_scalars_per_entity(
+                        deref(cfields[k]), deref(deref(bkts)[i]))
+
+        nthreads = min(nthreads, nbkts)
+        if schedule == "static":
+            chunks = np.array_split(np.arange(nbkts, dtype=np.intp), nthreads)
+        else:
+            # Largest buckets first, each assigned to the least loaded thread
+            loads = np.zeros((nthreads,), dtype=np.uintp)
+            assigned = [[] for _ in range(nthreads)]
+            for ib in np.argsort(sizes)[::-1]:
+                tid = np.argmin(loads)
+                assigned[tid].append(ib)
+                loads[tid] += sizes[ib]
+            chunks = [np.array(sorted(a), dtype=np.intp) for a in assigned]
+
+        if nthreads == 1:
+            _run_bucket_kernel(kaddr, ptrs, comps, sizes, chunks[0], user_data)
+            return
+        pool = thread_pool(nthreads)
+        futures = [pool.submit(_run_bucket_kernel, kaddr, ptrs, comps, sizes,
+                               chunk, user_data)
+                   for chunk in chunks if chunk.shape[0] > 0]
+        for fut in futures:
+            fut.result()
+
+    def iter_buckets(self, StkSelector sel, rank_t rank=rank_t.NODE_RANK):
+        """Iterator for looping over STK buckets
+
+        The bucket list is cached until the mesh changes (see :attr:`cache`).
+
+        Args:
+            sel (StkSelector): Selector for fetching the desired entities
+            rank (rank_t): Entity rank
+
+        Yield:
+            StkBucket: Bucket instances
+        """
+        cdef BucketList entry = mesh_cache(self.bulk).bucket_list(sel.sel, rank)
+        cdef double t0 = _prof.tic() if _prof.enabled else -1.0
+        try:
+            for sbkt in entry.buckets:
+                yield sbkt
+        finally:
+            # Also record the time if the loop is left early
+            if t0 >= 0.0:
+                _prof.toc("bulk.iter_buckets", t0)
 
     def iter_entities(self, StkSelector sel, rank_t rank=rank_t.NODE_RANK):
         """Iterator for looping over STK buckets
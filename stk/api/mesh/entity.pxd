@@ -5,7 +5,7 @@
 from libc.stdint cimport uint64_t
 from libcpp cimport bool
 
-cdef extern from "stk_mesh/base/Entity.hpp" namespace "stk::mesh":
+cdef extern from "stk_mesh/base/Entity.hpp" namespace "stk::mesh" nogil:
     cdef cppclass Entity:
         Entity()
         uint64_t local_offset() const
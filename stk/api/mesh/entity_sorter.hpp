@@ -0,0 +1,41 @@
+#ifndef PYSTK_ENTITY_SORTER_HPP
+#define PYSTK_ENTITY_SORTER_HPP
+
+#include <algorithm>
+#include <cstdint>
+
+#include "stk_mesh/base/BulkData.hpp"
+#include "stk_mesh/base/EntitySorterBase.hpp"
+
+namespace pystk {
+
+/** Order the entities of every bucket partition by a precomputed key
+ *
+ *  The keys are indexed by the local offset of the entities and must cover
+ *  the entity index space of the mesh. Entities with equal keys keep their
+ *  current relative order.
+ */
+class EntityKeySorter : public stk::mesh::EntitySorterBase
+{
+public:
+    explicit EntityKeySorter(const int64_t* keys) : m_keys(keys) {}
+
+    virtual ~EntityKeySorter() {}
+
+    virtual void sort(stk::mesh::BulkData&, stk::mesh::EntityVector& entities) const
+    {
+        const int64_t* keys = m_keys;
+        std::stable_sort(
+            entities.begin(), entities.end(),
+            [keys](stk::mesh::Entity a, stk::mesh::Entity b) {
+                return keys[a.local_offset()] < keys[b.local_offset()];
+            });
+    }
+
+private:
+    const int64_t* m_keys;
+};
+
+} // namespace pystk
+
+#endif /* PYSTK_ENTITY_SORTER_HPP */
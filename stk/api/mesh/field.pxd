@@ -4,6 +4,7 @@
 # cython: infer_types = True
 
 cimport cython
+from libc.stdint cimport int64_t, uint8_t
 from libcpp cimport bool
 from libcpp.string cimport string
 cimport numpy as np
@@ -23,7 +24,7 @@ cdef extern from "stk_mesh/base/FieldState.hpp" namespace "stk::mesh":
 cdef extern from "stk_mesh/base/FieldTraits.hpp" namespace "stk::mesh":
     cdef cppclass FieldTraits[T]
 
-cdef extern from "stk_mesh/base/FieldBase.hpp" namespace "stk::mesh":
+cdef extern from "stk_mesh/base/FieldBase.hpp" namespace "stk::mesh" nogil:
     cdef cppclass FieldBase:
         MetaData& mesh_meta_data() const
         unsigned mesh_meta_data_ordinal() const
@@ -51,7 +52,7 @@ cdef extern from "stk_mesh/base/Field.hpp" namespace "stk::mesh":
 
         Field& field_of_state(FieldState input_state) const
 
-cdef extern from "stk_mesh/base/FieldBase.hpp" namespace "stk::mesh":
+cdef extern from "stk_mesh/base/FieldBase.hpp" namespace "stk::mesh" nogil:
     void* field_data[FieldBase](const FieldBase& f, Entity e)
     void* field_data[FieldBase](const FieldBase& f, const Bucket& b)
 
@@ -61,8 +62,66 @@ cdef extern from "stk_mesh/base/FieldBase.hpp" namespace "stk::mesh":
 
 ctypedef FieldBase* FieldBasePtr
 
+#: Scalar types supported for field data
+ctypedef fused field_scalar_t:
+    double
+    float
+    int
+    long
+    int64_t
+    uint8_t
+
+cdef inline int field_type_num(const FieldBase& fld) nogil:
+    """NumPy type number of the field scalars (-1 if not supported)"""
+    if fld.type_is[double]():
+        return np.NPY_DOUBLE
+    if fld.type_is[float]():
+        return np.NPY_FLOAT
+    if fld.type_is[int]():
+        return np.NPY_INT
+    if fld.type_is[int64_t]():
+        return np.NPY_INT64
+    if fld.type_is[long]():
+        return np.NPY_LONG
+    if fld.type_is[uint8_t]():
+        return np.NPY_UINT8
+    return -1
+
+cdef inline int field_itemsize(const FieldBase& fld) except -1:
+    """Size of the field scalars in bytes"""
+    cdef int typenum = field_type_num(fld)
+    if typenum < 0:
+        raise TypeError("Unsupported data type for field %s"%fld.name().decode('UTF-8'))
+    return np.PyArray_DescrFromType(typenum).itemsize
+
+cdef inline object field_array(const FieldBase& fld, void* ptr, np.npy_intp nent,
+                               np.npy_intp ncomp, bint squeeze):
+    """NumPy view of field data with the dtype of the field
+
+    The view has shape ``(nent, ncomp)``, or ``(nent,)`` if ``squeeze`` is
+    True and the field has a single component.
+    """
+    cdef int typenum = field_type_num(fld)
+    if typenum < 0:
+        raise TypeError("Unsupported data type for field %s"%fld.name().decode('UTF-8'))
+    if ptr == NULL:
+        raise ValueError("Field %s is not defined on the entities"%fld.name().decode('UTF-8'))
+    cdef np.npy_intp dims[2]
+    dims[0] = nent
+    dims[1] = ncomp
+    if squeeze and ncomp == 1:
+        return np.PyArray_SimpleNewFromData(1, dims, typenum, ptr)
+    return np.PyArray_SimpleNewFromData(2, dims, typenum, ptr)
+
+cdef int bucket_field_ncomp(const FieldBase& fld, const BucketVector& bkts) nogil
+cdef int copy_bucket_data(const FieldBase& fld, const BucketVector& bkts,
+                          void* buf, size_t ncomp, size_t stride,
+                          size_t col, size_t itemsize, bint to_field) nogil
+
 cdef class StkFieldBase:
     cdef FieldBase* fld
 
+    cdef np.ndarray _init_array(self, int num_components, init_value)
+
     @staticmethod
     cdef wrap_instance(FieldBase* fld)
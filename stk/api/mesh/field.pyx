@@ -8,17 +8,91 @@ from libc.stdint cimport int64_t, uint64_t
 from libcpp.string cimport string
 from libcpp.cast cimport dynamic_cast
 from libcpp.vector cimport vector
+from libc.string cimport memcpy
 from ..topology cimport topology as T
 from .entity cimport StkEntity
-from .bucket cimport StkBucket
+from .bucket cimport StkBucket, Bucket as BucketT
 from .meta cimport StkMetaData, put_field_on_mesh
-from .bulk cimport StkBulkData
+from .bulk cimport StkBulkData, BulkData, count_entities, mesh_cache
 from .part cimport StkPart
-from .selector cimport StkSelector
+from .selector cimport StkSelector, Selector
+from ..util.profiling cimport Profiler, get_profiler
 
 cimport numpy as np
 import numpy as np
 
+np.import_array()
+
+cdef Profiler _prof = get_profiler()
+
+cdef int bucket_field_ncomp(const FieldBase& fld, const BucketVector& bkts) nogil:
+    """Number of components of a field over a list of buckets
+
+    Returns -1 if the field is not defined on one of the buckets or if the
+    number of components varies between buckets.
+    """
+    cdef size_t nbkts = bkts.size()
+    cdef int ncomp = -1
+    cdef int bcomp
+    cdef size_t i
+    for i in range(nbkts):
+        bcomp = field_scalars_per_entity(fld, deref(bkts[i]))
+        if bcomp == 0 or (ncomp > 0 and bcomp != ncomp):
+            return -1
+        ncomp = bcomp
+    return ncomp
+
+cdef int copy_bucket_data(const FieldBase& fld, const BucketVector& bkts,
+                          void* buf, size_t ncomp, size_t stride,
+                          size_t col, size_t itemsize, bint to_field) nogil:
+    """Copy field data between buckets and a contiguous row-major buffer
+
+    Entity ``k`` (in bucket order) maps to ``buf[k * stride + col : k * stride
+    + col + ncomp]``, where the buffer holds scalars of ``itemsize`` bytes. If
+    ``to_field`` is True, data is copied from the buffer into the field,
+    otherwise from the field into the buffer.
+    """
+    cdef size_t nbkts = bkts.size()
+    cdef size_t offset = 0
+    cdef size_t bsize, i, j
+    cdef size_t nbytes = ncomp * itemsize
+    cdef size_t row = stride * itemsize
+    cdef char* fdata
+    cdef char* bdata
+    cdef char* cbuf = <char*>buf
+    for i in range(nbkts):
+        bsize = deref(<BucketT*>bkts[i]).size()
+        fdata = <char*>field_data(fld, deref(bkts[i]))
+        if stride == ncomp:
+            bdata = cbuf + offset * row
+            if to_field:
+                memcpy(fdata, bdata, bsize * nbytes)
+            else:
+                memcpy(bdata, fdata, bsize * nbytes)
+        else:
+            for j in range(bsize):
+                bdata = cbuf + (offset + j) * row + col * itemsize
+                if to_field:
+                    memcpy(fdata + j * nbytes, bdata, nbytes)
+                else:
+                    memcpy(bdata, fdata + j * nbytes, nbytes)
+        offset += bsize
+    return 0
+
+cdef const BucketVector* field_buckets(FieldBase* fld, StkSelector sel):
+    """Buckets of the field's entity rank matching the selector
+
+    If no selector is provided, all buckets where the field is defined are
+    returned.
+    """
+    cdef BulkData* bulk = &deref(fld).get_mesh()
+    cdef Selector ssel
+    if sel is None:
+        ssel = Selector(deref(fld))
+    else:
+        ssel = sel.sel
+    return &deref(bulk).get_buckets(deref(fld).entity_rank(), ssel)
+
 cdef class StkFieldBase:
     """stk::mesh::FieldBase
 
@@ -85,11 +159,28 @@ cdef class StkFieldBase:
         """Number of states available for this field"""
         return deref(self.fld).number_of_states()
 
+    @property
+    def dtype(self):
+        """NumPy data type of the field scalars
+
+        Supported types are ``float64``, ``float32``, ``int32``, ``int64`` and
+        ``uint8``.
+        """
+        cdef int typenum = field_type_num(deref(self.fld))
+        if typenum < 0:
+            raise TypeError("Unsupported data type for field %s"%self.name)
+        return np.PyArray_DescrFromType(typenum)
+
     @property
     def field_array_rank(self):
         """Array dimensionality"""
         return deref(self.fld).field_array_rank()
 
+    @property
+    def max_size(self):
+        """Maximum number of scalars per entity across all restrictions"""
+        return deref(self.fld).max_size()
+
     @property
     def entity_rank(self):
         """Entity rank on which the field is defined"""
@@ -142,6 +233,8 @@ cdef class StkFieldBase:
            pressure = pressure_field.get(entity)
            pressure[0] = 10.0
 
+        The dtype of the array matches the field data type (see :attr:`dtype`).
+
         Args:
             entity (StkEntity): Entity instance
 
@@ -152,14 +245,18 @@ cdef class StkFieldBase:
         cdef Entity sentity = entity.entity
         cdef void* ptr = field_data(deref(self.fld), sentity)
         cdef unsigned ncomp = field_scalars_per_entity(deref(self.fld), sentity)
-        return np.asarray(<double[:ncomp]>ptr)
+        return field_array(deref(self.fld), ptr, ncomp, 1, True)
 
     def bkt_view(self, StkBucket bkt):
         """Get the data view for a bucket
 
         For scalar fields, this method returns a 1-D array with ``bkt.size``
         elements. For vector fields, it returns a 2-D array of shape
-        ``(bkt.size, num_components)``.
+        ``(bkt.size, num_components)``. The dtype of the array matches the field
+        data type (see :attr:`dtype`).
+
+        The views are cached by :attr:`~stk.api.mesh.bulk.StkBulkData.cache`
+        and the same array is returned until the mesh changes.
 
         Args:
             bkt (StkBucket): Bucket instance
@@ -167,32 +264,122 @@ cdef class StkFieldBase:
         Return:
             np.ndarray: View of the bucket data as a NumPy array
         """
-        cdef Bucket* sbkt = bkt.bkt
-        cdef void* ptr = field_data(deref(self.fld), deref(sbkt))
-        cdef unsigned ncomp = field_scalars_per_entity(deref(self.fld), deref(sbkt))
-        if ncomp == 1:
-            return np.asarray(<double[:bkt.size]>ptr)
-        else:
-            return np.asarray(<double[:bkt.size, :ncomp]>ptr)
+        return mesh_cache(&deref(self.fld).get_mesh()).field_view(
+            self.fld, <BucketT*>bkt.bkt)
 
     def get_int(self, StkEntity entity):
-        """Get the data for a given entity"""
-        cdef Entity sentity = entity.entity
-        cdef void* ptr = field_data(deref(self.fld), sentity)
-        cdef unsigned ncomp = field_scalars_per_entity(deref(self.fld), sentity)
-        return np.asarray(<int[:ncomp]>ptr)
+        """Get the data for a given entity
+
+        Same as :meth:`get`, kept for backward compatibility.
+        """
+        return self.get(entity)
 
     def bkt_view_int(self, StkBucket bkt):
-        """Get the data view for a bucket"""
-        cdef Bucket* sbkt = bkt.bkt
-        cdef void* ptr = field_data(deref(self.fld), deref(sbkt))
-        cdef unsigned ncomp = field_scalars_per_entity(deref(self.fld), deref(sbkt))
+        """Get the data view for a bucket
+
+        Same as :meth:`bkt_view`, kept for backward compatibility.
+        """
+        return self.bkt_view(bkt)
+
+    def gather(self, StkSelector sel=None, out=None):
+        """Gather field data for all entities of a selector into one array
+
+        Entities are ordered bucket by bucket, i.e., the same order as
+        :meth:`~stk.api.mesh.bulk.StkBulkData.iter_entities`. For scalar
+        fields, this method returns a 1-D array with one entry per entity. For
+        vector fields, it returns a 2-D array of shape ``(n_entities,
+        num_components)``. An existing array can be passed as ``out`` to avoid
+        allocating a new one on every call.
+
+        .. code-block:: python
+
+           sel = meta.locally_owned_part
+           vel = velocity.gather(sel)
+           for step in range(nsteps):
+               velocity.gather(sel, out=vel)
+
+        Args:
+            sel (StkSelector): Selector (default: entities where the field is defined)
+            out (np.ndarray): Optional C-contiguous array of the field dtype to fill
+
+        Return:
+            np.ndarray: Copy of the field data for the selected entities
+        """
+        cdef const BucketVector* bkts = field_buckets(self.fld, sel)
+        cdef size_t nent = count_entities(deref(bkts))
+        cdef int ncomp = bucket_field_ncomp(deref(self.fld), deref(bkts))
+        cdef size_t itemsize = field_itemsize(deref(self.fld))
+        if nent == 0:
+            ncomp = max(deref(self.fld).max_size(), 1)
+        elif ncomp < 0:
+            raise RuntimeError(
+                "Field %s is not defined uniformly on selected buckets"%self.name)
         if ncomp == 1:
-            return np.asarray(<int[:bkt.size]>ptr)
+            shape = (nent,)
         else:
-            return np.asarray(<int[:bkt.size, :ncomp]>ptr)
+            shape = (nent, ncomp)
+
+        dtype = self.dtype
+        if out is None:
+            out = np.empty(shape, dtype=dtype)
+        assert out.shape == shape, "Size mismatch in output array"
+        assert out.dtype == dtype and out.flags.c_contiguous, \
+            "Output array must be a C-contiguous %s array"%dtype
+        if nent == 0:
+            return out
+
+        cdef double t0 = _prof.tic() if _prof.enabled else -1.0
+        cdef void* buf = np.PyArray_DATA(out)
+        with nogil:
+            copy_bucket_data(deref(self.fld), deref(bkts), buf,
+                             ncomp, ncomp, 0, itemsize, False)
+        if t0 >= 0.0:
+            _prof.toc("field.gather", t0, <double>itemsize * nent * ncomp)
+        return out
+
+    def scatter(self, values, StkSelector sel=None):
+        """Scatter values from a contiguous array into the field
+
+        This is the inverse of :meth:`gather`, the entities are expected in the
+        same order as returned by :meth:`gather` for the same selector.
+
+        Args:
+            values (np.ndarray): Array of shape ``(n_entities,)`` or ``(n_entities, num_components)``
+            sel (StkSelector): Selector (default: entities where the field is defined)
+        """
+        cdef const BucketVector* bkts = field_buckets(self.fld, sel)
+        cdef size_t nent = count_entities(deref(bkts))
+        cdef int ncomp = bucket_field_ncomp(deref(self.fld), deref(bkts))
+        if nent == 0:
+            return
+        if ncomp < 0:
+            raise RuntimeError(
+                "Field %s is not defined uniformly on selected buckets"%self.name)
+
+        cdef size_t itemsize = field_itemsize(deref(self.fld))
+        cdef np.ndarray arr = np.ascontiguousarray(values, dtype=self.dtype)
+        assert arr.size == nent * ncomp, "Size mismatch in input array"
+        cdef double t0 = _prof.tic() if _prof.enabled else -1.0
+        cdef void* buf = np.PyArray_DATA(arr)
+        with nogil:
+            copy_bucket_data(deref(self.fld), deref(bkts), buf,
+                             ncomp, ncomp, 0, itemsize, True)
+        if t0 >= 0.0:
+            _prof.toc("field.scatter", t0, <double>itemsize * nent * ncomp)
+
+    cdef np.ndarray _init_array(self, int num_components, init_value):
+        """Initial value converted to the field data type
+
+        STK reads the initial value with the data type of the field, the
+        pointer is only cast to match the declaration.
+        """
+        if init_value is None:
+            return None
+        cdef np.ndarray arr = np.ascontiguousarray(init_value, dtype=self.dtype).ravel()
+        assert num_components == arr.shape[0], "Size mismatch in initial value"
+        return arr
 
-    def add_to_part(self, StkPart part, int num_components=1, double[:] init_value=None):
+    def add_to_part(self, StkPart part, int num_components=1, init_value=None):
         """Register field to a given part
 
         Args:
@@ -202,17 +389,17 @@ cdef class StkFieldBase:
         """
         cdef Part* spart = part.part
         cdef FieldBase* sfield = self.fld
+        cdef np.ndarray init_arr = self._init_array(num_components, init_value)
         cdef double* init_ptr = NULL
-        if init_value is not None:
-            assert num_components == init_value.shape[0], "Size mismatch in initial value"
-            init_ptr = &init_value[0]
+        if init_arr is not None:
+            init_ptr = <double*>np.PyArray_DATA(init_arr)
         if num_components == 1:
             put_field_on_mesh(deref(sfield), deref(spart), init_ptr)
         else:
             put_field_on_mesh(deref(sfield), deref(spart), num_components, init_ptr)
 
     def add_to_selected(self, StkSelector sel,
-                        int num_components=1, double[:] init_value=None):
+                        int num_components=1, init_value=None):
         """Register field to parts matching the given selector
 
         Args:
@@ -222,10 +409,10 @@ cdef class StkFieldBase:
         """
         cdef Selector ssel = sel.sel
         cdef FieldBase* sfield = self.fld
+        cdef np.ndarray init_arr = self._init_array(num_components, init_value)
         cdef double* init_ptr = NULL
-        if init_value is not None:
-            assert num_components == init_value.shape[0], "Size mismatch in initial value"
-            init_ptr = &init_value[0]
+        if init_arr is not None:
+            init_ptr = <double*>np.PyArray_DATA(init_arr)
         if num_components == 1:
             put_field_on_mesh(deref(sfield), ssel, init_ptr)
         else:
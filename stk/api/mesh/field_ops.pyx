@@ -9,26 +9,63 @@ STK field operations
 This module exposes the BLAS and parallel operations defined on fields by the
 STK library.
 
-For the BLAS operations, the default functions (matching the STK library) are
-implemented by default for ``double`` data type. The templated versions for
-other data types are implemented with a ``_t`` suffix. For example,
-``stk::mesh::field_fill`` is exposed as ``fill`` for ``double``, and a
-*templated* version is exposed for other data types as ``fill_t``.
+The BLAS operations (e.g., ``stk::mesh::field_fill`` exposed as :func:`fill`)
+dispatch on the data type of the fields (see
+:attr:`~stk.api.mesh.field.StkFieldBase.dtype`) and convert the scalar
+coefficients to that type. The *templated* versions with a ``_t`` suffix
+(e.g., ``fill_t``) select the data type explicitly. The gather/scatter
+functions preserve the field data type, while :func:`evaluate` and the
+reductions compute in double precision for all data types.
+
+In addition to the STK functions, this module provides :func:`gather_fields`
+and :func:`scatter_fields` to move data for several fields between STK buckets
+and a single contiguous NumPy array, :func:`evaluate` to apply a fused
+elementwise expression over fields in a single pass, and global reductions
+(:func:`dot`, :func:`nrm2`, :func:`reduce_many`, etc.) that combine the
+contributions from all MPI ranks. :class:`TimeStepper` rotates the states of
+multi-state fields between time steps without copying the field data.
+
+The parallel communication functions release the GIL while they run. Their
+``begin_*`` variants (e.g., :func:`begin_parallel_sum`) return a
+:class:`FieldCommRequest` immediately so that computations can overlap the
+communication; call :meth:`FieldCommRequest.wait` before using the fields.
 
 """
 
 cimport cython
 from cython.operator cimport dereference as deref
+from libc cimport math
+from libc.stdint cimport int64_t, uint8_t
+from libc.string cimport memcpy
 from libcpp.vector cimport vector
 from libcpp.string cimport string
 from . cimport field_parallel as fp
 from . cimport field_blas as fb
 
+from .stk_mesh_fwd cimport BucketVector
+from .bucket cimport Bucket
+from ..util.parallel cimport allreduce_sum_max
+from ..util.parallel cimport mpi_thread_level, MPI_THREAD_MULTIPLE
+from ..util.profiling cimport Profiler, get_profiler, wall_time
 from .meta cimport MetaData
-from .bulk cimport StkBulkData
-from .field cimport FieldBase, StkFieldBase
-from .selector cimport StkSelector
+from .bulk cimport StkBulkData, BulkData, count_entities
+from .field cimport FieldBase, StkFieldBase, field_data, field_scalars_per_entity
+from .field cimport bucket_field_ncomp, copy_bucket_data
+from .field cimport field_scalar_t, field_type_num, field_itemsize
+from .field import FieldState
+from .selector cimport StkSelector, Selector
 from .ghosting cimport StkGhosting, Ghosting
+from . cimport stk_mesh_fwd as fwd
+
+cimport numpy as np
+import numpy as np
+import ast
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+np.import_array()
+
+cdef Profiler _prof = get_profiler()
 
 cdef pyfields_to_cfields(list fields, vector[const FieldBase*]& cfields):
     cdef FieldBase* cfield
@@ -39,12 +76,139 @@ cdef pyfields_to_cfields(list fields, vector[const FieldBase*]& cfields):
         cfield = pyfield.fld
         cfields.push_back(cfield)
 
+cdef double fields_bytes(list fields, const Selector* sel) except -1.0:
+    """Bytes of field data on the selected entities (for profiling)
+
+    All entities where the fields are defined are included if ``sel`` is NULL.
+    """
+    cdef StkFieldBase pyfield
+    cdef BulkData* bulk
+    cdef const BucketVector* bkts
+    cdef Selector fsel
+    cdef double nbytes = 0.0
+    cdef double nscalars
+    cdef size_t ib
+    for pyfield in fields:
+        bulk = &deref(pyfield.fld).get_mesh()
+        fsel = Selector(deref(pyfield.fld))
+        if sel != NULL:
+            fsel = deref(sel) & fsel
+        bkts = &deref(bulk).get_buckets(deref(pyfield.fld).entity_rank(), fsel)
+        nscalars = 0.0
+        for ib in range(deref(bkts).size()):
+            nscalars += (<double>field_scalars_per_entity(
+                deref(pyfield.fld), deref(deref(bkts)[ib])) *
+                         deref(<Bucket*>deref(bkts)[ib]).size())
+        nbytes += nscalars * field_itemsize(deref(pyfield.fld))
+    return nbytes
+
+cdef double selected_bytes(list fields, StkSelector sel) except -1.0:
+    """Bytes of field data of the entities in an optional selector"""
+    if sel is None:
+        return fields_bytes(fields, NULL)
+    return fields_bytes(fields, &sel.sel)
+
+cdef double shared_bytes(StkBulkData bulk, list fields, bint ghosts) except -1.0:
+    """Bytes of field data of the shared (and ghosted) entities"""
+    cdef MetaData* meta = <MetaData*>&deref(bulk.bulk).mesh_meta_data()
+    cdef Selector sel
+    if ghosts:
+        sel = Selector(deref(meta).locally_owned_part()).complement()
+    else:
+        sel = Selector(deref(meta).globally_shared_part())
+    return fields_bytes(fields, &sel)
+
+cdef int blas_type_num(StkFieldBase field, StkFieldBase other=None) except -1:
+    """NumPy type number of the field(s) used by a BLAS operation"""
+    cdef int typenum = field_type_num(deref(field.fld))
+    if typenum < 0:
+        raise TypeError("Unsupported data type for field %s"%field.name)
+    if other is not None and field_type_num(deref(other.fld)) != typenum:
+        raise TypeError("Fields %s and %s have different data types"%(
+            field.name, other.name))
+    return typenum
+
+cdef int common_type_num(list fields) except -1:
+    """NumPy type number shared by a list of fields"""
+    cdef StkFieldBase pyfield = fields[0]
+    cdef int typenum = blas_type_num(pyfield)
+    for pyfield in fields:
+        if blas_type_num(pyfield) != typenum:
+            raise TypeError("Fields must have the same data type")
+    return typenum
+
+cdef double* as_doubles(void* ptr, int typenum, size_t n,
+                        vector[double]& scratch) nogil:
+    """Field data as doubles, converted into ``scratch`` if necessary"""
+    if typenum == np.NPY_DOUBLE:
+        return <double*>ptr
+    scratch.resize(n)
+    cdef double* out = scratch.data()
+    cdef size_t j
+    if typenum == np.NPY_FLOAT:
+        for j in range(n):
+            out[j] = (<float*>ptr)[j]
+    elif typenum == np.NPY_INT:
+        for j in range(n):
+            out[j] = (<int*>ptr)[j]
+    elif typenum == np.NPY_INT64:
+        for j in range(n):
+            out[j] = (<int64_t*>ptr)[j]
+    elif typenum == np.NPY_LONG:
+        for j in range(n):
+            out[j] = (<long*>ptr)[j]
+    elif typenum == np.NPY_UINT8:
+        for j in range(n):
+            out[j] = (<uint8_t*>ptr)[j]
+    return out
+
+cdef void from_doubles(const double* src, void* ptr, int typenum, size_t n) nogil:
+    """Store doubles into field data of another type (C conversion)"""
+    cdef size_t j
+    if typenum == np.NPY_DOUBLE:
+        if src != <double*>ptr:
+            memcpy(ptr, src, n * sizeof(double))
+    elif typenum == np.NPY_FLOAT:
+        for j in range(n):
+            (<float*>ptr)[j] = <float>src[j]
+    elif typenum == np.NPY_INT:
+        for j in range(n):
+            (<int*>ptr)[j] = <int>src[j]
+    elif typenum == np.NPY_INT64:
+        for j in range(n):
+            (<int64_t*>ptr)[j] = <int64_t>src[j]
+    elif typenum == np.NPY_LONG:
+        for j in range(n):
+            (<long*>ptr)[j] = <long>src[j]
+    elif typenum == np.NPY_UINT8:
+        for j in range(n):
+            (<uint8_t*>ptr)[j] = <uint8_t>src[j]
+
 def communicate_field_data(StkGhosting ghosting, list fields):
-    """Communicate field data for a given ghosting"""
+    """Communicate field data from the owned entities to their ghosts
+
+    Args:
+        ghosting (StkGhosting): Ghosting instance, e.g., ``bulk.aura_ghosting``
+            or a custom ghosting from :meth:`StkBulkData.create_ghosting`
+        fields (list): A list of StkFieldBase instances
+    """
+    cdef double t0 = _prof.tic() if _prof.enabled else -1.0
+    cdef double t1
     cdef const Ghosting* sghost = ghosting.ghosting
     cdef vector[const FieldBase*] sfields
     pyfields_to_cfields(fields, sfields)
-    fp.communicate_field_data(deref(sghost), sfields)
+    with nogil:
+        fp.communicate_field_data(deref(sghost), sfields)
+    cdef BulkData* bulk
+    cdef Selector gsel
+    cdef double nbytes = 0.0
+    if t0 >= 0.0:
+        t1 = wall_time()
+        if sfields.size() > 0:
+            bulk = &deref(sfields[0]).get_mesh()
+            gsel = Selector(deref(bulk).ghosting_part(deref(<fwd.Ghosting*>sghost)))
+            nbytes = fields_bytes(fields, &gsel)
+        _prof.toc("field_ops.communicate_field_data", t0, nbytes, t1)
 
 def copy_owned_to_shared(StkBulkData bulk, list fields):
     """Copy data from owned entities to the shared entities
@@ -53,9 +217,16 @@ def copy_owned_to_shared(StkBulkData bulk, list fields):
         bulk (StkBulkData): BulkData instance
         fields (list): A list of StkFieldBase instances
     """
+    cdef double t0 = _prof.tic() if _prof.enabled else -1.0
+    cdef double t1
     cdef vector[const FieldBase*] sfields
     pyfields_to_cfields(fields, sfields)
-    fp.copy_owned_to_shared(deref(bulk.bulk), sfields)
+    with nogil:
+        fp.copy_owned_to_shared(deref(bulk.bulk), sfields)
+    if t0 >= 0.0:
+        t1 = wall_time()
+        _prof.toc("field_ops.copy_owned_to_shared", t0,
+                  shared_bytes(bulk, fields, False), t1)
 
 def parallel_sum(StkBulkData bulk, list fields):
     """Parallel sum across all shared entities for a given list of fields
@@ -64,9 +235,16 @@ def parallel_sum(StkBulkData bulk, list fields):
         bulk (StkBulkData): BulkData instance
         fields (list): A list of StkFieldBase instances
     """
+    cdef double t0 = _prof.tic() if _prof.enabled else -1.0
+    cdef double t1
     cdef vector[const FieldBase*] sfields
     pyfields_to_cfields(fields, sfields)
-    fp.parallel_sum(deref(bulk.bulk), sfields)
+    with nogil:
+        fp.parallel_sum(deref(bulk.bulk), sfields)
+    if t0 >= 0.0:
+        t1 = wall_time()
+        _prof.toc("field_ops.parallel_sum", t0,
+                  shared_bytes(bulk, fields, False), t1)
 
 def parallel_max(StkBulkData bulk, list fields):
     """Parallel max
@@ -75,9 +253,16 @@ def parallel_max(StkBulkData bulk, list fields):
         bulk (StkBulkData): BulkData instance
         fields (list): A list of StkFieldBase instances
     """
+    cdef double t0 = _prof.tic() if _prof.enabled else -1.0
+    cdef double t1
     cdef vector[const FieldBase*] sfields
     pyfields_to_cfields(fields, sfields)
-    fp.parallel_max(deref(bulk.bulk), sfields)
+    with nogil:
+        fp.parallel_max(deref(bulk.bulk), sfields)
+    if t0 >= 0.0:
+        t1 = wall_time()
+        _prof.toc("field_ops.parallel_max", t0,
+                  shared_bytes(bulk, fields, False), t1)
 
 def parallel_min(StkBulkData bulk, list fields):
     """Parallel min
@@ -86,69 +271,261 @@ def parallel_min(StkBulkData bulk, list fields):
         bulk (StkBulkData): BulkData instance
         fields (list): A list of StkFieldBase instances
     """
+    cdef double t0 = _prof.tic() if _prof.enabled else -1.0
+    cdef double t1
     cdef vector[const FieldBase*] sfields
     pyfields_to_cfields(fields, sfields)
-    fp.parallel_min(deref(bulk.bulk), sfields)
+    with nogil:
+        fp.parallel_min(deref(bulk.bulk), sfields)
+    if t0 >= 0.0:
+        t1 = wall_time()
+        _prof.toc("field_ops.parallel_min", t0,
+                  shared_bytes(bulk, fields, False), t1)
 
 def parallel_sum_including_ghosts(StkBulkData bulk, list fields):
     """Parallel sum"""
+    cdef double t0 = _prof.tic() if _prof.enabled else -1.0
+    cdef double t1
     cdef vector[const FieldBase*] sfields
     pyfields_to_cfields(fields, sfields)
-    fp.parallel_sum_including_ghosts(deref(bulk.bulk), sfields)
+    with nogil:
+        fp.parallel_sum_including_ghosts(deref(bulk.bulk), sfields)
+    if t0 >= 0.0:
+        t1 = wall_time()
+        _prof.toc("field_ops.parallel_sum_including_ghosts", t0,
+                  shared_bytes(bulk, fields, True), t1)
 
 def parallel_max_including_ghosts(StkBulkData bulk, list fields):
     """Parallel max"""
+    cdef double t0 = _prof.tic() if _prof.enabled else -1.0
+    cdef double t1
     cdef vector[const FieldBase*] sfields
     pyfields_to_cfields(fields, sfields)
-    fp.parallel_max_including_ghosts(deref(bulk.bulk), sfields)
+    with nogil:
+        fp.parallel_max_including_ghosts(deref(bulk.bulk), sfields)
+    if t0 >= 0.0:
+        t1 = wall_time()
+        _prof.toc("field_ops.parallel_max_including_ghosts", t0,
+                  shared_bytes(bulk, fields, True), t1)
 
 def parallel_min_including_ghosts(StkBulkData bulk, list fields):
     """Parallel min"""
+    cdef double t0 = _prof.tic() if _prof.enabled else -1.0
+    cdef double t1
     cdef vector[const FieldBase*] sfields
     pyfields_to_cfields(fields, sfields)
-    fp.parallel_min_including_ghosts(deref(bulk.bulk), sfields)
+    with nogil:
+        fp.parallel_min_including_ghosts(deref(bulk.bulk), sfields)
+    if t0 >= 0.0:
+        t1 = wall_time()
+        _prof.toc("field_ops.parallel_min_including_ghosts", t0,
+                  shared_bytes(bulk, fields, True), t1)
+
+#: Single worker thread that issues the non-blocking field communications. Using
+#: one worker guarantees that background MPI calls are serialized.
+_comm_executor = None
+
+class FieldCommRequest:
+    """Handle to a field communication started by one of the ``begin_*`` functions
+
+    The communication runs on a background thread with the GIL released, so
+    that the calling thread can perform computations that do not touch the
+    fields being communicated. The caller may issue other MPI calls in the
+    meantime, e.g., global reductions, but must not call the blocking field
+    communication functions until :meth:`wait` returns.
+    """
 
+    def __init__(self, future=None):
+        self._future = future
+
+    @property
+    def is_async(self):
+        """Is the communication running on a background thread"""
+        return self._future is not None
+
+    def test(self):
+        """Return True if the communication has completed"""
+        return self._future is None or self._future.done()
+
+    def wait(self):
+        """Block until the communication has completed
+
+        Exceptions raised during the communication are re-raised here.
+        """
+        if self._future is not None:
+            self._future.result()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.wait()
+
+def _begin_comm(func, *args):
+    """Run ``func(*args)`` in the background and return a FieldCommRequest
+
+    If the MPI library was not initialized with ``MPI_THREAD_MULTIPLE``
+    support, the communication is performed immediately and a completed
+    request is returned. ``MPI_THREAD_SERIALIZED`` is not sufficient because
+    the calling thread may issue unrelated MPI calls (e.g., reductions) while
+    the communication is in flight.
+    """
+    global _comm_executor
+    if mpi_thread_level() < MPI_THREAD_MULTIPLE:
+        func(*args)
+        return FieldCommRequest()
+    if _comm_executor is None:
+        _comm_executor = ThreadPoolExecutor(max_workers=1)
+    return FieldCommRequest(_comm_executor.submit(func, *args))
+
+def begin_communicate_field_data(StkGhosting ghosting, list fields):
+    """Non-blocking version of :func:`communicate_field_data`
+
+    Return:
+        FieldCommRequest: Handle to wait on for completion
+    """
+    return _begin_comm(communicate_field_data, ghosting, list(fields))
+
+def begin_copy_owned_to_shared(StkBulkData bulk, list fields):
+    """Non-blocking version of :func:`copy_owned_to_shared`
+
+    Return:
+        FieldCommRequest: Handle to wait on for completion
+    """
+    return _begin_comm(copy_owned_to_shared, bulk, list(fields))
+
+def begin_parallel_sum(StkBulkData bulk, list fields):
+    """Non-blocking version of :func:`parallel_sum`
+
+    Return:
+        FieldCommRequest: Handle to wait on for completion
+    """
+    return _begin_comm(parallel_sum, bulk, list(fields))
+
+def begin_parallel_max(StkBulkData bulk, list fields):
+    """Non-blocking version of :func:`parallel_max`
+
+    Return:
+        FieldCommRequest: Handle to wait on for completion
+    """
+    return _begin_comm(parallel_max, bulk, list(fields))
+
+def begin_parallel_min(StkBulkData bulk, list fields):
+    """Non-blocking version of :func:`parallel_min`
+
+    Return:
+        FieldCommRequest: Handle to wait on for completion
+    """
+    return _begin_comm(parallel_min, bulk, list(fields))
 
-def axpy(double alpha, StkFieldBase xfield, StkFieldBase yfield, StkSelector sel = None):
+
+cdef void typed_axpy(field_scalar_t alpha, StkFieldBase xfield, StkFieldBase yfield,
+                     StkSelector sel):
+    if sel is None:
+        fb.field_axpy(alpha, deref(xfield.fld), deref(yfield.fld))
+    else:
+        fb.field_axpy(alpha, deref(xfield.fld), deref(yfield.fld), sel.sel)
+
+cdef void typed_fill(field_scalar_t alpha, StkFieldBase field, StkSelector sel):
+    if sel is None:
+        fb.field_fill(alpha, deref(field.fld))
+    else:
+        fb.field_fill(alpha, deref(field.fld), sel.sel)
+
+cdef void typed_fill_component(const field_scalar_t* alpha, StkFieldBase field,
+                               StkSelector sel):
+    if sel is None:
+        fb.field_fill_component(alpha, deref(field.fld))
+    else:
+        fb.field_fill_component(alpha, deref(field.fld), sel.sel)
+
+def axpy(alpha, StkFieldBase xfield, StkFieldBase yfield, StkSelector sel = None):
     """y = alpha * x + y
 
+    Both fields must have the same data type, ``alpha`` is converted to it.
+
     Args:
         alpha (double): Constant coefficient
         xfield (StkFieldBase): Source field
         yfield (StkFieldBase): Destination field
         sel (StkSelector): A selector to restrict where the BLAS operation is carried out
     """
-    if sel is None:
-        fb.field_axpy(alpha, deref(xfield.fld), deref(yfield.fld))
+    cdef double t0 = _prof.tic() if _prof.enabled else -1.0
+    cdef double t1
+    cdef int typenum = blas_type_num(xfield, yfield)
+    if typenum == np.NPY_DOUBLE:
+        typed_axpy(<double>alpha, xfield, yfield, sel)
+    elif typenum == np.NPY_FLOAT:
+        typed_axpy(<float>alpha, xfield, yfield, sel)
+    elif typenum == np.NPY_INT:
+        typed_axpy(<int>alpha, xfield, yfield, sel)
+    elif typenum == np.NPY_INT64:
+        typed_axpy(<int64_t>alpha, xfield, yfield, sel)
+    elif typenum == np.NPY_LONG:
+        typed_axpy(<long>alpha, xfield, yfield, sel)
     else:
-        fb.field_axpy(alpha, deref(xfield.fld), deref(yfield.fld), sel.sel)
+        typed_axpy(<uint8_t>alpha, xfield, yfield, sel)
+    if t0 >= 0.0:
+        t1 = wall_time()
+        _prof.toc("field_ops.axpy", t0, selected_bytes([xfield, yfield], sel), t1)
 
-def fill(double alpha, StkFieldBase field, StkSelector sel = None):
+def fill(alpha, StkFieldBase field, StkSelector sel = None):
     """field[:] = alpha
 
     Args:
 
-        alpha (double): Constant coefficient
+        alpha (double): Constant coefficient (converted to the field data type)
         field (StkFieldBase): Field to be updated
         sel (StkSelector): A selector to restrict where the BLAS operation is carried out
     """
-    if sel is None:
-        fb.field_fill(alpha, deref(field.fld))
+    cdef double t0 = _prof.tic() if _prof.enabled else -1.0
+    cdef double t1
+    cdef int typenum = blas_type_num(field)
+    if typenum == np.NPY_DOUBLE:
+        typed_fill(<double>alpha, field, sel)
+    elif typenum == np.NPY_FLOAT:
+        typed_fill(<float>alpha, field, sel)
+    elif typenum == np.NPY_INT:
+        typed_fill(<int>alpha, field, sel)
+    elif typenum == np.NPY_INT64:
+        typed_fill(<int64_t>alpha, field, sel)
+    elif typenum == np.NPY_LONG:
+        typed_fill(<long>alpha, field, sel)
     else:
-        fb.field_fill(alpha, deref(field.fld), sel.sel)
+        typed_fill(<uint8_t>alpha, field, sel)
+    if t0 >= 0.0:
+        t1 = wall_time()
+        _prof.toc("field_ops.fill", t0, selected_bytes([field], sel), t1)
 
-def fill_component(double[:] alpha, StkFieldBase field, StkSelector sel = None):
+def fill_component(alpha, StkFieldBase field, StkSelector sel = None):
     """field[:] = alpha[:]
 
     Args:
-        alpha (double):  Component values
+        alpha (np.ndarray):  Component values (converted to the field data type)
         field (StkFieldBase): Field to be updated
         sel (StkSelector): A selector to restrict where the BLAS operation is carried out
     """
-    if sel is None:
-        fb.field_fill_component(&alpha[0], deref(field.fld))
+    cdef double t0 = _prof.tic() if _prof.enabled else -1.0
+    cdef double t1
+    cdef int typenum = blas_type_num(field)
+    cdef np.ndarray arr = np.ascontiguousarray(alpha, dtype=field.dtype).ravel()
+    cdef void* ptr = np.PyArray_DATA(arr)
+    if typenum == np.NPY_DOUBLE:
+        typed_fill_component(<double*>ptr, field, sel)
+    elif typenum == np.NPY_FLOAT:
+        typed_fill_component(<float*>ptr, field, sel)
+    elif typenum == np.NPY_INT:
+        typed_fill_component(<int*>ptr, field, sel)
+    elif typenum == np.NPY_INT64:
+        typed_fill_component(<int64_t*>ptr, field, sel)
+    elif typenum == np.NPY_LONG:
+        typed_fill_component(<long*>ptr, field, sel)
     else:
-        fb.field_fill_component(&alpha[0], deref(field.fld), sel.sel)
+        typed_fill_component(<uint8_t*>ptr, field, sel)
+    if t0 >= 0.0:
+        t1 = wall_time()
+        _prof.toc("field_ops.fill_component", t0,
+                  selected_bytes([field], sel), t1)
 
 def axpy_t(cython.numeric alpha, StkFieldBase xfield, StkFieldBase yfield, StkSelector sel = None):
     """y = alpha * x + y"""
@@ -179,10 +556,15 @@ def copy(StkFieldBase xfield, StkFieldBase yfield, StkSelector sel=None):
         yfield (StkFieldBase): Destination field
         sel (StkSelector): Restrict copy to only entities belonging to selector
     """
+    cdef double t0 = _prof.tic() if _prof.enabled else -1.0
+    cdef double t1
     if sel is None:
         fb.field_copy(deref(xfield.fld), deref(yfield.fld))
     else:
         fb.field_copy(deref(xfield.fld), deref(yfield.fld), sel.sel)
+    if t0 >= 0.0:
+        t1 = wall_time()
+        _prof.toc("field_ops.copy", t0, selected_bytes([xfield, yfield], sel), t1)
 
 def swap(StkFieldBase xfield, StkFieldBase yfield, StkSelector sel=None):
     """Swap the contents of x and y fields
@@ -192,7 +574,838 @@ def swap(StkFieldBase xfield, StkFieldBase yfield, StkSelector sel=None):
         yfield (StkFieldBase): Field for swapping
         sel (StkSelector): Restrict swap to only entities belonging to selector
     """
+    cdef double t0 = _prof.tic() if _prof.enabled else -1.0
+    cdef double t1
     if sel is None:
         fb.field_swap(deref(xfield.fld), deref(yfield.fld))
     else:
         fb.field_swap(deref(xfield.fld), deref(yfield.fld), sel.sel)
+    if t0 >= 0.0:
+        t1 = wall_time()
+        _prof.toc("field_ops.swap", t0, selected_bytes([xfield, yfield], sel), t1)
+
+class TimeStepper:
+    """Manage the state rotation of multi-state fields during time integration
+
+    :meth:`advance` rotates the states of all managed fields with
+    :meth:`~stk.api.mesh.bulk.StkBulkData.update_field_data_states`, which
+    swaps pointers instead of copying the data between states. Bucket views
+    returned by :meth:`bucket_views` are cached and fetched again
+    automatically whenever the field data moves.
+
+    .. code-block:: python
+
+       stepper = field_ops.TimeStepper([velocity, pressure], time=0.0)
+       for step in range(nsteps):
+           stepper.advance(dt)
+           vel_new = stepper.bucket_views(velocity, StkState.StateNP1)
+           vel_old = stepper.bucket_views(velocity, StkState.StateN)
+           ...
+
+    Args:
+        fields (list): Fields with more than one state
+        time (float): Initial time
+    """
+
+    def __init__(self, list fields, double time=0.0):
+        if not fields:
+            raise ValueError("TimeStepper requires at least one field")
+        cdef StkFieldBase fld
+        for fld in fields:
+            if fld.number_of_states < 2:
+                raise ValueError("Field %s has a single state"%fld.name)
+        self.fields = [fld.field_state(FieldState.StateNP1) for fld in fields]
+        self.bulk = self.fields[0].bulk_data
+        for fld in self.fields:
+            if not (fld.bulk_data == self.bulk):
+                raise ValueError("Fields must belong to the same mesh")
+        self.time = time
+        self.step = 0
+        self._epoch = None
+        self._views = {}
+
+    def advance(self, double dt, bint copy_new_state=False):
+        """Rotate the field states and advance the time
+
+        Args:
+            dt (float): Time step
+            copy_new_state (bool): Initialize ``StateNP1`` with the values of
+                ``StateN`` (for predictors) instead of the oldest state
+        """
+        self.bulk.update_field_data_states(self.fields)
+        if copy_new_state:
+            for fld in self.fields:
+                copy(fld.field_state(FieldState.StateN), fld)
+        self.time += dt
+        self.step += 1
+
+    def bucket_views(self, StkFieldBase field, state=FieldState.StateNP1):
+        """NumPy views of a field state for all buckets where it is defined
+
+        Args:
+            field (StkFieldBase): Field (any state)
+            state (FieldState): Requested state
+
+        Return:
+            list: Bucket views in bucket order
+        """
+        epoch = self.bulk.field_data_epoch
+        if epoch != self._epoch:
+            self._views.clear()
+            self._epoch = epoch
+        fld = field.field_state(state)
+        views = self._views.get(fld.field_ordinal, None)
+        if views is None:
+            sel = StkSelector.select_field(fld)
+            views = [fld.bkt_view(bkt)
+                     for bkt in self.bulk.iter_buckets(sel, fld.entity_rank)]
+            self._views[fld.field_ordinal] = views
+        return views
+
+cdef const BucketVector* fields_buckets(list fields, StkSelector sel,
+                                        vector[int]& ncomps) except NULL:
+    """Common buckets for a list of fields and the components per field"""
+    cdef StkFieldBase pyfield = fields[0]
+    cdef FieldBase* fld = pyfield.fld
+    cdef BulkData* bulk = &deref(fld).get_mesh()
+    cdef Selector ssel = Selector(deref(fld))
+    cdef const BucketVector* bkts
+    cdef size_t nent
+    cdef int ncomp
+
+    for pyfield in fields:
+        assert deref(pyfield.fld).entity_rank() == deref(fld).entity_rank(), \
+            "Fields must be defined on the same entity rank"
+        ssel = ssel & Selector(deref(pyfield.fld))
+    if sel is not None:
+        ssel = sel.sel & ssel
+    bkts = &deref(bulk).get_buckets(deref(fld).entity_rank(), ssel)
+    nent = count_entities(deref(bkts))
+
+    for pyfield in fields:
+        ncomp = bucket_field_ncomp(deref(pyfield.fld), deref(bkts))
+        if nent == 0:
+            ncomp = max(deref(pyfield.fld).max_size(), 1)
+        elif ncomp < 0:
+            raise RuntimeError(
+                "Field %s is not defined uniformly on selected buckets"%pyfield.name)
+        ncomps.push_back(ncomp)
+    return bkts
+
+def gather_fields(list fields, StkSelector sel=None, out=None):
+    """Gather data for several fields into one contiguous array
+
+    The components of the fields are stacked column-wise in the order the
+    fields are provided, i.e., gathering ``[pressure, velocity]`` returns an
+    array of shape ``(n_entities, 4)`` with pressure in the first column. The
+    entities are selected from the intersection of the selector and the parts
+    where all the fields are defined.
+
+    Args:
+        fields (list): A list of StkFieldBase instances on the same entity rank
+            and of the same data type
+        sel (StkSelector): Restrict the entities to those belonging to the selector
+        out (np.ndarray): Optional C-contiguous array of the fields' dtype to fill
+
+    Return:
+        np.ndarray: Array of shape ``(n_entities, total_components)``
+    """
+    cdef double t0 = _prof.tic() if _prof.enabled else -1.0
+    dtype = np.PyArray_DescrFromType(common_type_num(fields))
+    cdef size_t itemsize = dtype.itemsize
+    cdef vector[int] ncomps
+    cdef const BucketVector* bkts = fields_buckets(fields, sel, ncomps)
+    cdef size_t nent = count_entities(deref(bkts))
+    cdef size_t stride = 0
+    cdef size_t col = 0
+    cdef size_t i
+    for i in range(ncomps.size()):
+        stride += ncomps[i]
+
+    shape = (nent, stride)
+    if out is None:
+        out = np.empty(shape, dtype=dtype)
+    assert out.shape == shape, "Size mismatch in output array"
+    assert out.dtype == dtype and out.flags.c_contiguous, \
+        "Output array must be a C-contiguous %s array"%dtype
+    if nent == 0:
+        return out
+
+    cdef void* buf = np.PyArray_DATA(out)
+    cdef vector[const FieldBase*] sfields
+    pyfields_to_cfields(fields, sfields)
+    with nogil:
+        for i in range(sfields.size()):
+            copy_bucket_data(deref(sfields[i]), deref(bkts), buf,
+                             ncomps[i], stride, col, itemsize, False)
+            col += ncomps[i]
+    if t0 >= 0.0:
+        _prof.toc("field_ops.gather_fields", t0, <double>itemsize * nent * stride)
+    return out
+
+def scatter_fields(list fields, values, StkSelector sel=None):
+    """Scatter a contiguous array into several fields
+
+    This is the inverse of :func:`gather_fields` for the same list of fields
+    and selector.
+
+    Args:
+        fields (list): A list of StkFieldBase instances on the same entity rank
+            and of the same data type
+        values (np.ndarray): Array of shape ``(n_entities, total_components)``
+        sel (StkSelector): Restrict the entities to those belonging to the selector
+    """
+    cdef double t0 = _prof.tic() if _prof.enabled else -1.0
+    dtype = np.PyArray_DescrFromType(common_type_num(fields))
+    cdef size_t itemsize = dtype.itemsize
+    cdef vector[int] ncomps
+    cdef const BucketVector* bkts = fields_buckets(fields, sel, ncomps)
+    cdef size_t nent = count_entities(deref(bkts))
+    cdef size_t stride = 0
+    cdef size_t col = 0
+    cdef size_t i
+    for i in range(ncomps.size()):
+        stride += ncomps[i]
+    if nent == 0:
+        return
+
+    cdef np.ndarray arr = np.ascontiguousarray(values, dtype=dtype)
+    assert arr.size == nent * stride, "Size mismatch in input array"
+    cdef void* buf = np.PyArray_DATA(arr)
+    cdef vector[const FieldBase*] sfields
+    pyfields_to_cfields(fields, sfields)
+    with nogil:
+        for i in range(sfields.size()):
+            copy_bucket_data(deref(sfields[i]), deref(bkts), buf,
+                             ncomps[i], stride, col, itemsize, True)
+            col += ncomps[i]
+    if t0 >= 0.0:
+        _prof.toc("field_ops.scatter_fields", t0, <double>itemsize * nent * stride)
+
+cdef enum ExprOpCode:
+    OP_FIELD, OP_SCALAR, OP_CONST,
+    OP_ADD, OP_SUB, OP_MUL, OP_DIV, OP_POW, OP_NEG,
+    OP_SQRT, OP_ABS, OP_EXP, OP_LOG, OP_SIN, OP_COS, OP_TAN, OP_TANH,
+    OP_MIN, OP_MAX
+
+DEF EXPR_MAX_STACK = 64
+#: Number of values processed per opcode by the expression evaluator
+DEF EXPR_BLOCK = 256
+
+_expr_binops = {
+    ast.Add: OP_ADD, ast.Sub: OP_SUB, ast.Mult: OP_MUL,
+    ast.Div: OP_DIV, ast.Pow: OP_POW,
+}
+
+_expr_funcs = {
+    "sqrt": (OP_SQRT, 1), "abs": (OP_ABS, 1), "exp": (OP_EXP, 1),
+    "log": (OP_LOG, 1), "sin": (OP_SIN, 1), "cos": (OP_COS, 1),
+    "tan": (OP_TAN, 1), "tanh": (OP_TANH, 1),
+    "min": (OP_MIN, 2), "max": (OP_MAX, 2),
+}
+
+cdef class ExprPlan:
+    """Compiled elementwise field expression
+
+    The expression is compiled into a postfix program that is evaluated in a
+    single pass over the buckets, applying every opcode to a block of values
+    at a time. Instances are created and cached by :func:`evaluate`.
+    """
+    cdef vector[int] ops
+    cdef vector[int] args
+    cdef vector[double] consts
+    cdef readonly str target
+    cdef readonly list field_names
+    cdef readonly list scalar_names
+    cdef readonly int depth
+
+    def __init__(self, str expr, field_names, scalar_names):
+        tree = ast.parse(expr.strip(), mode="exec")
+        if (len(tree.body) != 1 or not isinstance(tree.body[0], ast.Assign) or
+            len(tree.body[0].targets) != 1 or
+            not isinstance(tree.body[0].targets[0], ast.Name)):
+            raise ValueError("Expression must be of the form 'u = ...': %s"%expr)
+        self.target = tree.body[0].targets[0].id
+        if self.target not in field_names:
+            raise ValueError("Unknown target field in expression: %s"%self.target)
+        self.field_names = [self.target]
+        self.scalar_names = []
+        self.depth = self._compile(
+            tree.body[0].value, set(field_names), set(scalar_names))
+        if self.depth > EXPR_MAX_STACK:
+            raise ValueError("Expression too deeply nested: %s"%expr)
+
+    cdef _emit(self, int op, int arg=0):
+        self.ops.push_back(op)
+        self.args.push_back(arg)
+
+    def _compile(self, node, known_fields, known_scalars):
+        """Emit the postfix program for a node and return its stack depth"""
+        if isinstance(node, ast.BinOp) and type(node.op) in _expr_binops:
+            d1 = self._compile(node.left, known_fields, known_scalars)
+            d2 = self._compile(node.right, known_fields, known_scalars)
+            self._emit(_expr_binops[type(node.op)])
+            return max(d1, d2 + 1)
+        elif isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd)):
+            depth = self._compile(node.operand, known_fields, known_scalars)
+            if isinstance(node.op, ast.USub):
+                self._emit(OP_NEG)
+            return depth
+        elif isinstance(node, ast.Constant) and isinstance(node.value, (int, float)):
+            self.consts.push_back(node.value)
+            self._emit(OP_CONST, self.consts.size() - 1)
+            return 1
+        elif isinstance(node, ast.Name):
+            name = node.id
+            if name in known_fields:
+                if name not in self.field_names:
+                    self.field_names.append(name)
+                self._emit(OP_FIELD, self.field_names.index(name))
+            elif name in known_scalars:
+                if name not in self.scalar_names:
+                    self.scalar_names.append(name)
+                self._emit(OP_SCALAR, self.scalar_names.index(name))
+            else:
+                raise ValueError("Unknown name in expression: %s"%name)
+            return 1
+        elif (isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and
+              node.func.id in _expr_funcs and not node.keywords):
+            op, nargs = _expr_funcs[node.func.id]
+            if len(node.args) != nargs:
+                raise ValueError("%s expects %d argument(s)"%(node.func.id, nargs))
+            depth = 0
+            for i, arg in enumerate(node.args):
+                depth = max(depth, self._compile(arg, known_fields, known_scalars) + i)
+            self._emit(op)
+            return depth
+        raise ValueError("Unsupported construct in expression: %s"%ast.dump(node))
+
+cdef int eval_expr_bucket(const int* ops, const int* args, size_t nops,
+                          const double* consts, const double* scalars,
+                          double** fdata, const int* fcomps, size_t bsize,
+                          int ncomp, double* work) nogil:
+    """Evaluate the postfix program for all entities in a bucket
+
+    Every opcode is applied to a block of ``EXPR_BLOCK`` values at a time, the
+    stack holds one block per level in ``work``.
+    """
+    cdef size_t n = bsize * ncomp
+    cdef size_t start, m, l, k
+    cdef int top, arg
+    cdef double* x
+    cdef double* y
+    cdef const double* src
+    cdef double val
+    for start in range(0, n, EXPR_BLOCK):
+        m = min(<size_t>EXPR_BLOCK, n - start)
+        top = -1
+        for k in range(nops):
+            arg = args[k]
+            if ops[k] == OP_FIELD:
+                top += 1
+                x = work + top * EXPR_BLOCK
+                src = fdata[arg]
+                if fcomps[arg] == ncomp:
+                    for l in range(m):
+                        x[l] = src[start + l]
+                else:
+                    # Single component fields are broadcast
+                    for l in range(m):
+                        x[l] = src[(start + l) // ncomp]
+                continue
+            elif ops[k] == OP_SCALAR or ops[k] == OP_CONST:
+                top += 1
+                x = work + top * EXPR_BLOCK
+                val = scalars[arg] if ops[k] == OP_SCALAR else consts[arg]
+                for l in range(m):
+                    x[l] = val
+                continue
+
+            x = work + top * EXPR_BLOCK
+            if ops[k] == OP_NEG:
+                for l in range(m):
+                    x[l] = -x[l]
+            elif ops[k] == OP_SQRT:
+                for l in range(m):
+                    x[l] = math.sqrt(x[l])
+            elif ops[k] == OP_ABS:
+                for l in range(m):
+                    x[l] = math.fabs(x[l])
+            elif ops[k] == OP_EXP:
+                for l in range(m):
+                    x[l] = math.exp(x[l])
+            elif ops[k] == OP_LOG:
+                for l in range(m):
+                    x[l] = math.log(x[l])
+            elif ops[k] == OP_SIN:
+                for l in range(m):
+                    x[l] = math.sin(x[l])
+            elif ops[k] == OP_COS:
+                for l in range(m):
+                    x[l] = math.cos(x[l])
+            elif ops[k] == OP_TAN:
+                for l in range(m):
+                    x[l] = math.tan(x[l])
+            elif ops[k] == OP_TANH:
+                for l in range(m):
+                    x[l] = math.tanh(x[l])
+            else:
+                y = x
+                top -= 1
+                x = work + top * EXPR_BLOCK
+                if ops[k] == OP_ADD:
+                    for l in range(m):
+                        x[l] = x[l] + y[l]
+                elif ops[k] == OP_SUB:
+                    for l in range(m):
+                        x[l] = x[l] - y[l]
+                elif ops[k] == OP_MUL:
+                    for l in range(m):
+                        x[l] = x[l] * y[l]
+                elif ops[k] == OP_DIV:
+                    for l in range(m):
+                        x[l] = x[l] / y[l]
+                elif ops[k] == OP_POW:
+                    for l in range(m):
+                        x[l] = math.pow(x[l], y[l])
+                elif ops[k] == OP_MIN:
+                    for l in range(m):
+                        x[l] = math.fmin(x[l], y[l])
+                elif ops[k] == OP_MAX:
+                    for l in range(m):
+                        x[l] = math.fmax(x[l], y[l])
+        memcpy(fdata[0] + start, work, m * sizeof(double))
+    return 0
+
+#: Maximum number of compiled expressions retained by :func:`evaluate`
+expr_cache_size = 128
+_expr_cache = OrderedDict()
+
+def compile_expr(str expr, field_names, scalar_names=()):
+    """Compile an expression or fetch it from the cache
+
+    The cache is keyed by the expression and the names of the fields and
+    scalars available to it.
+
+    Args:
+        expr (str): Expression of the form ``"u = a*x + b*y*z"``
+        field_names (list): Names that refer to fields
+        scalar_names (list): Names that refer to scalar constants
+
+    Return:
+        ExprPlan: The compiled expression
+    """
+    key = (expr, tuple(sorted(field_names)), tuple(sorted(scalar_names)))
+    plan = _expr_cache.get(key, None)
+    if plan is not None:
+        _expr_cache.move_to_end(key)
+        return plan
+    plan = ExprPlan(expr, field_names, scalar_names)
+    _expr_cache[key] = plan
+    while len(_expr_cache) > expr_cache_size:
+        _expr_cache.popitem(last=False)
+    return plan
+
+def evaluate(str expr, dict fields, dict scalars=None, StkSelector sel=None):
+    """Evaluate a fused elementwise expression over fields
+
+    The right-hand side is evaluated for every entity and component and
+    assigned to the target field in one pass over the buckets, instead of one
+    pass per BLAS operation. Fields with a single component are broadcast
+    against multi-component fields. The supported operations are ``+, -, *, /,
+    **``, and the functions ``sqrt, abs, exp, log, sin, cos, tan, tanh, min,
+    max``.
+
+    The number of components of the fields is checked on all buckets before
+    any value is written, so a failed evaluation leaves the target unchanged.
+
+    .. code-block:: python
+
+       field_ops.evaluate(
+           "u = a*x + b*y*z",
+           fields=dict(u=ufield, x=xfield, y=yfield, z=zfield),
+           scalars=dict(a=0.5, b=2.0),
+           sel=meta.locally_owned_part)
+
+    Args:
+        expr (str): Expression of the form ``"target = rhs"``
+        fields (dict): Mapping of names to StkFieldBase instances
+        scalars (dict): Mapping of names to scalar values
+        sel (StkSelector): Restrict the operation to entities belonging to
+            the selector (default: entities where the target is defined)
+    """
+    cdef double t0 = _prof.tic() if _prof.enabled else -1.0
+    cdef double t1
+    scalars = scalars or {}
+    cdef ExprPlan plan = compile_expr(expr, list(fields), list(scalars))
+    cdef size_t nfields = len(plan.field_names)
+    cdef vector[FieldBase*] cfields
+    cdef vector[int] ftypes
+    cdef StkFieldBase pyfield
+    for name in plan.field_names:
+        pyfield = fields[name]
+        cfields.push_back(pyfield.fld)
+        ftypes.push_back(blas_type_num(pyfield))
+
+    cdef vector[double] cscalars
+    for name in plan.scalar_names:
+        cscalars.push_back(scalars[name])
+
+    cdef FieldBase* target = cfields[0]
+    cdef BulkData* bulk = &deref(target).get_mesh()
+    cdef Selector ssel = Selector(deref(target))
+    cdef size_t i
+    for i in range(nfields):
+        assert deref(cfields[i]).entity_rank() == deref(target).entity_rank(), \
+            "Fields must be defined on the same entity rank"
+        ssel = ssel & Selector(deref(cfields[i]))
+    if sel is not None:
+        ssel = sel.sel & ssel
+    cdef const BucketVector* bkts = &deref(bulk).get_buckets(
+        deref(target).entity_rank(), ssel)
+
+    cdef size_t nbkts = deref(bkts).size()
+    cdef vector[double*] fdata
+    cdef vector[int] bcomps
+    cdef vector[vector[double]] scratch
+    cdef vector[double] work
+    fdata.resize(nfields)
+    bcomps.resize(nbkts * nfields)
+    scratch.resize(nfields)
+    work.resize(max(plan.depth, 1) * EXPR_BLOCK)
+    cdef int ncomp
+    cdef int err = 0
+    cdef size_t ib, bsize
+    cdef int* fcomps
+    with nogil:
+        # Validate all buckets before any data is written
+        for ib in range(nbkts):
+            fcomps = bcomps.data() + ib * nfields
+            for i in range(nfields):
+                fcomps[i] = field_scalars_per_entity(
+                    deref(cfields[i]), deref(deref(bkts)[ib]))
+                if fcomps[i] != fcomps[0] and fcomps[i] != 1:
+                    err = 1
+        if not err:
+            for ib in range(nbkts):
+                bsize = deref(<Bucket*>deref(bkts)[ib]).size()
+                fcomps = bcomps.data() + ib * nfields
+                ncomp = fcomps[0]
+                for i in range(nfields):
+                    fdata[i] = as_doubles(
+                        field_data(deref(cfields[i]), deref(deref(bkts)[ib])),
+                        ftypes[i], bsize * fcomps[i], scratch[i])
+                eval_expr_bucket(
+                    plan.ops.data(), plan.args.data(), plan.ops.size(),
+                    plan.consts.data(), cscalars.data(), fdata.data(),
+                    fcomps, bsize, ncomp, work.data())
+                if ftypes[0] != np.NPY_DOUBLE:
+                    from_doubles(fdata[0], field_data(deref(target), deref(deref(bkts)[ib])),
+                                 ftypes[0], bsize * ncomp)
+    if err:
+        raise RuntimeError(
+            "Incompatible number of components for fields in: %s"%expr)
+    if t0 >= 0.0:
+        t1 = wall_time()
+        _prof.toc("field_ops.evaluate", t0, fields_bytes(
+            [fields[name] for name in plan.field_names], &ssel), t1)
+
+cdef enum ReduceKind:
+    RED_DOT, RED_NRM2, RED_ASUM, RED_AMAX, RED_MIN, RED_MAX, RED_SUM
+
+cdef struct ReduceOp:
+    int kind
+    int xidx
+    int yidx
+    int ncomp
+    int slot
+
+_reduce_kinds = {
+    "dot": (RED_DOT, 2), "nrm2": (RED_NRM2, 1), "asum": (RED_ASUM, 1),
+    "amax": (RED_AMAX, 1), "min": (RED_MIN, 1), "max": (RED_MAX, 1),
+    "sum": (RED_SUM, 1),
+}
+
+cdef void reduce_bucket(const ReduceOp* ops, size_t nops, double** fdata,
+                        size_t bsize, double* sums, double* maxs) nogil:
+    """Accumulate local partial reductions for all entities in a bucket"""
+    cdef size_t i, j, n
+    cdef int c
+    cdef const double* x
+    cdef const double* y
+    cdef double val
+    for i in range(nops):
+        x = fdata[ops[i].xidx]
+        n = bsize * ops[i].ncomp
+        if ops[i].kind == RED_DOT:
+            y = fdata[ops[i].yidx]
+            val = 0.0
+            for j in range(n):
+                val += x[j] * y[j]
+            sums[ops[i].slot] += val
+        elif ops[i].kind == RED_NRM2:
+            val = 0.0
+            for j in range(n):
+                val += x[j] * x[j]
+            sums[ops[i].slot] += val
+        elif ops[i].kind == RED_ASUM:
+            val = 0.0
+            for j in range(n):
+                val += math.fabs(x[j])
+            sums[ops[i].slot] += val
+        elif ops[i].kind == RED_AMAX:
+            val = maxs[ops[i].slot]
+            for j in range(n):
+                val = math.fmax(val, math.fabs(x[j]))
+            maxs[ops[i].slot] = val
+        elif ops[i].kind == RED_SUM:
+            for j in range(bsize):
+                for c in range(ops[i].ncomp):
+                    sums[ops[i].slot + c] += x[j * ops[i].ncomp + c]
+        elif ops[i].kind == RED_MAX:
+            for j in range(bsize):
+                for c in range(ops[i].ncomp):
+                    maxs[ops[i].slot + c] = math.fmax(
+                        maxs[ops[i].slot + c], x[j * ops[i].ncomp + c])
+        elif ops[i].kind == RED_MIN:
+            # Minimum is stored as the maximum of the negated values
+            for j in range(bsize):
+                for c in range(ops[i].ncomp):
+                    maxs[ops[i].slot + c] = math.fmax(
+                        maxs[ops[i].slot + c], -x[j * ops[i].ncomp + c])
+
+def reduce_many(list reductions, StkSelector sel=None):
+    """Compute several global reductions with a single pass over the mesh
+
+    Each reduction is a tuple of the operation name followed by the fields,
+    e.g., ``("dot", x, y)``, ``("nrm2", x)``, ``("asum", x)``, ``("amax",
+    x)``, ``("min", x)``, ``("max", x)``, or ``("sum", x)``. Every reduction
+    covers the selected entities where its own fields are defined, so the
+    batched fields may live on different parts and entity ranks. The local
+    contributions of all reductions are combined across MPI ranks with a
+    single collective.
+
+    By default, only the locally owned entities are included so that shared
+    entities are not counted multiple times.
+
+    .. code-block:: python
+
+       unorm, pmax, vsum = field_ops.reduce_many([
+           ("nrm2", velocity), ("max", pressure), ("sum", velocity)])
+
+    Args:
+        reductions (list): List of reduction tuples
+        sel (StkSelector): Entities included in the reduction (default:
+            locally owned entities)
+
+    Return:
+        list: The results in the same order as the requests. ``dot``,
+        ``nrm2``, ``asum``, and ``amax`` return a float, ``min``, ``max``, and
+        ``sum`` return an array with one entry per component.
+    """
+    if not reductions:
+        return []
+    cdef double t0 = _prof.tic() if _prof.enabled else -1.0
+    cdef double t1
+    cdef list pyfields = []
+    cdef vector[ReduceOp] ops
+    cdef ReduceOp op
+    cdef int nsums = 0
+    cdef int nmaxs = 0
+    for red in reductions:
+        if red[0] not in _reduce_kinds:
+            raise ValueError("Invalid reduction type: %s"%red[0])
+        kind, nargs = _reduce_kinds[red[0]]
+        if len(red) != nargs + 1:
+            raise ValueError("%s reduction expects %d field(s)"%(red[0], nargs))
+        for fld in red[1:]:
+            if fld not in pyfields:
+                pyfields.append(fld)
+        op.kind = kind
+        op.xidx = pyfields.index(red[1])
+        op.yidx = pyfields.index(red[nargs])
+        ops.push_back(op)
+
+    cdef StkFieldBase pyfield = pyfields[0]
+    cdef StkFieldBase yfield
+    if sel is None:
+        sel = StkSelector.from_part(pyfield.meta_data.locally_owned_part)
+    cdef BulkData* bulk = &deref(pyfield.fld).get_mesh()
+    cdef vector[BucketVector] opbkts
+    cdef Selector osel
+    cdef size_t i
+    cdef int ncomp
+    for i in range(ops.size()):
+        # Every reduction covers the entities where its own fields exist
+        pyfield = pyfields[ops[i].xidx]
+        yfield = pyfields[ops[i].yidx]
+        if deref(yfield.fld).entity_rank() != deref(pyfield.fld).entity_rank():
+            raise ValueError("Fields %s and %s are defined on different ranks"%(
+                pyfield.name, yfield.name))
+        osel = sel.sel & Selector(deref(pyfield.fld)) & Selector(deref(yfield.fld))
+        opbkts.push_back(deref(bulk).get_buckets(deref(pyfield.fld).entity_rank(), osel))
+        ncomp = bucket_field_ncomp(deref(pyfield.fld), opbkts.back())
+        if count_entities(opbkts.back()) == 0:
+            ncomp = max(deref(pyfield.fld).max_size(), 1)
+        elif ncomp < 0 or bucket_field_ncomp(deref(yfield.fld), opbkts.back()) != ncomp:
+            raise RuntimeError("Field %s is not defined uniformly on selected buckets"%(
+                pyfield.name))
+        ops[i].ncomp = ncomp
+        if ops[i].kind in (RED_DOT, RED_NRM2, RED_ASUM):
+            ops[i].slot = nsums
+            nsums += 1
+        elif ops[i].kind == RED_SUM:
+            ops[i].slot = nsums
+            nsums += ops[i].ncomp
+        elif ops[i].kind == RED_AMAX:
+            ops[i].slot = nmaxs
+            nmaxs += 1
+        else:
+            ops[i].slot = nmaxs
+            nmaxs += ops[i].ncomp
+
+    # Sums followed by maxima, combined with a single collective
+    cdef vector[double] values
+    values.resize(nsums + nmaxs + 1, 0.0)
+    cdef double* sums = values.data()
+    cdef double* maxs = values.data() + nsums
+    cdef int k
+    for i in range(ops.size()):
+        if ops[i].kind in (RED_MAX, RED_MIN):
+            for k in range(ops[i].ncomp):
+                maxs[ops[i].slot + k] = -math.HUGE_VAL
+
+    cdef vector[const FieldBase*] cfields
+    pyfields_to_cfields(pyfields, cfields)
+    cdef vector[int] ftypes
+    for pyfield in pyfields:
+        ftypes.push_back(blas_type_num(pyfield))
+    cdef vector[double*] fdata
+    cdef vector[vector[double]] scratch
+    fdata.resize(cfields.size())
+    scratch.resize(cfields.size())
+    cdef size_t ib, bsize
+    cdef int xi, yi
+    with nogil:
+        for i in range(ops.size()):
+            xi = ops[i].xidx
+            yi = ops[i].yidx
+            for ib in range(opbkts[i].size()):
+                bsize = deref(<Bucket*>opbkts[i][ib]).size()
+                fdata[xi] = as_doubles(
+                    field_data(deref(cfields[xi]), deref(opbkts[i][ib])),
+                    ftypes[xi], bsize * ops[i].ncomp, scratch[xi])
+                if yi != xi:
+                    fdata[yi] = as_doubles(
+                        field_data(deref(cfields[yi]), deref(opbkts[i][ib])),
+                        ftypes[yi], bsize * ops[i].ncomp, scratch[yi])
+                reduce_bucket(&ops[i], 1, fdata.data(), bsize, sums, maxs)
+        allreduce_sum_max(deref(bulk).parallel(), values.data(), nsums, nmaxs)
+
+    cdef list results = []
+    for i in range(ops.size()):
+        if ops[i].kind in (RED_DOT, RED_ASUM):
+            results.append(sums[ops[i].slot])
+        elif ops[i].kind == RED_NRM2:
+            results.append(math.sqrt(sums[ops[i].slot]))
+        elif ops[i].kind == RED_AMAX:
+            results.append(maxs[ops[i].slot])
+        elif ops[i].kind == RED_SUM:
+            results.append(np.array(
+                [sums[ops[i].slot + k] for k in range(ops[i].ncomp)]))
+        elif ops[i].kind == RED_MAX:
+            results.append(np.array(
+                [maxs[ops[i].slot + k] for k in range(ops[i].ncomp)]))
+        else:
+            results.append(np.array(
+                [-maxs[ops[i].slot + k] for k in range(ops[i].ncomp)]))
+    if t0 >= 0.0:
+        t1 = wall_time()
+        _prof.toc("field_ops.reduce_many", t0, fields_bytes(pyfields, &sel.sel) +
+                  sizeof(double) * (nsums + nmaxs), t1)
+    return results
+
+def dot(StkFieldBase xfield, StkFieldBase yfield, StkSelector sel=None):
+    """Global dot product of two fields
+
+    Args:
+        xfield (StkFieldBase): First field
+        yfield (StkFieldBase): Second field
+        sel (StkSelector): Entities included (default: locally owned entities)
+
+    Return:
+        float: Sum of ``x * y`` over all entities and components
+    """
+    return reduce_many([("dot", xfield, yfield)], sel)[0]
+
+def nrm2(StkFieldBase field, StkSelector sel=None):
+    """Global L2 norm of a field
+
+    Args:
+        field (StkFieldBase): Field instance
+        sel (StkSelector): Entities included (default: locally owned entities)
+
+    Return:
+        float: Square root of the sum of squares over all entities and components
+    """
+    return reduce_many([("nrm2", field)], sel)[0]
+
+def asum(StkFieldBase field, StkSelector sel=None):
+    """Global sum of absolute values of a field
+
+    Args:
+        field (StkFieldBase): Field instance
+        sel (StkSelector): Entities included (default: locally owned entities)
+
+    Return:
+        float: Sum of ``abs(x)`` over all entities and components
+    """
+    return reduce_many([("asum", field)], sel)[0]
+
+def amax(StkFieldBase field, StkSelector sel=None):
+    """Global maximum absolute value of a field
+
+    Args:
+        field (StkFieldBase): Field instance
+        sel (StkSelector): Entities included (default: locally owned entities)
+
+    Return:
+        float: Maximum of ``abs(x)`` over all entities and components
+    """
+    return reduce_many([("amax", field)], sel)[0]
+
+def field_min(StkFieldBase field, StkSelector sel=None):
+    """Global minimum of each component of a field
+
+    Args:
+        field (StkFieldBase): Field instance
+        sel (StkSelector): Entities included (default: locally owned entities)
+
+    Return:
+        np.ndarray: Minimum value for every component
+    """
+    return reduce_many([("min", field)], sel)[0]
+
+def field_max(StkFieldBase field, StkSelector sel=None):
+    """Global maximum of each component of a field
+
+    Args:
+        field (StkFieldBase): Field instance
+        sel (StkSelector): Entities included (default: locally owned entities)
+
+    Return:
+        np.ndarray: Maximum value for every component
+    """
+    return reduce_many([("max", field)], sel)[0]
+
+def field_sum(StkFieldBase field, StkSelector sel=None):
+    """Global sum of each component of a field
+
+    Args:
+        field (StkFieldBase): Field instance
+        sel (StkSelector): Entities included (default: locally owned entities)
+
+    Return:
+        np.ndarray: Sum for every component
+    """
+    return reduce_many([("sum", field)], sel)[0]
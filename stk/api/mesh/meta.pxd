@@ -34,6 +34,7 @@ cdef extern from "stk_mesh/base/MetaData.hpp" namespace "stk::mesh" nogil:
         Part& declare_part(const string& part_name, EntityRank rank)
         Part& declare_part_with_topology(
             const string& part_name, topo_cls.topology_t topology)
+        void declare_part_subset(Part& superset, Part& subset)
 
         void initialize(size_t ndim)
         bool is_initialized() const
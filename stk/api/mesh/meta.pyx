@@ -8,7 +8,26 @@ from libcpp.cast cimport const_cast
 from ..topology cimport topology
 from .bulk cimport BulkData, StkBulkData
 from .part cimport Part, StkPart
-from .field cimport FieldBase, StkFieldBase, FieldBasePtr, Field
+from .field cimport FieldBase, StkFieldBase, FieldBasePtr, Field, field_scalar_t
+from libc.stdint cimport int64_t, uint8_t
+
+import numpy as np
+
+#: Names of the field scalar types for the supported NumPy dtypes
+_field_type_names = {
+    np.dtype(np.float64): "double",
+    np.dtype(np.float32): "float",
+    np.dtype(np.int32): "int",
+    np.dtype(np.int64): "int64_t",
+    np.dtype(np.uint8): "uint8_t",
+}
+
+def _field_type_name(dtype):
+    """Name of the ``field_scalar_t`` specialization for a NumPy dtype"""
+    try:
+        return _field_type_names[np.dtype(dtype)]
+    except KeyError:
+        raise TypeError("Unsupported field data type: %s"%dtype)
 
 cdef class StkMetaData:
     """stk::mesh::MetaData"""
@@ -140,6 +159,15 @@ cdef class StkMetaData:
         cdef string pname = part_name.encode('UTF-8')
         return StkPart.wrap_reference(deref(self.meta).declare_part(pname, rank))
 
+    def declare_part_subset(self, StkPart superset, StkPart subset):
+        """Declare ``subset`` as a subset of ``superset``
+
+        Args:
+            superset (StkPart): Parent part
+            subset (StkPart): Part to add as a subset
+        """
+        deref(self.meta).declare_part_subset(deref(superset.part), deref(subset.part))
+
     def initialize(self, int ndim=3):
         """Initialize the STK mesh
 
@@ -219,17 +247,22 @@ cdef class StkMetaData:
 
     def declare_scalar_field(self, str name,
                              topology.rank_t rank=topology.rank_t.NODE_RANK,
-                             unsigned number_of_states=1):
-        """Declare a double scalar field
+                             unsigned number_of_states=1, dtype=np.float64):
+        """Declare a scalar field (``double`` by default)
 
         Args:
             name (str): Name of the field
             rank (rank_t): ``NODE_RANK``, ``ELEM_RANK``, etc.
             number_of_states (int): Number of states associated with this field
+            dtype (np.dtype): Scalar type: ``float64`` (default), ``float32``,
+                ``int32``, ``int64`` or ``uint8``
 
         Return:
             StkFieldBase: The field instance
         """
+        if np.dtype(dtype) != np.float64:
+            return self.declare_scalar_field_t[_field_type_name(dtype)](
+                name, rank, number_of_states)
         cdef string fname = name.encode('UTF-8')
         cdef FieldBase* fld = NULL
         fld = <FieldBase*>&(deref(self.meta).declare_field[Field[double]](
@@ -238,17 +271,22 @@ cdef class StkMetaData:
 
     def declare_vector_field(self, str name,
                              topology.rank_t rank=topology.rank_t.NODE_RANK,
-                             unsigned number_of_states=1):
-        """Declare a double vector field
+                             unsigned number_of_states=1, dtype=np.float64):
+        """Declare a vector field (``double`` by default)
 
         Args:
             name (str): Name of the field
             rank (rank_t): ``NODE_RANK``, ``ELEM_RANK``, etc.
             number_of_states (int): Number of states associated with this field
+            dtype (np.dtype): Scalar type: ``float64`` (default), ``float32``,
+                ``int32``, ``int64`` or ``uint8``
 
         Return:
             StkFieldBase: The field instance
         """
+        if np.dtype(dtype) != np.float64:
+            return self.declare_vector_field_t[_field_type_name(dtype)](
+                name, rank, number_of_states)
         cdef string fname = name.encode('UTF-8')
         cdef FieldBase* fld = NULL
         fld = <FieldBase*>&(deref(self.meta).declare_field[Field[double, Cartesian]](
@@ -257,17 +295,22 @@ cdef class StkMetaData:
 
     def declare_generic_field(self, str name,
                              topology.rank_t rank=topology.rank_t.NODE_RANK,
-                             unsigned number_of_states=1):
-        """Declare a double generic field
+                             unsigned number_of_states=1, dtype=np.float64):
+        """Declare a generic field (``double`` by default)
 
         Args:
             name (str): Name of the field
             rank (rank_t): ``NODE_RANK``, ``ELEM_RANK``, etc.
             number_of_states (int): Number of states associated with this field
+            dtype (np.dtype): Scalar type: ``float64`` (default), ``float32``,
+                ``int32``, ``int64`` or ``uint8``
 
         Return:
             StkFieldBase: The field instance
         """
+        if np.dtype(dtype) != np.float64:
+            return self.declare_generic_field_t[_field_type_name(dtype)](
+                name, rank, number_of_states)
         cdef string fname = name.encode('UTF-8')
         cdef FieldBase* fld = NULL
         fld = <FieldBase*>&(deref(self.meta).declare_field[Field[double, SimpleArrayTag]](
@@ -277,15 +320,18 @@ cdef class StkMetaData:
     def declare_scalar_field_t(self, str name,
                                topology.rank_t rank=topology.rank_t.NODE_RANK,
                                unsigned number_of_states=1,
-                               cython.numeric data=0):
+                               field_scalar_t data=0):
         """Declare a scalar field of a given type
 
-        A scalar field is of type ``Field<T>`` and has rank 0.
+        A scalar field is of type ``Field<T>`` and has rank 0. The supported
+        types are ``double``, ``float``, ``int``, ``long``, ``int64_t`` and
+        ``uint8_t``.
 
         .. code-block:: python
 
             density = meta.declare_scalar_field[double]("density")
             iblank  = meta.declare_scalar_field[int]("iblank")
+            flag    = meta.declare_scalar_field_t["uint8_t"]("flag")
 
         Args:
             name (str): Name of the field
@@ -297,18 +343,24 @@ cdef class StkMetaData:
         """
         cdef string fname = name.encode('UTF-8')
         cdef FieldBase* fld = NULL
-        if cython.numeric is double:
+        if field_scalar_t is double:
             fld = <FieldBase*>&(deref(self.meta).declare_field[Field[double]](
                 rank, fname, number_of_states))
-        elif cython.numeric is float:
+        elif field_scalar_t is float:
             fld = <FieldBase*>&(deref(self.meta).declare_field[Field[float]](
                 rank, fname, number_of_states))
-        elif cython.numeric is int:
+        elif field_scalar_t is int:
             fld = <FieldBase*>&(deref(self.meta).declare_field[Field[int]](
                 rank, fname, number_of_states))
-        elif cython.numeric is long:
+        elif field_scalar_t is long:
             fld = <FieldBase*>&(deref(self.meta).declare_field[Field[long]](
                 rank, fname, number_of_states))
+        elif field_scalar_t is int64_t:
+            fld = <FieldBase*>&(deref(self.meta).declare_field[Field[int64_t]](
+                rank, fname, number_of_states))
+        elif field_scalar_t is uint8_t:
+            fld = <FieldBase*>&(deref(self.meta).declare_field[Field[uint8_t]](
+                rank, fname, number_of_states))
 
         if fld == NULL:
             raise RuntimeError("Invalid field type requested")
@@ -317,7 +369,7 @@ cdef class StkMetaData:
     def declare_vector_field_t(self, str name,
                                topology.rank_t rank=topology.rank_t.NODE_RANK,
                                unsigned number_of_states=1,
-                               cython.numeric data=0):
+                               field_scalar_t data=0):
         """Declare a vector field
 
         A vector field is of type ``Field<T, Cartesian>`` of rank 1.
@@ -336,18 +388,24 @@ cdef class StkMetaData:
         """
         cdef string fname = name.encode('UTF-8')
         cdef FieldBase* fld = NULL
-        if cython.numeric is double:
+        if field_scalar_t is double:
             fld = <FieldBase*>&(deref(self.meta).declare_field[Field[double, Cartesian]](
                 rank, fname, number_of_states))
-        elif cython.numeric is float:
+        elif field_scalar_t is float:
             fld = <FieldBase*>&(deref(self.meta).declare_field[Field[float, Cartesian]](
                 rank, fname, number_of_states))
-        elif cython.numeric is int:
+        elif field_scalar_t is int:
             fld = <FieldBase*>&(deref(self.meta).declare_field[Field[int, Cartesian]](
                 rank, fname, number_of_states))
-        elif cython.numeric is long:
+        elif field_scalar_t is long:
             fld = <FieldBase*>&(deref(self.meta).declare_field[Field[long, Cartesian]](
                 rank, fname, number_of_states))
+        elif field_scalar_t is int64_t:
+            fld = <FieldBase*>&(deref(self.meta).declare_field[Field[int64_t, Cartesian]](
+                rank, fname, number_of_states))
+        elif field_scalar_t is uint8_t:
+            fld = <FieldBase*>&(deref(self.meta).declare_field[Field[uint8_t, Cartesian]](
+                rank, fname, number_of_states))
 
         if fld == NULL:
             raise RuntimeError("Invalid field type requested")
@@ -356,7 +414,7 @@ cdef class StkMetaData:
     def declare_generic_field_t(self, str name,
                                 topology.rank_t rank=topology.rank_t.NODE_RANK,
                                 unsigned number_of_states=1,
-                                cython.numeric data=0):
+                                field_scalar_t data=0):
         """Declare a generic field of a given datatype
 
         A generic field is of type ``Field<T, SimpleArrayTag>`` with rank 1.
@@ -375,18 +433,24 @@ cdef class StkMetaData:
         """
         cdef string fname = name.encode('UTF-8')
         cdef FieldBase* fld = NULL
-        if cython.numeric is double:
+        if field_scalar_t is double:
             fld = <FieldBase*>&(deref(self.meta).declare_field[Field[double, SimpleArrayTag]](
                 rank, fname, number_of_states))
-        elif cython.numeric is float:
+        elif field_scalar_t is float:
             fld = <FieldBase*>&(deref(self.meta).declare_field[Field[float, SimpleArrayTag]](
                 rank, fname, number_of_states))
-        elif cython.numeric is int:
+        elif field_scalar_t is int:
             fld = <FieldBase*>&(deref(self.meta).declare_field[Field[int, SimpleArrayTag]](
                 rank, fname, number_of_states))
-        elif cython.numeric is long:
+        elif field_scalar_t is long:
             fld = <FieldBase*>&(deref(self.meta).declare_field[Field[long, SimpleArrayTag]](
                 rank, fname, number_of_states))
+        elif field_scalar_t is int64_t:
+            fld = <FieldBase*>&(deref(self.meta).declare_field[Field[int64_t, SimpleArrayTag]](
+                rank, fname, number_of_states))
+        elif field_scalar_t is uint8_t:
+            fld = <FieldBase*>&(deref(self.meta).declare_field[Field[uint8_t, SimpleArrayTag]](
+                rank, fname, number_of_states))
 
         if fld == NULL:
             raise RuntimeError("Invalid field type requested")
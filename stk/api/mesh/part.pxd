@@ -14,6 +14,7 @@ cdef extern from "stk_mesh/base/Part.hpp" namespace "stk::mesh" nogil:
         string& name() const
         topo_cls topology() const
         int64_t id() const
+        EntityRank primary_entity_rank() const
 
         bool contains(const Part&) const
         const PartVector& supersets() const
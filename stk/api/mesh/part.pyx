@@ -54,6 +54,12 @@ cdef class StkPart:
         cdef topo_cls topo = deref(self.part).topology()
         return StkTopology.wrap_instance(topo)
 
+    @property
+    def primary_entity_rank(self):
+        """Entity rank of the part (``INVALID_RANK`` for parts with no rank)"""
+        assert(self.part != NULL)
+        return deref(self.part).primary_entity_rank()
+
     @property
     def part_id(self):
         """Unique part identifier
@@ -107,7 +113,7 @@ cdef class StkPart:
     @property
     def is_io_part(self):
         """Return True if this part is an I/O part"""
-        is_part_io_part(deref(self.part))
+        return is_part_io_part(deref(self.part))
 
     def set_toplogy(self, topology_t topo):
         """Set the topology type for a newly created part"""
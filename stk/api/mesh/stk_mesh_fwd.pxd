@@ -61,6 +61,7 @@ cdef extern from "stk_mesh/base/Types.hpp" namespace "stk::mesh" nogil:
     ctypedef vector[FieldBase*] FieldVector
     ctypedef topology.rank_t EntityRank
     ctypedef unsigned Ordinal
+    ctypedef unsigned ConnectivityOrdinal
     ctypedef uint64_t EntityId
     ctypedef vector[EntityId] EntityIdVector
     ctypedef pair[Entity, int] EntityProc
@@ -70,6 +70,17 @@ cdef extern from "stk_topology/topology.hpp" namespace "stk" nogil:
         string name() const
         rank_t rank() const
         topology_t value() const
+        unsigned num_nodes() const
+        unsigned num_vertices() const
+        unsigned num_edges() const
+        unsigned num_sides() const
+        unsigned dimension() const
+        bool is_shell() const
+        topology base() const
+        topology side_topology(unsigned side_ordinal) const
+        topology edge_topology(unsigned edge_ordinal) const
+        void side_node_ordinals(unsigned side_ordinal, unsigned* output) const
+        void edge_node_ordinals(unsigned edge_ordinal, unsigned* output) const
 
         bool operator==(const topology& rhs) const
         bool operator==(const topology_t& rhs) const
@@ -2,7 +2,20 @@
 # distutils: language = c++
 # cython: embedsignature = True
 
+cimport numpy as np
+import numpy as np
+
+np.import_array()
+
 cdef class StkTopology:
+    """STK topology
+
+    Args:
+        topo (topology_t): Topology type (default: INVALID_TOPOLOGY)
+    """
+
+    def __init__(self, topology_t topo=topology_t.INVALID_TOPOLOGY):
+        self.topo = topology(topo)
 
     @staticmethod
     cdef wrap_instance(topology topo):
@@ -31,6 +44,90 @@ cdef class StkTopology:
         """Topology type"""
         return self.topo.value()
 
+    @property
+    def num_nodes(self):
+        """Number of nodes"""
+        return self.topo.num_nodes()
+
+    @property
+    def num_vertices(self):
+        """Number of vertex (corner) nodes"""
+        return self.topo.num_vertices()
+
+    @property
+    def num_edges(self):
+        """Number of edges"""
+        return self.topo.num_edges()
+
+    @property
+    def num_sides(self):
+        """Number of sides"""
+        return self.topo.num_sides()
+
+    @property
+    def dimension(self):
+        """Parametric dimension of the topology"""
+        return self.topo.dimension()
+
+    @property
+    def is_shell(self):
+        """Boolean indicating whether the topology is a shell"""
+        return self.topo.is_shell()
+
+    @property
+    def base(self):
+        """Linear topology with the same vertices"""
+        return StkTopology.wrap_instance(self.topo.base())
+
+    def side_topology(self, unsigned ordinal=0):
+        """Topology of a side
+
+        Args:
+            ordinal (int): Side ordinal
+
+        Return:
+            StkTopology: Topology of the side
+        """
+        if ordinal >= self.topo.num_sides():
+            raise IndexError("Invalid side ordinal %d for %s"%(ordinal, self.name))
+        return StkTopology.wrap_instance(self.topo.side_topology(ordinal))
+
+    def side_node_ordinals(self, unsigned ordinal):
+        """Element node ordinals of a side in the side node order
+
+        Args:
+            ordinal (int): Side ordinal
+
+        Return:
+            np.ndarray: Node ordinals (uint32)
+        """
+        if ordinal >= self.topo.num_sides():
+            raise IndexError("Invalid side ordinal %d for %s"%(ordinal, self.name))
+        cdef unsigned nnodes = self.topo.side_topology(ordinal).num_nodes()
+        out = np.empty((nnodes,), dtype=np.uintc)
+        cdef unsigned[::1] optr = out
+        if nnodes > 0:
+            self.topo.side_node_ordinals(ordinal, &optr[0])
+        return out
+
+    def edge_node_ordinals(self, unsigned ordinal):
+        """Element node ordinals of an edge in the edge node order
+
+        Args:
+            ordinal (int): Edge ordinal
+
+        Return:
+            np.ndarray: Node ordinals (uint32)
+        """
+        if ordinal >= self.topo.num_edges():
+            raise IndexError("Invalid edge ordinal %d for %s"%(ordinal, self.name))
+        cdef unsigned nnodes = self.topo.edge_topology(ordinal).num_nodes()
+        out = np.empty((nnodes,), dtype=np.uintc)
+        cdef unsigned[::1] optr = out
+        if nnodes > 0:
+            self.topo.edge_node_ordinals(ordinal, &optr[0])
+        return out
+
     def __eq__(StkTopology self, other):
         """Equality comparison"""
         cdef StkTopology stopo
@@ -5,4 +5,4 @@ stk_util Python interface
 =========================
 """
 
-from .parallel import Parallel
+from .parallel import Parallel, ReduceOp
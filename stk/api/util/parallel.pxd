@@ -3,13 +3,82 @@
 # cython: embedsignature = True
 
 cimport cython
+cimport numpy as np
 
 cdef extern from "mpi.h" nogil:
   ctypedef struct _mpi_comm_t
   ctypedef _mpi_comm_t* MPI_Comm
+  ctypedef struct _mpi_datatype_t
+  ctypedef _mpi_datatype_t* MPI_Datatype
+  ctypedef struct _mpi_op_t
+  ctypedef _mpi_op_t* MPI_Op
+  ctypedef struct _mpi_win_t
+  ctypedef _mpi_win_t* MPI_Win
+  ctypedef struct _mpi_info_t
+  ctypedef _mpi_info_t* MPI_Info
+  ctypedef long MPI_Aint
+  ctypedef int MPI_Fint
   MPI_Comm MPI_COMM_WORLD
+  MPI_Comm MPI_COMM_NULL
+  MPI_Win MPI_WIN_NULL
+  MPI_Info MPI_INFO_NULL
+  void* MPI_IN_PLACE
+
+  MPI_Datatype MPI_DOUBLE
+  MPI_Datatype MPI_FLOAT
+  MPI_Datatype MPI_INT
+  MPI_Datatype MPI_LONG
+  MPI_Datatype MPI_LONG_LONG
+  MPI_Datatype MPI_UNSIGNED_CHAR
+  MPI_Datatype MPI_INT64_T
+  MPI_Datatype MPI_BYTE
+  MPI_Op MPI_SUM
+  MPI_Op MPI_MAX
+  MPI_Op MPI_MIN
 
   int MPI_Initialized(int* flag)
+  int MPI_Finalized(int* flag)
+  int MPI_Comm_split(MPI_Comm comm, int color, int key, MPI_Comm* newcomm)
+  int MPI_Comm_free(MPI_Comm* comm)
+  MPI_Fint MPI_Comm_c2f(MPI_Comm comm)
+  MPI_Comm MPI_Comm_f2c(MPI_Fint comm)
+  int MPI_Allreduce(void* sendbuf, void* recvbuf, int count,
+                    MPI_Datatype datatype, MPI_Op op, MPI_Comm comm)
+  int MPI_Barrier(MPI_Comm comm)
+  ctypedef void MPI_User_function(void* invec, void* inoutvec, int* length,
+                                  MPI_Datatype* datatype)
+  int MPI_Op_create(MPI_User_function* function, int commute, MPI_Op* op)
+  int MPI_Op_free(MPI_Op* op)
+  int MPI_Type_contiguous(int count, MPI_Datatype oldtype, MPI_Datatype* newtype)
+  int MPI_Type_commit(MPI_Datatype* datatype)
+  int MPI_Type_free(MPI_Datatype* datatype)
+  int MPI_Bcast(void* buffer, int count, MPI_Datatype datatype, int root,
+                MPI_Comm comm)
+  int MPI_Gather(void* sendbuf, int sendcount, MPI_Datatype sendtype,
+                 void* recvbuf, int recvcount, MPI_Datatype recvtype,
+                 int root, MPI_Comm comm)
+  int MPI_Gatherv(void* sendbuf, int sendcount, MPI_Datatype sendtype,
+                  void* recvbuf, const int* recvcounts, const int* displs,
+                  MPI_Datatype recvtype, int root, MPI_Comm comm)
+
+  int MPI_Win_allocate(MPI_Aint size, int disp_unit, MPI_Info info,
+                       MPI_Comm comm, void* baseptr, MPI_Win* win)
+  int MPI_Win_free(MPI_Win* win)
+  int MPI_Win_lock_all(int assertion, MPI_Win win)
+  int MPI_Win_unlock_all(MPI_Win win)
+  int MPI_Win_flush(int rank, MPI_Win win)
+  int MPI_Fetch_and_op(void* origin_addr, void* result_addr,
+                       MPI_Datatype datatype, int target_rank,
+                       MPI_Aint target_disp, MPI_Op op, MPI_Win win)
+  int MPI_Init_thread(int* argc, char*** argv, int required, int* provided)
+  int MPI_Query_thread(int* provided)
+
+  enum:
+    MPI_THREAD_SINGLE
+    MPI_THREAD_FUNNELED
+    MPI_THREAD_SERIALIZED
+    MPI_THREAD_MULTIPLE
+    MPI_UNDEFINED
 
 cdef extern from "stk_util/parallel/Parallel.hpp" namespace "stk" nogil:
   ctypedef MPI_Comm ParallelMachine
@@ -24,9 +93,23 @@ cdef extern from "stk_util/parallel/ParallelReduce.hpp" namespace "stk" nogil:
   void all_reduce_sum[T](ParallelMachine comm, const T* loc, T* g_val, unsigned count)
   T get_global_sum[T](ParallelMachine comm, const T local)
 
+cdef int mpi_thread_level() nogil
+cdef void allreduce_sum_max(MPI_Comm comm, double* values, int nsums, int nmaxs) nogil
+
+cpdef enum ReduceOp:
+  REDUCE_SUM
+  REDUCE_MAX
+  REDUCE_MIN
+
 cdef class Parallel:
   cdef MPI_Comm comm
   cdef readonly int rank
   cdef readonly int size
+  cdef bint owner
+  cdef object pycomm
+
+  @staticmethod
+  cdef Parallel wrap_comm(MPI_Comm comm, bint owner=*)
 
-  cdef parallel_reduce(self, cython.numeric [:] inp, optype=*)
+  cdef parallel_reduce(self, cython.numeric [:] inp, ReduceOp op)
+  cdef void reduce_inplace(self, np.ndarray arr, ReduceOp op) except *
@@ -9,26 +9,184 @@ cimport cython
 cimport numpy as np
 
 from cpython.mem cimport PyMem_Malloc, PyMem_Realloc, PyMem_Free
+from libc.stdlib cimport malloc, free
+from libc.string cimport memcpy
 from cpython.string cimport PyString_AsString
 
 import sys
+import pickle
 import numpy as np
 
+cdef int mpi_thread_level() nogil:
+    """Return the MPI thread support level, or -1 if MPI is not initialized"""
+    cdef int flag = 0
+    cdef int provided = MPI_THREAD_SINGLE
+    MPI_Initialized(&flag)
+    if flag == 0:
+        return -1
+    MPI_Query_thread(&provided)
+    return provided
+
+cdef void sum_max_op(void* invec, void* inoutvec, int* length,
+                     MPI_Datatype* datatype) nogil:
+    """Sum of the leading values and maximum of the others
+
+    Every element starts with the number of summed values and the total
+    number of values.
+    """
+    cdef const double* a = <const double*>invec
+    cdef double* b = <double*>inoutvec
+    cdef int nsums, nvals, i, k
+    for k in range(length[0]):
+        nsums = <int>b[0]
+        nvals = <int>b[1]
+        for i in range(2, nsums + 2):
+            b[i] += a[i]
+        for i in range(nsums + 2, nvals + 2):
+            if a[i] > b[i]:
+                b[i] = a[i]
+        a += nvals + 2
+        b += nvals + 2
+
+cdef void allreduce_sum_max(MPI_Comm comm, double* values, int nsums, int nmaxs) nogil:
+    """Global sum of ``values[:nsums]`` and maximum of the following ``nmaxs``
+    values, in place and with a single collective
+    """
+    cdef int nvals = nsums + nmaxs
+    if nvals == 0:
+        return
+    cdef double* buf = <double*>malloc((nvals + 2) * sizeof(double))
+    cdef MPI_Datatype dtype
+    cdef MPI_Op op
+    buf[0] = nsums
+    buf[1] = nvals
+    memcpy(&buf[2], values, nvals * sizeof(double))
+    # One element per rank, so the operation never sees a partial buffer
+    MPI_Type_contiguous(nvals + 2, MPI_DOUBLE, &dtype)
+    MPI_Type_commit(&dtype)
+    MPI_Op_create(&sum_max_op, 1, &op)
+    MPI_Allreduce(MPI_IN_PLACE, buf, 1, dtype, op, comm)
+    MPI_Op_free(&op)
+    MPI_Type_free(&dtype)
+    memcpy(values, &buf[2], nvals * sizeof(double))
+    free(buf)
+
+_reduce_op_names = {"sum": REDUCE_SUM, "max": REDUCE_MAX, "min": REDUCE_MIN}
+
+cdef ReduceOp reduce_op(op) except *:
+    """Convert an operation name or :class:`ReduceOp` value"""
+    if isinstance(op, str):
+        try:
+            return _reduce_op_names[op]
+        except KeyError:
+            raise NotImplementedError("Invalid operation type passed: " + op)
+    if op not in (REDUCE_SUM, REDUCE_MAX, REDUCE_MIN):
+        raise NotImplementedError("Invalid operation type passed: %s"%op)
+    return <ReduceOp>op
+
 cdef class Parallel:
     """Interface to STK MPI
 
-    TODO: Enable linking with mpi4py
+    A Parallel wraps an MPI communicator. Besides ``MPI_COMM_WORLD`` from
+    :meth:`initialize`, instances can be created for sub-communicators with
+    :meth:`split` or from an ``mpi4py`` communicator with
+    :meth:`from_mpi4py`, and passed to :class:`~stk.stk.stk_mesh.StkMesh`,
+    :meth:`~stk.api.mesh.bulk.StkBulkData.create`, or
+    :meth:`~stk.api.io.io.StkIoBroker.create` to run on a subset of the ranks.
     """
 
     def __eq__(self, Parallel other):
         return self.comm == other.comm
 
     @staticmethod
-    def initialize(arg_list=None):
-        """Initialize the MPI object"""
+    cdef Parallel wrap_comm(MPI_Comm comm, bint owner=False):
+        """Wrap an existing MPI communicator"""
+        cdef Parallel par = Parallel.__new__(Parallel)
+        par.comm = comm
+        par.owner = owner
+        par.rank = parallel_machine_rank(comm)
+        par.size = parallel_machine_size(comm)
+        return par
+
+    @staticmethod
+    def from_mpi4py(comm):
+        """Create a Parallel instance from an mpi4py communicator
+
+        The communicator is shared, not duplicated, and a reference to it is
+        kept for the lifetime of this instance.
+
+        Args:
+            comm (mpi4py.MPI.Comm): mpi4py communicator
+
+        Return:
+            Parallel: Instance wrapping the same MPI communicator
+        """
+        cdef MPI_Fint handle = comm.py2f()
+        cdef Parallel par = Parallel.wrap_comm(MPI_Comm_f2c(handle))
+        par.pycomm = comm
+        return par
+
+    def to_mpi4py(self):
+        """Return an mpi4py communicator for this instance
+
+        Return:
+            mpi4py.MPI.Intracomm: Communicator sharing the MPI handle
+        """
+        if self.pycomm is not None:
+            return self.pycomm
+        try:
+            from mpi4py import MPI
+        except ImportError:
+            raise ImportError("mpi4py is required to convert the communicator")
+        self.pycomm = MPI.Intracomm.f2py(MPI_Comm_c2f(self.comm))
+        return self.pycomm
+
+    def split(self, int color, key=None):
+        """Split the communicator into disjoint sub-communicators
+
+        Ranks passing the same ``color`` end up in the same sub-communicator.
+        This is a collective operation.
+
+        Args:
+            color (int): Sub-communicator of this rank (negative to opt out)
+            key (int): Ordering of the ranks (default: rank in this communicator)
+
+        Return:
+            Parallel: New communicator, or None if ``color`` is negative
+        """
+        cdef int ckey = self.rank if key is None else key
+        cdef int ccolor = MPI_UNDEFINED if color < 0 else color
+        cdef MPI_Comm newcomm = MPI_COMM_NULL
+        MPI_Comm_split(self.comm, ccolor, ckey, &newcomm)
+        if newcomm == MPI_COMM_NULL:
+            return None
+        return Parallel.wrap_comm(newcomm, owner=True)
+
+    def free(self):
+        """Free a communicator created by :meth:`split`
+
+        Must only be called once all meshes and I/O brokers created on this
+        communicator have been destroyed.
+        """
+        if not self.owner:
+            raise RuntimeError("Only communicators created by split can be freed")
+        MPI_Comm_free(&self.comm)
+        self.owner = False
+        self.pycomm = None
+
+    @staticmethod
+    def initialize(arg_list=None, bint threads=False):
+        """Initialize the MPI object
+
+        Args:
+            arg_list (list): Command line arguments (default: sys.argv)
+            threads (bool): If True, request ``MPI_THREAD_MULTIPLE`` support
+                so that MPI calls can be issued from background threads
+        """
         tmp = arg_list or sys.argv
         argv = [ss.encode('UTF-8') for ss in tmp]
         cdef int flag
+        cdef int provided
         cdef int nargs = len(argv)
         cdef char** cargv = <char**> PyMem_Malloc(nargs * sizeof(char*));
         if not cargv:
@@ -42,7 +200,11 @@ cdef class Parallel:
             else:
                 for i in range(nargs):
                     cargv[i] = argv[i]
-                self.comm = parallel_machine_init(&nargs, &cargv);
+                if threads:
+                    MPI_Init_thread(&nargs, &cargv, MPI_THREAD_MULTIPLE, &provided)
+                    self.comm = MPI_COMM_WORLD
+                else:
+                    self.comm = parallel_machine_init(&nargs, &cargv);
             self.rank = parallel_machine_rank(self.comm);
             self.size = parallel_machine_size(self.comm);
         finally:
@@ -54,40 +216,186 @@ cdef class Parallel:
         """Call MPI finalize"""
         parallel_machine_finalize()
 
-    cdef parallel_reduce(self, cython.numeric [:] inp, optype="sum"):
-        """Perform a parallel sum reduction operation and return the global sum"""
+    @property
+    def thread_level(self):
+        """Level of thread support provided by the MPI library
+
+        One of ``MPI_THREAD_SINGLE``, ``MPI_THREAD_FUNNELED``,
+        ``MPI_THREAD_SERIALIZED``, or ``MPI_THREAD_MULTIPLE`` (increasing
+        values).
+        """
+        return mpi_thread_level()
+
+    @property
+    def threads_supported(self):
+        """Can MPI calls be issued from threads other than the main thread"""
+        return self.thread_level >= MPI_THREAD_MULTIPLE
+
+    cdef parallel_reduce(self, cython.numeric [:] inp, ReduceOp op):
+        """Perform a parallel reduction operation and return the global values"""
         num_vals = inp.shape[0]
         if cython.numeric is int:
             dtype = np.intc
         elif cython.numeric is long:
-            dtype = np.long
+            dtype = np.int_
         elif cython.numeric is cython.longlong:
             dtype = np.longlong
         elif cython.numeric is cython.float:
-            dtype = np.float
+            dtype = np.float32
         else:
             dtype = np.double
 
         retval = np.zeros((num_vals, ), dtype=dtype)
+        if num_vals == 0:
+            return retval
         cdef cython.numeric[:] ret_view = retval
-        if optype == "sum":
+        if op == REDUCE_SUM:
             all_reduce_sum(self.comm, &inp[0], &ret_view[0], num_vals)
-        elif optype == "max":
+        elif op == REDUCE_MAX:
             all_reduce_max(self.comm, &inp[0], &ret_view[0], num_vals)
-        elif optype == "min":
-            all_reduce_min(self.comm, &inp[0], &ret_view[0], num_vals)
         else:
-            raise NotImplementedError("Invalid operation type passed: " + optype)
+            all_reduce_min(self.comm, &inp[0], &ret_view[0], num_vals)
         return retval
 
     def parallel_reduce_sum(self, cython.numeric [:] inp):
         """Wrapper to stk::parallel_reduce_sum"""
-        return self.parallel_reduce(inp, "sum")
+        return self.parallel_reduce(inp, REDUCE_SUM)
 
     def parallel_reduce_max(self, cython.numeric [:] inp):
         """Wrapper to stk::parallel_reduce_max"""
-        return self.parallel_reduce(inp, "max")
+        return self.parallel_reduce(inp, REDUCE_MAX)
 
     def parallel_reduce_min(self, cython.numeric [:] inp):
         """Wrapper to stk::parallel_reduce_min"""
-        return self.parallel_reduce(inp, "min")
+        return self.parallel_reduce(inp, REDUCE_MIN)
+
+    cdef void reduce_inplace(self, np.ndarray arr, ReduceOp op) except *:
+        """In-place MPI_Allreduce of a contiguous array"""
+        if not np.PyArray_ISCARRAY(arr):
+            raise ValueError("Reduction buffer must be a writeable contiguous array")
+        cdef int typenum = np.PyArray_TYPE(arr)
+        cdef MPI_Datatype dtype
+        if typenum == np.NPY_DOUBLE:
+            dtype = MPI_DOUBLE
+        elif typenum == np.NPY_FLOAT:
+            dtype = MPI_FLOAT
+        elif typenum == np.NPY_INT:
+            dtype = MPI_INT
+        elif typenum == np.NPY_LONG:
+            dtype = MPI_LONG
+        elif typenum == np.NPY_LONGLONG:
+            dtype = MPI_LONG_LONG
+        elif typenum == np.NPY_UBYTE:
+            dtype = MPI_UNSIGNED_CHAR
+        else:
+            raise TypeError("Unsupported dtype for reduction: %s"%arr.dtype)
+        cdef MPI_Op mop = (MPI_SUM if op == REDUCE_SUM else
+                           MPI_MAX if op == REDUCE_MAX else MPI_MIN)
+        cdef int count = arr.size
+        cdef void* data = np.PyArray_DATA(arr)
+        if count == 0:
+            return
+        with nogil:
+            MPI_Allreduce(MPI_IN_PLACE, data, count, dtype, mop, self.comm)
+
+    def allreduce(self, buf, op="sum", out=None):
+        """Global reduction of an array or of several values in one collective
+
+        If ``buf`` is a list or tuple of scalars and arrays, the entries are
+        packed into a single buffer of their common dtype so that only one
+        ``MPI_Allreduce`` is issued. The reduction is performed in place on
+        ``out`` if it is provided.
+
+        Args:
+            buf: Array, or list of scalars and arrays
+            op (str): One of ``"sum"``, ``"max"``, or ``"min"``
+            out: Contiguous array (or list of arrays) receiving the result;
+                may be ``buf`` itself
+
+        Return:
+            Reduced array, or list of reduced scalars and arrays
+        """
+        cdef ReduceOp rop = reduce_op(op)
+        cdef np.ndarray packed
+        if not isinstance(buf, (list, tuple)):
+            if out is None:
+                packed = np.array(buf, order="C")
+            else:
+                packed = out
+                if packed is not buf:
+                    packed[...] = buf
+            self.reduce_inplace(packed, rop)
+            return packed
+
+        items = [np.asarray(b) for b in buf]
+        if out is not None and len(out) != len(items):
+            raise ValueError("Mismatch in number of inputs and outputs")
+        dtype = np.result_type(*items) if items else np.float64
+        sizes = [b.size for b in items]
+        offsets = np.zeros((len(items) + 1,), dtype=np.int64)
+        np.cumsum(sizes, out=offsets[1:])
+        packed = np.empty((offsets[len(items)],), dtype=dtype)
+        for i, b in enumerate(items):
+            packed[offsets[i]:offsets[i + 1]] = b.ravel()
+        self.reduce_inplace(packed, rop)
+
+        result = [] if out is None else out
+        for i, b in enumerate(items):
+            val = packed[offsets[i]:offsets[i + 1]].reshape(b.shape)
+            if out is not None:
+                out[i][...] = val
+            elif b.ndim == 0:
+                result.append(val[()])
+            else:
+                result.append(val)
+        return result
+
+    def bcast(self, obj, int root=0):
+        """Broadcast a picklable Python object from the root rank
+
+        Args:
+            obj: Object to send (ignored on the other ranks)
+            root (int): Rank sending the object
+
+        Return:
+            The object of the root rank
+        """
+        data = pickle.dumps(obj, pickle.HIGHEST_PROTOCOL) if self.rank == root else b""
+        cdef int nbytes = len(data)
+        MPI_Bcast(&nbytes, 1, MPI_INT, root, self.comm)
+        cdef np.ndarray buf = np.empty((nbytes,), dtype=np.uint8)
+        if self.rank == root:
+            buf[:] = np.frombuffer(data, dtype=np.uint8)
+        MPI_Bcast(np.PyArray_DATA(buf), nbytes, MPI_BYTE, root, self.comm)
+        if self.rank == root:
+            return obj
+        return pickle.loads(buf.tobytes())
+
+    def gather(self, obj, int root=0):
+        """Gather a picklable Python object from every rank on the root rank
+
+        Args:
+            obj: Object of this rank
+            root (int): Rank receiving the objects
+
+        Return:
+            list: Objects ordered by rank on the root rank, None elsewhere
+        """
+        cdef bytes data = pickle.dumps(obj, pickle.HIGHEST_PROTOCOL)
+        cdef const char* sbuf = data
+        cdef int nbytes = len(data)
+        cdef bint is_root = self.rank == root
+        cdef np.ndarray counts = np.zeros((self.size if is_root else 1,), dtype=np.intc)
+        MPI_Gather(&nbytes, 1, MPI_INT, np.PyArray_DATA(counts), 1, MPI_INT,
+                   root, self.comm)
+        cdef np.ndarray displs = np.zeros_like(counts)
+        np.cumsum(counts[:counts.shape[0] - 1], out=displs[1:])
+        cdef np.ndarray recv = np.empty(
+            (int(counts.sum()) if is_root else 1,), dtype=np.uint8)
+        MPI_Gatherv(<void*>sbuf, nbytes, MPI_BYTE, np.PyArray_DATA(recv),
+                    <const int*>np.PyArray_DATA(counts),
+                    <const int*>np.PyArray_DATA(displs), MPI_BYTE, root, self.comm)
+        if not is_root:
+            return None
+        return [pickle.loads(recv[displs[i]:displs[i] + counts[i]].tobytes())
+                for i in range(self.size)]
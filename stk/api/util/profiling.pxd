@@ -0,0 +1,18 @@
+# -*- coding: utf-8 -*-
+# distutils: language = c++
+# cython: embedsignature = True
+
+cdef double wall_time() nogil
+
+cdef class Profiler:
+    cdef readonly bint enabled
+    cdef readonly bint trace
+    cdef readonly size_t max_events
+    cdef double origin
+    cdef dict stats
+    cdef list events
+
+    cdef double tic(self)
+    cdef void toc(self, str name, double t0, double nbytes=*, double t1=*) except *
+
+cdef Profiler get_profiler()
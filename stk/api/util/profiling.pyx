@@ -0,0 +1,222 @@
+# -*- coding: utf-8 -*-
+# distutils: language = c++
+# cython: embedsignature = True
+
+"""\
+Profiling of pySTK operations
+=============================
+
+This module provides an opt-in instrumentation layer that records the number
+of calls, the wall time, and the bytes moved for the mesh, I/O, and field
+operations wrapped by pySTK. Profiling is disabled by default and the
+instrumented operations only check a flag in that case.
+
+.. code-block:: python
+
+   from stk import profiling
+
+   profiling.enable(trace=True)
+   with profiling.region("solve"):
+       ...
+   report = profiling.report(comm)
+   profiling.write_json("profile.json", comm)
+   profiling.write_chrome_trace("trace.json", comm)
+
+Reports can be aggregated across MPI ranks, giving the minimum, maximum, and
+average time per operation and the load imbalance (``max / avg``). All ranks
+must call :func:`report` (and the functions that use it) collectively and
+must have recorded the same set of operation names.
+"""
+
+from posix.time cimport clock_gettime, timespec, CLOCK_MONOTONIC
+from .parallel cimport Parallel
+
+import json
+import os
+import threading
+import zlib
+from contextlib import contextmanager
+import numpy as np
+
+cdef double wall_time() nogil:
+    """Monotonic wall clock time in seconds"""
+    cdef timespec ts
+    clock_gettime(CLOCK_MONOTONIC, &ts)
+    return ts.tv_sec + 1.0e-9 * ts.tv_nsec
+
+cdef class Profiler:
+    """Collect timings for instrumented operations
+
+    A single instance is shared by all pySTK modules, use the module-level
+    functions (e.g., :func:`enable`, :func:`report`) to interact with it.
+    """
+
+    def __cinit__(self):
+        self.enabled = False
+        self.trace = False
+        self.max_events = 1000000
+        self.origin = wall_time()
+        self.stats = {}
+        self.events = []
+
+    cdef double tic(self):
+        """Start time for an operation"""
+        return wall_time()
+
+    cdef void toc(self, str name, double t0, double nbytes=0.0,
+                  double t1=-1.0) except *:
+        """Record an operation that started at ``t0``
+
+        The end time ``t1`` defaults to the current time. Callers that compute
+        ``nbytes`` after the operation pass the end time taken before, so that
+        the bookkeeping is not included in the recorded time.
+        """
+        if t1 < 0.0:
+            t1 = wall_time()
+        cdef list rec = self.stats.get(name, None)
+        if rec is None:
+            rec = [0, 0.0, 0.0]
+            self.stats[name] = rec
+        rec[0] += 1
+        rec[1] += t1 - t0
+        rec[2] += nbytes
+        if self.trace and len(self.events) < self.max_events:
+            self.events.append((name, t0, t1 - t0, threading.get_ident()))
+
+cdef Profiler _profiler = Profiler()
+
+cdef Profiler get_profiler():
+    """Return the profiler shared by all modules"""
+    return _profiler
+
+def enable(bint trace=False, size_t max_events=1000000):
+    """Enable profiling
+
+    Args:
+        trace (bool): If True, also record individual events for Chrome trace output
+        max_events (int): Maximum number of trace events recorded per rank
+    """
+    _profiler.enabled = True
+    _profiler.trace = trace
+    _profiler.max_events = max_events
+
+def disable():
+    """Disable profiling (recorded data is retained)"""
+    _profiler.enabled = False
+
+def is_enabled():
+    """Return True if profiling is enabled"""
+    return _profiler.enabled
+
+def reset():
+    """Discard all recorded data"""
+    _profiler.stats.clear()
+    _profiler.events.clear()
+    _profiler.origin = wall_time()
+
+@contextmanager
+def region(str name, double nbytes=0.0):
+    """Context manager to time a user-defined region
+
+    Args:
+        name (str): Name of the region
+        nbytes (double): Bytes moved within the region (optional)
+    """
+    if not _profiler.enabled:
+        yield
+        return
+    cdef double t0 = _profiler.tic()
+    try:
+        yield
+    finally:
+        _profiler.toc(name, t0, nbytes)
+
+def local_stats():
+    """Return the data recorded on this rank
+
+    Return:
+        dict: ``{name: (count, time, bytes)}``
+    """
+    return {name: tuple(rec) for name, rec in _profiler.stats.items()}
+
+def report(Parallel comm=None):
+    """Summary of the recorded operations
+
+    If ``comm`` is provided, the statistics are aggregated across all ranks of
+    the communicator.
+
+    Args:
+        comm (Parallel): Communicator for aggregating across ranks
+
+    Return:
+        dict: ``{name: {count, time_min, time_max, time_avg, imbalance, bytes}}``
+    """
+    names = sorted(_profiler.stats)
+    nops = len(names)
+    local = np.zeros((3, nops), dtype=np.float64)
+    for i, name in enumerate(names):
+        local[:, i] = _profiler.stats[name]
+    nranks = 1
+    tsum = tmin = tmax = local[1]
+    counts = local[0]
+    nbytes = local[2]
+    if comm is not None and comm.size > 1:
+        nranks = comm.size
+        sig = np.array([nops, zlib.crc32("\n".join(names).encode())],
+                       dtype=np.float64)
+        if np.any(comm.parallel_reduce_min(sig) != comm.parallel_reduce_max(sig)):
+            raise RuntimeError(
+                "Profiled operations differ across MPI ranks, cannot aggregate")
+        if nops == 0:
+            return {}
+        sums = comm.parallel_reduce_sum(local.ravel()).reshape(3, nops)
+        tmin = comm.parallel_reduce_min(local[1].copy())
+        tmax = comm.parallel_reduce_max(local[1].copy())
+        counts = sums[0]
+        tsum = sums[1]
+        nbytes = sums[2]
+
+    out = {}
+    for i, name in enumerate(names):
+        tavg = tsum[i] / nranks
+        out[name] = dict(
+            count=int(counts[i]), time_min=float(tmin[i]),
+            time_max=float(tmax[i]), time_avg=float(tavg),
+            imbalance=float(tmax[i] / tavg) if tavg > 0.0 else 1.0,
+            bytes=float(nbytes[i]))
+    return out
+
+def write_json(str filename, Parallel comm=None):
+    """Write the (aggregated) report to a JSON file on the root rank
+
+    Args:
+        filename (str): Output file name
+        comm (Parallel): Communicator for aggregating across ranks
+    """
+    summary = report(comm)
+    if comm is None or comm.rank == 0:
+        with open(filename, "w") as fh:
+            json.dump(dict(nranks=1 if comm is None else comm.size,
+                           operations=summary), fh, indent=2)
+
+def write_chrome_trace(str filename, Parallel comm=None):
+    """Write recorded events in the Chrome trace event format
+
+    The trace can be viewed in ``chrome://tracing`` or Perfetto. In parallel
+    runs, every rank writes its own file with the rank number inserted before
+    the extension (``trace.3.json``), with the rank used as the process ID.
+
+    Args:
+        filename (str): Output file name
+        comm (Parallel): Communicator used to determine the rank
+    """
+    rank = 0 if comm is None else comm.rank
+    if comm is not None and comm.size > 1:
+        base, ext = os.path.splitext(filename)
+        filename = "%s.%d%s"%(base, rank, ext)
+    origin = _profiler.origin
+    events = [dict(name=name, ph="X", ts=1.0e6 * (t0 - origin),
+                   dur=1.0e6 * dur, pid=rank, tid=tid, cat="stk")
+              for name, t0, dur, tid in _profiler.events]
+    with open(filename, "w") as fh:
+        json.dump(dict(traceEvents=events, displayTimeUnit="ms"), fh)
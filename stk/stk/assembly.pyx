@@ -0,0 +1,204 @@
+# -*- coding: utf-8 -*-
+# distutils: language = c++
+# cython: embedsignature = True
+
+"""\
+Sparse operator assembly
+========================
+
+Assemble edge or element contributions into a nodal sparse matrix in SciPy
+CSR format. :class:`CsrAssembler` computes the sparsity pattern and the
+position of every local matrix entry in the CSR data array once; every
+subsequent :meth:`CsrAssembler.assemble` only scatters the new coefficients,
+so the operator can be reassembled cheaply whenever the coefficients change.
+
+.. code-block:: python
+
+   from stk.stk.assembly import CsrAssembler
+
+   asm = CsrAssembler(mesh.bulk, sel, StkRank.EDGE_RANK)
+   lap = asm.graph_laplacian(weights)
+   # Reuse the matrix storage for the next update
+   lap = asm.graph_laplacian(new_weights, out=lap)
+
+The rows and columns are the selected nodes in
+:meth:`~stk.api.mesh.bulk.StkBulkData.iter_entities` order. The assembly is
+local to each MPI rank; contributions to shared nodes from other ranks are not
+included. SciPy is only required to create the matrix.
+"""
+
+from libc.stdint cimport int64_t
+from ..api.mesh.bulk cimport StkBulkData
+from ..api.mesh.selector cimport StkSelector
+from ..api.topology.topology cimport rank_t
+from ..api.util.profiling cimport Profiler, get_profiler
+
+cimport numpy as np
+import numpy as np
+
+np.import_array()
+
+cdef Profiler _prof = get_profiler()
+
+def _csr_matrix(data, indices, indptr, shape):
+    """Create a SciPy CSR matrix without copying the arrays"""
+    try:
+        from scipy.sparse import csr_matrix
+    except ImportError:
+        raise ImportError("SciPy is required to assemble sparse matrices")
+    return csr_matrix((data, indices, indptr), shape=shape, copy=False)
+
+cdef class CsrAssembler:
+    """Assemble local edge or element matrices into a nodal CSR matrix
+
+    Args:
+        bulk (StkBulkData): BulkData instance
+        sel (StkSelector): Selector for the nodes and the edges or elements
+        rank (rank_t): EDGE_RANK or ELEM_RANK (default: ELEM_RANK)
+    """
+
+    cdef readonly rank_t rank
+    cdef readonly np.ndarray node_offsets
+    cdef readonly np.ndarray entity_offsets
+    cdef readonly np.ndarray block_sizes
+    cdef readonly np.ndarray indptr
+    cdef readonly np.ndarray indices
+    cdef np.ndarray scatter_map
+    cdef readonly np.ndarray connectivity
+
+    def __init__(self, StkBulkData bulk, StkSelector sel,
+                 rank_t rank=rank_t.ELEM_RANK):
+        if rank not in (rank_t.EDGE_RANK, rank_t.ELEM_RANK):
+            raise ValueError("Assembly is only supported for edges and elements")
+        self.rank = rank
+        self.node_offsets = bulk.local_offsets(sel, rank_t.NODE_RANK)
+        self.entity_offsets = bulk.local_offsets(sel, rank)
+        coffsets, conn = bulk.connectivity_csr(sel, rank, rank_t.NODE_RANK)
+        self.block_sizes = np.diff(coffsets)
+
+        # Map the local offsets of the connected nodes to matrix rows
+        order = np.argsort(self.node_offsets, kind="stable")
+        pos = np.searchsorted(self.node_offsets, conn, sorter=order)
+        pos = np.minimum(pos, max(len(order) - 1, 0))
+        if len(conn) > 0 and (len(order) == 0 or
+                              np.any(self.node_offsets[order[pos]] != conn)):
+            raise ValueError("Connected nodes must belong to the selector")
+        self.connectivity = order[pos].astype(np.int64) if len(conn) else conn
+        self._build_pattern(coffsets)
+
+    cdef void _build_pattern(self, np.ndarray coffsets) except *:
+        """Compute the sparsity pattern and the scatter map"""
+        cdef int64_t nrows = self.node_offsets.shape[0]
+        cdef int64_t nblocks = self.block_sizes.shape[0]
+        cdef np.ndarray sizes = self.block_sizes.astype(np.int64)
+        cdef int64_t nentries = int(np.sum(sizes * sizes))
+        rows = np.empty((nentries,), dtype=np.int64)
+        cols = np.empty((nentries,), dtype=np.int64)
+        cdef int64_t[::1] rptr = rows
+        cdef int64_t[::1] cptr = cols
+        cdef const int64_t[::1] conn = self.connectivity
+        cdef const int64_t[::1] offs = coffsets.astype(np.int64)
+        cdef int64_t b, i, j, count = 0
+        with nogil:
+            for b in range(nblocks):
+                for i in range(offs[b], offs[b + 1]):
+                    for j in range(offs[b], offs[b + 1]):
+                        rptr[count] = conn[i]
+                        cptr[count] = conn[j]
+                        count += 1
+
+        keys, inverse = np.unique(rows * nrows + cols, return_inverse=True)
+        self.indices = (keys % max(nrows, 1)).astype(np.int64)
+        counts = np.bincount(keys // max(nrows, 1), minlength=nrows) if nrows else []
+        self.indptr = np.zeros((nrows + 1,), dtype=np.int64)
+        self.indptr[1:] = np.cumsum(counts)
+        self.scatter_map = inverse.astype(np.int64).ravel()
+
+    @property
+    def shape(self):
+        """Shape of the assembled matrix"""
+        n = self.node_offsets.shape[0]
+        return (n, n)
+
+    @property
+    def nnz(self):
+        """Number of nonzero entries in the sparsity pattern"""
+        return self.indices.shape[0]
+
+    @property
+    def num_entries(self):
+        """Number of local matrix entries expected by :meth:`assemble`"""
+        return self.scatter_map.shape[0]
+
+    def pattern(self):
+        """Sparsity pattern as a matrix of ones
+
+        Return:
+            scipy.sparse.csr_matrix: Matrix with the assembly sparsity pattern
+        """
+        return _csr_matrix(np.ones(self.nnz), self.indices, self.indptr, self.shape)
+
+    def assemble(self, values, out=None):
+        """Sum local matrices into the CSR matrix
+
+        The local matrix of every edge or element is a dense ``(k, k)`` block
+        in the node order of its connectivity. The blocks are provided either
+        as an array of shape ``(n, k, k)`` (if all entities have ``k`` nodes)
+        or as a flat array of the concatenated row-major blocks.
+
+        Args:
+            values (np.ndarray): Local matrices of the selected edges or elements
+            out (scipy.sparse.csr_matrix): Matrix from a previous call whose
+                data is overwritten in place
+
+        Return:
+            scipy.sparse.csr_matrix: Assembled matrix
+        """
+        cdef np.ndarray vals = np.ascontiguousarray(values, dtype=np.float64).ravel()
+        if vals.shape[0] != self.scatter_map.shape[0]:
+            raise ValueError("Expected %d local matrix entries, got %d"%(
+                self.scatter_map.shape[0], vals.shape[0]))
+        if out is not None:
+            if out.nnz != self.nnz or out.data.dtype != np.float64:
+                raise ValueError("Output matrix does not match the sparsity pattern")
+            data = out.data
+        else:
+            data = np.empty((self.nnz,), dtype=np.float64)
+        cdef double[::1] dptr = data
+        cdef const double[::1] vptr = vals
+        cdef const int64_t[::1] smap = self.scatter_map
+        cdef int64_t i
+        cdef double t0 = _prof.tic() if _prof.enabled else -1.0
+        with nogil:
+            dptr[:] = 0.0
+            for i in range(smap.shape[0]):
+                dptr[smap[i]] += vptr[i]
+        if t0 >= 0.0:
+            _prof.toc("assembly.assemble", t0)
+        if out is not None:
+            return out
+        return _csr_matrix(data, self.indices, self.indptr, self.shape)
+
+    def graph_laplacian(self, weights=None, out=None):
+        """Assemble the weighted graph Laplacian of the edges
+
+        Every edge with weight ``w`` contributes ``[[w, -w], [-w, w]]``.
+
+        Args:
+            weights (np.ndarray): Weight for every edge (default: 1)
+            out (scipy.sparse.csr_matrix): Matrix from a previous call
+
+        Return:
+            scipy.sparse.csr_matrix: Laplacian matrix
+        """
+        if self.rank != rank_t.EDGE_RANK:
+            raise ValueError("Graph Laplacian requires an edge assembler")
+        nedges = self.block_sizes.shape[0]
+        w = (np.ones((nedges,)) if weights is None
+             else np.asarray(weights, dtype=np.float64).reshape((nedges,)))
+        blocks = np.empty((nedges, 2, 2), dtype=np.float64)
+        blocks[:, 0, 0] = w
+        blocks[:, 1, 1] = w
+        blocks[:, 0, 1] = -w
+        blocks[:, 1, 0] = -w
+        return self.assemble(blocks, out=out)
@@ -0,0 +1,315 @@
+# -*- coding: utf-8 -*-
+# distutils: language = c++
+# cython: embedsignature = True
+
+"""\
+Dynamic load balancing
+======================
+
+Weighted partitioning of the elements across MPI ranks, used by
+:meth:`~stk.stk.stk_mesh.StkMesh.rebalance` to migrate the mesh when the
+load of the ranks drifts apart during a simulation.
+
+- :func:`rcb_partition`: recursive coordinate bisection of the element
+  centroids. All cuts of a level are computed together, so the number of
+  collective reductions grows with the logarithm of the number of parts.
+- :func:`hilbert_partition`: splits the elements along a Hilbert
+  space-filling curve into contiguous pieces of equal weight.
+- :func:`graph_refine`: moves elements on the part boundaries to reduce the
+  number of cut edges of the element graph of an existing partition.
+
+Both partitioners work on distributed data: every rank passes its own
+elements, and the cuts are found by bisection with global reductions.
+
+.. code-block:: python
+
+   stats = mesh.rebalance(weights_field=cost, method="rcb", imbalance_tol=1.05)
+   print(stats["imbalance_before"], stats["imbalance_after"])
+"""
+
+from ..api.util.parallel cimport Parallel
+from ..api.mesh.bulk cimport curve_keys
+
+cimport numpy as np
+import numpy as np
+
+np.import_array()
+
+def load_imbalance(Parallel par, double load):
+    """Ratio of the maximum load to the average load across all ranks
+
+    Args:
+        par (Parallel): Parallel communicator
+        load (float): Load of this rank
+
+    Return:
+        float: Imbalance factor (1.0 is perfectly balanced)
+    """
+    loc = np.array([load])
+    total = par.parallel_reduce_sum(loc)[0]
+    maximum = par.parallel_reduce_max(loc)[0]
+    if total <= 0.0:
+        return 1.0
+    return maximum * par.size / total
+
+def _local_weights(points, weights):
+    """Points as a 2-D float64 array and weights (default: 1)"""
+    pts = np.ascontiguousarray(points, dtype=np.float64)
+    if pts.ndim == 1:
+        pts = pts.reshape((-1, 1))
+    if weights is None:
+        wts = np.ones((pts.shape[0],), dtype=np.float64)
+    else:
+        wts = np.ascontiguousarray(weights, dtype=np.float64).reshape((-1,))
+        if wts.shape[0] != pts.shape[0]:
+            raise ValueError("Mismatch in number of points and weights")
+    return pts, wts
+
+def _bincount_sum(Parallel par, group, values, ngroups):
+    """Global sum of values per group"""
+    return par.parallel_reduce_sum(
+        np.bincount(group, values, minlength=ngroups).astype(np.float64))
+
+def rcb_partition(Parallel par, points, weights=None, int nparts=0,
+                  double tol=1.0e-3, int max_iter=60):
+    """Weighted recursive coordinate bisection
+
+    Parts ``[lo, hi)`` are split recursively along the longest axis of their
+    bounding box, with the cut placed such that the weight on each side is
+    proportional to its number of parts. Items lying on the cut plane (e.g.,
+    element centroids of structured meshes) are divided along the remaining
+    axes. This is a collective operation.
+
+    Args:
+        par (Parallel): Parallel communicator
+        points (np.ndarray): Coordinates of the local items, shape ``(n, ndim)``
+        weights (np.ndarray): Weight of every item (default: 1)
+        nparts (int): Number of parts (default: number of MPI ranks)
+        tol (float): Relative tolerance on the weight of every cut
+        max_iter (int): Maximum number of bisection steps per cut and axis
+
+    Return:
+        np.ndarray: Part (int32) for every local item
+    """
+    pts, wts = _local_weights(points, weights)
+    if nparts < 1:
+        nparts = par.size
+    cdef int ndim = pts.shape[1]
+    npts = pts.shape[0]
+    items = np.arange(npts)
+    group = np.zeros((npts,), dtype=np.int64)
+    part_lo = np.array([0], dtype=np.int64)
+    part_hi = np.array([nparts], dtype=np.int64)
+
+    while np.any(part_hi - part_lo > 1):
+        ngroups = part_lo.shape[0]
+        gmin = np.full((ngroups, ndim), np.inf)
+        gmax = np.full((ngroups, ndim), -np.inf)
+        np.minimum.at(gmin, group, pts)
+        np.maximum.at(gmax, group, pts)
+        gmin = par.parallel_reduce_min(gmin.ravel()).reshape((ngroups, ndim))
+        gmax = par.parallel_reduce_max(gmax.ravel()).reshape((ngroups, ndim))
+        with np.errstate(invalid="ignore"):
+            extent = np.nan_to_num(gmax - gmin, neginf=0.0)
+        axes = np.argsort(-extent, axis=1, kind="stable")
+        total = _bincount_sum(par, group, wts, ngroups)
+        nparts_grp = part_hi - part_lo
+        nleft = nparts_grp // 2
+        target = total * nleft / nparts_grp
+        split = nparts_grp > 1
+
+        # Bisect along the primary axis, then divide the items on the cut
+        # plane along the secondary and tertiary axes
+        left = ~split[group]
+        active = split[group]
+        done = ~split
+        base = np.zeros((ngroups,))
+        for a in range(ndim):
+            if np.all(done):
+                break
+            coord = pts[items, axes[group, a]]
+            amin = np.full((ngroups,), np.inf)
+            amax = np.full((ngroups,), -np.inf)
+            np.minimum.at(amin, group[active], coord[active])
+            np.maximum.at(amax, group[active], coord[active])
+            amin = par.parallel_reduce_min(amin)
+            amax = par.parallel_reduce_max(amax)
+            lo = np.nextafter(amin, -np.inf)
+            hi = amax
+            with np.errstate(invalid="ignore"):
+                for it in range(max_iter):
+                    trial = lo + 0.5 * (hi - lo)
+                    collapsed = ~((trial > lo) & (trial < hi))
+                    below = base + _bincount_sum(
+                        par, group, wts * (active & (coord <= trial[group])), ngroups)
+                    converged = ~done & (np.abs(below - target) <= tol * total)
+                    if np.any(converged):
+                        left |= active & converged[group] & (coord <= trial[group])
+                        active &= ~converged[group]
+                        done = done | converged
+                    if np.all(done | collapsed):
+                        break
+                    heavy = below >= target
+                    hi = np.where(heavy, trial, hi)
+                    lo = np.where(heavy, lo, trial)
+
+                # Items below the bracket go left, items on the cut plane
+                # stay active for the next axis
+                below_lo = active & (coord <= lo[group])
+                base = base + _bincount_sum(par, group, wts * below_lo, ngroups)
+                left |= below_lo
+                active &= (coord > lo[group]) & (coord <= hi[group])
+        left |= active
+
+        # Children of every group, groups with a single part are not split
+        left_child = np.cumsum(1 + split) - 1 - split
+        right_child = left_child + split
+        new_lo = np.empty((ngroups + np.count_nonzero(split),), dtype=np.int64)
+        new_hi = np.empty_like(new_lo)
+        new_lo[left_child] = part_lo
+        new_hi[left_child] = part_lo + np.where(split, nleft, nparts_grp)
+        new_lo[right_child[split]] = (part_lo + nleft)[split]
+        new_hi[right_child[split]] = part_hi[split]
+        group = np.where(left, left_child[group], right_child[group])
+        part_lo, part_hi = new_lo, new_hi
+
+    return part_lo[group].astype(np.intc)
+
+def hilbert_partition(Parallel par, points, weights=None, int nparts=0):
+    """Weighted partitioning along a Hilbert space-filling curve
+
+    The items are ordered along a Hilbert curve over the global bounding box
+    and split into ``nparts`` contiguous pieces of equal weight. The splitters
+    are found by bisection on the curve keys. This is a collective operation.
+
+    Args:
+        par (Parallel): Parallel communicator
+        points (np.ndarray): Coordinates of the local items, shape ``(n, ndim)``
+        weights (np.ndarray): Weight of every item (default: 1)
+        nparts (int): Number of parts (default: number of MPI ranks)
+
+    Return:
+        np.ndarray: Part (int32) for every local item
+    """
+    pts, wts = _local_weights(points, weights)
+    if nparts < 1:
+        nparts = par.size
+    if nparts == 1:
+        return np.zeros((pts.shape[0],), dtype=np.intc)
+    cdef int ndim = pts.shape[1]
+    lo = np.full((ndim,), np.inf)
+    hi = np.full((ndim,), -np.inf)
+    if pts.shape[0] > 0:
+        lo = pts.min(axis=0)
+        hi = pts.max(axis=0)
+    lo = par.parallel_reduce_min(lo)
+    hi = par.parallel_reduce_max(hi)
+    keys = curve_keys(pts, True, lo, hi)
+
+    order = np.argsort(keys, kind="stable")
+    sorted_keys = keys[order]
+    cumw = np.zeros((keys.shape[0] + 1,), dtype=np.float64)
+    np.cumsum(wts[order], out=cumw[1:])
+    total = par.parallel_reduce_sum(cumw[-1:].copy())[0]
+    target = total * np.arange(1, nparts) / nparts
+
+    # Smallest key such that the weight up to and including it reaches the target
+    klo = np.zeros((nparts - 1,), dtype=np.int64)
+    khi = np.full((nparts - 1,), np.iinfo(np.int64).max, dtype=np.int64)
+    while np.any(klo < khi):
+        mid = klo + (khi - klo) // 2
+        below = par.parallel_reduce_sum(
+            cumw[np.searchsorted(sorted_keys, mid, side="right")])
+        reached = below >= target
+        khi = np.where(reached, mid, khi)
+        klo = np.where(reached, klo, mid + 1)
+    return np.searchsorted(klo, keys, side="left").astype(np.intc)
+
+def graph_refine(Parallel par, indptr, indices, parts, weights=None, int nparts=0,
+                 double imbalance_tol=1.05, int max_passes=4):
+    """Reduce the edge cut of a partition by moving items on part boundaries
+
+    In every pass, items move to the adjacent part holding most of their
+    neighbors if this reduces the number of cut edges and the load of the
+    target part stays below ``imbalance_tol`` times the average load. The
+    room left in a part is shared among the ranks in proportion to the
+    weight they want to move. Moves to parts with larger and smaller numbers
+    alternate, so neighboring items do not swap parts back and forth. The
+    graph is local to every rank: edges to items on other ranks are not
+    seen. This is a collective operation.
+
+    Args:
+        par (Parallel): Parallel communicator
+        indptr (np.ndarray): CSR row pointers of the local graph
+        indices (np.ndarray): Neighbors (positions of the local items)
+        parts (np.ndarray): Initial part for every local item
+        weights (np.ndarray): Weight of every item (default: 1)
+        nparts (int): Number of parts (default: number of MPI ranks)
+        imbalance_tol (float): Maximum ratio of the part loads to the average
+        max_passes (int): Maximum number of passes in each direction
+
+    Return:
+        np.ndarray: Refined part (int32) for every local item
+    """
+    part = np.array(parts, dtype=np.int64).reshape((-1,))
+    cdef Py_ssize_t n = part.shape[0]
+    ptr = np.asarray(indptr, dtype=np.int64)
+    nbrs = np.asarray(indices, dtype=np.int64)
+    if ptr.shape[0] != n + 1:
+        raise ValueError("Mismatch in number of items and graph rows")
+    if weights is None:
+        wts = np.ones((n,), dtype=np.float64)
+    else:
+        wts = np.ascontiguousarray(weights, dtype=np.float64).reshape((-1,))
+        if wts.shape[0] != n:
+            raise ValueError("Mismatch in number of items and weights")
+    if nparts < 1:
+        nparts = par.size
+    rows = np.repeat(np.arange(n, dtype=np.int64), np.diff(ptr))
+
+    idle = 0
+    for it in range(2 * max_passes):
+        upward = it % 2 == 0
+        load = par.parallel_reduce_sum(np.bincount(part, wts, minlength=nparts))
+        room = np.maximum(imbalance_tol * load.sum() / nparts - load, 0.0)
+
+        # Gain of moving every item to each adjacent part
+        keys, counts = np.unique(rows * nparts + part[nbrs], return_counts=True)
+        krow = keys // nparts
+        kpart = keys % nparts
+        internal = np.zeros((n,), dtype=np.int64)
+        same = kpart == part[krow]
+        internal[krow[same]] = counts[same]
+        gain = counts - internal[krow]
+        direction = kpart > part[krow] if upward else kpart < part[krow]
+        cand = (gain > 0) & direction
+        krow, kpart, gain = krow[cand], kpart[cand], gain[cand]
+
+        # Best target part of every item
+        order = np.lexsort((-gain, krow))
+        first = np.ones((order.shape[0],), dtype=bool)
+        first[1:] = krow[order[1:]] != krow[order[:-1]]
+        best = order[first]
+        crow, cpart, cgain = krow[best], kpart[best], gain[best]
+        cw = wts[crow]
+
+        want = np.bincount(cpart, cw, minlength=nparts)
+        total = par.parallel_reduce_sum(want)
+        if not np.any(total > 0.0):
+            idle += 1
+            if idle > 1:
+                break
+            continue
+        idle = 0
+        frac = np.divide(room, total, out=np.zeros_like(room), where=total > 0.0)
+        budget = want * np.minimum(frac, 1.0) * (1.0 + 1.0e-12)
+
+        # Accept the largest gains first within the room of every part
+        order = np.lexsort((-cgain, cpart))
+        spart = cpart[order]
+        cum = np.cumsum(cw[order])
+        start = np.searchsorted(spart, spart, side="left")
+        used = cum - (cum[start] - cw[order][start])
+        accept = order[used <= budget[spart]]
+        part[crow[accept]] = cpart[accept]
+    return part.astype(np.intc)
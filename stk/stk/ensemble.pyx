@@ -0,0 +1,218 @@
+# -*- coding: utf-8 -*-
+# distutils: language = c++
+# cython: embedsignature = True
+
+"""\
+Ensemble processing
+===================
+
+Process many Exodus databases with a per-mesh callback. Every database is
+loaded into a fresh :class:`~stk.stk.stk_mesh.StkMesh`, and the values
+returned by the callback are gathered on the root rank.
+
+- With MPI, the ranks are split into groups of ``ranks_per_mesh`` ranks and
+  every group processes one database at a time on its own sub-communicator.
+  The groups take the next database from a shared counter as soon as they
+  are done, so fast groups keep working while slow ones finish large files.
+- In a serial run, ``max_workers`` processes can work on serial meshes
+  concurrently.
+
+In both cases the databases are handed out largest first, which keeps the
+tail of uneven ensembles short.
+
+.. code-block:: python
+
+   def max_temperature(mesh, path):
+       temp = mesh.meta.get_field("temperature")
+       sel = StkSelector.from_part(mesh.meta.locally_owned_part)
+       return mesh.comm.parallel_reduce_max(temp.gather(sel).max(keepdims=True))[0]
+
+   results = stk.ensemble.run(files, max_temperature, par, ranks_per_mesh=4)
+
+The callback must return a picklable object, and must be importable by name
+(i.e., not a lambda) when worker processes are used. The mesh is destroyed
+once the callback returns, so the result must not reference it. Exceptions
+raised while processing a database are returned (without traceback) in place
+of its result.
+"""
+
+import os
+from libc.stdint cimport int64_t
+from ..api.util.parallel cimport *
+from .stk_mesh cimport StkMesh
+
+cdef class _TaskCounter:
+    """Shared task counter on the first rank of a communicator"""
+
+    cdef MPI_Win win
+    cdef int64_t* base
+
+    def __cinit__(self, Parallel par):
+        cdef MPI_Aint nbytes = sizeof(int64_t) if par.rank == 0 else 0
+        self.win = MPI_WIN_NULL
+        MPI_Win_allocate(nbytes, sizeof(int64_t), MPI_INFO_NULL, par.comm,
+                         &self.base, &self.win)
+        if par.rank == 0:
+            self.base[0] = 0
+        MPI_Barrier(par.comm)
+        MPI_Win_lock_all(0, self.win)
+
+    cdef int64_t next(self):
+        """Atomically increment the counter and return the previous value"""
+        cdef int64_t one = 1
+        cdef int64_t value = 0
+        with nogil:
+            MPI_Fetch_and_op(&one, &value, MPI_INT64_T, 0, 0, MPI_SUM, self.win)
+            MPI_Win_flush(0, self.win)
+        return value
+
+    cdef void free(self):
+        """Release the window (collective)"""
+        if self.win != MPI_WIN_NULL:
+            MPI_Win_unlock_all(self.win)
+            MPI_Win_free(&self.win)
+
+def _largest_first(paths):
+    """Indices of the databases ordered by decreasing file size"""
+    def size(i):
+        try:
+            return os.path.getsize(paths[i])
+        except OSError:
+            return 0
+    return sorted(range(len(paths)), key=size, reverse=True)
+
+def process_database(Parallel par, str path, callback, int ndim=3,
+                     read_args=None, populate_args=None):
+    """Load a single database and apply the callback
+
+    Args:
+        par (Parallel): Communicator for the mesh
+        path (str): Path to the Exodus database
+        callback: Function called as ``callback(mesh, path)``
+        ndim (int): Dimensionality of the mesh
+        read_args (dict): Arguments to :meth:`StkMesh.read_mesh_meta_data`
+        populate_args (dict): Arguments to :meth:`StkMesh.populate_bulk_data`
+            (default: load the fields at the last time step)
+
+    Return:
+        Value returned by the callback, or the exception raised
+    """
+    if populate_args is None:
+        populate_args = dict(auto_load_fields=True)
+    mesh = None
+    try:
+        mesh = StkMesh(par, ndim=ndim)
+        mesh.read_mesh_meta_data(path, **(read_args or {}))
+        mesh.populate_bulk_data(**populate_args)
+        return callback(mesh, path)
+    except Exception as exc:
+        return _detach(exc)
+    finally:
+        # Destroy the mesh before the next database is loaded
+        del mesh
+
+def _detach(exc):
+    """Drop the tracebacks of an exception chain
+
+    The frames of the traceback reference the mesh, which would otherwise be
+    kept alive together with the returned exception.
+    """
+    err = exc
+    while err is not None:
+        err.__traceback__ = None
+        err = err.__cause__ or err.__context__
+    return exc
+
+cdef Parallel _worker_par = None
+
+def _init_worker():
+    """Initialize MPI in a worker process"""
+    global _worker_par
+    import atexit
+    _worker_par = Parallel.initialize(["stk-ensemble"])
+    atexit.register(_worker_par.finalize)
+
+def _worker_task(path, callback, ndim, read_args, populate_args):
+    return process_database(_worker_par, path, callback, ndim,
+                            read_args, populate_args)
+
+def _run_pool(paths, callback, int max_workers, int ndim,
+              read_args, populate_args):
+    """Process serial meshes in a pool of worker processes"""
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+    results = [None] * len(paths)
+    with ProcessPoolExecutor(max_workers=max_workers,
+                             mp_context=multiprocessing.get_context("spawn"),
+                             initializer=_init_worker) as pool:
+        futures = [(i, pool.submit(_worker_task, paths[i], callback, ndim,
+                                   read_args, populate_args))
+                   for i in _largest_first(paths)]
+        for i, fut in futures:
+            results[i] = fut.result()
+    return results
+
+def run(databases, callback, Parallel par=None, int ranks_per_mesh=1,
+        int max_workers=0, int root=0, int ndim=3,
+        read_args=None, populate_args=None):
+    """Process a list of databases and gather the results on the root rank
+
+    This is a collective operation over ``par``.
+
+    Args:
+        databases (list): Paths to the Exodus databases
+        callback: Function called as ``callback(mesh, path)`` on every rank
+            of the group processing the database
+        par (Parallel): Communicator (default: ``MPI_COMM_WORLD``)
+        ranks_per_mesh (int): Number of MPI ranks per mesh
+        max_workers (int): Number of worker processes for serial meshes; only
+            supported if ``par`` has a single rank (default: no workers)
+        root (int): Rank receiving the results
+        ndim (int): Dimensionality of the meshes
+        read_args (dict): Arguments to :meth:`StkMesh.read_mesh_meta_data`
+        populate_args (dict): Arguments to :meth:`StkMesh.populate_bulk_data`
+            (default: load the fields at the last time step)
+
+    Return:
+        list: Result of the callback on the first rank of the group for every
+        database (in input order) on the root rank, None elsewhere
+    """
+    paths = [os.fspath(p) for p in databases]
+    if par is None:
+        par = Parallel.initialize()
+    if ranks_per_mesh < 1:
+        raise ValueError("ranks_per_mesh must be positive")
+    if max_workers > 0:
+        if par.size > 1:
+            raise ValueError("Worker processes require a single MPI rank")
+        return _run_pool(paths, callback, max_workers, ndim,
+                         read_args, populate_args)
+
+    order = _largest_first(paths)
+    cdef Parallel group = par.split(par.rank // min(ranks_per_mesh, par.size))
+    cdef _TaskCounter counter = _TaskCounter(par)
+    cdef int64_t task
+    done = []
+    try:
+        while True:
+            task = counter.next() if group.rank == 0 else 0
+            task = group.bcast(task)
+            if task >= len(order):
+                break
+            idx = order[task]
+            res = process_database(group, paths[idx], callback, ndim,
+                                   read_args, populate_args)
+            if group.rank == 0:
+                done.append((idx, res))
+    finally:
+        counter.free()
+        group.free()
+
+    gathered = par.gather(done, root)
+    if gathered is None:
+        return None
+    results = [None] * len(paths)
+    for rank_results in gathered:
+        for idx, res in rank_results:
+            results[idx] = res
+    return results
@@ -0,0 +1,604 @@
+# -*- coding: utf-8 -*-
+# distutils: language = c++
+# cython: embedsignature = True
+
+"""\
+Element geometry
+================
+
+Vectorized geometry kernels for the elements and sides of a STK mesh. The
+nodal coordinates are gathered per bucket into ``(n_entities, npe, 3)``
+blocks, and the kernels run over every block with the GIL released:
+
+- :func:`centroids`: vertex average of the elements (or faces, edges)
+- :func:`volumes`: element volumes (areas in 2-D)
+- :func:`quality`: minimum scaled Jacobian over the element corners
+- :func:`face_areas`: areas and unit normals of the sides
+- :func:`volume_weighted_average`: global volume-weighted average of an
+  element field
+
+The results are returned as NumPy arrays in bucket order (the order of
+:meth:`~stk.api.mesh.bulk.StkBulkData.iter_entities` and
+:meth:`~stk.api.mesh.field.StkFieldBase.gather` for the same selector), and
+are optionally stored directly in STK fields.
+
+.. code-block:: python
+
+   from stk import geometry
+
+   sel = StkSelector.from_part(mesh.meta.locally_owned_part)
+   vol = geometry.volumes(mesh.bulk, sel, out=volume_field)
+   if geometry.quality(mesh.bulk, sel).min() <= 0.0:
+       raise RuntimeError("Mesh has inverted elements")
+
+Supported topologies are TET_4, PYRAMID_5, WEDGE_6 and HEX_8 elements,
+QUAD_4 and TRI_3 elements (2-D) and faces, and LINE_2 sides in 2-D.
+Higher-order elements use their vertex nodes. Volumes are exact for the
+trilinear hexahedra and wedges; pyramids with a non-planar base use the
+average of the two tetrahedral decompositions.
+"""
+
+from cython.operator cimport dereference as deref
+from libc cimport math
+from libcpp.vector cimport vector
+from ..api.mesh cimport stk_mesh_fwd as fwd
+from ..api.mesh.stk_mesh_fwd cimport Entity, BucketVector
+from ..api.mesh.bulk cimport BulkData, StkBulkData, count_entities
+from ..api.mesh.bucket cimport Bucket, StkBucket
+from ..api.mesh.field cimport StkFieldBase, FieldBase, field_data, field_scalars_per_entity
+from ..api.mesh.field cimport field_type_num
+from ..api.mesh.selector cimport StkSelector
+from ..api.topology.topology cimport topology, rank_t, topology_t
+from ..api.util.profiling cimport Profiler, get_profiler
+
+cimport numpy as np
+import numpy as np
+
+np.import_array()
+
+cdef Profiler _prof = get_profiler()
+
+cdef enum GeomShape:
+    GEOM_NONE
+    GEOM_LINE
+    GEOM_TRI
+    GEOM_QUAD
+    GEOM_TET
+    GEOM_PYRAMID
+    GEOM_WEDGE
+    GEOM_HEX
+
+cdef enum GeomKernel:
+    KERNEL_CENTROID
+    KERNEL_VOLUME
+    KERNEL_QUALITY
+    KERNEL_SIDE
+
+# Parametric coordinates of the hexahedron nodes
+cdef double HEX_XI[8]
+cdef double HEX_ETA[8]
+cdef double HEX_ZETA[8]
+HEX_XI[:] = [-1.0, 1.0, 1.0, -1.0, -1.0, 1.0, 1.0, -1.0]
+HEX_ETA[:] = [-1.0, -1.0, 1.0, 1.0, -1.0, -1.0, 1.0, 1.0]
+HEX_ZETA[:] = [-1.0, -1.0, -1.0, -1.0, 1.0, 1.0, 1.0, 1.0]
+
+# Triangle quadrature points and shape function derivatives (wedge volumes)
+cdef double TRI_QP_R[3]
+cdef double TRI_QP_S[3]
+cdef double TRI_DN_R[3]
+cdef double TRI_DN_S[3]
+TRI_QP_R[:] = [1.0 / 6.0, 2.0 / 3.0, 1.0 / 6.0]
+TRI_QP_S[:] = [1.0 / 6.0, 1.0 / 6.0, 2.0 / 3.0]
+TRI_DN_R[:] = [-1.0, 1.0, 0.0]
+TRI_DN_S[:] = [-1.0, 0.0, 1.0]
+
+# Corner node followed by its three edge neighbors (right-handed)
+cdef int TET_CORNERS[16]
+cdef int PYRAMID_CORNERS[16]
+cdef int WEDGE_CORNERS[24]
+cdef int HEX_CORNERS[32]
+TET_CORNERS[:] = [0, 1, 2, 3, 1, 2, 0, 3, 2, 0, 1, 3, 3, 0, 2, 1]
+PYRAMID_CORNERS[:] = [0, 1, 3, 4, 1, 2, 0, 4, 2, 3, 1, 4, 3, 0, 2, 4]
+WEDGE_CORNERS[:] = [0, 1, 2, 3, 1, 2, 0, 4, 2, 0, 1, 5,
+                    3, 5, 4, 0, 4, 3, 5, 1, 5, 4, 3, 2]
+HEX_CORNERS[:] = [0, 1, 3, 4, 1, 2, 0, 5, 2, 3, 1, 6, 3, 0, 2, 7,
+                  4, 7, 5, 0, 5, 4, 6, 1, 6, 5, 7, 2, 7, 6, 4, 3]
+
+cdef int geom_shape(topology topo):
+    """Shape category of the linear base topology"""
+    cdef topology_t base = topo.base().value()
+    if base == topology_t.TET_4:
+        return GEOM_TET
+    if base == topology_t.PYRAMID_5:
+        return GEOM_PYRAMID
+    if base == topology_t.WEDGE_6:
+        return GEOM_WEDGE
+    if base == topology_t.HEX_8:
+        return GEOM_HEX
+    if base in (topology_t.TRI_3, topology_t.TRI_3_2D, topology_t.SHELL_TRI_3):
+        return GEOM_TRI
+    if base in (topology_t.QUAD_4, topology_t.QUAD_4_2D, topology_t.SHELL_QUAD_4):
+        return GEOM_QUAD
+    if base in (topology_t.LINE_2, topology_t.LINE_2_1D, topology_t.SHELL_LINE_2,
+                topology_t.BEAM_2):
+        return GEOM_LINE
+    return GEOM_NONE
+
+cdef inline double det3(const double* a, const double* b, const double* c) nogil:
+    return (a[0] * (b[1] * c[2] - b[2] * c[1]) -
+            a[1] * (b[0] * c[2] - b[2] * c[0]) +
+            a[2] * (b[0] * c[1] - b[1] * c[0]))
+
+cdef inline void cross3(const double* a, const double* b, double* c) nogil:
+    c[0] = a[1] * b[2] - a[2] * b[1]
+    c[1] = a[2] * b[0] - a[0] * b[2]
+    c[2] = a[0] * b[1] - a[1] * b[0]
+
+cdef inline double norm3(const double* a) nogil:
+    return math.sqrt(a[0] * a[0] + a[1] * a[1] + a[2] * a[2])
+
+cdef inline void diff3(const double* x, int i, int j, double* d) nogil:
+    """Edge vector ``x[j] - x[i]``"""
+    cdef int k
+    for k in range(3):
+        d[k] = x[3 * j + k] - x[3 * i + k]
+
+cdef double tet_volume(const double* x, int i0, int i1, int i2, int i3) nogil:
+    cdef double e1[3]
+    cdef double e2[3]
+    cdef double e3[3]
+    diff3(x, i0, i1, e1)
+    diff3(x, i0, i2, e2)
+    diff3(x, i0, i3, e3)
+    return det3(e1, e2, e3) / 6.0
+
+cdef double hex_volume(const double* x) nogil:
+    """2x2x2 Gauss quadrature of the Jacobian determinant"""
+    cdef double jac[9]
+    cdef double gp = 1.0 / math.sqrt(3.0)
+    cdef double xi, eta, zeta, d0, d1, d2
+    cdef double vol = 0.0
+    cdef int q, a, k
+    for q in range(8):
+        xi = gp * HEX_XI[q]
+        eta = gp * HEX_ETA[q]
+        zeta = gp * HEX_ZETA[q]
+        for k in range(9):
+            jac[k] = 0.0
+        for a in range(8):
+            d0 = 0.125 * HEX_XI[a] * (1.0 + HEX_ETA[a] * eta) * (1.0 + HEX_ZETA[a] * zeta)
+            d1 = 0.125 * HEX_ETA[a] * (1.0 + HEX_XI[a] * xi) * (1.0 + HEX_ZETA[a] * zeta)
+            d2 = 0.125 * HEX_ZETA[a] * (1.0 + HEX_XI[a] * xi) * (1.0 + HEX_ETA[a] * eta)
+            for k in range(3):
+                jac[k] += x[3 * a + k] * d0
+                jac[3 + k] += x[3 * a + k] * d1
+                jac[6 + k] += x[3 * a + k] * d2
+        vol += det3(&jac[0], &jac[3], &jac[6])
+    return vol
+
+cdef double wedge_volume(const double* x) nogil:
+    """3-point triangle rule times 2-point Gauss rule along the extrusion"""
+    cdef double jac[9]
+    cdef double lval[3]
+    cdef double gp = 1.0 / math.sqrt(3.0)
+    cdef double zeta, zs, h, d0, d1, d2
+    cdef double vol = 0.0
+    cdef int q, g, a, k, t
+    for q in range(3):
+        lval[0] = 1.0 - TRI_QP_R[q] - TRI_QP_S[q]
+        lval[1] = TRI_QP_R[q]
+        lval[2] = TRI_QP_S[q]
+        for g in range(2):
+            zeta = -gp if g == 0 else gp
+            for k in range(9):
+                jac[k] = 0.0
+            for a in range(6):
+                t = a % 3
+                zs = -1.0 if a < 3 else 1.0
+                h = 0.5 * (1.0 + zs * zeta)
+                d0 = TRI_DN_R[t] * h
+                d1 = TRI_DN_S[t] * h
+                d2 = 0.5 * zs * lval[t]
+                for k in range(3):
+                    jac[k] += x[3 * a + k] * d0
+                    jac[3 + k] += x[3 * a + k] * d1
+                    jac[6 + k] += x[3 * a + k] * d2
+            vol += det3(&jac[0], &jac[3], &jac[6]) / 6.0
+    return vol
+
+cdef double solid_volume(int shape, const double* x) nogil:
+    if shape == GEOM_TET:
+        return tet_volume(x, 0, 1, 2, 3)
+    if shape == GEOM_PYRAMID:
+        return 0.5 * (tet_volume(x, 0, 1, 2, 4) + tet_volume(x, 0, 2, 3, 4) +
+                      tet_volume(x, 0, 1, 3, 4) + tet_volume(x, 1, 2, 3, 4))
+    if shape == GEOM_WEDGE:
+        return wedge_volume(x)
+    return hex_volume(x)
+
+cdef void area_vector(int shape, const double* x, double* area) nogil:
+    """Area-weighted normal of a line, triangle or quadrilateral"""
+    cdef double e1[3]
+    cdef double e2[3]
+    cdef int k
+    if shape == GEOM_LINE:
+        diff3(x, 0, 1, e1)
+        area[0] = e1[1]
+        area[1] = -e1[0]
+        area[2] = 0.0
+        return
+    if shape == GEOM_TRI:
+        diff3(x, 0, 1, e1)
+        diff3(x, 0, 2, e2)
+    else:
+        diff3(x, 0, 2, e1)
+        diff3(x, 1, 3, e2)
+    cross3(e1, e2, area)
+    for k in range(3):
+        area[k] *= 0.5
+
+cdef double corner_jacobian(const double* x, const int* corner) nogil:
+    """Scaled Jacobian at a corner of a solid element"""
+    cdef double e1[3]
+    cdef double e2[3]
+    cdef double e3[3]
+    diff3(x, corner[0], corner[1], e1)
+    diff3(x, corner[0], corner[2], e2)
+    diff3(x, corner[0], corner[3], e3)
+    cdef double lengths = norm3(e1) * norm3(e2) * norm3(e3)
+    if lengths <= 0.0:
+        return 0.0
+    return det3(e1, e2, e3) / lengths
+
+cdef double solid_quality(int shape, const double* x) nogil:
+    cdef const int* corners = HEX_CORNERS
+    cdef int ncorners = 8
+    cdef double scale = 1.0
+    cdef double q = math.INFINITY
+    cdef int k
+    if shape == GEOM_TET:
+        corners, ncorners, scale = TET_CORNERS, 4, math.sqrt(2.0)
+    elif shape == GEOM_PYRAMID:
+        corners, ncorners, scale = PYRAMID_CORNERS, 4, math.sqrt(2.0)
+    elif shape == GEOM_WEDGE:
+        corners, ncorners, scale = WEDGE_CORNERS, 6, 2.0 / math.sqrt(3.0)
+    for k in range(ncorners):
+        q = min(q, corner_jacobian(x, &corners[4 * k]))
+    return q * scale
+
+cdef double surface_quality(int shape, int ndim, const double* x) nogil:
+    """Scaled Jacobian of a triangle or quadrilateral
+
+    The corners are measured against the element normal in 3-D, and against
+    the positive z-axis in 2-D.
+    """
+    cdef double normal[3]
+    cdef double e1[3]
+    cdef double e2[3]
+    cdef double c[3]
+    cdef int nv = 3 if shape == GEOM_TRI else 4
+    cdef double scale = 2.0 / math.sqrt(3.0) if shape == GEOM_TRI else 1.0
+    cdef double q = math.INFINITY
+    cdef double lengths, nrm
+    cdef int k
+    if ndim == 2:
+        normal[0] = 0.0
+        normal[1] = 0.0
+        normal[2] = 1.0
+    else:
+        area_vector(shape, x, normal)
+        nrm = norm3(normal)
+        if nrm <= 0.0:
+            return 0.0
+        for k in range(3):
+            normal[k] /= nrm
+    for k in range(nv):
+        diff3(x, k, (k + 1) % nv, e1)
+        diff3(x, k, (k + nv - 1) % nv, e2)
+        lengths = norm3(e1) * norm3(e2)
+        if lengths <= 0.0:
+            return 0.0
+        cross3(e1, e2, c)
+        q = min(q, (c[0] * normal[0] + c[1] * normal[1] + c[2] * normal[2]) / lengths)
+    return q * scale
+
+cdef void entity_kernel(int kind, int shape, int ndim, const double* x,
+                        unsigned nv, double* res) nogil:
+    """Evaluate a kernel for one entity with ``nv`` vertex coordinates"""
+    cdef double area[3]
+    cdef double mag
+    cdef unsigned a
+    cdef int k
+    if kind == KERNEL_CENTROID:
+        for k in range(ndim):
+            res[k] = 0.0
+            for a in range(nv):
+                res[k] += x[3 * a + k]
+            res[k] /= nv
+    elif kind == KERNEL_VOLUME:
+        if shape >= GEOM_TET:
+            res[0] = solid_volume(shape, x)
+        elif shape == GEOM_LINE:
+            diff3(x, 0, 1, area)
+            res[0] = norm3(area)
+        else:
+            area_vector(shape, x, area)
+            res[0] = area[2] if ndim == 2 else norm3(area)
+    elif kind == KERNEL_QUALITY:
+        if shape >= GEOM_TET:
+            res[0] = solid_quality(shape, x)
+        else:
+            res[0] = surface_quality(shape, ndim, x)
+    else:
+        area_vector(shape, x, area)
+        mag = norm3(area)
+        res[0] = mag
+        for k in range(ndim):
+            res[1 + k] = area[k] / mag if mag > 0.0 else 0.0
+
+cdef void gather_coordinates(BulkData* bulk, const FieldBase* fld, const Bucket* bkt,
+                             unsigned npe, double* xyz) nogil:
+    """Copy the coordinates of the first ``npe`` nodes of every entity
+
+    The block has shape ``(bucket size, npe, 3)``, missing components are zero.
+    """
+    cdef size_t nent = deref(bkt).size()
+    cdef const Entity* nodes
+    cdef const double* data
+    cdef double* pt
+    cdef Entity ent
+    cdef unsigned nn, ncomp, k, c
+    cdef size_t e
+    for e in range(nent):
+        ent = deref(bkt)[e]
+        nodes = deref(bulk).begin_nodes(ent)
+        nn = deref(bulk).num_nodes(ent)
+        for k in range(npe):
+            pt = &xyz[3 * (e * npe + k)]
+            pt[0] = 0.0
+            pt[1] = 0.0
+            pt[2] = 0.0
+            if k >= nn:
+                continue
+            data = <const double*>field_data(deref(fld), nodes[k])
+            if data == NULL:
+                continue
+            ncomp = field_scalars_per_entity(deref(fld), nodes[k])
+            for c in range(min(ncomp, 3)):
+                pt[c] = data[c]
+
+cdef void store_bucket(const FieldBase* fld, const Bucket* bkt, const double* res,
+                       unsigned nres, unsigned col, unsigned ncol) nogil:
+    """Copy columns ``[col, col + ncol)`` of the results into a field"""
+    cdef double* fdata = <double*>field_data(deref(fld), deref(<fwd.Bucket*>bkt))
+    if fdata == NULL:
+        return
+    cdef unsigned ncomp = field_scalars_per_entity(deref(fld), deref(<fwd.Bucket*>bkt))
+    cdef unsigned ncopy = min(ncomp, ncol)
+    cdef size_t e
+    cdef unsigned c
+    for e in range(deref(bkt).size()):
+        for c in range(ncopy):
+            fdata[e * ncomp + c] = res[e * nres + col + c]
+
+cdef StkFieldBase coordinate_field(StkBulkData bulk, StkFieldBase coords):
+    if coords is None:
+        coords = bulk.meta.coordinate_field
+    if coords.is_null:
+        raise ValueError("Coordinate field has not been registered")
+    if field_type_num(deref(coords.fld)) != np.NPY_DOUBLE:
+        raise TypeError("Coordinate field %s must be float64"%coords.name)
+    return coords
+
+cdef np.ndarray evaluate(StkBulkData bulk, StkSelector sel, rank_t rank, int kind,
+                         StkFieldBase coords, list outputs):
+    """Run a kernel over the selected buckets
+
+    ``outputs`` is a list of ``(field, first column, number of columns)`` of
+    the results stored in fields.
+    """
+    coords = coordinate_field(bulk, coords)
+    cdef int ndim = bulk.meta.spatial_dimension
+    cdef unsigned nres = 1
+    if kind == KERNEL_CENTROID:
+        nres = ndim
+    elif kind == KERNEL_SIDE:
+        nres = ndim + 1
+
+    cdef vector[FieldBase*] flds
+    cdef vector[unsigned] fcols
+    cdef vector[unsigned] fsizes
+    cdef StkFieldBase sfld
+    for fld, col, ncol in outputs:
+        if fld is None:
+            continue
+        sfld = fld
+        if sfld.is_null:
+            raise ValueError("Output field does not exist")
+        if sfld.entity_rank != rank:
+            raise ValueError("Field %s is not defined on %s"%(sfld.name, rank))
+        if field_type_num(deref(sfld.fld)) != np.NPY_DOUBLE:
+            raise TypeError("Output field %s must be float64"%sfld.name)
+        flds.push_back(sfld.fld)
+        fcols.push_back(col)
+        fsizes.push_back(ncol)
+
+    cdef BulkData* bptr = bulk.bulk
+    cdef const FieldBase* cfld = coords.fld
+    cdef const BucketVector* bkts = &deref(bptr).get_buckets(rank, sel.sel)
+    cdef size_t nent = count_entities(deref(bkts))
+    result = np.zeros((nent, nres), dtype=np.float64)
+    cdef double* res = <double*>np.PyArray_DATA(result)
+    cdef vector[double] xbuf
+    cdef const Bucket* bkt
+    cdef topology topo
+    cdef size_t i, e, n, start = 0
+    cdef unsigned nv, f
+    cdef int shape
+    for i in range(deref(bkts).size()):
+        bkt = <const Bucket*>deref(bkts)[i]
+        topo = deref(bkt).topology()
+        shape = geom_shape(topo)
+        if (shape == GEOM_NONE or
+                (kind == KERNEL_SIDE and shape > GEOM_QUAD) or
+                (kind == KERNEL_SIDE and shape == GEOM_LINE and ndim != 2) or
+                (kind == KERNEL_QUALITY and shape == GEOM_LINE)):
+            raise ValueError("Unsupported topology: %s"%topo.name().decode('UTF-8'))
+        nv = topo.num_vertices()
+        n = deref(bkt).size()
+        xbuf.resize(n * nv * 3)
+        with nogil:
+            gather_coordinates(bptr, cfld, bkt, nv, xbuf.data())
+            for e in range(n):
+                entity_kernel(kind, shape, ndim, &xbuf[3 * e * nv], nv,
+                              &res[(start + e) * nres])
+            for f in range(flds.size()):
+                store_bucket(flds[f], bkt, &res[start * nres], nres,
+                             fcols[f], fsizes[f])
+        start += n
+    return result
+
+def bucket_coordinates(StkBulkData bulk, StkBucket bucket, StkFieldBase coords=None):
+    """Nodal coordinates of all entities in a bucket
+
+    Args:
+        bulk (StkBulkData): BulkData instance
+        bucket (StkBucket): Bucket
+        coords (StkFieldBase): Coordinate field (default: mesh coordinate field)
+
+    Return:
+        np.ndarray: Coordinates of shape ``(bucket size, nodes per entity, ndim)``
+    """
+    coords = coordinate_field(bulk, coords)
+    cdef int ndim = bulk.meta.spatial_dimension
+    cdef unsigned npe = deref(bucket.bkt).topology().num_nodes()
+    block = np.empty((deref(bucket.bkt).size(), npe, 3), dtype=np.float64)
+    cdef double* xyz = <double*>np.PyArray_DATA(block)
+    with nogil:
+        gather_coordinates(bulk.bulk, coords.fld, bucket.bkt, npe, xyz)
+    return np.ascontiguousarray(block[:, :, :ndim])
+
+def centroids(StkBulkData bulk, StkSelector sel, rank_t rank=rank_t.ELEM_RANK,
+              StkFieldBase coords=None, StkFieldBase out=None):
+    """Centroids (vertex average) of the selected entities
+
+    Args:
+        bulk (StkBulkData): BulkData instance
+        sel (StkSelector): Selector for the entities
+        rank (rank_t): Entity rank (default: ELEM_RANK)
+        coords (StkFieldBase): Coordinate field (default: mesh coordinate field)
+        out (StkFieldBase): Vector field of the entity rank to store the centroids
+
+    Return:
+        np.ndarray: Centroids of shape ``(n_entities, ndim)``
+    """
+    cdef double t0 = _prof.tic() if _prof.enabled else -1.0
+    result = evaluate(bulk, sel, rank, KERNEL_CENTROID, coords,
+                      [(out, 0, bulk.meta.spatial_dimension)])
+    if t0 >= 0.0:
+        _prof.toc("geometry.centroids", t0)
+    return result
+
+def volumes(StkBulkData bulk, StkSelector sel, StkFieldBase coords=None,
+            StkFieldBase out=None):
+    """Volumes of the selected elements
+
+    Two-dimensional elements return their signed area in 2-D meshes and their
+    area in 3-D meshes (shells).
+
+    Args:
+        bulk (StkBulkData): BulkData instance
+        sel (StkSelector): Selector for the elements
+        coords (StkFieldBase): Coordinate field (default: mesh coordinate field)
+        out (StkFieldBase): Scalar element field to store the volumes
+
+    Return:
+        np.ndarray: Volume of every element
+    """
+    cdef double t0 = _prof.tic() if _prof.enabled else -1.0
+    result = evaluate(bulk, sel, rank_t.ELEM_RANK, KERNEL_VOLUME, coords,
+                      [(out, 0, 1)])
+    if t0 >= 0.0:
+        _prof.toc("geometry.volumes", t0)
+    return result.reshape((-1,))
+
+def quality(StkBulkData bulk, StkSelector sel, StkFieldBase coords=None,
+            StkFieldBase out=None):
+    """Scaled Jacobian quality of the selected elements
+
+    The quality is the minimum over the element corners of the determinant
+    of the unit edge vectors at the corner, normalized to 1 for the ideal
+    element (e.g., a cube or an equilateral tetrahedron). Values less than or
+    equal to zero indicate degenerate or inverted elements.
+
+    Args:
+        bulk (StkBulkData): BulkData instance
+        sel (StkSelector): Selector for the elements
+        coords (StkFieldBase): Coordinate field (default: mesh coordinate field)
+        out (StkFieldBase): Scalar element field to store the quality
+
+    Return:
+        np.ndarray: Quality of every element
+    """
+    cdef double t0 = _prof.tic() if _prof.enabled else -1.0
+    result = evaluate(bulk, sel, rank_t.ELEM_RANK, KERNEL_QUALITY, coords,
+                      [(out, 0, 1)])
+    if t0 >= 0.0:
+        _prof.toc("geometry.quality", t0)
+    return result.reshape((-1,))
+
+def face_areas(StkBulkData bulk, StkSelector sel, StkFieldBase coords=None,
+               StkFieldBase area=None, StkFieldBase normal=None):
+    """Areas and unit normals of the selected sides
+
+    The normals follow the node ordering of the sides; sides created from
+    the elements (e.g., sidesets) point out of the element.
+
+    Args:
+        bulk (StkBulkData): BulkData instance
+        sel (StkSelector): Selector for the sides (e.g., a sideset part)
+        coords (StkFieldBase): Coordinate field (default: mesh coordinate field)
+        area (StkFieldBase): Scalar side field to store the areas
+        normal (StkFieldBase): Vector side field to store the unit normals
+
+    Return:
+        tuple: Areas ``(n_sides,)`` and unit normals ``(n_sides, ndim)``
+    """
+    cdef double t0 = _prof.tic() if _prof.enabled else -1.0
+    meta = bulk.meta
+    ndim = meta.spatial_dimension
+    result = evaluate(bulk, sel, meta.side_rank, KERNEL_SIDE, coords,
+                      [(area, 0, 1), (normal, 1, ndim)])
+    if t0 >= 0.0:
+        _prof.toc("geometry.face_areas", t0)
+    return np.ascontiguousarray(result[:, 0]), np.ascontiguousarray(result[:, 1:])
+
+def volume_weighted_average(StkBulkData bulk, StkFieldBase field,
+                            StkSelector sel=None, StkFieldBase coords=None):
+    """Global volume-weighted average of an element field
+
+    Only the locally owned elements are included, so that every element is
+    counted once across all MPI ranks. This is a collective operation.
+
+    Args:
+        bulk (StkBulkData): BulkData instance
+        field (StkFieldBase): Element field
+        sel (StkSelector): Selector for the elements (default: all elements of the field)
+
+    Return:
+        float or np.ndarray: Average (per component for vector fields)
+    """
+    if field.entity_rank != rank_t.ELEM_RANK:
+        raise ValueError("Field %s is not an element field"%field.name)
+    meta = bulk.meta
+    owned = StkSelector.select_field(field) & meta.locally_owned_part
+    if sel is not None:
+        owned = owned & sel
+    vol = volumes(bulk, owned, coords)
+    values = field.gather(owned)
+    wsum = (vol if values.ndim == 1 else vol[:, None]) * values
+    par = bulk.parallel
+    totals = par.parallel_reduce_sum(
+        np.concatenate([[vol.sum()], np.atleast_1d(wsum.sum(axis=0))]))
+    avg = totals[1:] / totals[0] if totals[0] != 0.0 else np.zeros(totals.shape[0] - 1)
+    return avg[0] if values.ndim == 1 else avg
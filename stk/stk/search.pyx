@@ -0,0 +1,807 @@
+# -*- coding: utf-8 -*-
+# distutils: language = c++
+# cython: embedsignature = True
+
+"""\
+Geometric search
+================
+
+Spatial queries on the elements and nodes of a STK mesh. :class:`MeshSearch`
+gathers the element connectivity and nodal coordinates for a selector once,
+and builds two bounding volume hierarchies (:class:`BoundingBoxTree`): one
+over the element bounding boxes and one over the nodes. The batched queries
+release the GIL and return NumPy arrays:
+
+- :meth:`MeshSearch.query_points` finds the element containing each point.
+- :meth:`MeshSearch.nearest_nodes` finds the ``k`` nearest nodes of each point.
+- :meth:`MeshSearch.query_boxes` finds the elements overlapping each box.
+
+When the coordinates change (e.g., mesh motion), :meth:`MeshSearch.refit`
+updates the bounding boxes of the existing trees without rebuilding them.
+
+.. code-block:: python
+
+   from stk import search
+
+   index = search.MeshSearch(mesh)
+   elem_ids, owners = index.query_points(probe_points)
+   node_ids, dist = index.nearest_nodes(probe_points, k=4)
+
+Point containment is exact for linear simplices. Hexahedra, wedges and
+pyramids are decomposed into tetrahedra, so points close to non-planar faces
+are classified within the tolerance. Other topologies (shells, beams) are
+tested against their bounding boxes only. Higher-order elements use their
+vertex nodes.
+"""
+
+from cython.operator cimport dereference as deref
+from libc cimport math
+from libc.stdint cimport int64_t
+from libcpp.vector cimport vector
+from ..api.mesh.stk_mesh_fwd cimport *
+from ..api.mesh.bulk cimport BulkData, StkBulkData, curve_keys
+from ..api.mesh.bucket cimport Bucket
+from ..api.mesh.entity cimport Entity as EntityT
+from ..api.mesh.field cimport StkFieldBase, FieldBase, field_data, field_scalars_per_entity
+from ..api.mesh.selector cimport StkSelector
+from ..api.topology.topology cimport rank_t, topology_t
+from ..api.util.profiling cimport Profiler, get_profiler
+
+cimport numpy as np
+import numpy as np
+
+np.import_array()
+
+cdef Profiler _prof = get_profiler()
+
+cdef struct TreeNode:
+    double lo[3]
+    double hi[3]
+    int64_t left
+    int64_t start
+    int64_t count
+
+DEF MAX_STACK = 256
+
+cdef enum ElemShape:
+    SHAPE_BOX
+    SHAPE_TET
+    SHAPE_PYRAMID
+    SHAPE_WEDGE
+    SHAPE_HEX
+    SHAPE_TRI
+    SHAPE_QUAD
+
+# Decomposition of the solid elements into tetrahedra (and quads into triangles)
+cdef int PYRAMID_TETS[8]
+cdef int WEDGE_TETS[12]
+cdef int HEX_TETS[24]
+cdef int QUAD_TRIS[6]
+PYRAMID_TETS[:] = [0, 1, 2, 4, 0, 2, 3, 4]
+WEDGE_TETS[:] = [0, 1, 2, 3, 1, 2, 3, 4, 2, 3, 4, 5]
+HEX_TETS[:] = [0, 1, 2, 6, 0, 2, 3, 6, 0, 3, 7, 6, 0, 7, 4, 6, 0, 4, 5, 6, 0, 5, 1, 6]
+QUAD_TRIS[:] = [0, 1, 2, 0, 2, 3]
+
+cdef int elem_shape(int topo, int ndim):
+    """Shape category used for the point containment test"""
+    if topo in (topology_t.TET_4, topology_t.TET_8, topology_t.TET_10,
+                topology_t.TET_11):
+        return SHAPE_TET
+    if topo in (topology_t.PYRAMID_5, topology_t.PYRAMID_13, topology_t.PYRAMID_14):
+        return SHAPE_PYRAMID
+    if topo in (topology_t.WEDGE_6, topology_t.WEDGE_15, topology_t.WEDGE_18):
+        return SHAPE_WEDGE
+    if topo in (topology_t.HEX_8, topology_t.HEX_20, topology_t.HEX_27):
+        return SHAPE_HEX
+    if ndim == 2 and topo in (topology_t.TRI_3_2D, topology_t.TRI_4_2D,
+                              topology_t.TRI_6_2D):
+        return SHAPE_TRI
+    if ndim == 2 and topo in (topology_t.QUAD_4_2D, topology_t.QUAD_8_2D,
+                              topology_t.QUAD_9_2D):
+        return SHAPE_QUAD
+    return SHAPE_BOX
+
+cdef inline double det3(const double* a, const double* b, const double* c) nogil:
+    return (a[0] * (b[1] * c[2] - b[2] * c[1]) -
+            a[1] * (b[0] * c[2] - b[2] * c[0]) +
+            a[2] * (b[0] * c[1] - b[1] * c[0]))
+
+cdef bint in_tet(const double* a, const double* b, const double* c,
+                 const double* d, const double* p, double tol) nogil:
+    """Barycentric containment test for a tetrahedron"""
+    cdef double e1[3]
+    cdef double e2[3]
+    cdef double e3[3]
+    cdef double r[3]
+    cdef double vol, l1, l2, l3
+    cdef int i
+    for i in range(3):
+        e1[i] = b[i] - a[i]
+        e2[i] = c[i] - a[i]
+        e3[i] = d[i] - a[i]
+        r[i] = p[i] - a[i]
+    vol = det3(e1, e2, e3)
+    if vol == 0.0:
+        return False
+    l1 = det3(r, e2, e3) / vol
+    l2 = det3(e1, r, e3) / vol
+    l3 = det3(e1, e2, r) / vol
+    return (l1 >= -tol and l2 >= -tol and l3 >= -tol and
+            1.0 - l1 - l2 - l3 >= -tol)
+
+cdef bint in_tri(const double* a, const double* b, const double* c,
+                 const double* p, double tol) nogil:
+    """Barycentric containment test for a triangle in the xy-plane"""
+    cdef double area = (b[0] - a[0]) * (c[1] - a[1]) - (b[1] - a[1]) * (c[0] - a[0])
+    cdef double l1, l2
+    if area == 0.0:
+        return False
+    l1 = ((p[0] - a[0]) * (c[1] - a[1]) - (p[1] - a[1]) * (c[0] - a[0])) / area
+    l2 = ((b[0] - a[0]) * (p[1] - a[1]) - (b[1] - a[1]) * (p[0] - a[0])) / area
+    return l1 >= -tol and l2 >= -tol and 1.0 - l1 - l2 >= -tol
+
+cdef inline double box_dist2(const double* lo, const double* hi, const double* p) nogil:
+    """Squared distance from a point to an axis-aligned box"""
+    cdef double d2 = 0.0
+    cdef double d
+    cdef int i
+    for i in range(3):
+        if p[i] < lo[i]:
+            d = lo[i] - p[i]
+            d2 += d * d
+        elif p[i] > hi[i]:
+            d = p[i] - hi[i]
+            d2 += d * d
+    return d2
+
+cdef inline bint box_overlap(const double* lo, const double* hi,
+                             const double* qlo, const double* qhi) nogil:
+    return (lo[0] <= qhi[0] and hi[0] >= qlo[0] and
+            lo[1] <= qhi[1] and hi[1] >= qlo[1] and
+            lo[2] <= qhi[2] and hi[2] >= qlo[2])
+
+cdef np.ndarray as_points(points, int ndim):
+    """Convert an array of points to a C-contiguous (n, 3) float64 array"""
+    cdef np.ndarray pts = np.asarray(points, dtype=np.float64)
+    if pts.ndim == 1:
+        pts = pts.reshape((1, -1))
+    if pts.ndim != 2 or pts.shape[1] < ndim or pts.shape[1] > 3:
+        raise ValueError("Expected an array of points of shape (n, %d)"%ndim)
+    if pts.shape[1] == 3:
+        return np.ascontiguousarray(pts)
+    out = np.zeros((pts.shape[0], 3), dtype=np.float64)
+    out[:, :pts.shape[1]] = pts
+    return out
+
+def morton_order(centroids):
+    """Order of points along a Morton (Z-order) space-filling curve
+
+    Args:
+        centroids (np.ndarray): Array of shape ``(n, 3)``
+
+    Return:
+        np.ndarray: int64 permutation that sorts the points along the curve
+    """
+    keys = curve_keys(centroids, False)
+    return np.argsort(keys, kind="stable").astype(np.int64)
+
+cdef class BoundingBoxTree:
+    """Bounding volume hierarchy over axis-aligned boxes
+
+    The boxes are ordered along a Morton curve and split recursively into
+    balanced halves. The tree topology only depends on the initial boxes, so
+    :meth:`refit` updates the node boxes after the items move without
+    rebuilding the hierarchy.
+
+    Args:
+        boxes (np.ndarray): Array of shape ``(n, 6)`` with ``(lo, hi)`` corners
+        leaf_size (int): Maximum number of boxes in a leaf
+    """
+
+    cdef vector[TreeNode] nodes
+    cdef np.ndarray boxes
+    cdef readonly np.ndarray order
+    cdef readonly int leaf_size
+    cdef const double* bptr
+    cdef const int64_t* perm
+
+    def __init__(self, boxes, int leaf_size=8):
+        assert leaf_size > 0, "Leaf size must be positive"
+        self.leaf_size = leaf_size
+        self.boxes = self._check_boxes(boxes)
+        cdef np.ndarray bx = self.boxes
+        self.order = morton_order(0.5 * (bx[:, :3] + bx[:, 3:]))
+        self.perm = <const int64_t*>np.PyArray_DATA(self.order)
+        self._build()
+        self.refit(self.boxes)
+
+    cdef np.ndarray _check_boxes(self, boxes):
+        cdef np.ndarray bx = np.ascontiguousarray(boxes, dtype=np.float64)
+        if bx.ndim != 2 or bx.shape[1] != 6:
+            raise ValueError("Expected boxes of shape (n, 6)")
+        return bx
+
+    cdef void _build(self):
+        """Create the tree nodes by splitting the Morton order in halves"""
+        cdef int64_t nitems = self.order.shape[0]
+        cdef vector[int64_t] stack
+        cdef TreeNode node
+        cdef int64_t idx, half
+        self.nodes.clear()
+        node.left = -1
+        node.start = 0
+        node.count = nitems
+        self.nodes.push_back(node)
+        stack.push_back(0)
+        while stack.size() > 0:
+            idx = stack.back()
+            stack.pop_back()
+            if self.nodes[idx].count <= self.leaf_size:
+                continue
+            half = self.nodes[idx].count // 2
+            node.left = -1
+            node.start = self.nodes[idx].start
+            node.count = half
+            self.nodes[idx].left = self.nodes.size()
+            self.nodes.push_back(node)
+            node.start = self.nodes[idx].start + half
+            node.count = self.nodes[idx].count - half
+            self.nodes.push_back(node)
+            stack.push_back(self.nodes[idx].left)
+            stack.push_back(self.nodes[idx].left + 1)
+
+    @property
+    def num_items(self):
+        """Number of boxes in the tree"""
+        return self.order.shape[0]
+
+    @property
+    def num_nodes(self):
+        """Number of nodes in the hierarchy"""
+        return self.nodes.size()
+
+    def refit(self, boxes):
+        """Update the tree for new boxes of the same items
+
+        Args:
+            boxes (np.ndarray): Array of shape ``(n, 6)`` in the original item order
+        """
+        cdef np.ndarray bx = self._check_boxes(boxes)
+        if bx.shape[0] != self.order.shape[0]:
+            raise ValueError("Number of boxes does not match the tree")
+        self.boxes = bx
+        self.bptr = <const double*>np.PyArray_DATA(bx)
+        cdef const double* bptr = self.bptr
+        cdef const int64_t* perm = self.perm
+        cdef TreeNode* tn = self.nodes.data()
+        cdef int64_t nnodes = self.nodes.size()
+        cdef int64_t i, j, item
+        cdef TreeNode* child
+        cdef int k
+        with nogil:
+            # Children are always stored after their parent
+            for i in range(nnodes - 1, -1, -1):
+                for k in range(3):
+                    tn[i].lo[k] = math.INFINITY
+                    tn[i].hi[k] = -math.INFINITY
+                if tn[i].left < 0:
+                    for j in range(tn[i].start, tn[i].start + tn[i].count):
+                        item = perm[j]
+                        for k in range(3):
+                            tn[i].lo[k] = math.fmin(tn[i].lo[k], bptr[6 * item + k])
+                            tn[i].hi[k] = math.fmax(tn[i].hi[k], bptr[6 * item + 3 + k])
+                else:
+                    for j in range(2):
+                        child = &tn[tn[i].left + j]
+                        for k in range(3):
+                            tn[i].lo[k] = math.fmin(tn[i].lo[k], child.lo[k])
+                            tn[i].hi[k] = math.fmax(tn[i].hi[k], child.hi[k])
+
+    cdef void query_box(self, const double* qlo, const double* qhi,
+                        vector[int64_t]& out) nogil:
+        """Append the items whose boxes overlap the query box"""
+        cdef const TreeNode* tn = self.nodes.data()
+        cdef const double* bptr = self.bptr
+        cdef const int64_t* perm = self.perm
+        cdef int64_t stack[MAX_STACK]
+        cdef int top = 0
+        cdef int64_t idx, j, item
+        if self.nodes.size() == 0:
+            return
+        stack[0] = 0
+        top = 1
+        while top > 0:
+            top -= 1
+            idx = stack[top]
+            if not box_overlap(tn[idx].lo, tn[idx].hi, qlo, qhi):
+                continue
+            if tn[idx].left < 0:
+                for j in range(tn[idx].start, tn[idx].start + tn[idx].count):
+                    item = perm[j]
+                    if box_overlap(&bptr[6 * item], &bptr[6 * item + 3], qlo, qhi):
+                        out.push_back(item)
+            else:
+                stack[top] = tn[idx].left
+                stack[top + 1] = tn[idx].left + 1
+                top += 2
+
+    cdef void nearest(self, const double* p, int k, int64_t* best_idx,
+                      double* best_d2) nogil:
+        """Find the ``k`` items closest to a point (sorted by distance)"""
+        cdef const TreeNode* tn = self.nodes.data()
+        cdef const double* bptr = self.bptr
+        cdef const int64_t* perm = self.perm
+        cdef int64_t stack[MAX_STACK]
+        cdef int top = 0
+        cdef int64_t idx, j, item, near, far
+        cdef double d2, dl, dr
+        cdef int m
+        for m in range(k):
+            best_idx[m] = -1
+            best_d2[m] = math.INFINITY
+        if self.nodes.size() == 0:
+            return
+        stack[0] = 0
+        top = 1
+        while top > 0:
+            top -= 1
+            idx = stack[top]
+            if box_dist2(tn[idx].lo, tn[idx].hi, p) >= best_d2[k - 1]:
+                continue
+            if tn[idx].left < 0:
+                for j in range(tn[idx].start, tn[idx].start + tn[idx].count):
+                    item = perm[j]
+                    d2 = box_dist2(&bptr[6 * item], &bptr[6 * item + 3], p)
+                    if d2 >= best_d2[k - 1]:
+                        continue
+                    m = k - 1
+                    while m > 0 and best_d2[m - 1] > d2:
+                        best_d2[m] = best_d2[m - 1]
+                        best_idx[m] = best_idx[m - 1]
+                        m -= 1
+                    best_d2[m] = d2
+                    best_idx[m] = item
+            else:
+                dl = box_dist2(tn[tn[idx].left].lo, tn[tn[idx].left].hi, p)
+                dr = box_dist2(tn[tn[idx].left + 1].lo, tn[tn[idx].left + 1].hi, p)
+                near = tn[idx].left
+                far = near + 1
+                if dr < dl:
+                    near, far = far, near
+                # Visit the nearer child first
+                stack[top] = far
+                stack[top + 1] = near
+                top += 2
+
+    def query_boxes(self, boxes):
+        """Find the items overlapping each query box
+
+        Args:
+            boxes (np.ndarray): Array of shape ``(m, 6)`` with ``(lo, hi)`` corners
+
+        Return:
+            tuple: ``(offsets, items)`` in CSR format; the items overlapping
+            box ``i`` are ``items[offsets[i]:offsets[i+1]]``
+        """
+        cdef np.ndarray qb = self._check_boxes(boxes)
+        cdef const double* qptr = <const double*>np.PyArray_DATA(qb)
+        cdef int64_t nq = qb.shape[0]
+        offsets = np.empty((nq + 1,), dtype=np.int64)
+        cdef int64_t[::1] optr = offsets
+        cdef vector[int64_t] found
+        cdef int64_t i
+        with nogil:
+            optr[0] = 0
+            for i in range(nq):
+                self.query_box(&qptr[6 * i], &qptr[6 * i + 3], found)
+                optr[i + 1] = found.size()
+        items = np.empty((found.size(),), dtype=np.int64)
+        if found.size() > 0:
+            items[:] = <int64_t[:found.size()]>found.data()
+        return offsets, items
+
+    def nearest_items(self, points, int k=1):
+        """Find the ``k`` items with the closest boxes to each point
+
+        Args:
+            points (np.ndarray): Array of shape ``(m, 3)``
+            k (int): Number of neighbors
+
+        Return:
+            tuple: ``(items, distances)`` arrays of shape ``(m, k)``; missing
+            neighbors have index ``-1`` and infinite distance
+        """
+        assert k > 0, "Number of neighbors must be positive"
+        cdef np.ndarray pts = as_points(points, 3)
+        cdef const double* pptr = <const double*>np.PyArray_DATA(pts)
+        cdef int64_t npts = pts.shape[0]
+        items = np.empty((npts, k), dtype=np.int64)
+        dist = np.empty((npts, k), dtype=np.float64)
+        cdef int64_t* iptr = <int64_t*>np.PyArray_DATA(items)
+        cdef double* dptr = <double*>np.PyArray_DATA(dist)
+        cdef int64_t i
+        with nogil:
+            for i in range(npts):
+                self.nearest(&pptr[3 * i], k, &iptr[i * k], &dptr[i * k])
+        return items, np.sqrt(dist)
+
+cdef class MeshSearch:
+    """Search index over the elements and nodes of a mesh
+
+    Args:
+        mesh (StkMesh): Mesh with populated BulkData
+        sel (StkSelector): Elements to include (default: all elements on this
+            rank, including ghosted elements)
+        coords (StkFieldBase): Coordinate field (default: mesh coordinate field)
+        leaf_size (int): Maximum number of entities in a tree leaf
+    """
+
+    cdef StkBulkData bulk
+    cdef StkFieldBase coords
+    cdef readonly int ndim
+    cdef vector[Entity] node_ents
+    cdef readonly np.ndarray elem_ids
+    cdef readonly np.ndarray elem_owners
+    cdef readonly np.ndarray node_ids
+    cdef np.ndarray shapes
+    cdef np.ndarray conn_offsets
+    cdef np.ndarray conn
+    cdef readonly np.ndarray coordinates
+    cdef np.ndarray elem_boxes
+    cdef readonly BoundingBoxTree elem_tree
+    cdef readonly BoundingBoxTree node_tree
+    cdef object mesh
+    cdef const int64_t* eid_ptr
+    cdef const int* owner_ptr
+    cdef const int* shape_ptr
+    cdef const int64_t* off_ptr
+    cdef const int64_t* conn_ptr
+    cdef const double* xyz_ptr
+    cdef const double* box_ptr
+
+    def __init__(self, mesh, StkSelector sel=None, StkFieldBase coords=None,
+                 int leaf_size=8):
+        cdef double t0 = _prof.tic() if _prof.enabled else -1.0
+        self.mesh = mesh
+        self.bulk = mesh.bulk
+        meta = mesh.meta
+        self.ndim = meta.spatial_dimension
+        self.coords = coords if coords is not None else meta.coordinate_field
+        assert not self.coords.is_null, "Coordinate field has not been registered"
+        if sel is None:
+            sel = StkSelector.from_part(meta.universal_part)
+        self._gather(sel)
+        self._update_coordinates()
+        self.elem_tree = BoundingBoxTree(self._element_boxes(), leaf_size)
+        self.node_tree = BoundingBoxTree(self._node_boxes(), leaf_size)
+        if t0 >= 0.0:
+            _prof.toc("search.build", t0)
+
+    cdef void _gather(self, StkSelector sel) except *:
+        """Collect the elements, their connectivity and the unique nodes"""
+        cdef BulkData* bulk = self.bulk.bulk
+        cdef const BucketVector* bkts = &deref(bulk).get_buckets(rank_t.ELEM_RANK, sel.sel)
+        cdef np.ndarray node_map = np.full(
+            (deref(bulk).get_size_of_entity_index_space(),), -1, dtype=np.int64)
+        cdef int64_t* nmap = <int64_t*>np.PyArray_DATA(node_map)
+        cdef vector[int64_t] eids
+        cdef vector[int] owners
+        cdef vector[int] shapes
+        cdef vector[int64_t] offsets
+        cdef vector[int64_t] conn
+        cdef Bucket* bkt
+        cdef Entity ent
+        cdef Entity node
+        cdef const Entity* nodes
+        cdef size_t i, j, nn, off
+        cdef unsigned k
+        cdef int shape
+
+        self.node_ents.clear()
+        offsets.push_back(0)
+        for i in range(deref(bkts).size()):
+            bkt = <Bucket*>deref(bkts)[i]
+            shape = elem_shape(deref(bkt).topology().value(), self.ndim)
+            for j in range(deref(bkt).size()):
+                ent = deref(bkt)[j]
+                eids.push_back(deref(bulk).identifier(ent))
+                owners.push_back(deref(bulk).parallel_owner_rank(ent))
+                shapes.push_back(shape)
+                nn = deref(bulk).num_nodes(ent)
+                nodes = deref(bulk).begin_nodes(ent)
+                for k in range(nn):
+                    node = nodes[k]
+                    off = (<EntityT*>&node).local_offset()
+                    if nmap[off] < 0:
+                        nmap[off] = self.node_ents.size()
+                        self.node_ents.push_back(node)
+                    conn.push_back(nmap[off])
+                offsets.push_back(conn.size())
+
+        self.elem_ids = np.array(eids, dtype=np.int64)
+        self.elem_owners = np.array(owners, dtype=np.intc)
+        self.shapes = np.array(shapes, dtype=np.intc)
+        self.conn_offsets = np.array(offsets, dtype=np.int64)
+        self.conn = np.array(conn, dtype=np.int64)
+        self.node_ids = np.empty((self.node_ents.size(),), dtype=np.int64)
+        for i in range(self.node_ents.size()):
+            self.node_ids[i] = deref(bulk).identifier(self.node_ents[i])
+        self.eid_ptr = <const int64_t*>np.PyArray_DATA(self.elem_ids)
+        self.owner_ptr = <const int*>np.PyArray_DATA(self.elem_owners)
+        self.shape_ptr = <const int*>np.PyArray_DATA(self.shapes)
+        self.off_ptr = <const int64_t*>np.PyArray_DATA(self.conn_offsets)
+        self.conn_ptr = <const int64_t*>np.PyArray_DATA(self.conn)
+
+    cdef void _update_coordinates(self) except *:
+        """Copy the nodal coordinates (padded to 3 components)"""
+        cdef size_t nnodes = self.node_ents.size()
+        self.coordinates = np.zeros((nnodes, 3), dtype=np.float64)
+        cdef double* xyz = <double*>np.PyArray_DATA(self.coordinates)
+        self.xyz_ptr = xyz
+        cdef const FieldBase* fld = self.coords.fld
+        cdef const double* data
+        cdef unsigned ncomp, k
+        cdef size_t i
+        with nogil:
+            for i in range(nnodes):
+                data = <const double*>field_data(deref(fld), self.node_ents[i])
+                ncomp = field_scalars_per_entity(deref(fld), self.node_ents[i])
+                for k in range(min(ncomp, 3)):
+                    xyz[3 * i + k] = data[k]
+
+    cdef np.ndarray _element_boxes(self):
+        """Bounding boxes of the elements from the nodal coordinates"""
+        cdef int64_t nelem = self.elem_ids.shape[0]
+        boxes = np.empty((nelem, 6), dtype=np.float64)
+        cdef double* bptr = <double*>np.PyArray_DATA(boxes)
+        cdef const double* xyz = self.xyz_ptr
+        cdef const int64_t* offsets = self.off_ptr
+        cdef const int64_t* conn = self.conn_ptr
+        cdef int64_t e, j
+        cdef int k
+        with nogil:
+            for e in range(nelem):
+                for k in range(3):
+                    bptr[6 * e + k] = math.INFINITY
+                    bptr[6 * e + 3 + k] = -math.INFINITY
+                for j in range(offsets[e], offsets[e + 1]):
+                    for k in range(3):
+                        bptr[6 * e + k] = math.fmin(bptr[6 * e + k], xyz[3 * conn[j] + k])
+                        bptr[6 * e + 3 + k] = math.fmax(
+                            bptr[6 * e + 3 + k], xyz[3 * conn[j] + k])
+        self.elem_boxes = boxes
+        self.box_ptr = bptr
+        return boxes
+
+    cdef np.ndarray _node_boxes(self):
+        """Degenerate boxes at the node locations"""
+        return np.hstack([self.coordinates, self.coordinates])
+
+    @property
+    def num_elements(self):
+        """Number of elements in the index"""
+        return self.elem_ids.shape[0]
+
+    @property
+    def num_nodes(self):
+        """Number of nodes in the index"""
+        return self.node_ids.shape[0]
+
+    def refit(self):
+        """Update the index after the nodal coordinates have changed
+
+        The mesh connectivity must not have changed since the index was built.
+        """
+        cdef double t0 = _prof.tic() if _prof.enabled else -1.0
+        self._update_coordinates()
+        self.elem_tree.refit(self._element_boxes())
+        self.node_tree.refit(self._node_boxes())
+        if t0 >= 0.0:
+            _prof.toc("search.refit", t0)
+
+    cdef bint _contains(self, int64_t e, const double* p, double tol) nogil:
+        """Point containment test for one element"""
+        cdef const double* xyz = self.xyz_ptr
+        cdef int shape = self.shape_ptr[e]
+        cdef const int64_t* en = &self.conn_ptr[self.off_ptr[e]]
+        cdef const int* tets = NULL
+        cdef int ntets = 0
+        cdef int t
+        if shape == SHAPE_TET:
+            return in_tet(&xyz[3 * en[0]], &xyz[3 * en[1]], &xyz[3 * en[2]],
+                          &xyz[3 * en[3]], p, tol)
+        elif shape == SHAPE_TRI:
+            return in_tri(&xyz[3 * en[0]], &xyz[3 * en[1]], &xyz[3 * en[2]], p, tol)
+        elif shape == SHAPE_QUAD:
+            for t in range(2):
+                if in_tri(&xyz[3 * en[QUAD_TRIS[3 * t]]], &xyz[3 * en[QUAD_TRIS[3 * t + 1]]],
+                          &xyz[3 * en[QUAD_TRIS[3 * t + 2]]], p, tol):
+                    return True
+            return False
+        elif shape == SHAPE_PYRAMID:
+            tets = PYRAMID_TETS
+            ntets = 2
+        elif shape == SHAPE_WEDGE:
+            tets = WEDGE_TETS
+            ntets = 3
+        elif shape == SHAPE_HEX:
+            tets = HEX_TETS
+            ntets = 6
+        else:
+            return box_dist2(&self.box_ptr[6 * e], &self.box_ptr[6 * e + 3], p) == 0.0
+        for t in range(ntets):
+            if in_tet(&xyz[3 * en[tets[4 * t]]], &xyz[3 * en[tets[4 * t + 1]]],
+                      &xyz[3 * en[tets[4 * t + 2]]], &xyz[3 * en[tets[4 * t + 3]]],
+                      p, tol):
+                return True
+        return False
+
+    cdef void _locate(self, const double* pts, int64_t npts, double tol,
+                      int owner, int64_t* found) nogil:
+        """Index of the element containing each point (-1 if not found)
+
+        If several elements contain a point, the one with the lowest
+        identifier is returned. If ``owner >= 0``, only elements owned by that
+        rank are considered.
+        """
+        cdef const int64_t* eids = self.eid_ptr
+        cdef const int* owners = self.owner_ptr
+        cdef vector[int64_t] cand
+        cdef double qlo[3]
+        cdef double qhi[3]
+        cdef double pad = 0.0
+        cdef int64_t i, e, best
+        cdef size_t c
+        cdef int k
+        if self.elem_tree.nodes.size() > 0:
+            for k in range(3):
+                pad = math.fmax(pad, self.elem_tree.nodes[0].hi[k] -
+                                self.elem_tree.nodes[0].lo[k])
+        pad *= tol
+        for i in range(npts):
+            for k in range(3):
+                qlo[k] = pts[3 * i + k] - pad
+                qhi[k] = pts[3 * i + k] + pad
+            cand.clear()
+            self.elem_tree.query_box(qlo, qhi, cand)
+            best = -1
+            for c in range(cand.size()):
+                e = cand[c]
+                if owner >= 0 and owners[e] != owner:
+                    continue
+                if best >= 0 and eids[e] >= eids[best]:
+                    continue
+                if self._contains(e, &pts[3 * i], tol):
+                    best = e
+            found[i] = best
+
+    def query_points(self, points, double tol=1.0e-8):
+        """Find the element containing each point
+
+        Args:
+            points (np.ndarray): Array of shape ``(n, ndim)``
+            tol (float): Relative tolerance for the containment test
+
+        Return:
+            tuple: ``(elem_ids, owner_ranks)``; points outside the indexed
+            elements have an element ID of 0 and an owner rank of -1
+        """
+        cdef double t0 = _prof.tic() if _prof.enabled else -1.0
+        cdef np.ndarray pts = as_points(points, self.ndim)
+        cdef int64_t npts = pts.shape[0]
+        cdef const double* pptr = <const double*>np.PyArray_DATA(pts)
+        found = np.empty((npts,), dtype=np.int64)
+        cdef int64_t* fptr = <int64_t*>np.PyArray_DATA(found)
+        with nogil:
+            self._locate(pptr, npts, tol, -1, fptr)
+        mask = found >= 0
+        elem_ids = np.zeros((npts,), dtype=np.int64)
+        owners = np.full((npts,), -1, dtype=np.intc)
+        elem_ids[mask] = self.elem_ids[found[mask]]
+        owners[mask] = self.elem_owners[found[mask]]
+        if t0 >= 0.0:
+            _prof.toc("search.query_points", t0)
+        return elem_ids, owners
+
+    def parallel_query_points(self, points, double tol=1.0e-8):
+        """Find the element containing each point across all MPI ranks
+
+        All ranks must provide the same points (e.g., a probe line). Each rank
+        searches its locally owned elements and the results are combined with
+        collective reductions, so every rank receives the element ID and the
+        owning rank for every point. This is a collective operation.
+
+        Args:
+            points (np.ndarray): Array of shape ``(n, ndim)``
+            tol (float): Relative tolerance for the containment test
+
+        Return:
+            tuple: ``(elem_ids, owner_ranks)``; points outside the mesh have
+            an element ID of 0 and an owner rank of -1
+        """
+        cdef np.ndarray pts = as_points(points, self.ndim)
+        cdef int64_t npts = pts.shape[0]
+        cdef const double* pptr = <const double*>np.PyArray_DATA(pts)
+        cdef int myrank = self.bulk.parallel_rank
+        found = np.empty((npts,), dtype=np.int64)
+        cdef int64_t* fptr = <int64_t*>np.PyArray_DATA(found)
+        with nogil:
+            self._locate(pptr, npts, tol, myrank, fptr)
+        mask = found >= 0
+        not_found = np.iinfo(np.int64).max
+        local_ids = np.full((npts,), not_found, dtype=np.int64)
+        local_ids[mask] = self.elem_ids[found[mask]]
+        comm = self.bulk.parallel
+        global_ids = comm.allreduce(local_ids, op="min")
+        nranks = comm.size
+        local_owner = np.where(mask & (local_ids == global_ids), myrank,
+                               nranks).astype(np.intc)
+        owners = comm.allreduce(local_owner, op="min")
+        valid = global_ids != not_found
+        elem_ids = np.where(valid, global_ids, 0).astype(np.int64)
+        owners = np.where(valid, owners, -1).astype(np.intc)
+        return elem_ids, owners
+
+    def rank_bounding_boxes(self):
+        """Bounding boxes of the indexed elements on every MPI rank
+
+        This is a collective operation that can be used for a coarse search
+        before sending points to the ranks that may contain them.
+
+        Return:
+            np.ndarray: Array of shape ``(nranks, 6)`` with ``(lo, hi)`` corners
+        """
+        comm = self.bulk.parallel
+        lo = np.full((comm.size, 3), np.inf)
+        hi = np.full((comm.size, 3), -np.inf)
+        cdef int k
+        if self.elem_tree.nodes.size() > 0:
+            for k in range(3):
+                lo[comm.rank, k] = self.elem_tree.nodes[0].lo[k]
+                hi[comm.rank, k] = self.elem_tree.nodes[0].hi[k]
+        lo = comm.parallel_reduce_min(lo.ravel()).reshape((-1, 3))
+        hi = comm.parallel_reduce_max(hi.ravel()).reshape((-1, 3))
+        return np.hstack([lo, hi])
+
+    def nearest_nodes(self, points, int k=1):
+        """Find the ``k`` nearest nodes to each point
+
+        Args:
+            points (np.ndarray): Array of shape ``(n, ndim)``
+            k (int): Number of nodes per point
+
+        Return:
+            tuple: ``(node_ids, distances)`` arrays of shape ``(n, k)`` sorted
+            by distance; missing neighbors have ID 0 and infinite distance
+        """
+        cdef double t0 = _prof.tic() if _prof.enabled else -1.0
+        items, dist = self.node_tree.nearest_items(as_points(points, self.ndim), k)
+        node_ids = np.zeros(items.shape, dtype=np.int64)
+        mask = items >= 0
+        node_ids[mask] = self.node_ids[items[mask]]
+        if t0 >= 0.0:
+            _prof.toc("search.nearest_nodes", t0)
+        return node_ids, dist
+
+    def query_boxes(self, lo, hi):
+        """Find the elements whose bounding boxes overlap each query box
+
+        Args:
+            lo (np.ndarray): Lower corners of shape ``(n, ndim)``
+            hi (np.ndarray): Upper corners of shape ``(n, ndim)``
+
+        Return:
+            tuple: ``(offsets, elem_ids)`` in CSR format; the elements
+            overlapping box ``i`` are ``elem_ids[offsets[i]:offsets[i+1]]``
+        """
+        qlo = as_points(lo, self.ndim)
+        qhi = as_points(hi, self.ndim)
+        if qlo.shape != qhi.shape:
+            raise ValueError("Mismatch in the shapes of the box corners")
+        if self.ndim < 3:
+            qlo = qlo.copy()
+            qhi = qhi.copy()
+            qlo[:, self.ndim:] = -np.inf
+            qhi[:, self.ndim:] = np.inf
+        offsets, items = self.elem_tree.query_boxes(np.hstack([qlo, qhi]))
+        return offsets, self.elem_ids[items]
@@ -0,0 +1,366 @@
+# -*- coding: utf-8 -*-
+# distutils: language = c++
+# cython: embedsignature = True
+
+"""\
+Mesh snapshots
+==============
+
+Save a distributed STK mesh to a per-rank binary cache and rebuild it without
+reading and decomposing the original database. Every rank writes its own
+directory containing NumPy ``.npy`` files (memory-mapped when loading) and a
+JSON description of the parts and fields. The snapshot is keyed by the source
+database (path, modification time, size and optionally a content hash) and
+the number of MPI ranks; a snapshot is only used if the key matches on all
+ranks.
+
+Only I/O parts (element blocks, sidesets and nodesets) and node or element
+fields are stored. Edges are recreated on load if the mesh had edges when it
+was saved.
+"""
+
+from cython.operator cimport dereference as deref
+from libc.stdint cimport int64_t
+from libcpp.vector cimport vector
+from ..api.mesh.stk_mesh_fwd cimport *
+from ..api.mesh cimport stk_mesh_fwd as fwd
+from ..api.mesh.bulk cimport BulkData, StkBulkData
+from ..api.mesh.bucket cimport Bucket
+from ..api.mesh.part cimport StkPart
+from ..api.mesh.meta cimport StkMetaData
+from ..api.mesh.field cimport StkFieldBase, FieldBase
+from ..api.mesh.selector cimport StkSelector
+from ..api.mesh.misc cimport create_edges
+from ..api.mesh cimport field_parallel as fp
+from ..api.topology.topology cimport rank_t, topology_t
+
+cimport numpy as np
+import numpy as np
+import hashlib
+import json
+import os
+
+np.import_array()
+
+#: Version of the snapshot format
+SNAPSHOT_VERSION = 1
+
+cdef tuple shared_node_procs(BulkData* bulk, StkSelector sel):
+    """Return (node id, sharing proc) pairs for the shared nodes"""
+    cdef const BucketVector* bkts = &deref(bulk).get_buckets(
+        rank_t.NODE_RANK, sel.sel)
+    cdef vector[int64_t] ids
+    cdef vector[int] procs
+    cdef vector[int] tmp
+    cdef Bucket* bkt
+    cdef Entity ent
+    cdef size_t i, j, k
+    for i in range(deref(bkts).size()):
+        bkt = <Bucket*>deref(bkts)[i]
+        for j in range(deref(bkt).size()):
+            ent = deref(bkt)[j]
+            tmp.clear()
+            deref(bulk).comm_shared_procs(ent, tmp)
+            for k in range(tmp.size()):
+                ids.push_back(deref(bulk).identifier(ent))
+                procs.push_back(tmp[k])
+    out_ids = np.empty((ids.size(),), dtype=np.int64)
+    out_procs = np.empty((ids.size(),), dtype=np.intc)
+    for i in range(ids.size()):
+        out_ids[i] = ids[i]
+        out_procs[i] = procs[i]
+    return (out_ids, out_procs)
+
+cdef tuple element_sides(BulkData* bulk, StkSelector sel, EntityRank side_rank):
+    """Return (element id, side ordinal) for sides of locally owned elements"""
+    cdef const BucketVector* bkts = &deref(bulk).get_buckets(side_rank, sel.sel)
+    cdef int myrank = deref(bulk).parallel_rank()
+    cdef vector[int64_t] elem_ids
+    cdef vector[int64_t] ords
+    cdef const Entity* elems
+    cdef const ConnectivityOrdinal* elem_ords
+    cdef Bucket* bkt
+    cdef Entity ent
+    cdef size_t i, j, k, nelem
+    for i in range(deref(bkts).size()):
+        bkt = <Bucket*>deref(bkts)[i]
+        for j in range(deref(bkt).size()):
+            ent = deref(bkt)[j]
+            nelem = deref(bulk).num_elements(ent)
+            elems = deref(bulk).begin_elements(ent)
+            elem_ords = deref(bulk).begin_ordinals(ent, rank_t.ELEM_RANK)
+            for k in range(nelem):
+                if deref(bulk).parallel_owner_rank(elems[k]) == myrank:
+                    elem_ids.push_back(deref(bulk).identifier(elems[k]))
+                    ords.push_back(elem_ords[k])
+                    break
+    out_ids = np.empty((elem_ids.size(),), dtype=np.int64)
+    out_ords = np.empty((elem_ids.size(),), dtype=np.int64)
+    for i in range(elem_ids.size()):
+        out_ids[i] = elem_ids[i]
+        out_ords[i] = ords[i]
+    return (out_ids, out_ords)
+
+cdef void communicate_to_aura(StkBulkData bulk, list fields):
+    """Update the aura copies of the fields after loading owned data"""
+    cdef StkFieldBase fld
+    cdef vector[const FieldBase*] sfields
+    if not bulk.is_automatic_aura_on:
+        return
+    for fld in fields:
+        sfields.push_back(fld.fld)
+    fp.communicate_field_data(deref(bulk.bulk).aura_ghosting(), sfields)
+
+cdef list field_part_names(StkFieldBase fld, list parts, StkPart universal):
+    """Names of the parts the field is defined on (None if on the universal part)"""
+    cdef StkPart part
+    if deref(fld.fld).defined_on(deref(<fwd.Part*>universal.part)):
+        return None
+    return [part.name for part in parts
+            if deref(fld.fld).defined_on(deref(<fwd.Part*>part.part))]
+
+def snapshot_key(source, int nranks, bint check_hash=False):
+    """Cache key for a snapshot
+
+    Args:
+        source (str): Path to the source database, or None
+        nranks (int): Number of MPI ranks
+        check_hash (bool): If True, include a SHA-1 hash of the source file
+
+    Return:
+        dict: Key identifying the mesh snapshot
+    """
+    key = dict(version=SNAPSHOT_VERSION, nranks=nranks, source=None)
+    if source is not None:
+        stat = os.stat(source)
+        key.update(source=os.path.abspath(source), mtime_ns=stat.st_mtime_ns,
+                   size=stat.st_size)
+        if check_hash:
+            sha = hashlib.sha1()
+            with open(source, "rb") as fh:
+                for chunk in iter(lambda: fh.read(1 << 24), b""):
+                    sha.update(chunk)
+            key["sha1"] = sha.hexdigest()
+    return key
+
+def snapshot_dir(str path, int nranks, int rank):
+    """Directory holding the snapshot files of a rank"""
+    return os.path.join(path, "np%d"%nranks, "rank%05d"%rank)
+
+def _remap(saved_ids, saved_data, target_ids):
+    """Reorder saved data to match the ordering of the target IDs"""
+    order = np.argsort(saved_ids, kind="stable")
+    pos = np.searchsorted(saved_ids, target_ids, sorter=order)
+    return np.asarray(saved_data)[order[pos]]
+
+def save_snapshot(mesh, str path, fields=None, source=None, bint check_hash=False):
+    """Save a snapshot of the mesh
+
+    Args:
+        mesh (StkMesh): Mesh with populated BulkData
+        path (str): Snapshot directory
+        fields (list): StkFieldBase instances to save in addition to coordinates
+        source (str): Path to the source database used for the cache key
+        check_hash (bool): Include a hash of the source file in the cache key
+    """
+    cdef StkBulkData bulk = mesh.bulk
+    cdef StkMetaData meta = mesh.meta
+    cdef StkPart part
+    cdef StkFieldBase fld
+    comm = mesh.comm
+    nranks = bulk.parallel_size
+    rdir = snapshot_dir(path, nranks, bulk.parallel_rank)
+    os.makedirs(rdir, exist_ok=True)
+    key = snapshot_key(source, nranks, check_hash)
+
+    ndim = meta.spatial_dimension
+    side_rank = int(meta.side_rank)
+    local = StkSelector.or_(meta.locally_owned_part, meta.globally_shared_part)
+    owned = StkSelector.from_part(meta.locally_owned_part)
+    arrays = {}
+
+    coords = meta.coordinate_field
+    arrays["node_ids"] = bulk.entity_ids(local, rank_t.NODE_RANK)
+    arrays["coordinates"] = coords.gather(local)
+    arrays["shared_ids"], arrays["shared_procs"] = shared_node_procs(
+        bulk.bulk, StkSelector.from_part(meta.globally_shared_part))
+
+    # Internal parts (universal, owned, shared, topology roots) are recreated
+    # by MetaData and must not be stored
+    io_parts = [part for part in meta.get_parts() if part.is_io_part]
+    part_info = []
+    for i, part in enumerate(io_parts):
+        prank = int(part.primary_entity_rank)
+        topo = int(part.topology.value)
+        pinfo = dict(name=part.name, rank=prank, topology=topo,
+                     subsets=[p.name for p in part.subsets if p.is_io_part])
+        psel = StkSelector.and_(part, local)
+        if prank == rank_t.ELEM_RANK and topo != topology_t.INVALID_TOPOLOGY:
+            psel = StkSelector.and_(part, owned)
+            conn = bulk.connectivity(psel, rank_t.ELEM_RANK, rank_t.NODE_RANK,
+                                     use_ids=True)
+            arrays["part%d_ids"%i] = bulk.entity_ids(psel, rank_t.ELEM_RANK)
+            arrays["part%d_conn"%i] = conn.get(topo, np.empty((0, 0), dtype=np.int64))
+            pinfo["kind"] = "elements"
+        elif prank == side_rank and topo != topology_t.INVALID_TOPOLOGY:
+            arrays["part%d_ids"%i], arrays["part%d_ords"%i] = element_sides(
+                bulk.bulk, psel, side_rank)
+            pinfo["kind"] = "sides"
+        elif prank == rank_t.NODE_RANK:
+            arrays["part%d_ids"%i] = bulk.entity_ids(psel, rank_t.NODE_RANK)
+            pinfo["kind"] = "nodes"
+        else:
+            pinfo["kind"] = None
+        part_info.append(pinfo)
+
+    field_info = []
+    for i, fld in enumerate(fields or ()):
+        frank = int(fld.entity_rank)
+        if frank not in (rank_t.NODE_RANK, rank_t.ELEM_RANK):
+            raise ValueError("Only node and element fields can be saved: %s"%fld.name)
+        fsel = StkSelector.and_(StkSelector.select_field(fld), local)
+        arrays["field%d_ids"%i] = bulk.entity_ids(fsel, frank)
+        arrays["field%d"%i] = fld.gather(fsel)
+        field_info.append(dict(
+            name=fld.name, rank=frank, ncomp=fld.max_size,
+            array_rank=fld.field_array_rank,
+            number_of_states=fld.number_of_states,
+            parts=field_part_names(fld, io_parts, meta.universal_part)))
+
+    has_edges = (ndim == 3 and len(bulk.entity_ids(local, rank_t.EDGE_RANK)) > 0)
+    info = dict(key=key, ndim=ndim, coordinate_field=coords.name,
+                has_edges=has_edges, parts=part_info, fields=field_info)
+    for name, arr in arrays.items():
+        np.save(os.path.join(rdir, name + ".npy"), np.ascontiguousarray(arr))
+    with open(os.path.join(rdir, "snapshot.json"), "w") as fh:
+        json.dump(info, fh)
+
+    # Write the key only after every rank has written its data
+    comm.parallel_reduce_min(np.ones((1,), dtype=np.intc))
+    if bulk.parallel_rank == 0:
+        kfile = os.path.join(path, "np%d"%nranks, "key.json")
+        with open(kfile + ".tmp", "w") as fh:
+            json.dump(key, fh)
+        os.replace(kfile + ".tmp", kfile)
+
+def _read_snapshot_info(str path, key, int nranks, int rank):
+    """Return the snapshot description if it matches the key, else None"""
+    rdir = snapshot_dir(path, nranks, rank)
+    try:
+        with open(os.path.join(path, "np%d"%nranks, "key.json")) as fh:
+            if json.load(fh) != key:
+                return None
+        with open(os.path.join(rdir, "snapshot.json")) as fh:
+            info = json.load(fh)
+    except (OSError, ValueError):
+        return None
+    return info if info.get("key") == key else None
+
+def load_snapshot(mesh, str path, fields=None, source=None, bint check_hash=False):
+    """Rebuild the mesh from a snapshot if a valid one exists
+
+    The MetaData must not have been committed. If no valid snapshot is found
+    on all ranks, the mesh is not modified and this function returns False.
+
+    Args:
+        mesh (StkMesh): Mesh with uncommitted MetaData
+        path (str): Snapshot directory
+        fields (list): Names of saved fields to restore (default: all)
+        source (str): Path to the source database used for the cache key
+        check_hash (bool): Include a hash of the source file in the cache key
+
+    Return:
+        bool: True if the mesh was loaded from the snapshot
+    """
+    cdef StkBulkData bulk = mesh.bulk
+    cdef StkMetaData meta = mesh.meta
+    cdef BulkData* sbulk = bulk.bulk
+    cdef StkPart part
+    cdef StkFieldBase fld
+    assert not meta.is_committed, "Cannot load snapshot into a committed mesh"
+    comm = mesh.comm
+    nranks = bulk.parallel_size
+    key = snapshot_key(source, nranks, check_hash)
+    info = _read_snapshot_info(path, key, nranks, bulk.parallel_rank)
+    valid = np.array([0 if info is None else 1], dtype=np.intc)
+    if comm.parallel_reduce_min(valid)[0] == 0:
+        return False
+    assert info["ndim"] == meta.spatial_dimension, "Spatial dimension mismatch"
+
+    rdir = snapshot_dir(path, nranks, bulk.parallel_rank)
+    def load(name):
+        return np.load(os.path.join(rdir, name + ".npy"), mmap_mode="r")
+
+    parts = {}
+    for pinfo in info["parts"]:
+        part = meta.declare_part(pinfo["name"], pinfo["rank"])
+        if pinfo["topology"] != topology_t.INVALID_TOPOLOGY:
+            part.set_toplogy(pinfo["topology"])
+        part.set_io_attribute(True)
+        parts[pinfo["name"]] = part
+    for pinfo in info["parts"]:
+        for sub in pinfo["subsets"]:
+            meta.declare_part_subset(parts[pinfo["name"]], parts[sub])
+
+    ndim = info["ndim"]
+    coords = meta.get_field(info["coordinate_field"])
+    if coords.is_null:
+        coords = meta.declare_vector_field(info["coordinate_field"])
+    coords.add_to_part(meta.universal_part, ndim)
+    meta.coordinate_field = coords
+
+    restored = []
+    for i, finfo in enumerate(info["fields"]):
+        if fields is not None and finfo["name"] not in fields:
+            continue
+        fld = meta.get_field(finfo["name"], finfo["rank"])
+        if fld.is_null:
+            nstates = finfo["number_of_states"]
+            if finfo["array_rank"] == 0:
+                fld = meta.declare_scalar_field(finfo["name"], finfo["rank"], nstates)
+            elif finfo["ncomp"] == ndim:
+                fld = meta.declare_vector_field(finfo["name"], finfo["rank"], nstates)
+            else:
+                fld = meta.declare_generic_field(finfo["name"], finfo["rank"], nstates)
+        if finfo["parts"] is None:
+            fld.add_to_part(meta.universal_part, finfo["ncomp"])
+        else:
+            for pname in finfo["parts"]:
+                fld.add_to_part(parts[pname], finfo["ncomp"])
+        restored.append((i, fld))
+    meta.commit()
+
+    node_ids = load("node_ids")
+    with bulk.modification():
+        bulk.declare_nodes(node_ids)
+        for i, pinfo in enumerate(info["parts"]):
+            part = parts[pinfo["name"]]
+            if pinfo["kind"] == "nodes":
+                bulk.declare_nodes(load("part%d_ids"%i), part)
+            elif pinfo["kind"] == "elements":
+                conn = load("part%d_conn"%i)
+                if conn.shape[0] > 0:
+                    bulk.declare_elements(part, load("part%d_ids"%i), conn)
+        bulk.add_node_sharing(load("shared_ids"), load("shared_procs"))
+
+    side_parts = [(i, pinfo) for i, pinfo in enumerate(info["parts"])
+                  if pinfo["kind"] == "sides"]
+    if side_parts:
+        with bulk.modification():
+            for i, pinfo in side_parts:
+                bulk.declare_element_sides(parts[pinfo["name"]],
+                                           load("part%d_ids"%i), load("part%d_ords"%i))
+    if info["has_edges"]:
+        create_edges(deref(sbulk))
+
+    local = StkSelector.or_(meta.locally_owned_part, meta.globally_shared_part)
+    coords.scatter(_remap(node_ids, load("coordinates"),
+                          bulk.entity_ids(local, rank_t.NODE_RANK)), local)
+    updated = [coords]
+    for i, fld in restored:
+        fsel = StkSelector.and_(StkSelector.select_field(fld), local)
+        fld.scatter(_remap(load("field%d_ids"%i), load("field%d"%i),
+                           bulk.entity_ids(fsel, fld.entity_rank)), fsel)
+        updated.append(fld)
+    communicate_to_aura(bulk, updated)
+    return True
@@ -8,6 +8,10 @@ from ..api.io.io cimport DatabasePurpose, TimeMatchOption
 from ..api.topology.topology cimport rank_t
 from ..api.mesh.selector cimport StkSelector
 from ..api.mesh.misc cimport *
+from ..api.io.io import AsyncOutputWriter
+from . import snapshot
+from . import balance
+import numpy as np
 
 cdef class StkMesh:
 
@@ -15,7 +19,8 @@ cdef class StkMesh:
         """Create a new StkMesh instance
 
         Args:
-            comm: Communicator object
+            comm: Communicator object; the mesh is distributed over the
+                ranks of this (possibly split) communicator
             ndim: Dimensionality of the mesh
         """
         self.comm = comm
@@ -23,12 +28,20 @@ cdef class StkMesh:
         self.bulk = StkBulkData.create(self.meta, self.comm)
         self.stkio = StkIoBroker.create(self.comm)
 
+    def __dealloc__(self):
+        # Release the I/O broker before the BulkData it refers to
+        self.stkio = None
+        self.bulk = None
+
     def read_mesh_meta_data(self, str filename,
                             DatabasePurpose purpose=DatabasePurpose.READ_MESH,
                             bool auto_decomp = True,
                             str auto_decomp_type="rcb",
                             bool auto_declare_fields = True,
-                            TimeMatchOption tmo=TimeMatchOption.CLOSEST):
+                            TimeMatchOption tmo=TimeMatchOption.CLOSEST,
+                            include_parts=None,
+                            exclude_parts=None,
+                            fields=None):
         """Open a file and load the meta data from the file
 
         This method combines various operations of the
@@ -39,6 +52,12 @@ cdef class StkMesh:
             - Creates the metadata from the input mesh
             - Automatically declares all fields in the database as input fields
 
+        Element blocks and sidesets can be omitted from the mesh by providing
+        ``include_parts`` and/or ``exclude_parts`` (see
+        :meth:`~stk.api.io.io.StkIoBroker.omit_input_parts`). If ``fields`` is
+        provided, only the named database fields are declared and registered
+        as input fields.
+
         Args:
             filename (str): Path to the Exodus database
             purpose (DatabasePurpose): READ_MESH, READ_RESTART
@@ -46,6 +65,9 @@ cdef class StkMesh:
             auto_decomp_type (str): Decomposition type (default: rcb)
             auto_declare_fields (bool): If True, declare fields found in file
             tmo (TimeMatchOption): CLOSEST, LINEAR_INTERPOLATION
+            include_parts (list): Names of element blocks and sidesets to load
+            exclude_parts (list): Names of element blocks and sidesets to skip
+            fields (list): Names of database fields to load (default: all)
 
         """
         if auto_decomp and self.comm.size > 1:
@@ -53,13 +75,46 @@ cdef class StkMesh:
         self.stkio.add_mesh_database(filename, purpose)
         self.stkio.set_bulk_data(self.bulk)
         self.stkio.create_input_mesh()
-        if auto_declare_fields:
+        omitted = []
+        if include_parts is not None or exclude_parts:
+            omitted = self.stkio.omit_input_parts(include_parts, exclude_parts)
+        if fields is not None:
+            self.declare_input_fields(fields, omitted)
+        elif auto_declare_fields:
             self.stkio.add_all_mesh_fields_as_input_fields(tmo)
 
         coords = self.meta.coordinate_field
         coords.add_to_part(self.meta.universal_part,
                            self.meta.spatial_dimension)
 
+    def declare_input_fields(self, list fields, omitted=()):
+        """Declare fields found in the input database and register them for input
+
+        Args:
+            fields (list): Names of the database fields
+            omitted (list): Names of element blocks that will not be loaded
+        """
+        meta = self.meta
+        ndim = meta.spatial_dimension
+        skip = set(p.lower() for p in omitted)
+        for name in fields:
+            rank, ncomp, blocks = self.stkio.input_field_info(name)
+            fld = meta.get_field(name, rank)
+            if fld.is_null:
+                if ncomp == 1:
+                    fld = meta.declare_scalar_field(name, rank)
+                elif ncomp == ndim:
+                    fld = meta.declare_vector_field(name, rank)
+                else:
+                    fld = meta.declare_generic_field(name, rank)
+            if rank == rank_t.NODE_RANK:
+                fld.add_to_part(meta.universal_part, ncomp)
+            else:
+                for bname in blocks:
+                    if bname.lower() not in skip:
+                        fld.add_to_part(meta.get_part(bname, must_exist=True), ncomp)
+            self.stkio.add_input_field(fld)
+
     cdef create_edges_helper(self):
         create_edges(deref(self.bulk.bulk))
 
@@ -90,6 +145,124 @@ cdef class StkMesh:
             ftime, missing = self.stkio.read_defined_input_fields_at_time(time_available[-1])
             return (ftime, missing)
 
+    def create_async_output(self, list fields, int queue_depth=2):
+        """Create an asynchronous output writer for the given fields
+
+        Must be called before :meth:`populate_bulk_data`. See
+        :class:`~stk.api.io.io.AsyncOutputWriter` for details.
+
+        Args:
+            fields (list): List of StkFieldBase instances to output
+            queue_depth (int): Maximum number of pending output steps
+
+        Return:
+            AsyncOutputWriter: Writer instance to be opened after populating the mesh
+        """
+        return AsyncOutputWriter(self.stkio, self.meta, fields, queue_depth)
+
+    def save_snapshot(self, str path, fields=None, source=None, check_hash=False):
+        """Save the mesh and selected fields to a per-rank binary snapshot
+
+        .. code-block:: python
+
+           if not mesh.load_snapshot("mesh.cache", source=filename):
+               mesh.read_mesh_meta_data(filename)
+               mesh.populate_bulk_data(create_edges=True)
+               mesh.save_snapshot("mesh.cache", source=filename)
+
+        Args:
+            path (str): Snapshot directory
+            fields (list): StkFieldBase instances to save in addition to coordinates
+            source (str): Path to the source database used for the cache key
+            check_hash (bool): Include a hash of the source file in the cache key
+        """
+        snapshot.save_snapshot(self, path, fields, source, check_hash)
+
+    def load_snapshot(self, str path, fields=None, source=None, check_hash=False):
+        """Build the mesh from a snapshot created by :meth:`save_snapshot`
+
+        Must be called on a new mesh (before the MetaData is committed). If the
+        snapshot does not exist or its key (source file, number of MPI ranks)
+        does not match, the mesh is left unmodified.
+
+        Args:
+            path (str): Snapshot directory
+            fields (list): Names of saved fields to restore (default: all)
+            source (str): Path to the source database used for the cache key
+            check_hash (bool): Include a hash of the source file in the cache key
+
+        Return:
+            bool: True if the mesh was loaded from the snapshot
+        """
+        return snapshot.load_snapshot(self, path, fields, source, check_hash)
+
+    def rebalance(self, weights_field=None, str method="rcb",
+                  double imbalance_tol=1.05):
+        """Repartition the elements across MPI ranks based on their weights
+
+        The load of a rank is the sum of the weights of its locally owned
+        elements. If the imbalance (maximum load over average load) exceeds
+        ``imbalance_tol``, a new partition of the elements is computed with
+        :mod:`~stk.stk.balance` and the elements, their downward closure, and
+        all field data are migrated with
+        :meth:`~stk.api.mesh.bulk.StkBulkData.change_entity_owner` in a single
+        modification cycle. This is a collective operation.
+
+        Supported methods are ``"rcb"`` (recursive coordinate bisection),
+        ``"hilbert"`` (Hilbert space-filling curve), and ``"graph"`` (RCB
+        followed by :func:`~stk.stk.balance.graph_refine` on the element
+        graph from :meth:`~stk.api.mesh.bulk.StkBulkData.adjacency` to reduce
+        the number of cut faces).
+
+        Args:
+            weights_field (StkFieldBase): Scalar element field with the
+                weights (default: 1 per element)
+            method (str): Partitioning method
+            imbalance_tol (float): Rebalance only if the imbalance exceeds this value
+
+        Return:
+            dict: ``imbalance_before``, ``imbalance_after``, ``num_moved``
+            (elements moved across all ranks) and ``rebalanced``
+        """
+        if method not in ("rcb", "hilbert", "graph"):
+            raise ValueError("Invalid rebalance method: %s"%method)
+        bulk = self.bulk
+        par = self.comm
+        sel = StkSelector.from_part(self.meta.locally_owned_part)
+
+        def element_weights():
+            nelems = bulk.local_offsets(sel, rank_t.ELEM_RANK).shape[0]
+            if weights_field is None:
+                return np.ones((nelems,))
+            return weights_field.gather(sel).reshape((nelems,))
+
+        weights = element_weights()
+        before = balance.load_imbalance(par, weights.sum())
+        stats = dict(imbalance_before=before, imbalance_after=before,
+                     num_moved=0, rebalanced=False)
+        if par.size < 2 or before <= imbalance_tol:
+            return stats
+
+        centroids = bulk.entity_centroids(sel, rank_t.ELEM_RANK)
+        if method == "hilbert":
+            dest = balance.hilbert_partition(par, centroids, weights)
+        else:
+            dest = balance.rcb_partition(par, centroids, weights)
+        if method == "graph":
+            indptr, indices = bulk.adjacency(sel, "elem-elem", compact=True)
+            dest = balance.graph_refine(par, indptr, indices, dest, weights,
+                                        imbalance_tol=imbalance_tol)
+        ids = bulk.entity_ids(sel, rank_t.ELEM_RANK)
+        moved = dest != par.rank
+        bulk.change_entity_owner(ids[moved], dest[moved], rank_t.ELEM_RANK)
+
+        stats["num_moved"] = int(par.parallel_reduce_sum(
+            np.array([np.count_nonzero(moved)], dtype=np.intc))[0])
+        stats["imbalance_after"] = balance.load_imbalance(
+            par, element_weights().sum())
+        stats["rebalanced"] = True
+        return stats
+
     def iter_buckets(self, StkSelector sel, rank_t rank=rank_t.NODE_RANK):
         """Yield iterator for looping over buckets"""
         yield from self.bulk.iter_buckets(sel, rank)
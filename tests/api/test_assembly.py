@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+import numpy as np
+from stk import assembly
+from stk.api.mesh import StkSelector
+from stk.api.topology import rank_t
+from stk.stk.stk_mesh import StkMesh
+
+scipy = pytest.importorskip("scipy")
+
+def test_csr_assembler_edges(stk_mesh):
+    mesh = stk_mesh
+    sel = StkSelector.from_part(mesh.meta.universal_part)
+    asm = assembly.CsrAssembler(mesh.bulk, sel, rank_t.EDGE_RANK)
+    assert asm.shape == (8, 8)
+    assert asm.nnz == 8 + 24
+    assert asm.num_entries == 12 * 4
+
+    lap = asm.graph_laplacian()
+    dense = lap.toarray()
+    np.testing.assert_allclose(np.diag(dense), 3.0)
+    np.testing.assert_allclose(dense.sum(axis=1), 0.0)
+    np.testing.assert_allclose(dense, dense.T)
+
+    # Reassemble in place with new weights
+    lap2 = asm.graph_laplacian(2.0 * np.ones(12), out=lap)
+    assert lap2 is lap
+    np.testing.assert_allclose(lap.toarray(), 2.0 * dense)
+
+    with pytest.raises(ValueError):
+        asm.assemble(np.ones(10))
+
+def test_csr_assembler_elements(parallel):
+    if parallel.size > 1:
+        pytest.skip("Serial test")
+    mesh = StkMesh(parallel)
+    mesh.read_mesh_meta_data("generated:2x2x2")
+    mesh.populate_bulk_data()
+    sel = StkSelector.from_part(mesh.meta.universal_part)
+    asm = assembly.CsrAssembler(mesh.bulk, sel)
+    assert asm.shape == (27, 27)
+
+    # Sum of element mass matrices with unit entries counts the shared elements
+    mat = asm.assemble(np.ones((8, 8, 8)))
+    nelems = np.diff(mesh.bulk.adjacency(sel, "node-elem")[0])
+    np.testing.assert_allclose(mat.diagonal(), nelems)
+    np.testing.assert_allclose(mat.sum(), 8 * 64)
+    assert asm.pattern().nnz == asm.nnz
+
+    with pytest.raises(ValueError):
+        asm.graph_laplacian()
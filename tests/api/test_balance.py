@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+import numpy as np
+from stk import balance
+from stk.api.mesh import StkSelector
+from stk.api.topology import rank_t
+from stk.stk.stk_mesh import StkMesh
+
+def grid_points(n):
+    x = (np.arange(n) + 0.5) / n
+    return np.array(np.meshgrid(x, x, x, indexing="ij")).reshape((3, -1)).T
+
+@pytest.mark.parametrize("points", [
+    grid_points(8), np.random.default_rng(0).random((2000, 3))],
+                         ids=["grid", "random"])
+@pytest.mark.parametrize("method", ["rcb", "hilbert"])
+def test_partition(parallel, method, points):
+    pts = points
+    weights = np.where(pts[:, 0] < 0.25, 4.0, 1.0)
+    func = getattr(balance, "%s_partition"%method)
+    parts = func(parallel, pts, weights, nparts=5)
+    assert parts.min() == 0 and parts.max() == 4
+    loads = np.bincount(parts, weights, minlength=5)
+    assert loads.max() / loads.mean() < 1.1
+
+def weighted_mesh(parallel):
+    mesh = StkMesh(parallel)
+    mesh.read_mesh_meta_data("generated:8x8x8")
+    cost = mesh.meta.declare_scalar_field("cost", rank_t.ELEM_RANK)
+    cost.add_to_part(mesh.meta.universal_part, init_value=np.array([1.0]))
+    mesh.populate_bulk_data()
+
+    # Make the elements near x = 0 much more expensive
+    sel = StkSelector.from_part(mesh.meta.locally_owned_part)
+    xyz = mesh.bulk.entity_centroids(sel, rank_t.ELEM_RANK)
+    cost.scatter(np.where(xyz[:, 0] < 2.0, 10.0, 1.0), sel)
+    return mesh, cost
+
+def test_rebalance_serial(parallel):
+    if parallel.size > 1:
+        pytest.skip("Serial test")
+    mesh, cost = weighted_mesh(parallel)
+    stats = mesh.rebalance(cost)
+    assert stats["imbalance_before"] == 1.0
+    assert not stats["rebalanced"]
+    with pytest.raises(ValueError):
+        mesh.rebalance(cost, method="metis")
+
+def test_graph_refine(parallel):
+    # Chain of 20 items with two misplaced items
+    indptr = np.r_[0, np.cumsum([1] + [2] * 18 + [1])]
+    indices = np.array([j for i in range(20) for j in (i - 1, i + 1) if 0 <= j < 20])
+    parts = np.repeat([0, 1], 10)
+    parts[3], parts[15] = 1, 0
+    refined = balance.graph_refine(parallel, indptr, indices, parts,
+                                   nparts=2, imbalance_tol=1.5)
+    np.testing.assert_array_equal(refined, np.repeat([0, 1], 10))
+
+@pytest.mark.parametrize("method", ["rcb", "hilbert", "graph"])
+def test_rebalance(parallel, method):
+    if parallel.size < 2:
+        pytest.skip("Parallel test, run with mpirun -np 4")
+    mesh, cost = weighted_mesh(parallel)
+    stats = mesh.rebalance(cost, method=method)
+    assert stats["rebalanced"]
+    assert stats["num_moved"] > 0
+    assert stats["imbalance_after"] < stats["imbalance_before"]
+    assert stats["imbalance_after"] < 1.25
+
+    sel = StkSelector.from_part(mesh.meta.locally_owned_part)
+    nelems = mesh.bulk.entity_ids(sel, rank_t.ELEM_RANK).shape[0]
+    total = parallel.parallel_reduce_sum(np.array([nelems], dtype=np.intc))[0]
+    assert total == 512
+    np.testing.assert_allclose(
+        cost.gather(sel),
+        np.where(mesh.bulk.entity_centroids(sel, rank_t.ELEM_RANK)[:, 0] < 2.0,
+                 10.0, 1.0))
@@ -1,8 +1,12 @@
 # -*- coding: utf-8 -*-
 
 import pytest
+import numpy as np
 from stk.api.mesh import StkMetaData, StkBulkData, StkSelector
-from stk.api.topology import rank_t
+from stk.api.topology import rank_t, topology_t
+from stk.api.mesh import field_ops
+from stk.api.mesh.field import FieldState
+from stk.stk.stk_mesh import StkMesh
 
 def test_bulk_create(parallel):
     meta = StkMetaData.create()
@@ -10,6 +14,11 @@ def test_bulk_create(parallel):
     assert bulk.parallel_size == parallel.size
     assert bulk.parallel_rank == parallel.rank
 
+    # The BulkData keeps its MetaData alive
+    bulk = StkBulkData.create(StkMetaData.create(ndim=2), parallel)
+    assert bulk.meta.spatial_dimension == 2
+    del bulk
+
 def test_bulk_entity_relations(hex_1elem_mesh):
     mesh = hex_1elem_mesh
     mesh.populate_bulk_data(create_edges = True)
@@ -63,3 +72,271 @@ def test_bulk_identifier(hex_1elem_mesh):
 
     assert min_node_id == 1
     assert max_node_id == 8
+
+def test_bulk_connectivity(stk_mesh):
+    mesh = stk_mesh
+    bulk = mesh.bulk
+    sel = StkSelector.from_part(mesh.meta.universal_part)
+
+    conn = bulk.connectivity(sel)
+    assert list(conn.keys()) == [topology_t.HEX_8]
+    hex_conn = conn[topology_t.HEX_8]
+    assert hex_conn.shape == (1, 8)
+    offsets = sorted(node.local_offset for node in mesh.iter_entities(sel))
+    assert sorted(hex_conn[0]) == offsets
+
+    conn = bulk.connectivity(sel, use_ids=True)
+    assert sorted(conn[topology_t.HEX_8][0]) == list(range(1, 9))
+
+    conn = bulk.connectivity(sel, rank_t.FACE_RANK, rank_t.NODE_RANK)
+    assert conn[topology_t.QUAD_4].shape == (6, 4)
+
+    offsets, indices = bulk.connectivity_csr(
+        sel, rank_t.NODE_RANK, rank_t.ELEM_RANK, use_ids=True)
+    assert offsets.shape == (9,)
+    np.testing.assert_array_equal(np.diff(offsets), 1)
+    np.testing.assert_array_equal(indices, 1)
+
+def test_bulk_entity_arrays(stk_mesh):
+    mesh = stk_mesh
+    bulk = mesh.bulk
+    sel = StkSelector.from_part(mesh.meta.universal_part)
+
+    ids = bulk.entity_ids(sel, rank_t.NODE_RANK)
+    offsets = bulk.local_offsets(sel, rank_t.NODE_RANK)
+    owners = bulk.owner_ranks(sel, rank_t.NODE_RANK)
+    assert ids.shape == (8,)
+    np.testing.assert_array_equal(np.sort(ids), np.arange(1, 9))
+    np.testing.assert_array_equal(owners, 0)
+
+    exp_ids = [bulk.identifier(n) for n in mesh.iter_entities(sel)]
+    exp_offsets = [n.local_offset for n in mesh.iter_entities(sel)]
+    np.testing.assert_array_equal(ids, exp_ids)
+    np.testing.assert_array_equal(offsets, exp_offsets)
+
+    table = bulk.entity_table(sel, rank_t.NODE_RANK)
+    np.testing.assert_array_equal(table["identifier"], ids)
+    np.testing.assert_array_equal(table["local_offset"], offsets)
+    np.testing.assert_array_equal(table["owner_rank"], owners)
+
+    lookup = bulk.get_entities(rank_t.NODE_RANK, ids[::-1])
+    np.testing.assert_array_equal(lookup, offsets[::-1])
+    assert bulk.get_entities(rank_t.NODE_RANK, [1000])[0] == 0
+
+def test_bulk_adjacency(stk_mesh):
+    mesh = stk_mesh
+    bulk = mesh.bulk
+    sel = StkSelector.from_part(mesh.meta.universal_part)
+
+    indptr, indices = bulk.adjacency(sel, "node-node")
+    assert indptr.shape == (9,)
+    np.testing.assert_array_equal(np.diff(indptr), 3)
+    offsets = bulk.local_offsets(sel, rank_t.NODE_RANK)
+    assert set(indices) == set(offsets)
+
+    indptr, indices = bulk.adjacency(sel, "node-node", compact=True,
+                                     through=rank_t.ELEM_RANK)
+    np.testing.assert_array_equal(np.diff(indptr), 7)
+    assert indices.min() == 0 and indices.max() == 7
+
+    indptr, indices = bulk.adjacency(sel, "node-elem", compact=True)
+    np.testing.assert_array_equal(np.diff(indptr), 1)
+    np.testing.assert_array_equal(indices, 0)
+
+    indptr, indices = bulk.adjacency(sel, "elem-elem")
+    np.testing.assert_array_equal(indptr, [0, 0])
+    assert indices.shape == (0,)
+
+    with pytest.raises(ValueError):
+        bulk.adjacency(sel, "edge-face")
+
+@pytest.mark.parametrize("method", ["hilbert", "morton", "rcm"])
+def test_bulk_reorder_entities(parallel, method):
+    if parallel.size > 1:
+        pytest.skip("Serial test")
+    mesh = StkMesh(parallel)
+    mesh.read_mesh_meta_data("generated:3x3x3")
+    mesh.populate_bulk_data()
+    bulk = mesh.bulk
+    sel = StkSelector.from_part(mesh.meta.universal_part)
+    coords = mesh.meta.coordinate_field
+
+    for rank in (rank_t.NODE_RANK, rank_t.ELEM_RANK):
+        ids = bulk.entity_ids(sel, rank)
+        xyz = bulk.entity_centroids(sel, rank)
+        epoch = bulk.state_epoch
+        previous = bulk.reorder_entities(method, rank)
+        assert bulk.state_epoch == epoch + 1
+        np.testing.assert_array_equal(np.sort(previous), np.arange(ids.shape[0]))
+        np.testing.assert_array_equal(bulk.entity_ids(sel, rank), ids[previous])
+        np.testing.assert_allclose(bulk.entity_centroids(sel, rank), xyz[previous])
+    np.testing.assert_allclose(
+        coords.gather(sel), bulk.entity_centroids(sel, rank_t.NODE_RANK))
+
+    with pytest.raises(ValueError):
+        bulk.reorder_entities("random")
+
+def test_bulk_cache(stk_mesh_fields):
+    mesh = stk_mesh_fields
+    bulk = mesh.bulk
+    velocity = mesh.meta.get_field("velocity")
+    sel = StkSelector.from_part(mesh.meta.universal_part)
+    cache = bulk.cache
+    cache.clear()
+    cache.reset_stats()
+
+    blist = bulk.bucket_list(sel, rank_t.NODE_RANK)
+    assert blist.num_entities == 8
+    assert blist.offsets[0] == 0 and blist.sizes.sum() == 8
+    assert bulk.bucket_list(sel, rank_t.NODE_RANK) is blist
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert list(bulk.iter_buckets(sel, rank_t.NODE_RANK)) == list(blist.buckets)
+
+    bkt = blist.buckets[0]
+    view = velocity.bkt_view(bkt)
+    assert velocity.bkt_view(bkt) is view
+    assert cache.num_views == 1
+
+    # State rotation and modification cycles invalidate the cache
+    bulk.update_field_data_states([velocity])
+    assert velocity.bkt_view(bkt) is not view
+    with bulk.modification():
+        pass
+    assert bulk.bucket_list(sel, rank_t.NODE_RANK) is not blist
+    assert cache.num_views == 0
+
+    cache.max_views = 1
+    velocity.bkt_view(bkt)
+    velocity.field_state(FieldState.StateN).bkt_view(bkt)
+    assert cache.num_views == 1 and cache.evictions >= 1
+
+@pytest.mark.parametrize("schedule", ["static", "balanced"])
+def test_bulk_parallel_for_buckets(stk_mesh_fields, schedule):
+    numba = pytest.importorskip("numba")
+    from numba import types, carray
+
+    sig = types.void(types.uintp, types.CPointer(types.CPointer(types.double)),
+                     types.CPointer(types.intc), types.voidptr)
+
+    @numba.cfunc(sig, nopython=True)
+    def kernel(num_entities, data, ncomp, user_data):
+        pres = carray(data[0], (num_entities,))
+        vel = carray(data[1], (num_entities * ncomp[1],))
+        for i in range(num_entities):
+            pres[i] = vel[i * ncomp[1]] + 1.0
+
+    mesh = stk_mesh_fields
+    sel = StkSelector.from_part(mesh.meta.universal_part)
+    pressure = mesh.meta.get_field("pressure")
+    velocity = mesh.meta.get_field("velocity")
+    mesh.bulk.parallel_for_buckets(
+        sel, rank_t.NODE_RANK, kernel, [pressure, velocity],
+        nthreads=2, schedule=schedule)
+    np.testing.assert_allclose(pressure.gather(sel), 11.0)
+
+def test_bulk_parallel_for_buckets_part_field(hex_1elem_mesh):
+    numba = pytest.importorskip("numba")
+    from numba import types, carray
+
+    sig = types.void(types.uintp, types.CPointer(types.CPointer(types.double)),
+                     types.CPointer(types.intc), types.voidptr)
+
+    @numba.cfunc(sig, nopython=True)
+    def kernel(num_entities, data, ncomp, user_data):
+        pres = carray(data[0], (num_entities,))
+        flux = carray(data[1], (num_entities,))
+        for i in range(num_entities):
+            pres[i] = flux[i]
+
+    meta = hex_1elem_mesh.meta
+    pressure = meta.declare_scalar_field("pressure")
+    flux = meta.declare_scalar_field("wall_flux")
+    surf = meta.get_part("surface_1")
+    pressure.add_to_part(meta.universal_part, init_value=np.array([20.0]))
+    flux.add_to_part(surf, init_value=np.array([3.0]))
+    hex_1elem_mesh.populate_bulk_data()
+
+    # Buckets without the flux field are skipped
+    sel = StkSelector.from_part(meta.universal_part)
+    hex_1elem_mesh.bulk.parallel_for_buckets(
+        sel, rank_t.NODE_RANK, kernel, [pressure, flux], nthreads=2)
+    pres = pressure.gather(sel)
+    assert np.count_nonzero(pres == 3.0) == 4
+    assert np.count_nonzero(pres == 20.0) == 4
+    np.testing.assert_allclose(
+        pressure.gather(StkSelector.from_part(surf)), 3.0)
+
+    with pytest.raises(ValueError):
+        hex_1elem_mesh.bulk.parallel_for_buckets(
+            sel, rank_t.ELEM_RANK, kernel, [pressure, flux])
+
+def test_bulk_declare_mesh(parallel):
+    if parallel.size > 1:
+        pytest.skip("Serial test")
+    meta = StkMetaData.create()
+    block = meta.declare_part("block_1", rank_t.ELEM_RANK)
+    block.set_toplogy(topology_t.HEX_8)
+    surf = meta.declare_part("surface_1", rank_t.FACE_RANK)
+    coords = meta.declare_vector_field("coordinates")
+    coords.add_to_part(meta.universal_part, 3)
+    meta.coordinate_field = coords
+    meta.commit()
+    bulk = StkBulkData.create(meta, parallel)
+
+    # Two hexes along x sharing the face at x = 1
+    node_ids = np.arange(1, 13)
+    xyz = np.array([[i, j, k] for k in range(2) for j in range(2) for i in range(3)],
+                   dtype=np.float64)
+    conn = np.array([[1, 2, 5, 4, 7, 8, 11, 10],
+                     [2, 3, 6, 5, 8, 9, 12, 11]])
+    with bulk.modification():
+        bulk.declare_nodes(node_ids)
+        bulk.declare_elements(block, [1, 2], conn)
+        with pytest.raises(ValueError):
+            bulk.declare_elements(block, [3], conn[:, :4])
+    with bulk.modification():
+        bulk.declare_element_sides(surf, [1], [3])
+    bulk.set_coordinates(node_ids, xyz)
+    assert not bulk.in_modifiable_state
+
+    sel = StkSelector.from_part(meta.universal_part)
+    assert len(bulk.entity_ids(sel, rank_t.ELEM_RANK)) == 2
+    assert len(bulk.entity_ids(StkSelector.from_part(surf), rank_t.FACE_RANK)) == 1
+    econn = bulk.connectivity(sel, rank_t.ELEM_RANK, rank_t.NODE_RANK, use_ids=True)
+    np.testing.assert_array_equal(econn[topology_t.HEX_8], conn)
+    ids = bulk.entity_ids(sel, rank_t.NODE_RANK)
+    np.testing.assert_allclose(coords.gather(sel), xyz[ids - 1])
+
+def test_bulk_custom_ghosting(parallel):
+    mesh = StkMesh(parallel)
+    mesh.read_mesh_meta_data("generated:1x1x%d"%(2 * parallel.size))
+    pressure = mesh.meta.declare_scalar_field("pressure", rank_t.ELEM_RANK)
+    pressure.add_to_part(mesh.meta.universal_part)
+    mesh.populate_bulk_data()
+    bulk = mesh.bulk
+    owned = StkSelector.from_part(mesh.meta.locally_owned_part)
+    elem_ids = bulk.entity_ids(owned, rank_t.ELEM_RANK)
+    pressure.scatter(elem_ids.astype(np.float64), owned)
+
+    ghosting = bulk.create_ghosting("custom")
+    assert ghosting.name == "custom"
+    assert ghosting.ordinal in [g.ordinal for g in bulk.ghostings]
+    dest = np.full(elem_ids.shape, (parallel.rank + 1) % parallel.size)
+    if parallel.size == 1:
+        elem_ids = elem_ids[:0]
+        dest = dest[:0]
+    bulk.change_ghosting(ghosting, elem_ids, dest)
+    with pytest.raises(ValueError):
+        bulk.change_ghosting(ghosting, [0], [0])
+
+    ghosted = StkSelector.from_part(bulk.ghosting_part(ghosting))
+    recv_ids = bulk.entity_ids(ghosted, rank_t.ELEM_RANK)
+    nrecv = parallel.parallel_reduce_sum(np.array([len(recv_ids)], dtype=np.intc))
+    assert nrecv[0] == (0 if parallel.size == 1 else 2 * parallel.size)
+
+    field_ops.communicate_field_data(ghosting, [pressure])
+    np.testing.assert_allclose(pressure.gather(ghosted), recv_ids)
+
+    bulk.change_ghosting(ghosting, [], [], remove_ids=recv_ids)
+    assert len(bulk.entity_ids(ghosted, rank_t.ELEM_RANK)) == 0
+    bulk.destroy_ghosting(ghosting)
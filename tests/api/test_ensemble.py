@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+import numpy as np
+from stk import ensemble, geometry
+from stk.api.mesh import StkSelector
+
+def mesh_volume(mesh, path):
+    sel = StkSelector.from_part(mesh.meta.locally_owned_part)
+    vol = np.array([geometry.volumes(mesh.bulk, sel).sum()])
+    return mesh.comm.parallel_reduce_sum(vol)[0]
+
+def test_ensemble(parallel):
+    files = ["generated:1x1x1", "generated:2x2x2", "generated:3x1x1"]
+    results = ensemble.run(files, mesh_volume, parallel)
+    if parallel.rank != 0:
+        assert results is None
+        return
+    np.testing.assert_allclose(results, [1.0, 8.0, 3.0])
+
+def test_ensemble_groups(parallel):
+    files = ["generated:2x2x%d"%(i + 1) for i in range(5)]
+    results = ensemble.run(files, mesh_volume, parallel,
+                           ranks_per_mesh=parallel.size, root=parallel.size - 1)
+    if parallel.rank == parallel.size - 1:
+        np.testing.assert_allclose(results, 4.0 * np.arange(1, 6))
+    with pytest.raises(ValueError):
+        ensemble.run(files, mesh_volume, parallel, ranks_per_mesh=0)
@@ -0,0 +1,199 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+import numpy as np
+from stk.api.mesh import StkSelector
+from stk.api.mesh import field_ops
+from stk.api.mesh.field import FieldState
+from stk.api.topology import rank_t
+
+def test_gather_scatter_fields(stk_mesh_fields):
+    meta = stk_mesh_fields.meta
+    pressure = meta.get_field("pressure")
+    velocity = meta.get_field("velocity")
+    sel = StkSelector.from_part(meta.universal_part)
+
+    data = field_ops.gather_fields([pressure, velocity], sel)
+    assert data.shape == (8, 4)
+    np.testing.assert_allclose(data[:, 0], 20.0)
+    np.testing.assert_allclose(data[:, 1], 10.0)
+    np.testing.assert_allclose(data[:, 2], 5.0)
+    np.testing.assert_allclose(data[:, 3], 0.0)
+
+    data[:, 0] = 1.0
+    data[:, 3] = 2.0
+    field_ops.scatter_fields([pressure, velocity], data, sel)
+    np.testing.assert_allclose(pressure.gather(sel), 1.0)
+    np.testing.assert_allclose(velocity.gather(sel)[:, 2], 2.0)
+
+def test_evaluate(stk_mesh_fields):
+    meta = stk_mesh_fields.meta
+    pressure = meta.get_field("pressure")
+    velocity = meta.get_field("velocity")
+    sel = StkSelector.from_part(meta.universal_part)
+
+    field_ops.evaluate(
+        "v = a * v + b * p", fields=dict(v=velocity, p=pressure),
+        scalars=dict(a=2.0, b=0.5), sel=sel)
+    vel = velocity.gather(sel)
+    np.testing.assert_allclose(vel[:, 0], 30.0)
+    np.testing.assert_allclose(vel[:, 1], 20.0)
+    np.testing.assert_allclose(vel[:, 2], 10.0)
+
+    field_ops.evaluate("p = sqrt(p) * max(p, 0.0)", fields=dict(p=pressure))
+    np.testing.assert_allclose(pressure.gather(sel), np.sqrt(20.0) * 20.0)
+
+    with pytest.raises(ValueError):
+        field_ops.evaluate("p = p + q", fields=dict(p=pressure))
+    pres = pressure.gather(sel)
+    with pytest.raises(RuntimeError):
+        field_ops.evaluate("p = v", fields=dict(p=pressure, v=velocity))
+    np.testing.assert_array_equal(pressure.gather(sel), pres)
+
+    # Broadcast of a scalar field in a nested expression
+    field_ops.evaluate("v = max(v - 2 * p / p, -(1 + p * 0))",
+                       fields=dict(v=velocity, p=pressure))
+    vel = velocity.gather(sel)
+    np.testing.assert_allclose(vel, np.tile([28.0, 18.0, 8.0], (8, 1)))
+
+def test_reductions(stk_mesh_fields):
+    meta = stk_mesh_fields.meta
+    pressure = meta.get_field("pressure")
+    velocity = meta.get_field("velocity")
+
+    np.testing.assert_allclose(field_ops.dot(velocity, velocity), 8 * 125.0)
+    np.testing.assert_allclose(field_ops.nrm2(pressure), np.sqrt(8 * 400.0))
+    np.testing.assert_allclose(field_ops.asum(velocity), 8 * 15.0)
+    np.testing.assert_allclose(field_ops.amax(velocity), 10.0)
+    np.testing.assert_allclose(field_ops.field_sum(velocity), [80.0, 40.0, 0.0])
+    np.testing.assert_allclose(field_ops.field_min(velocity), [10.0, 5.0, 0.0])
+    np.testing.assert_allclose(field_ops.field_max(pressure), [20.0])
+
+    sel = StkSelector.from_part(meta.get_part("surface_1"))
+    vdot, pmax, vsum = field_ops.reduce_many([
+        ("dot", velocity, velocity), ("max", pressure), ("sum", velocity)], sel)
+    np.testing.assert_allclose(vdot, 4 * 125.0)
+    np.testing.assert_allclose(pmax, [20.0])
+    np.testing.assert_allclose(vsum, [40.0, 20.0, 0.0])
+
+    with pytest.raises(ValueError):
+        field_ops.reduce_many([("dot", velocity)])
+    assert field_ops.reduce_many([]) == []
+
+def test_reduce_many_parts(hex_1elem_mesh):
+    meta = hex_1elem_mesh.meta
+    temp = meta.declare_scalar_field("temperature")
+    wall = meta.declare_scalar_field("wall_flux")
+    vol = meta.declare_scalar_field("volume", rank_t.ELEM_RANK)
+    temp.add_to_part(meta.universal_part, init_value=np.array([2.0]))
+    wall.add_to_part(meta.get_part("surface_1"), init_value=np.array([3.0]))
+    vol.add_to_part(meta.universal_part, init_value=np.array([5.0]))
+    hex_1elem_mesh.populate_bulk_data()
+
+    # Every reduction covers the entities where its own field is defined
+    tsum, wsum, vsum, tmin = field_ops.reduce_many([
+        ("sum", temp), ("sum", wall), ("sum", vol), ("min", temp)])
+    np.testing.assert_allclose(tsum, [16.0])
+    np.testing.assert_allclose(wsum, [12.0])
+    np.testing.assert_allclose(vsum, [5.0])
+    np.testing.assert_allclose(tmin, [2.0])
+
+    with pytest.raises(ValueError):
+        field_ops.reduce_many([("dot", temp, vol)])
+
+def test_begin_parallel_sum(stk_mesh_fields):
+    meta = stk_mesh_fields.meta
+    bulk = stk_mesh_fields.bulk
+    pressure = meta.get_field("pressure")
+    sel = StkSelector.from_part(meta.universal_part)
+
+    req = field_ops.begin_parallel_sum(bulk, [pressure])
+    req.wait()
+    assert req.test()
+    # Serial mesh has no shared entities
+    np.testing.assert_allclose(pressure.gather(sel), 20.0)
+
+def test_begin_parallel_sum_async(parallel, stk_mesh_fields):
+    if not parallel.threads_supported:
+        pytest.skip("MPI library does not provide MPI_THREAD_MULTIPLE")
+    meta = stk_mesh_fields.meta
+    bulk = stk_mesh_fields.bulk
+    pressure = meta.get_field("pressure")
+    velocity = meta.get_field("velocity")
+    sel = StkSelector.from_part(meta.universal_part)
+
+    with field_ops.begin_parallel_sum(bulk, [pressure]) as req:
+        assert req.is_async
+        # Computation and unrelated collectives overlap the communication
+        field_ops.axpy(1.0, velocity, velocity)
+        assert parallel.allreduce([1.0])[0] == parallel.size
+    assert req.test()
+    np.testing.assert_allclose(pressure.gather(sel), 20.0)
+    np.testing.assert_allclose(velocity.gather(sel)[:, 0], 20.0)
+
+def test_state_rotation(stk_mesh_fields):
+    mesh = stk_mesh_fields
+    bulk = mesh.bulk
+    velocity = mesh.meta.get_field("velocity")
+    vel_n = velocity.field_state(FieldState.StateN)
+    sel = StkSelector.from_part(mesh.meta.universal_part)
+
+    field_ops.fill(1.0, velocity, sel)
+    epoch = bulk.field_data_epoch
+    bulk.update_field_data_states([velocity])
+    assert bulk.field_data_epoch != epoch
+    assert bulk.state_epoch == epoch[1] + 1
+    np.testing.assert_allclose(vel_n.gather(sel), 1.0)
+    np.testing.assert_allclose(velocity.gather(sel)[:, 0], 10.0)
+
+    # Any state handle rotates the field once
+    pressure = mesh.meta.get_field("pressure")
+    pres = pressure.gather(sel)
+    bulk.update_field_data_states([vel_n, velocity])
+    np.testing.assert_allclose(velocity.gather(sel), 1.0)
+    np.testing.assert_allclose(vel_n.gather(sel)[:, 0], 10.0)
+    np.testing.assert_allclose(pressure.gather(sel), pres)
+    bulk.update_field_data_states([vel_n])
+    np.testing.assert_allclose(velocity.gather(sel)[:, 0], 10.0)
+
+    stepper = field_ops.TimeStepper([velocity])
+    views = stepper.bucket_views(velocity)
+    assert stepper.bucket_views(velocity) is views
+    stepper.advance(0.5, copy_new_state=True)
+    assert stepper.step == 1 and stepper.time == 0.5
+    new_views = stepper.bucket_views(velocity)
+    assert new_views is not views
+    np.testing.assert_allclose(new_views[0][:, 0], 10.0)
+    np.testing.assert_allclose(stepper.bucket_views(velocity, FieldState.StateN)[0][:, 0], 10.0)
+
+    with pytest.raises(ValueError):
+        field_ops.TimeStepper([mesh.meta.get_field("pressure")])
+
+def test_compact_field_ops(hex_1elem_mesh):
+    meta = hex_1elem_mesh.meta
+    xfld = meta.declare_scalar_field("x32", dtype=np.float32)
+    yfld = meta.declare_scalar_field("y32", dtype=np.float32)
+    flag = meta.declare_scalar_field("flag", dtype=np.uint8)
+    for fld in (xfld, yfld, flag):
+        fld.add_to_part(meta.universal_part)
+    hex_1elem_mesh.populate_bulk_data()
+    sel = StkSelector.from_part(meta.universal_part)
+
+    field_ops.fill(2.0, xfld)
+    field_ops.fill(1.0, yfld)
+    field_ops.axpy(0.5, xfld, yfld)
+    np.testing.assert_allclose(yfld.gather(sel), 2.0)
+    field_ops.fill(1, flag)
+    with pytest.raises(TypeError):
+        field_ops.axpy(1.0, xfld, flag)
+
+    data = field_ops.gather_fields([xfld, yfld], sel)
+    assert data.dtype == np.float32 and data.shape == (8, 2)
+    with pytest.raises(TypeError):
+        field_ops.gather_fields([xfld, flag], sel)
+
+    field_ops.evaluate("f = f + 2 * x", fields=dict(f=flag, x=xfld), sel=sel)
+    np.testing.assert_array_equal(flag.gather(sel), 5)
+    fsum, ymax = field_ops.reduce_many([("sum", flag), ("max", yfld)], sel)
+    np.testing.assert_allclose(fsum, [40.0])
+    np.testing.assert_allclose(ymax, [2.0])
@@ -118,3 +118,75 @@ def test_field_modification(stk_mesh_fields):
     vel = velocity.bkt_view(bkt)
     assert vel.shape == (bkt.size, meta.spatial_dimension)
     np.testing.assert_allclose(vel, 0.0)
+
+def test_field_gather_scatter(stk_mesh_fields):
+    meta = stk_mesh_fields.meta
+    bulk = stk_mesh_fields.bulk
+
+    surf = meta.get_part("surface_1")
+    sel = StkSelector.from_part(surf)
+
+    pressure = meta.get_field("pressure")
+    velocity = meta.get_field("velocity")
+
+    pres = pressure.gather(sel)
+    assert pres.shape == (4,)
+    np.testing.assert_allclose(pres, 20.0)
+
+    vel = velocity.gather(sel)
+    assert vel.shape == (4, meta.spatial_dimension)
+    np.testing.assert_allclose(vel[:, 0], 10.0)
+    np.testing.assert_allclose(vel[:, 1], 5.0)
+
+    vel[:, 2] = np.arange(4)
+    velocity.scatter(vel, sel)
+    out = np.zeros_like(vel)
+    res = velocity.gather(sel, out=out)
+    assert res is out
+    np.testing.assert_allclose(out[:, 2], np.arange(4))
+
+    vz = []
+    for node in bulk.iter_entities(sel):
+        vz.append(velocity.get(node)[2])
+    np.testing.assert_allclose(vz, np.arange(4))
+
+    with pytest.raises(AssertionError):
+        velocity.gather(sel, out=np.zeros((3, 3)))
+
+def test_compact_field_types(hex_1elem_mesh):
+    meta = hex_1elem_mesh.meta
+    bulk = hex_1elem_mesh.bulk
+    temp = meta.declare_scalar_field("temp32", dtype=np.float32)
+    ids = meta.declare_vector_field("ids64", dtype=np.int64)
+    flag = meta.declare_scalar_field_t["uint8_t"]("flag")
+    temp.add_to_part(meta.universal_part, init_value=[1.5])
+    ids.add_to_part(meta.universal_part, 2, init_value=[-1, 7])
+    flag.add_to_part(meta.universal_part, init_value=[3])
+    hex_1elem_mesh.populate_bulk_data()
+
+    assert temp.dtype == np.float32
+    assert ids.dtype == np.int64
+    assert flag.dtype == np.uint8
+    with pytest.raises(TypeError):
+        meta.declare_scalar_field("cplx", dtype=np.complex128)
+
+    sel = StkSelector.from_part(meta.universal_part)
+    bkt = next(bulk.iter_buckets(sel, rank_t.NODE_RANK))
+    tview = temp.bkt_view(bkt)
+    assert tview.dtype == np.float32 and tview.shape == (bkt.size,)
+    np.testing.assert_allclose(tview, 1.5)
+    iview = ids.bkt_view(bkt)
+    assert iview.dtype == np.int64 and iview.shape == (bkt.size, 2)
+    np.testing.assert_array_equal(iview[:, 1], 7)
+    node = next(iter(bkt))
+    assert flag.get(node).dtype == np.uint8 and flag.get(node)[0] == 3
+
+    fvals = flag.gather(sel)
+    assert fvals.dtype == np.uint8 and fvals.shape == (8,)
+    flag.scatter(np.arange(8), sel)
+    np.testing.assert_array_equal(flag.gather(sel), np.arange(8))
+
+    # Kernels working on doubles reject other field types
+    node_ids = bulk.entity_ids(sel, rank_t.NODE_RANK)
+    with pytest.raises(TypeError):
+        bulk.set_coordinates(node_ids, np.zeros((8, 1)), field=temp)
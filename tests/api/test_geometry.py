@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+import numpy as np
+from stk import geometry
+from stk.api.mesh import StkSelector
+from stk.api.topology import rank_t, topology_t, StkTopology
+from stk.stk.stk_mesh import StkMesh
+
+def test_topology_queries():
+    hex8 = StkTopology(topology_t.HEX_8)
+    assert hex8.num_nodes == 8
+    assert hex8.num_vertices == 8
+    assert hex8.num_edges == 12
+    assert hex8.num_sides == 6
+    assert hex8.dimension == 3
+    assert not hex8.is_shell
+    assert hex8.side_topology(0) == topology_t.QUAD_4
+    assert sorted(hex8.side_node_ordinals(0)) == [0, 1, 4, 5]
+    assert list(hex8.edge_node_ordinals(0)) == [0, 1]
+    assert StkTopology(topology_t.HEX_27).base == topology_t.HEX_8
+    with pytest.raises(IndexError):
+        hex8.side_node_ordinals(6)
+
+def test_element_geometry(parallel):
+    if parallel.size > 1:
+        pytest.skip("Serial test")
+    mesh = StkMesh(parallel)
+    meta = mesh.meta
+    mesh.read_mesh_meta_data("generated:2x2x2|sideset:xXyYzZ")
+    vol_field = meta.declare_scalar_field("volume", rank_t.ELEM_RANK)
+    vol_field.add_to_part(meta.universal_part)
+    vol32 = meta.declare_scalar_field("volume32", rank_t.ELEM_RANK, dtype=np.float32)
+    vol32.add_to_part(meta.universal_part)
+    mesh.populate_bulk_data()
+    bulk = mesh.bulk
+    sel = StkSelector.from_part(meta.universal_part)
+
+    vol = geometry.volumes(bulk, sel, out=vol_field)
+    np.testing.assert_allclose(vol, np.ones(8))
+    np.testing.assert_allclose(vol_field.gather(sel), vol)
+    with pytest.raises(TypeError):
+        geometry.volumes(bulk, sel, out=vol32)
+    np.testing.assert_allclose(geometry.quality(bulk, sel), np.ones(8))
+    cent = geometry.centroids(bulk, sel)
+    assert cent.shape == (8, 3)
+    np.testing.assert_allclose(cent.mean(axis=0), [1.0, 1.0, 1.0])
+    bkt = next(bulk.iter_buckets(sel, rank_t.ELEM_RANK))
+    block = geometry.bucket_coordinates(bulk, bkt)
+    assert block.shape == (bkt.size, 8, 3)
+    np.testing.assert_allclose(block.mean(axis=1), cent[:bkt.size])
+
+    # Closed boundary: total area 24 and vanishing sum of the area vectors
+    sides = StkSelector.select_union(
+        [meta.get_part("surface_%d"%i) for i in range(1, 7)])
+    area, normal = geometry.face_areas(bulk, sides)
+    assert area.shape == (24,) and normal.shape == (24, 3)
+    np.testing.assert_allclose(area, np.ones(24))
+    np.testing.assert_allclose(np.linalg.norm(normal, axis=1), np.ones(24))
+    np.testing.assert_allclose((area[:, None] * normal).sum(axis=0), 0.0, atol=1.0e-12)
+
+    # Stretch the mesh along x
+    coords = meta.coordinate_field
+    xyz = coords.gather(sel)
+    xyz[:, 0] *= 3.0
+    coords.scatter(xyz, sel)
+    np.testing.assert_allclose(geometry.volumes(bulk, sel), 3.0 * np.ones(8))
+    vol_field.scatter(np.arange(8, dtype=np.float64), sel)
+    np.testing.assert_allclose(
+        geometry.volume_weighted_average(bulk, vol_field, sel), 3.5)
@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+import numpy as np
+from stk.api.mesh import StkSelector
+from stk.api.topology import rank_t
+from stk.stk.stk_mesh import StkMesh
+
+def test_async_output_writer(hex_1elem_mesh, parallel, tmp_path):
+    mesh = hex_1elem_mesh
+    pressure = mesh.meta.declare_scalar_field("pressure")
+    pressure.add_to_part(mesh.meta.universal_part, init_value=np.array([1.0]))
+    writer = mesh.create_async_output([pressure], queue_depth=2)
+    mesh.populate_bulk_data()
+
+    fname = str(tmp_path / "async_out.exo")
+    writer.open(fname)
+    for step in range(3):
+        writer.submit(float(step))
+        pressure.scatter(pressure.gather() + 1.0)
+    writer.wait_all()
+    assert writer.num_pending == 0
+    writer.close()
+
+    mesh2 = StkMesh(parallel)
+    mesh2.read_mesh_meta_data(fname)
+    assert mesh2.stkio.time_steps == [0.0, 1.0, 2.0]
+    mesh2.populate_bulk_data()
+    pres2 = mesh2.meta.get_field("pressure")
+    mesh2.stkio.read_defined_input_fields(2.0)
+    np.testing.assert_allclose(pres2.gather(), 3.0)
+
+def test_async_output_overlap(hex_1elem_mesh, parallel, tmp_path):
+    if not parallel.threads_supported:
+        pytest.skip("MPI library does not provide MPI_THREAD_MULTIPLE")
+    mesh = hex_1elem_mesh
+    temp = mesh.meta.declare_scalar_field("temperature", dtype=np.float32)
+    velocity = mesh.meta.declare_vector_field("velocity")
+    temp.add_to_part(mesh.meta.universal_part, init_value=np.array([1.0]))
+    velocity.add_to_part(mesh.meta.universal_part, 3,
+                         init_value=np.array([1.0, 0.0, 0.0]))
+    writer = mesh.create_async_output([temp, velocity], queue_depth=1)
+    assert [f.dtype for f in writer.shadow_fields] == [np.float32, np.float64]
+    mesh.populate_bulk_data()
+
+    fname = str(tmp_path / "async_overlap.exo")
+    with writer:
+        writer.open(fname)
+        assert writer.is_async
+        for step in range(4):
+            writer.submit(float(step))
+            # Field updates and collectives overlap the pending write
+            temp.scatter(temp.gather() + 1.0)
+            velocity.scatter(velocity.gather() * 2.0)
+            assert parallel.allreduce([1.0])[0] == parallel.size
+    assert writer.num_pending == 0
+
+    mesh2 = StkMesh(parallel)
+    mesh2.read_mesh_meta_data(fname)
+    mesh2.populate_bulk_data()
+    mesh2.stkio.read_defined_input_fields(3.0)
+    np.testing.assert_allclose(mesh2.meta.get_field("temperature").gather(), 4.0)
+    np.testing.assert_allclose(
+        mesh2.meta.get_field("velocity").gather()[:, 0], 8.0)
+
+def test_read_field_history(stk_mesh_fields, parallel, tmp_path):
+    mesh = stk_mesh_fields
+    pressure = mesh.meta.get_field("pressure")
+    velocity = mesh.meta.get_field("velocity")
+    stkio = mesh.stkio
+    fname = str(tmp_path / "history.exo")
+    fidx = stkio.create_output_mesh(fname)
+    stkio.add_field(fidx, pressure)
+    stkio.add_field(fidx, velocity)
+    for step in range(4):
+        pressure.scatter(np.full(8, float(step)))
+        stkio.process_output_request(fidx, 0.5 * step)
+
+    mesh2 = StkMesh(parallel)
+    mesh2.read_mesh_meta_data(fname)
+    mesh2.populate_bulk_data()
+    pres2 = mesh2.meta.get_field("pressure")
+    # Only the requested fields are read
+    vel2 = mesh2.meta.get_field("velocity")
+    vel2.scatter(np.full((8, 3), -1.0))
+
+    steps = []
+    for time, data in mesh2.stkio.iter_field_steps([pres2], steps=slice(1, None, 2)):
+        steps.append(time)
+        np.testing.assert_allclose(data["pressure"], 2.0 * time)
+    assert steps == [0.5, 1.5]
+
+    times, hist = mesh2.stkio.read_field_history(
+        pres2, filename=str(tmp_path / "history.npy"))
+    np.testing.assert_allclose(times, [0.0, 0.5, 1.0, 1.5])
+    assert hist.shape == (4, 8)
+    np.testing.assert_allclose(hist[:, 0], [0.0, 1.0, 2.0, 3.0])
+    np.testing.assert_allclose(vel2.gather(), -1.0)
+
+def test_partial_mesh_load(parallel):
+    spec = "generated:1x1x1|shell:xX|sideset:xX"
+
+    mesh = StkMesh(parallel)
+    mesh.read_mesh_meta_data(spec)
+    mesh.populate_bulk_data()
+    sel = StkSelector.from_part(mesh.meta.universal_part)
+    assert len(mesh.bulk.entity_ids(sel, rank_t.ELEM_RANK)) == 3
+
+    mesh = StkMesh(parallel)
+    mesh.read_mesh_meta_data(spec, include_parts=["block_1", "surface_1"])
+    mesh.populate_bulk_data()
+    sel = StkSelector.from_part(mesh.meta.universal_part)
+    assert len(mesh.bulk.entity_ids(sel, rank_t.ELEM_RANK)) == 1
+    surf2 = StkSelector.from_part(mesh.meta.get_part("surface_2"))
+    assert len(mesh.bulk.entity_ids(surf2, rank_t.FACE_RANK)) == 0
+
+    mesh = StkMesh(parallel)
+    with pytest.raises(ValueError):
+        mesh.read_mesh_meta_data(spec, exclude_parts=["no_such_block"])
+
+def test_partial_field_load(parallel, tmp_path):
+    mesh = StkMesh(parallel)
+    mesh.read_mesh_meta_data("generated:1x1x1|shell:xX")
+    temp = mesh.meta.declare_scalar_field("temperature")
+    unused = mesh.meta.declare_scalar_field("unused")
+    flux = mesh.meta.declare_scalar_field("elem_flux", rank_t.ELEM_RANK)
+    temp.add_to_part(mesh.meta.universal_part, init_value=np.array([300.0]))
+    unused.add_to_part(mesh.meta.universal_part)
+    flux.add_to_part(mesh.meta.universal_part, init_value=np.array([2.0]))
+    mesh.populate_bulk_data()
+    fname = str(tmp_path / "fields.exo")
+    fidx = mesh.stkio.create_output_mesh(fname)
+    for fld in (temp, unused, flux):
+        mesh.stkio.add_field(fidx, fld)
+    mesh.stkio.process_output_request(fidx, 0.0)
+
+    mesh2 = StkMesh(parallel)
+    mesh2.read_mesh_meta_data(fname, fields=["temperature", "elem_flux"],
+                              exclude_parts=["block_2"])
+    mesh2.populate_bulk_data()
+    mesh2.stkio.read_defined_input_fields(0.0)
+    meta = mesh2.meta
+    assert meta.get_field("unused").is_null
+    temp2 = meta.get_field("temperature")
+    flux2 = meta.get_field("elem_flux", rank_t.ELEM_RANK)
+    assert flux2.entity_rank == rank_t.ELEM_RANK
+    np.testing.assert_allclose(temp2.gather(), 300.0)
+
+    # The element field is defined on every block that is loaded
+    sel = StkSelector.from_part(meta.universal_part)
+    assert len(mesh2.bulk.entity_ids(sel, rank_t.ELEM_RANK)) == 2
+    fsel = StkSelector.select_field(flux2)
+    assert len(mesh2.bulk.entity_ids(fsel, rank_t.ELEM_RANK)) == 2
+    np.testing.assert_allclose(flux2.gather(), 2.0)
+
+def test_mesh_snapshot(stk_mesh_fields, parallel, tmp_path):
+    mesh = stk_mesh_fields
+    pressure = mesh.meta.get_field("pressure")
+    pressure.scatter(np.arange(8, dtype=np.float64))
+    cache = str(tmp_path / "mesh.cache")
+    mesh.save_snapshot(cache, fields=[pressure])
+
+    mesh2 = StkMesh(parallel)
+    assert mesh2.load_snapshot(cache)
+    sel = StkSelector.from_part(mesh.meta.universal_part)
+    sel2 = StkSelector.from_part(mesh2.meta.universal_part)
+    for rank in (rank_t.NODE_RANK, rank_t.EDGE_RANK,
+                 rank_t.FACE_RANK, rank_t.ELEM_RANK):
+        assert (len(mesh2.bulk.entity_ids(sel2, rank)) ==
+                len(mesh.bulk.entity_ids(sel, rank)))
+
+    ids = mesh.bulk.entity_ids(sel)
+    ids2 = mesh2.bulk.entity_ids(sel2)
+    coords = mesh.meta.coordinate_field.gather(sel)[np.argsort(ids)]
+    coords2 = mesh2.meta.coordinate_field.gather(sel2)[np.argsort(ids2)]
+    np.testing.assert_allclose(coords2, coords)
+    pres2 = mesh2.meta.get_field("pressure")
+    np.testing.assert_allclose(
+        pres2.gather(sel2)[np.argsort(ids2)], pressure.gather(sel)[np.argsort(ids)])
+    assert not mesh2.meta.get_part("surface_1").is_null
+    io_parts = sorted(p.name for p in mesh.meta.get_parts() if p.is_io_part)
+    assert sorted(p.name for p in mesh2.meta.get_parts() if p.is_io_part) == io_parts
+
+    source = tmp_path / "source.txt"
+    source.write_text("mesh")
+    mesh3 = StkMesh(parallel)
+    assert not mesh3.load_snapshot(cache, source=str(source))
@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+
+import json
+import pytest
+from stk import profiling
+from stk.api.mesh import StkSelector
+from stk.api.mesh import field_ops
+
+def test_profiling(stk_mesh_fields, parallel, tmp_path):
+    meta = stk_mesh_fields.meta
+    pressure = meta.get_field("pressure")
+    sel = StkSelector.from_part(meta.universal_part)
+
+    profiling.reset()
+    field_ops.fill(1.0, pressure)
+    assert profiling.local_stats() == {}
+
+    profiling.enable(trace=True)
+    try:
+        for _ in range(3):
+            field_ops.fill(2.0, pressure)
+        pressure.gather(sel)
+        for bkt in stk_mesh_fields.bulk.iter_buckets(sel):
+            break
+        with profiling.region("user_region"):
+            pass
+    finally:
+        profiling.disable()
+
+    summary = profiling.report(parallel)
+    assert summary["field_ops.fill"]["count"] == 3
+    assert summary["field.gather"]["bytes"] == 8 * 8
+    assert summary["field_ops.fill"]["bytes"] == 3 * 8 * 8
+    assert summary["bulk.iter_buckets"]["count"] == 1
+    assert summary["user_region"]["count"] == 1
+    assert summary["field_ops.fill"]["imbalance"] >= 1.0
+
+    fname = str(tmp_path / "profile.json")
+    profiling.write_json(fname, parallel)
+    with open(fname) as fh:
+        assert "field_ops.fill" in json.load(fh)["operations"]
+
+    fname = str(tmp_path / "trace.json")
+    profiling.write_chrome_trace(fname, parallel)
+    with open(fname) as fh:
+        assert len(json.load(fh)["traceEvents"]) == 6
+    profiling.reset()
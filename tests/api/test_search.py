@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+import numpy as np
+from stk import search
+from stk.api.mesh import StkSelector
+from stk.stk.stk_mesh import StkMesh
+
+def test_bounding_box_tree():
+    lo = np.array([[i, 0.0, 0.0] for i in range(20)])
+    tree = search.BoundingBoxTree(np.hstack([lo, lo + 1.0]), leaf_size=2)
+    assert tree.num_items == 20
+    offsets, items = tree.query_boxes([[4.5, 0.5, 0.5, 5.5, 0.5, 0.5]])
+    assert sorted(items) == [4, 5]
+    items, dist = tree.nearest_items([[10.5, 3.0, 0.5]], k=2)
+    assert items[0, 0] == 10 and items[0, 1] in (9, 11)
+    np.testing.assert_allclose(dist[0, 0], 2.0)
+
+    # Morton order of the corners of a unit square (x is the major axis)
+    corners = np.array([[1.0, 1.0, 0.0], [0.0, 0.0, 0.0],
+                        [0.0, 1.0, 0.0], [1.0, 0.0, 0.0]])
+    np.testing.assert_array_equal(search.morton_order(corners), [1, 2, 3, 0])
+
+def test_mesh_search(parallel):
+    if parallel.size > 1:
+        pytest.skip("Serial test")
+    mesh = StkMesh(parallel)
+    mesh.read_mesh_meta_data("generated:2x2x2")
+    mesh.populate_bulk_data()
+    index = search.MeshSearch(mesh)
+    assert index.num_elements == 8
+    assert index.num_nodes == 27
+
+    points = np.array([[0.5, 0.5, 0.5], [1.5, 1.5, 1.5], [3.0, 0.0, 0.0]])
+    elem_ids, owners = index.query_points(points)
+    assert elem_ids[0] > 0 and elem_ids[1] > 0 and elem_ids[2] == 0
+    assert elem_ids[0] != elem_ids[1]
+    np.testing.assert_array_equal(owners, [0, 0, -1])
+    pids, powners = index.parallel_query_points(points)
+    assert pids.dtype == np.int64
+    np.testing.assert_array_equal(pids, elem_ids)
+    np.testing.assert_array_equal(powners, owners)
+
+    node_ids, dist = index.nearest_nodes([[0.1, 0.1, 0.1]], k=2)
+    np.testing.assert_allclose(dist[0, 0], np.sqrt(0.03))
+    assert dist[0, 1] > dist[0, 0]
+
+    offsets, boxed = index.query_boxes([[0.9, 0.9, 0.9]], [[1.1, 1.1, 1.1]])
+    assert offsets[-1] == 8 and len(set(boxed)) == 8
+
+    # Move the mesh and update the existing trees
+    coords = mesh.meta.coordinate_field
+    sel = StkSelector.from_part(mesh.meta.universal_part)
+    coords.scatter(coords.gather(sel) + 10.0, sel)
+    index.refit()
+    moved_ids, _ = index.query_points(points + 10.0)
+    np.testing.assert_array_equal(moved_ids, elem_ids)
+    np.testing.assert_allclose(index.rank_bounding_boxes(),
+                               [[10.0, 10.0, 10.0, 12.0, 12.0, 12.0]])
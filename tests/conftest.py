@@ -6,6 +6,6 @@ from stk.api.util.parallel import Parallel
 @pytest.fixture(scope='session')
 def parallel():
     arg_list=["ptest"]
-    par = Parallel.initialize(arg_list)
+    par = Parallel.initialize(arg_list, threads=True)
     yield par
     par.finalize()
@@ -1,8 +1,40 @@
 # -*- coding: utf-8 -*-
 
 import pytest
+import numpy as np
+from stk.api.util.parallel import Parallel
 
 def test_parallel(parallel):
     """Run test on non-mpi situations"""
     assert parallel.size == 1
     assert parallel.rank == 0
+
+def test_allreduce(parallel):
+    nranks = parallel.size
+    total, vec = parallel.allreduce([1.0, np.arange(3)])
+    assert total == nranks
+    np.testing.assert_array_equal(vec, nranks * np.arange(3))
+    buf = np.full((2, 2), parallel.rank, dtype=np.int64)
+    assert parallel.allreduce(buf, op="max", out=buf) is buf
+    np.testing.assert_array_equal(buf, nranks - 1)
+    out = [np.zeros(2)]
+    parallel.allreduce([np.ones(2)], op="min", out=out)
+    np.testing.assert_array_equal(out[0], 1.0)
+    with pytest.raises(NotImplementedError):
+        parallel.allreduce([1.0], op="prod")
+
+def test_split(parallel):
+    sub = parallel.split(parallel.rank % 2)
+    assert sub.rank == parallel.rank // 2
+    assert sub.allreduce([1])[0] == sub.size
+    sub.free()
+    assert parallel.split(-1) is None
+    with pytest.raises(RuntimeError):
+        parallel.free()
+
+def test_mpi4py(parallel):
+    MPI = pytest.importorskip("mpi4py.MPI")
+    par = Parallel.from_mpi4py(MPI.COMM_WORLD)
+    assert par == parallel
+    assert par.to_mpi4py() is MPI.COMM_WORLD
+    assert parallel.to_mpi4py().Get_size() == parallel.size